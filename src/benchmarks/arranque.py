@@ -0,0 +1,175 @@
+"""Benchmark de arranque de la aplicación con el tiempo de importación por módulo.
+
+Cada repetición corre en un intérprete nuevo con ``python -X importtime`` y
+mide tres fases:
+
+- ``streamlit``: importar Streamlit y ``AppTest`` (lo que un servidor ya
+  tiene cargado antes de la primera sesión),
+- ``caratula``: la primera ejecución de la aplicación, que muestra la
+  carátula (tiempo hasta que la carátula es interactiva),
+- ``pagina``: pasar a una página de cálculo (por defecto ``costo_total``),
+  que importa la capa de cálculo (``interfaz``, pandas, Plotly y el motor).
+
+Entre fases el proceso hijo escribe una marca en la salida de error, de modo
+que cada línea de ``-X importtime`` se atribuye a la fase en que se importó
+el módulo. Informa el tiempo de reloj de cada fase (mediana de las
+repeticiones) y los paquetes que más tardaron en importarse en cada una. El
+código de salida es 1 si la aplicación falló o si la carátula importó alguno
+de los módulos de `PESADOS`.
+
+Uso, desde ``src/``:
+
+    python benchmarks/arranque.py
+    python benchmarks/arranque.py --repeticiones 5 --pagina combinado --salida arranque.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APP = os.path.join(RAIZ, "app.py")
+FASES = ("streamlit", "caratula", "pagina")
+# Módulos que la carátula no debe importar
+PESADOS = ("pandas", "numpy", "plotly.graph_objects", "pyarrow", "interfaz", "motor_costos.modelos")
+_MARCA = "#fase "
+_LINEA = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \| (\s*)(\S+)")
+
+# Código del proceso hijo: argumentos APP y página; imprime en stdout el tiempo
+# de cada fase y los errores de la aplicación
+_HIJO = """
+import json, logging, sys, time
+logging.disable(logging.CRITICAL)
+
+def fase(nombre):
+    sys.stderr.write("#fase " + nombre + "\\n")
+    sys.stderr.flush()
+
+tiempos = {}
+fase("streamlit")
+inicio = time.perf_counter()
+from streamlit.testing.v1 import AppTest
+tiempos["streamlit"] = time.perf_counter() - inicio
+
+fase("caratula")
+inicio = time.perf_counter()
+app = AppTest.from_file(sys.argv[1], default_timeout=120).run()
+tiempos["caratula"] = time.perf_counter() - inicio
+errores = [e.message for e in app.exception]
+
+fase("pagina")
+inicio = time.perf_counter()
+app.switch_page("paginas/" + sys.argv[2] + ".py").run()
+tiempos["pagina"] = time.perf_counter() - inicio
+errores += [e.message for e in app.exception]
+print(json.dumps({"tiempos": tiempos, "errores": errores}))
+"""
+
+
+# Módulos importados en cada fase: {fase: {módulo: (propio_us, acumulado_us, nivel)}}
+def leer_importtime(salida_error):
+    fases = {fase: {} for fase in FASES}
+    actual = None
+    for linea in salida_error.splitlines():
+        if linea.startswith(_MARCA):
+            actual = linea[len(_MARCA):].strip()
+            continue
+        coincidencia = _LINEA.match(linea)
+        if coincidencia and actual in fases:
+            propio, acumulado, sangria, modulo = coincidencia.groups()
+            fases[actual][modulo] = (int(propio), int(acumulado), len(sangria) // 2)
+    return fases
+
+
+def correr_una_vez(pagina):
+    entorno = dict(os.environ)
+    # Los escenarios guardados por la aplicación no deben quedar junto al código
+    entorno.setdefault("CALCULADORA_ESCENARIOS", os.path.join(tempfile.gettempdir(), "benchmark_escenarios.sqlite3"))
+    proceso = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _HIJO, APP, pagina],
+        cwd=RAIZ, env=entorno, capture_output=True, text=True,
+    )
+    if proceso.returncode != 0:
+        raise RuntimeError(f"El proceso de arranque falló:\n{proceso.stderr[-2000:]}")
+    resultado = json.loads(proceso.stdout.strip().splitlines()[-1])
+    resultado["modulos"] = leer_importtime(proceso.stderr)
+    return resultado
+
+
+# Tiempo propio de importación sumado por paquete de primer nivel, en ms
+def por_paquete(modulos):
+    paquetes = {}
+    for modulo, (propio, _, _) in modulos.items():
+        paquete = modulo.split(".")[0]
+        paquetes[paquete] = paquetes.get(paquete, 0) + propio / 1000
+    return dict(sorted(paquetes.items(), key=lambda p: -p[1]))
+
+
+def correr(pagina, repeticiones):
+    corridas = [correr_una_vez(pagina) for _ in range(repeticiones)]
+    fases = {}
+    for fase in FASES:
+        modulos = {}
+        # Mediana por módulo entre repeticiones; se informan los que aparecen en todas
+        for modulo, (propio, acumulado, nivel) in corridas[0]["modulos"][fase].items():
+            medidas = [c["modulos"][fase].get(modulo) for c in corridas]
+            if all(medidas):
+                modulos[modulo] = (
+                    statistics.median(m[0] for m in medidas),
+                    statistics.median(m[1] for m in medidas),
+                    nivel,
+                )
+        fases[fase] = {
+            "tiempo_ms": round(statistics.median(c["tiempos"][fase] for c in corridas) * 1000, 1),
+            "importacion_ms": round(sum(m[0] for m in modulos.values()) / 1000, 1),
+            "modulos_importados": len(modulos),
+            "paquetes_ms": {p: round(ms, 1) for p, ms in por_paquete(modulos).items()},
+            "modulos": {
+                m: {"propio_ms": round(p / 1000, 2), "acumulado_ms": round(a / 1000, 2), "nivel": n}
+                for m, (p, a, n) in modulos.items()
+            },
+        }
+    return {
+        "pagina": pagina,
+        "repeticiones": repeticiones,
+        "fases": fases,
+        "pesados_en_caratula": [m for m in PESADOS if m in fases["caratula"]["modulos"]],
+        "errores": sorted({e for c in corridas for e in c["errores"]}),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Tiempo de arranque de la aplicación e importación por módulo")
+    parser.add_argument("--pagina", default="costo_total", help="Página de cálculo que se abre después de la carátula (por defecto: costo_total)")
+    parser.add_argument("--repeticiones", type=int, default=3, help="Intérpretes nuevos a medir (por defecto: 3)")
+    parser.add_argument("--paquetes", type=int, default=8, help="Paquetes más lentos a mostrar por fase (por defecto: 8)")
+    parser.add_argument("--salida", help="Guardar los resultados en este archivo JSON")
+    args = parser.parse_args(argv)
+
+    resultado = correr(args.pagina, args.repeticiones)
+    for fase in FASES:
+        datos = resultado["fases"][fase]
+        print(
+            f"{fase:<10} {datos['tiempo_ms']:>8,.1f} ms · importación {datos['importacion_ms']:,.1f} ms "
+            f"en {datos['modulos_importados']:,} módulos"
+        )
+        for paquete, ms in list(datos["paquetes_ms"].items())[:args.paquetes]:
+            print(f"    {paquete:<28} {ms:>8,.1f} ms")
+    if resultado["pesados_en_caratula"]:
+        print(f"La carátula importó: {', '.join(resultado['pesados_en_caratula'])}")
+    for error in resultado["errores"]:
+        print(f"Error: {error}")
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(resultado, archivo, ensure_ascii=False, indent=2)
+    return 1 if resultado["errores"] or resultado["pesados_en_caratula"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,159 @@
+"""Prueba de carga del servicio HTTP de los modelos de costo.
+
+Envía solicitudes concurrentes a `POST /evaluar` por conexiones HTTP/1.1
+persistentes (solo biblioteca estándar) e informa latencia p50/p99 y
+rendimiento en solicitudes y escenarios por segundo.
+
+Uso, con el servicio ya levantado:
+
+    python -m motor_costos.servicio --puerto 8765 &
+    python benchmarks/carga_servicio.py --url http://127.0.0.1:8765 --concurrencia 64 --duracion 10
+
+Con `--iniciar` levanta el servicio en un proceso aparte, mide y lo detiene.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+
+def _escenario(rng):
+    return {
+        "alternativa1": {"nombre": "A", "unidades": rng.randint(100, 10_000), "precio": rng.randint(10, 100), "costo_var_unit": rng.randint(1, 60)},
+        "alternativa2": {"nombre": "B", "unidades": rng.randint(100, 10_000), "precio": rng.randint(10, 100), "costo_var_unit": rng.randint(1, 60)},
+        "costos_fijos": [
+            {"nombre": f"Costo {i}", "valor1": rng.randint(0, 5_000), "valor2": rng.randint(0, 5_000), "relevante": rng.random() < 0.5}
+            for i in range(rng.randint(1, 10))
+        ],
+    }
+
+
+def _cuerpo(rng, escenarios_por_solicitud):
+    if escenarios_por_solicitud == 1:
+        datos = _escenario(rng)
+    else:
+        datos = {"escenarios": [_escenario(rng) for _ in range(escenarios_por_solicitud)]}
+    return json.dumps(datos).encode("utf-8")
+
+
+async def _solicitud(lector, escritor, host, ruta, cuerpo):
+    escritor.write(
+        f"POST {ruta} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(cuerpo)}\r\n\r\n".encode("ascii") + cuerpo
+    )
+    await escritor.drain()
+    estado = int((await lector.readline()).split()[1])
+    largo = 0
+    while True:
+        linea = await lector.readline()
+        if linea in (b"\r\n", b""):
+            break
+        nombre, _, valor = linea.decode("latin-1").partition(":")
+        if nombre.strip().lower() == "content-length":
+            largo = int(valor)
+    await lector.readexactly(largo)
+    return estado
+
+
+async def _cliente(url, cuerpos, fin, latencias, errores):
+    partes = urlsplit(url)
+    lector, escritor = await asyncio.open_connection(partes.hostname, partes.port or 80)
+    i = 0
+    try:
+        while time.perf_counter() < fin:
+            inicio = time.perf_counter()
+            estado = await _solicitud(lector, escritor, partes.netloc, "/evaluar", cuerpos[i % len(cuerpos)])
+            if estado == 200:
+                latencias.append(time.perf_counter() - inicio)
+            else:
+                errores.append(estado)
+            i += 1
+    finally:
+        escritor.close()
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    if not valores:
+        return float("nan")
+    indice = min(len(valores) - 1, max(0, round(p / 100 * (len(valores) - 1))))
+    return valores[indice]
+
+
+async def medir(url, concurrencia=32, duracion=10.0, escenarios_por_solicitud=1, semilla=0):
+    rng = random.Random(semilla)
+    cuerpos = [_cuerpo(rng, escenarios_por_solicitud) for _ in range(256)]
+    latencias, errores = [], []
+    inicio = time.perf_counter()
+    fin = inicio + duracion
+    await asyncio.gather(*(_cliente(url, cuerpos, fin, latencias, errores) for _ in range(concurrencia)))
+    transcurrido = time.perf_counter() - inicio
+    return {
+        "solicitudes": len(latencias),
+        "errores": len(errores),
+        "solicitudes_por_s": len(latencias) / transcurrido,
+        "escenarios_por_s": len(latencias) * escenarios_por_solicitud / transcurrido,
+        "p50_ms": _percentil(latencias, 50) * 1000,
+        "p99_ms": _percentil(latencias, 99) * 1000,
+    }
+
+
+async def _esperar_servicio(url, limite=30.0):
+    partes = urlsplit(url)
+    fin = time.perf_counter() + limite
+    while time.perf_counter() < fin:
+        try:
+            _, escritor = await asyncio.open_connection(partes.hostname, partes.port or 80)
+            escritor.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.1)
+    raise RuntimeError(f"El servicio no respondió en {url}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga del servicio de modelos de costo.")
+    parser.add_argument("--url", default="http://127.0.0.1:8765")
+    parser.add_argument("--concurrencia", type=int, default=32, help="Conexiones simultáneas (por defecto: 32)")
+    parser.add_argument("--duracion", type=float, default=10.0, help="Segundos de medición (por defecto: 10)")
+    parser.add_argument("--escenarios", type=int, default=1, help="Escenarios por solicitud (por defecto: 1)")
+    parser.add_argument("--iniciar", action="store_true", help="Levantar el servicio durante la prueba")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos del servicio con --iniciar (por defecto: 1)")
+    parser.add_argument("--json", action="store_true", help="Imprimir el resultado como JSON")
+    args = parser.parse_args(argv)
+
+    servicio = None
+    if args.iniciar:
+        partes = urlsplit(args.url)
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        servicio = subprocess.Popen(
+            [sys.executable, "-m", "motor_costos.servicio", "--host", partes.hostname,
+             "--puerto", str(partes.port or 80), "--procesos", str(args.procesos)],
+            cwd=raiz,
+        )
+    try:
+        if servicio is not None:
+            asyncio.run(_esperar_servicio(args.url))
+        resultado = asyncio.run(medir(args.url, args.concurrencia, args.duracion, args.escenarios))
+    finally:
+        if servicio is not None:
+            servicio.terminate()
+            servicio.wait()
+
+    if args.json:
+        print(json.dumps(resultado, indent=2))
+    else:
+        print(f"Solicitudes: {resultado['solicitudes']:,} ({resultado['errores']:,} con error)")
+        print(f"Rendimiento: {resultado['solicitudes_por_s']:,.0f} solicitudes/s, {resultado['escenarios_por_s']:,.0f} escenarios/s")
+        print(f"Latencia: p50 {resultado['p50_ms']:.1f} ms, p99 {resultado['p99_ms']:.1f} ms")
+    return 1 if resultado["errores"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
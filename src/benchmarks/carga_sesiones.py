@@ -0,0 +1,170 @@
+"""Prueba de carga de la aplicación con muchas sesiones simultáneas.
+
+Abre N sesiones de la aplicación con ``AppTest`` en un mismo proceso, como
+las atiende un servidor de Streamlit, todas sobre un catálogo corporativo de
+costos fijos. Cada sesión edita algunos costos propios y todas quedan
+abiertas a la vez; luego se vuelven a ejecutar por rondas, intercaladas
+(``AppTest`` no admite ejecutar sesiones desde varios hilos). Informa la
+memoria retenida (``tracemalloc``) por el conjunto de sesiones y por sesión,
+y la latencia de cada reejecución (p50/p95/p99), medida sin ``tracemalloc``.
+
+Modos:
+
+- ``compartido``: el catálogo se carga una sola vez (``st.cache_resource``
+  con ``CALCULADORA_CATALOGO``) y cada sesión guarda solo sus cambios
+  (``CatalogoConDelta``).
+- ``copia``: cada sesión importa su propia copia del catálogo, como antes de
+  compartirlo.
+
+Uso, desde ``src/``:
+
+    python benchmarks/carga_sesiones.py --sesiones 60 --costos 100000 --rondas 1
+    python benchmarks/carga_sesiones.py --modo ambos --sesiones 50 --costos 20000 --rondas 3
+"""
+
+import argparse
+import gc
+import json
+import logging
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+APP = os.path.join(RAIZ, "app.py")
+MODOS = ("compartido", "copia")
+
+
+def crear_catalogo(ruta, n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    valor1 = rng.integers(0, 100_000, n)
+    pd.DataFrame({
+        "nombre": [f"Costo {i}" for i in range(n)],
+        "valor1": valor1,
+        "valor2": np.where(rng.random(n) < 0.3, rng.integers(0, 100_000, n), valor1),
+        "reduccion": 0,
+        "relevante": rng.random(n) < 0.3,
+    }).to_parquet(ruta)
+
+
+def _percentil(valores, p):
+    valores = sorted(valores)
+    return valores[min(len(valores) - 1, int(round(p / 100 * (len(valores) - 1))))]
+
+
+def _memoria():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def correr(modo, ruta_catalogo, sesiones, rondas, pagina, ediciones):
+    from streamlit.testing.v1 import AppTest
+
+    from motor_costos.archivos import leer_costos_fijos
+    from motor_costos.cache import cache_modelos
+
+    if modo == "compartido":
+        os.environ["CALCULADORA_CATALOGO"] = ruta_catalogo
+    else:
+        os.environ.pop("CALCULADORA_CATALOGO", None)
+    cache_modelos.limpiar()
+    # La capa de cálculo de las páginas se importa una vez por proceso; se carga
+    # antes de medir para no atribuir su memoria a la primera sesión
+    import interfaz  # noqa: F401
+    tracemalloc.start()
+    inicio_memoria = _memoria()
+
+    def abrir(numero):
+        at = AppTest.from_file(APP, default_timeout=120)
+        if modo == "copia":
+            at.session_state.costos_fijos = leer_costos_fijos(ruta_catalogo)
+        at.run()
+        at.switch_page(f"paginas/{pagina}.py").run()
+        at.number_input(key="unidades1").set_value(100 + numero)
+        at.number_input(key="precio1").set_value(50)
+        at.number_input(key="unidades2").set_value(80)
+        at.number_input(key="precio2").set_value(60)
+        at.run()
+        # Cambios propios de la sesión sobre el catálogo
+        catalogo = at.session_state.costos_fijos
+        ids = catalogo.ids()
+        for j in range(ediciones):
+            catalogo.editar(int(ids[(numero * ediciones + j) % len(ids)]), {"valor1": 1_000 + numero})
+        return at
+
+    inicio = time.perf_counter()
+    apps = [abrir(numero) for numero in range(sesiones)]
+    apertura = time.perf_counter() - inicio
+    errores = sum(len(at.exception) for at in apps)
+    memoria = _memoria() - inicio_memoria
+    tracemalloc.stop()
+
+    latencias = []
+    for _ in range(rondas):
+        for at in apps:
+            inicio = time.perf_counter()
+            at.run()
+            latencias.append(time.perf_counter() - inicio)
+            errores += len(at.exception)
+
+    resultado = {
+        "modo": modo,
+        "sesiones": sesiones,
+        "reejecuciones": len(latencias),
+        "apertura_s": round(apertura, 2),
+        "memoria_mb": round(memoria / 1024 ** 2, 1),
+        "memoria_por_sesion_mb": round(memoria / sesiones / 1024 ** 2, 2),
+        "latencia_p50_ms": round(_percentil(latencias, 50) * 1000, 1),
+        "latencia_p95_ms": round(_percentil(latencias, 95) * 1000, 1),
+        "latencia_p99_ms": round(_percentil(latencias, 99) * 1000, 1),
+        "latencia_media_ms": round(statistics.fmean(latencias) * 1000, 1),
+        "errores": errores,
+    }
+    del apps
+    return resultado
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Prueba de carga de la aplicación con sesiones simultáneas (AppTest)")
+    parser.add_argument("--sesiones", type=int, default=60, help="Sesiones simultáneas (por defecto: 60)")
+    parser.add_argument("--costos", type=int, default=20_000, help="Costos fijos del catálogo corporativo (por defecto: 20000)")
+    parser.add_argument("--rondas", type=int, default=3, help="Reejecuciones de cada sesión (por defecto: 3)")
+    parser.add_argument("--ediciones", type=int, default=5, help="Costos que edita cada sesión (por defecto: 5)")
+    parser.add_argument("--pagina", default="costo_total", help="Página que abre cada sesión (por defecto: costo_total)")
+    parser.add_argument("--modo", choices=MODOS + ("ambos",), default="compartido")
+    parser.add_argument("--salida", help="Guardar los resultados en este archivo JSON")
+    args = parser.parse_args(argv)
+
+    logging.disable(logging.WARNING)
+    directorio = tempfile.mkdtemp(prefix="carga_sesiones_")
+    ruta_catalogo = os.path.join(directorio, "catalogo.parquet")
+    crear_catalogo(ruta_catalogo, args.costos)
+    os.environ.setdefault("CALCULADORA_ESCENARIOS", os.path.join(directorio, "escenarios.sqlite3"))
+
+    resultados = []
+    for modo in MODOS if args.modo == "ambos" else (args.modo,):
+        resultado = correr(modo, ruta_catalogo, args.sesiones, args.rondas, args.pagina, args.ediciones)
+        resultados.append(resultado)
+        print(
+            f"{modo:<11} {resultado['sesiones']} sesiones · memoria {resultado['memoria_mb']:,.1f} MB "
+            f"({resultado['memoria_por_sesion_mb']:,.2f} MB/sesión) · reejecución p50 {resultado['latencia_p50_ms']:,.1f} ms "
+            f"p95 {resultado['latencia_p95_ms']:,.1f} ms p99 {resultado['latencia_p99_ms']:,.1f} ms · errores {resultado['errores']}"
+        )
+
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump({"costos": args.costos, "resultados": resultados}, archivo, ensure_ascii=False, indent=2)
+    return 1 if any(r["errores"] for r in resultados) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
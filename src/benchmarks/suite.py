@@ -0,0 +1,358 @@
+"""Suite de benchmarks de los modelos de costo, sin navegador.
+
+Mide cada capa con catálogos de 10 a 100.000 costos fijos y lotes de 1 a
+1.000.000 de escenarios:
+
+- totalización de costos fijos (lista de costos, catálogo columnar y
+  actualización incremental),
+- evaluación de los tres modelos (escalar y por lotes),
+- construcción de tablas,
+- asignación de costos compartidos entre 1.000 productos,
+- páginas "costo_total", "costos_relevantes" y "costo_oportunidad" de la
+  aplicación, ejecutadas con ``AppTest`` y con el perfil por etapas activo
+  (`calcular_costo_total`, `calcular_costos_relevantes`,
+  `calcular_costo_oportunidad` y el render),
+- tiempo de importación y de arranque de la aplicación.
+
+Cada caso informa la mediana y el mínimo de varias repeticiones y la memoria
+pico (``tracemalloc``) de una ejecución aparte. El resultado se guarda como
+JSON; con ``--comparar`` se contrasta el mínimo de cada caso contra una
+línea base guardada y el código de salida es 1 si alguno empeoró más que la
+tolerancia.
+
+Uso, desde ``src/``:
+
+    python benchmarks/suite.py --salida base.json
+    python benchmarks/suite.py --salida actual.json --comparar base.json --tolerancia 0.25
+    python benchmarks/suite.py --rapido --casos totales,lote
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if RAIZ not in sys.path:
+    sys.path.insert(0, RAIZ)
+
+import numpy as np  # noqa: E402
+
+from motor_costos import Alternativa, CostoFijo, evaluar, totalizar_costos_fijos  # noqa: E402
+from motor_costos.archivos import tabla_costos_fijos  # noqa: E402
+from motor_costos.asignacion import asignar_columnas  # noqa: E402
+from motor_costos.catalogo import CatalogoCostosFijos  # noqa: E402
+from motor_costos.lote import evaluar_lote_totales  # noqa: E402
+
+TAMANOS_CATALOGO = (10, 100, 1_000, 10_000, 100_000)
+TAMANOS_LOTE = (1, 100, 10_000, 1_000_000)
+TAMANOS_CATALOGO_RAPIDO = (10, 1_000, 10_000)
+TAMANOS_LOTE_RAPIDO = (1, 10_000, 100_000)
+PAGINAS = ("costo_total", "costos_relevantes", "costo_oportunidad")
+
+
+def _columnas_catalogo(n, semilla=0):
+    rng = np.random.default_rng(semilla)
+    return (
+        [f"Costo {i}" for i in range(n)],
+        rng.integers(0, 10_000, n).astype(np.float64),
+        rng.integers(0, 10_000, n).astype(np.float64),
+        np.zeros(n),
+        rng.random(n) < 0.3,
+    )
+
+
+def _catalogo(n):
+    return CatalogoCostosFijos.desde_columnas(*_columnas_catalogo(n))
+
+
+def _alternativas():
+    return Alternativa("Alternativa 1", 1_000, 120, 70), Alternativa("Alternativa 2", 900, 130, 75)
+
+
+# Cada caso recibe el tamaño y devuelve la función a medir; la preparación no se mide
+
+def caso_totales_lista(n):
+    nombres, valor1, valor2, _, relevante = _columnas_catalogo(n)
+    costos = [CostoFijo(nombre, v1, v2, 0, r) for nombre, v1, v2, r in zip(nombres, valor1.tolist(), valor2.tolist(), relevante.tolist())]
+    return lambda: totalizar_costos_fijos(costos)
+
+
+def caso_totales_catalogo(n):
+    columnas = _columnas_catalogo(n)
+    return lambda: CatalogoCostosFijos.desde_columnas(*columnas).totales
+
+
+def caso_totales_incremental(n):
+    catalogo = _catalogo(n)
+    ids = catalogo.ids()
+    estado = {"i": 0}
+
+    def editar():
+        i = int(ids[estado["i"] % len(ids)])
+        estado["i"] += 1
+        catalogo.actualizar(i, valor1=estado["i"])
+        return catalogo.totales
+
+    return editar
+
+
+def caso_modelos(n):
+    catalogo = _catalogo(n)
+    alt1, alt2 = _alternativas()
+    return lambda: evaluar(alt1, alt2, catalogo)
+
+
+def caso_tabla_costos_fijos(n):
+    catalogo = _catalogo(n)
+
+    def construir():
+        # Sin la columna cacheada del catálogo, para medir la construcción completa
+        catalogo._columnas = None
+        return tabla_costos_fijos(catalogo)
+
+    return construir
+
+
+# n centros de costo repartidos entre 1.000 productos con 6 inductores; la mitad
+# de los centros se limita a entre 1 y 20 productos
+def caso_asignacion(n, productos=1_000, inductores=6):
+    rng = np.random.default_rng(0)
+    cantidades = rng.random((productos, inductores))
+    valores = rng.integers(0, 10_000, n).astype(np.float64)
+    relevante = rng.random(n) < 0.3
+    inductor = rng.integers(0, inductores, n)
+    limitados = np.arange(0, n, 2)
+    largos = rng.integers(1, 21, len(limitados))
+    filas = np.repeat(limitados, largos)
+    columnas = rng.integers(0, productos, len(filas))
+    return lambda: asignar_columnas(valores, relevante, inductor, cantidades, filas, columnas)
+
+
+def caso_lote(n):
+    rng = np.random.default_rng(0)
+    unidades = rng.integers(1, 10_000, (n, 2)).astype(np.float64)
+    precio = rng.integers(1, 500, (n, 2)).astype(np.float64)
+    costo_var_unit = rng.integers(1, 400, (n, 2)).astype(np.float64)
+    total = rng.integers(0, 1_000_000, (n, 2)).astype(np.float64)
+    relevantes = total * rng.random((n, 2))
+    return lambda: evaluar_lote_totales(unidades, precio, costo_var_unit, total, relevantes)
+
+
+CASOS = {
+    "totales_lista": ("catalogo", caso_totales_lista),
+    "totales_catalogo": ("catalogo", caso_totales_catalogo),
+    "totales_incremental": ("catalogo", caso_totales_incremental),
+    "modelos": ("catalogo", caso_modelos),
+    "tabla_costos_fijos": ("catalogo", caso_tabla_costos_fijos),
+    "asignacion": ("catalogo", caso_asignacion),
+    "lote": ("lote", caso_lote),
+}
+
+
+# Repite la función hasta juntar `tiempo_minimo` segundos (entre 3 y `max_repeticiones` veces)
+def medir(funcion, tiempo_minimo=0.2, max_repeticiones=50):
+    funcion()
+    tiempos = []
+    inicio = time.perf_counter()
+    while len(tiempos) < 3 or (time.perf_counter() - inicio < tiempo_minimo and len(tiempos) < max_repeticiones):
+        gc.collect()
+        t = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - t)
+    return tiempos
+
+
+def memoria_pico(funcion):
+    gc.collect()
+    tracemalloc.start()
+    try:
+        funcion()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def _resultado(caso, n, tiempos, pico=None, **extra):
+    return {
+        "caso": caso,
+        "n": n,
+        "mediana_ms": statistics.median(tiempos) * 1000,
+        "minimo_ms": min(tiempos) * 1000,
+        "repeticiones": len(tiempos),
+        "memoria_pico_kb": None if pico is None else pico / 1024,
+        **extra,
+    }
+
+
+def correr_casos(nombres, tamanos_catalogo, tamanos_lote, informar):
+    resultados = []
+    for nombre in nombres:
+        tipo, preparar = CASOS[nombre]
+        for n in tamanos_catalogo if tipo == "catalogo" else tamanos_lote:
+            funcion = preparar(n)
+            tiempos = medir(funcion)
+            pico = memoria_pico(preparar(n))
+            resultados.append(_resultado(nombre, n, tiempos, pico))
+            informar(resultados[-1])
+    return resultados
+
+
+# Ejecuta las páginas de la aplicación con AppTest y el perfil por etapas activo.
+# La caché de modelos se vacía antes de cada ejecución para medir el cálculo en frío.
+def correr_paginas(tamanos_catalogo, informar, repeticiones=3):
+    import logging
+
+    os.environ["CALCULADORA_PERFIL"] = "1"
+    logging.disable(logging.CRITICAL)
+    from streamlit.testing.v1 import AppTest
+
+    from motor_costos.cache import cache_modelos
+
+    ruta_app = os.path.join(RAIZ, "app.py")
+    resultados = []
+    for pagina in PAGINAS:
+        for n in tamanos_catalogo:
+            app = AppTest.from_file(ruta_app, default_timeout=600)
+            app.session_state.costos_fijos = _catalogo(n)
+            app.run()
+            app.switch_page(f"paginas/{pagina}.py").run()
+            app.number_input(key="unidades1").set_value(1_000)
+            app.number_input(key="precio1").set_value(120)
+            app.number_input(key="unidades2").set_value(900)
+            app.number_input(key="precio2").set_value(130)
+            tiempos, etapas = [], []
+            for _ in range(repeticiones):
+                cache_modelos.limpiar()
+                gc.collect()
+                t = time.perf_counter()
+                app.run()
+                tiempos.append(time.perf_counter() - t)
+                if app.exception:
+                    raise RuntimeError(f"La página {pagina} falló: {app.exception[0].message}")
+                etapas.append(app.session_state.historial_perfiles.ultima().etapas)
+            # Mediana de cada etapa entre repeticiones
+            etapas_ms = {e: statistics.median(r.get(e, 0.0) for r in etapas) for e in etapas[-1]}
+            resultados.append(_resultado(f"pagina_{pagina}", n, tiempos, etapas_ms=etapas_ms))
+            informar(resultados[-1])
+    return resultados
+
+
+def _tiempo_subproceso(codigo, repeticiones=3):
+    tiempos = []
+    for _ in range(repeticiones):
+        t = time.perf_counter()
+        subprocess.run([sys.executable, "-c", codigo], cwd=RAIZ, check=True, capture_output=True)
+        tiempos.append(time.perf_counter() - t)
+    return tiempos
+
+
+# Tiempo de importación en un intérprete nuevo y de la primera ejecución de la aplicación
+def correr_arranque(informar):
+    medidas = {
+        "importar_motor": "import motor_costos, motor_costos.lote, motor_costos.catalogo",
+        "importar_dependencias_app": "import streamlit, pandas, plotly.graph_objects",
+        "arranque_app": (
+            "import logging; logging.disable(logging.CRITICAL)\n"
+            "from streamlit.testing.v1 import AppTest\n"
+            "AppTest.from_file('app.py', default_timeout=120).run()"
+        ),
+    }
+    resultados = []
+    for nombre, codigo in medidas.items():
+        resultados.append(_resultado(nombre, 1, _tiempo_subproceso(codigo)))
+        informar(resultados[-1])
+    return resultados
+
+
+def _clave(resultado):
+    return resultado["caso"], resultado["n"]
+
+
+# Compara contra una línea base; devuelve las filas de comparación y si hubo regresiones.
+# Se usa el mínimo de las repeticiones, menos sensible al ruido de la máquina que la mediana.
+def comparar(actuales, base, tolerancia):
+    anteriores = {_clave(r): r for r in base["resultados"]}
+    filas, regresion = [], False
+    for resultado in actuales:
+        anterior = anteriores.get(_clave(resultado))
+        if anterior is None:
+            continue
+        razon = resultado["minimo_ms"] / anterior["minimo_ms"] if anterior["minimo_ms"] else float("inf")
+        empeoro = razon > 1 + tolerancia
+        regresion |= empeoro
+        filas.append((resultado["caso"], resultado["n"], anterior["minimo_ms"], resultado["minimo_ms"], razon, empeoro))
+    return filas, regresion
+
+
+def _formato(resultado):
+    memoria = "" if resultado["memoria_pico_kb"] is None else f"  pico {resultado['memoria_pico_kb']:,.0f} KB"
+    return f"{resultado['caso']:<28} n={resultado['n']:>9,}  {resultado['mediana_ms']:>10.3f} ms{memoria}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los modelos de costo.")
+    parser.add_argument("--salida", help="Archivo JSON donde guardar los resultados")
+    parser.add_argument("--comparar", help="Archivo JSON de línea base para comparar")
+    parser.add_argument("--tolerancia", type=float, default=0.25, help="Empeoramiento relativo admitido (por defecto: 0.25)")
+    parser.add_argument("--rapido", action="store_true", help="Tamaños reducidos para una corrida corta")
+    parser.add_argument(
+        "--casos",
+        help=f"Grupos a correr separados por comas: {', '.join(CASOS)}, paginas, arranque (por defecto: todos)",
+    )
+    parser.add_argument("-q", "--silencioso", action="store_true")
+    args = parser.parse_args(argv)
+
+    # Los escenarios guardados por la aplicación no deben quedar junto al código
+    os.environ.setdefault("CALCULADORA_ESCENARIOS", os.path.join(tempfile.gettempdir(), "benchmark_escenarios.sqlite3"))
+    tamanos_catalogo = TAMANOS_CATALOGO_RAPIDO if args.rapido else TAMANOS_CATALOGO
+    tamanos_lote = TAMANOS_LOTE_RAPIDO if args.rapido else TAMANOS_LOTE
+    pedidos = args.casos.split(",") if args.casos else list(CASOS) + ["paginas", "arranque"]
+    desconocidos = set(pedidos) - set(CASOS) - {"paginas", "arranque"}
+    if desconocidos:
+        parser.error(f"Casos desconocidos: {', '.join(sorted(desconocidos))}")
+
+    def informar(resultado):
+        if not args.silencioso:
+            print(_formato(resultado), flush=True)
+
+    resultados = correr_casos([c for c in pedidos if c in CASOS], tamanos_catalogo, tamanos_lote, informar)
+    if "paginas" in pedidos:
+        resultados += correr_paginas(tamanos_catalogo, informar)
+    if "arranque" in pedidos:
+        resultados += correr_arranque(informar)
+
+    informe = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "plataforma": platform.platform(),
+        "procesadores": os.cpu_count(),
+        "resultados": resultados,
+    }
+    if args.salida:
+        with open(args.salida, "w", encoding="utf-8") as archivo:
+            json.dump(informe, archivo, ensure_ascii=False, indent=2)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as archivo:
+            base = json.load(archivo)
+        filas, regresion = comparar(resultados, base, args.tolerancia)
+        print(f"\n{'caso':<28} {'n':>9}  {'base ms':>10}  {'actual ms':>10}  {'razón':>6}")
+        for caso, n, anterior, actual, razon, empeoro in filas:
+            marca = "  REGRESIÓN" if empeoro else ""
+            print(f"{caso:<28} {n:>9,}  {anterior:>10.3f}  {actual:>10.3f}  {razon:>6.2f}{marca}")
+        return 1 if regresion else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1810 @@
+"""Componentes y cálculos compartidos por las páginas de la calculadora.
+
+Importa pandas, Plotly y el motor de cálculo, por lo que solo lo importan las
+páginas de `paginas/` al ejecutarse: la carátula (`app.py`) arranca sin
+ellos y el primer modelo abierto paga la importación una sola vez por proceso.
+"""
+
+import os
+import time
+
+import streamlit as st  
+import pandas as pd  
+import numpy as np  
+import plotly.graph_objects as go  
+
+from motor_costos import (
+    Alternativa,
+    DatosBasicos,
+    ResultadoModelo,
+    evaluar,
+    evaluar_alternativas,
+    modelo_costo_oportunidad,
+    modelo_costo_total,
+    modelo_costos_relevantes,
+    valor_con_reduccion,
+)
+from motor_costos.simulacion import (
+    AlternativaIncierta,
+    CostoFijoIncierto,
+    Normal,
+    Triangular,
+    Uniforme,
+    simular,
+)
+from motor_costos.sensibilidad import puntos_de_equilibrio, tornado
+from motor_costos.grilla import MAXIMO_PUNTOS, Eje, evaluar_grilla, variables_grilla
+from motor_costos.proyeccion import Crecimiento, proyectar, tasa_periodica
+from motor_costos.asignacion import INDUCTORES_BASICOS, CentroCosto, asignar
+from motor_costos.optimizacion import Recurso, optimizar_mezcla, scipy_disponible
+from motor_costos.ramas import ArbolEscenarios
+from motor_costos.resumen import AcumuladorDistribucion
+from motor_costos.cache import cache_modelos, huella, memoizar
+from motor_costos.dinero import montos, redondear
+from motor_costos.catalogo import CatalogoConDelta, CatalogoCostosFijos
+from motor_costos.almacen import AlmacenEscenarios
+from motor_costos.perfil import HistorialPerfiles, Perfilador
+from motor_costos.archivos import (
+    ErrorEsquema,
+    evaluar_bloque,
+    exportar_tabla,
+    leer_alternativas,
+    leer_bloques,
+    leer_costos_fijos,
+    tabla_costos_fijos,
+)
+
+# Perfilador de la ejecución en curso de la sesión, que `app.py` crea en cada
+# ejecución. Este módulo se importa una vez por proceso, así que los
+# decoradores `medir` buscan el perfilador de la ejecución al llamarse.
+class PerfilEjecucion:
+    def __getattr__(self, nombre):
+        return getattr(st.session_state.perfilador, nombre)
+
+    # `self.etapa` se resuelve en cada llamada contra el perfilador de la ejecución
+    medir = Perfilador.medir
+
+
+PERFIL = PerfilEjecucion()
+
+TIPOS_ARCHIVO = ["csv", "xlsx", "xls", "parquet", "arrow", "feather"]
+
+FORMATOS_EXPORTACION = {
+    "CSV": ("csv", "csv", "text/csv"),
+    "Excel": ("excel", "xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+    "Parquet": ("parquet", "parquet", "application/vnd.apache.parquet"),
+    "Arrow": ("arrow", "arrow", "application/vnd.apache.arrow.file")
+}
+
+# Función para cargar las dos primeras alternativas de un archivo en los campos del formulario  
+def importar_alternativas():
+    archivo = st.session_state.archivo_alternativas
+    if archivo is None:
+        return
+    try:
+        alternativas = leer_alternativas(archivo)
+    except (ErrorEsquema, ValueError, ImportError) as error:
+        st.session_state.mensaje_importacion = ("error", f"No se pudo importar el archivo: {error}")
+        return
+    if len(alternativas) < 2:
+        st.session_state.mensaje_importacion = ("error", "El archivo debe contener al menos dos alternativas")
+        return
+    
+    for sufijo, alt in zip(("1", "2"), alternativas):
+        st.session_state[f"nombre_alt{sufijo}"] = alt.nombre
+        st.session_state[f"unidades{sufijo}"] = int(alt.unidades)
+        st.session_state[f"precio{sufijo}"] = int(alt.precio)
+        st.session_state[f"cvu{sufijo}"] = int(alt.costo_var_unit)
+    st.session_state.mensaje_importacion = ("success", f"Alternativas importadas: {alternativas[0].nombre} y {alternativas[1].nombre}")
+
+# Función para reemplazar el catálogo de costos fijos con el contenido de un archivo  
+def importar_costos_fijos():
+    archivo = st.session_state.archivo_costos_fijos
+    if archivo is None:
+        return
+    try:
+        st.session_state.costos_fijos = leer_costos_fijos(archivo)
+    except (ErrorEsquema, ValueError, ImportError) as error:
+        st.session_state.mensaje_importacion = ("error", f"No se pudo importar el archivo: {error}")
+        return
+    st.session_state.mensaje_importacion = ("success", f"{len(st.session_state.costos_fijos):,} costos fijos importados")
+
+# Función para mostrar el resultado de la última importación  
+def mostrar_mensaje_importacion():
+    if "mensaje_importacion" in st.session_state:
+        tipo, mensaje = st.session_state.pop("mensaje_importacion")
+        if tipo == "success":
+            st.success(mensaje)
+        else:
+            st.error(mensaje)
+
+# Función para mostrar una tabla midiendo su render y registrando su tamaño en el perfil  
+def mostrar_tabla(df, nombre, **opciones):
+    with PERFIL.etapa("Render"):
+        st.dataframe(df, **opciones)
+    PERFIL.registrar_tabla(nombre, df)
+
+# Función para ofrecer la descarga de una tabla en el formato elegido  
+def ofrecer_descarga(df, nombre_archivo, key):
+    formato, extension, mime = FORMATOS_EXPORTACION[st.session_state.get("formato_exportacion", "CSV")]
+    st.download_button(
+        f"Descargar tabla ({extension.upper()})",
+        # La conversión se hace recién al hacer clic
+        data=lambda: exportar_tabla(df, formato=formato),
+        file_name=f"{nombre_archivo}.{extension}",
+        mime=mime,
+        key=key,
+        on_click="ignore"
+    )
+
+# Función para ingresar datos básicos de las alternativas  
+@PERFIL.medir("Entrada de datos")
+def ingresar_datos_basicos():  
+    st.write("### Datos básicos de las alternativas")  
+    
+    with st.expander("Importar alternativas desde archivo"):
+        st.file_uploader(
+            "Archivo con columnas nombre, unidades, precio y costo_var_unit",
+            type=TIPOS_ARCHIVO,
+            key="archivo_alternativas",
+            on_change=importar_alternativas
+        )
+    mostrar_mensaje_importacion()
+    
+    # Nombres de las alternativas  
+    col1, col2 = st.columns(2)  
+    with col1:  
+        nombre_alt1 = st.text_input("Nombre de la Alternativa 1", "Alternativa 1", key="nombre_alt1")  
+    with col2:  
+        nombre_alt2 = st.text_input("Nombre de la Alternativa 2", "Alternativa 2", key="nombre_alt2")  
+    
+    # Datos de unidades y precios  
+    col1, col2 = st.columns(2)  
+    with col1:  
+        st.subheader(f"{nombre_alt1}")  
+        unidades1 = st.number_input(f"Unidades ({nombre_alt1})", min_value=0, value=0, step=1, key="unidades1")  
+        precio1 = st.number_input(f"Precio por unidad ({nombre_alt1})", min_value=0, value=0, step=1, key="precio1")  
+        costo_var_unit1 = st.number_input(f"Costo variable unitario ({nombre_alt1})", min_value=0, value=0, step=1, key="cvu1")  
+    
+    with col2:  
+        st.subheader(f"{nombre_alt2}")  
+        unidades2 = st.number_input(f"Unidades ({nombre_alt2})", min_value=0, value=0, step=1, key="unidades2")  
+        precio2 = st.number_input(f"Precio por unidad ({nombre_alt2})", min_value=0, value=0, step=1, key="precio2")  
+        costo_var_unit2 = st.number_input(f"Costo variable unitario ({nombre_alt2})", min_value=0, value=0, step=1, key="cvu2")  
+    
+    # Cálculos automáticos  
+    alt1 = Alternativa(nombre_alt1, unidades1, precio1, costo_var_unit1)
+    alt2 = Alternativa(nombre_alt2, unidades2, precio2, costo_var_unit2)
+    
+    ingreso1 = alt1.ingreso  
+    ingreso2 = alt2.ingreso  
+    
+    costo_variable1 = alt1.costo_variable  
+    costo_variable2 = alt2.costo_variable  
+    
+    margen1 = alt1.margen  
+    margen2 = alt2.margen  
+    
+    st.markdown("---")  
+    st.write("### Resultados calculados automáticamente")  
+    
+    # Mostrar los cálculos paso a paso  
+    col1, col2 = st.columns(2)  
+    with col1:  
+        st.write(f"**Ingreso Total ({nombre_alt1}):** {unidades1} × ${precio1} = ${ingreso1:,}")  
+        st.write(f"**Costo Variable Total ({nombre_alt1}):** {unidades1} × ${costo_var_unit1} = ${costo_variable1:,}")  
+        st.write(f"**Margen de Contribución ({nombre_alt1}):** ${ingreso1:,} - ${costo_variable1:,} = ${margen1:,}")  
+    
+    with col2:  
+        st.write(f"**Ingreso Total ({nombre_alt2}):** {unidades2} × ${precio2} = ${ingreso2:,}")  
+        st.write(f"**Costo Variable Total ({nombre_alt2}):** {unidades2} × ${costo_var_unit2} = ${costo_variable2:,}")  
+        st.write(f"**Margen de Contribución ({nombre_alt2}):** ${ingreso2:,} - ${costo_variable2:,} = ${margen2:,}")  
+    
+    return DatosBasicos(alt1, alt2)
+
+TAMANOS_PAGINA = [25, 50, 100, 250]
+
+# Función para aplicar al catálogo solo las celdas modificadas en el editor  
+def aplicar_cambios_editor(clave, ids):
+    catalogo = st.session_state.costos_fijos
+    cambios = st.session_state[clave]
+    
+    for fila, valores in cambios.get("edited_rows", {}).items():
+        catalogo.editar(int(ids[int(fila)]), valores)
+    
+    for valores in cambios.get("added_rows", []):
+        if valores.get("nombre"):
+            valor1 = valores.get("valor1") or 0
+            reduccion = valores.get("reduccion") or 0
+            valor2 = valores.get("valor2")
+            if valor2 is None:
+                valor2 = valor_con_reduccion(valor1, reduccion)
+            relevante = valores.get("relevante")
+            if relevante is None:
+                relevante = valor1 != valor2
+            catalogo.agregar(valores["nombre"], valor1, valor2, reduccion, relevante)
+    
+    for fila in cambios.get("deleted_rows", []):
+        catalogo.eliminar(int(ids[int(fila)]))
+
+# Función para editar los costos fijos por páginas con un único editor  
+def editar_costos_fijos(catalogo, datos_basicos):
+    col1, col2, col3 = st.columns([2, 1, 1])
+    with col1:
+        filtro_nombre = st.text_input("Filtrar por nombre", key="filtro_costos_nombre")
+    with col2:
+        filtro_relevancia = st.selectbox("Relevancia", ["Todos", "Relevantes", "No relevantes"], key="filtro_costos_relevancia")
+    with col3:
+        tamano_pagina = st.selectbox("Costos por página", TAMANOS_PAGINA, key="costos_por_pagina")
+    
+    relevante = {"Todos": None, "Relevantes": True, "No relevantes": False}[filtro_relevancia]
+    ids = catalogo.filtrar(filtro_nombre, relevante)
+    paginas = max(1, -(-len(ids) // tamano_pagina))
+    
+    # Si el filtro reduce la cantidad de páginas, volver a la última disponible
+    if st.session_state.get("pagina_costos", 1) > paginas:
+        st.session_state.pagina_costos = paginas
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        pagina = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1, key="pagina_costos")
+    with col2:
+        st.write(f"{len(ids):,} de {len(catalogo):,} costos fijos · {paginas:,} páginas")
+    
+    ids_pagina = ids[(pagina - 1) * tamano_pagina:pagina * tamano_pagina]
+    columnas = catalogo.columnas()
+    posiciones = np.searchsorted(columnas["id"], ids_pagina)
+    df = pd.DataFrame({
+        "nombre": [columnas["nombre"][p] for p in posiciones],
+        "valor1": montos(columnas["valor1"][posiciones]),
+        "valor2": montos(columnas["valor2"][posiciones]),
+        "reduccion": columnas["reduccion"][posiciones].astype(float),
+        "relevante": columnas["relevante"][posiciones]
+    })
+    
+    # La clave cambia con cada versión del catálogo para que el editor se
+    # reconstruya con los datos ya aplicados
+    clave = f"editor_costos_{catalogo.__huella__()[1]}_{catalogo.version}_{pagina}_{tamano_pagina}_{filtro_nombre}_{filtro_relevancia}"
+    st.data_editor(
+        df,
+        key=clave,
+        num_rows="dynamic",
+        hide_index=True,
+        use_container_width=True,
+        on_change=aplicar_cambios_editor,
+        args=(clave, ids_pagina),
+        column_config={
+            "nombre": st.column_config.TextColumn("Nombre del costo fijo", required=True),
+            "valor1": st.column_config.NumberColumn(f"Valor para {datos_basicos.alt1.nombre}", min_value=0, step=1000),
+            "valor2": st.column_config.NumberColumn(f"Valor para {datos_basicos.alt2.nombre}", min_value=0, step=1000),
+            "reduccion": st.column_config.NumberColumn("% de reducción", min_value=0, max_value=100, step=0.01, format="%.2f"),
+            "relevante": st.column_config.CheckboxColumn("¿Es relevante?")
+        }
+    )
+
+# Función para ingresar costos fijos con posibilidad de reducción porcentual  
+@PERFIL.medir("Costos fijos")
+def ingresar_costos_fijos(datos_basicos):  
+    st.markdown("---")  
+    st.write("### Costos Fijos")  
+    
+    # Inicializar catálogo de costos fijos predeterminados si no existe  
+    if 'costos_fijos' not in st.session_state and os.environ.get("CALCULADORA_CATALOGO"):
+        # La sesión guarda solo sus cambios sobre el catálogo compartido
+        st.session_state.costos_fijos = CatalogoConDelta(obtener_catalogo_compartido(os.environ["CALCULADORA_CATALOGO"]))
+    elif 'costos_fijos' not in st.session_state:  
+        st.session_state.costos_fijos = CatalogoCostosFijos()  
+        
+        # Agregar costos fijos predeterminados vacíos si es primera vez  
+        costos_predeterminados = ["Arriendo", "Electricidad", "Remuneraciones", "Teléfono"]  
+        for costo in costos_predeterminados:  
+            st.session_state.costos_fijos.agregar(costo)  
+    elif isinstance(st.session_state.costos_fijos, list):  
+        # Sesiones que todavía guardan la lista de diccionarios  
+        st.session_state.costos_fijos = CatalogoCostosFijos.desde_dicts(st.session_state.costos_fijos)  
+    
+    catalogo = st.session_state.costos_fijos  
+    
+    with st.expander("Importar / exportar costos fijos"):
+        st.file_uploader(
+            "Archivo con columnas nombre, valor1, valor2, reduccion y relevante (reemplaza el catálogo actual)",
+            type=TIPOS_ARCHIVO,
+            key="archivo_costos_fijos",
+            on_change=importar_costos_fijos
+        )
+        ofrecer_descarga(tabla_costos_fijos(catalogo), "costos_fijos", key="descargar_costos_fijos")
+    if isinstance(catalogo, CatalogoConDelta):
+        col1, col2 = st.columns([3, 1])
+        with col1:
+            st.caption(f"Catálogo compartido de {len(catalogo.base):,} costos fijos · {catalogo.cantidad_cambios():,} cambios propios de esta sesión")
+        with col2:
+            if catalogo.cantidad_cambios():
+                st.button("Descartar mis cambios", key="btn_descartar_cambios", on_click=catalogo.descartar_cambios)
+    mostrar_mensaje_importacion()
+    
+    # Mostrar costos fijos actuales en un editor paginado  
+    st.write("#### Costos fijos:")  
+    editar_costos_fijos(catalogo, datos_basicos)  
+    
+    # Agregar opción para nuevo costo fijo  
+    with st.expander("Agregar nuevo costo fijo"):  
+        nuevo_nombre = st.text_input("Nombre del nuevo costo fijo", key="nuevo_costo_nombre")  
+        
+        col1, col2 = st.columns(2)  
+        
+        with col1:  
+            nuevo_valor1 = st.number_input(  
+                f"Valor para {datos_basicos.alt1.nombre}",  
+                min_value=0,   
+                value=0,   
+                step=1000,  
+                key="nuevo_valor1"  
+            )  
+        
+        with col2:  
+            opcion_nuevo = st.radio(  
+                f"Opción para {datos_basicos.alt2.nombre}",  
+                ["Mismo valor", "Valor diferente", "Reducción %"],  
+                key="opcion_nuevo"  
+            )  
+            
+            if opcion_nuevo == "Mismo valor":  
+                nuevo_valor2 = nuevo_valor1  
+                nueva_reduccion = 0  
+                es_relevante = False  
+            elif opcion_nuevo == "Valor diferente":  
+                nuevo_valor2 = st.number_input(  
+                    f"Valor para {datos_basicos.alt2.nombre}",  
+                    min_value=0,   
+                    value=0,   
+                    step=1000,  
+                    key="nuevo_valor2"  
+                )  
+                nueva_reduccion = 0  
+                es_relevante = (nuevo_valor1 != nuevo_valor2)  
+            else:  # Reducción porcentual  
+                nueva_reduccion = st.slider("% de reducción", 0, 100, 0, 5, key="nueva_reduccion")  
+                nuevo_valor2 = valor_con_reduccion(nuevo_valor1, nueva_reduccion)
+                es_relevante = (nueva_reduccion > 0)  
+                st.write(f"Valor con {nueva_reduccion}% reducción: ${nuevo_valor2:,}")  
+        
+        if st.button("Agregar costo fijo", key="btn_agregar"):  
+            if nuevo_nombre:  
+                catalogo.agregar(  
+                    nuevo_nombre,  
+                    nuevo_valor1,  
+                    nuevo_valor2,  
+                    nueva_reduccion,  
+                    es_relevante  
+                )  
+                st.success(f"Costo fijo '{nuevo_nombre}' agregado exitosamente")  
+                st.rerun()  
+            else:  
+                st.warning("Por favor, ingrese un nombre para el costo fijo")  
+    
+    # Resumen de costos fijos  
+    if catalogo:  
+        st.write("### Resumen de costos fijos")  
+        
+        # Totales de costos fijos y de costos relevantes, mantenidos por el catálogo  
+        with PERFIL.etapa("Totales"):
+            totales = catalogo.totales
+            total_costos_fijos1 = totales.total_costos_fijos1  
+            total_costos_fijos2 = totales.total_costos_fijos2  
+            total_costos_relevantes1 = totales.total_costos_relevantes1  
+            total_costos_relevantes2 = totales.total_costos_relevantes2  
+            
+            # Mostrar resumen en tabla; el detalle de cada costo está en el editor  
+            df = construir_resumen_costos_fijos(
+                datos_basicos.alt1.nombre,
+                datos_basicos.alt2.nombre,
+                catalogo,
+                totales
+            )
+        mostrar_tabla(df, "Resumen de costos fijos", use_container_width=True, hide_index=True)  
+        
+        col1, col2 = st.columns(2)  
+        with col1:  
+            st.write(f"**Total Costos Fijos ({datos_basicos.alt1.nombre}):** ${total_costos_fijos1:,}")  
+            st.write(f"**Total Costos Relevantes ({datos_basicos.alt1.nombre}):** ${total_costos_relevantes1:,}")  
+        
+        with col2:  
+            st.write(f"**Total Costos Fijos ({datos_basicos.alt2.nombre}):** ${total_costos_fijos2:,}")  
+            st.write(f"**Total Costos Relevantes ({datos_basicos.alt2.nombre}):** ${total_costos_relevantes2:,}")  
+        
+        if st.button("Borrar todos los costos fijos"):  
+            catalogo.limpiar()  
+            st.success("Todos los costos fijos han sido eliminados")  
+            st.rerun()  
+        
+        return {  
+            "costos_fijos": catalogo,  
+            "total_costos_fijos1": total_costos_fijos1,  
+            "total_costos_fijos2": total_costos_fijos2,  
+            "total_costos_relevantes1": total_costos_relevantes1,  
+            "total_costos_relevantes2": total_costos_relevantes2,
+            "totales": totales
+        }  
+    
+    else:  
+        st.warning("No hay costos fijos ingresados")  
+        return None  
+
+# Función para construir la tabla resumen de costos fijos  
+@memoizar(cache_modelos)
+def construir_resumen_costos_fijos(nombre_alt1, nombre_alt2, catalogo, totales):
+    relevantes = int(catalogo.columnas()["relevante"].sum())
+    data = {  
+        "Concepto": ["Cantidad de costos fijos", "Cantidad de costos relevantes", "**TOTAL Costos Fijos**", "**TOTAL Costos Relevantes**"],  
+        nombre_alt1: [len(catalogo), relevantes, redondear(totales.total_costos_fijos1), redondear(totales.total_costos_relevantes1)],  
+        nombre_alt2: [len(catalogo), relevantes, redondear(totales.total_costos_fijos2), redondear(totales.total_costos_relevantes2)]  
+    }  
+    
+    return pd.DataFrame(data)
+
+# Función para calcular modelo de costo total  
+@memoizar(cache_modelos)
+@PERFIL.medir("Construcción de tablas")
+def calcular_costo_total(datos_basicos, datos_costos):  
+    # Cálculo de resultados  
+    with PERFIL.etapa("Cálculo de modelos"):
+        modelo = modelo_costo_total(datos_basicos.alt1, datos_basicos.alt2, datos_costos["totales"])
+    resultado1 = modelo.resultado1  
+    resultado2 = modelo.resultado2  
+    
+    ventaja = modelo.ventaja  
+    
+    # Crear tabla para mostrar resultados  
+    data = {  
+        "Concepto": ["Ingreso", "Costo Variable", "Margen de Contribución"],  
+        datos_basicos.alt1.nombre: [  
+            redondear(datos_basicos.alt1.ingreso),   
+            redondear(datos_basicos.alt1.costo_variable),   
+            redondear(datos_basicos.alt1.margen)  
+        ],  
+        datos_basicos.alt2.nombre: [  
+            redondear(datos_basicos.alt2.ingreso),   
+            redondear(datos_basicos.alt2.costo_variable),   
+            redondear(datos_basicos.alt2.margen)  
+        ]  
+    }  
+    
+    # Agregar cada costo fijo a la tabla  
+    columnas = datos_costos["costos_fijos"].columnas()
+    data["Concepto"].extend(f"Costo Fijo: {nombre}" for nombre in columnas["nombre"])  
+    data[datos_basicos.alt1.nombre].extend(montos(columnas["valor1"]))  
+    data[datos_basicos.alt2.nombre].extend(montos(columnas["valor2"]))  
+    
+    # Agregar totales y resultado  
+    data["Concepto"].extend(["Total Costos Fijos", "Resultado", f"Ventaja de {datos_basicos.alt1.nombre if ventaja > 0 else datos_basicos.alt2.nombre}"])  
+    
+    data[datos_basicos.alt1.nombre].extend([  
+        redondear(datos_costos["total_costos_fijos1"]),  
+        redondear(resultado1),  
+        redondear(abs(ventaja)) if ventaja > 0 else ""  
+    ])  
+    
+    data[datos_basicos.alt2.nombre].extend([  
+        redondear(datos_costos["total_costos_fijos2"]),  
+        redondear(resultado2),  
+        redondear(abs(ventaja)) if ventaja <= 0 else ""  
+    ])  
+    
+    df = pd.DataFrame(data)  
+    
+    return df, resultado1, resultado2, ventaja  
+
+# Función para calcular modelo de costos relevantes  
+@memoizar(cache_modelos)
+@PERFIL.medir("Construcción de tablas")
+def calcular_costos_relevantes(datos_basicos, datos_costos):  
+    # Resultado relevante  
+    with PERFIL.etapa("Cálculo de modelos"):
+        modelo = modelo_costos_relevantes(datos_basicos.alt1, datos_basicos.alt2, datos_costos["totales"])
+    resultado_relevante1 = modelo.resultado1  
+    resultado_relevante2 = modelo.resultado2  
+    
+    ventaja = modelo.ventaja  
+    
+    # Crear tabla para mostrar resultados  
+    data = {  
+        "Concepto": ["Ingreso", "Costo Variable", "Margen de Contribución"],  
+        datos_basicos.alt1.nombre: [  
+            redondear(datos_basicos.alt1.ingreso),   
+            redondear(datos_basicos.alt1.costo_variable),   
+            redondear(datos_basicos.alt1.margen)  
+        ],  
+        datos_basicos.alt2.nombre: [  
+            redondear(datos_basicos.alt2.ingreso),   
+            redondear(datos_basicos.alt2.costo_variable),   
+            redondear(datos_basicos.alt2.margen)  
+        ]  
+    }  
+    
+    # Agregar solo costos fijos relevantes  
+    columnas = datos_costos["costos_fijos"].columnas()
+    relevantes = columnas["relevante"]
+    nombres = [nombre for nombre, relevante in zip(columnas["nombre"], relevantes) if relevante]
+    
+    data["Concepto"].extend(f"Costo Relevante: {nombre}" for nombre in nombres)  
+    data[datos_basicos.alt1.nombre].extend(montos(columnas["valor1"][relevantes]))  
+    data[datos_basicos.alt2.nombre].extend(montos(columnas["valor2"][relevantes]))  
+    
+    # Agregar totales y resultado  
+    data["Concepto"].extend(["Total Costos Relevantes", "Resultado Relevante", f"Ventaja de {datos_basicos.alt1.nombre if ventaja > 0 else datos_basicos.alt2.nombre}"])  
+    
+    data[datos_basicos.alt1.nombre].extend([  
+        redondear(datos_costos["total_costos_relevantes1"]),  
+        redondear(resultado_relevante1),  
+        redondear(abs(ventaja)) if ventaja > 0 else ""  
+    ])  
+    
+    data[datos_basicos.alt2.nombre].extend([  
+        redondear(datos_costos["total_costos_relevantes2"]),  
+        redondear(resultado_relevante2),  
+        redondear(abs(ventaja)) if ventaja <= 0 else ""  
+    ])  
+    
+    df = pd.DataFrame(data)  
+    
+    return df, resultado_relevante1, resultado_relevante2, ventaja  
+
+# Función para calcular modelo de costo de oportunidad  
+@memoizar(cache_modelos)
+@PERFIL.medir("Construcción de tablas")
+def calcular_costo_oportunidad(datos_basicos, resultado1, resultado2):  
+    # El costo de oportunidad es el resultado de la alternativa no elegida  
+    with PERFIL.etapa("Cálculo de modelos"):
+        oportunidad = modelo_costo_oportunidad(
+            datos_basicos.alt1,
+            datos_basicos.alt2,
+            ResultadoModelo(resultado1, resultado2)
+        )
+    
+    # Crear tabla para mostrar resultados  
+    data = {  
+        "Concepto": [  
+            f"Resultado {datos_basicos.alt1.nombre}",  
+            f"Resultado {datos_basicos.alt2.nombre}",  
+            f"Costo de oportunidad si elijo {datos_basicos.alt1.nombre}",  
+            f"Costo de oportunidad si elijo {datos_basicos.alt2.nombre}",  
+            f"Ventaja de {oportunidad.mejor_alternativa}"
+        ],  
+        "Valor": [  
+            redondear(resultado1),  
+            redondear(resultado2),  
+            redondear(oportunidad.costo_oportunidad_alt1),  
+            redondear(oportunidad.costo_oportunidad_alt2),  
+            redondear(abs(oportunidad.ventaja))
+        ]  
+    }  
+    
+    return pd.DataFrame(data)  
+
+# Función para ordenar las alternativas de mejor a peor resultado  
+@memoizar(cache_modelos)
+@PERFIL.medir("Construcción de tablas")
+def calcular_ranking(datos_basicos, datos_costos):
+    with PERFIL.etapa("Cálculo de modelos"):
+        resultados = evaluar_alternativas(
+            [datos_basicos.alt1, datos_basicos.alt2],
+            datos_costos["costos_fijos"]
+        )
+    resultados = sorted(resultados, key=lambda r: r.posicion)
+    
+    data = {
+        "Posición": [r.posicion for r in resultados],
+        "Alternativa": [r.nombre for r in resultados],
+        "Resultado": [redondear(r.resultado) for r in resultados],
+        "Resultado Relevante": [redondear(r.resultado_relevante) for r in resultados],
+        "Costo de Oportunidad": [redondear(r.costo_oportunidad) for r in resultados],
+        "Ventaja": [redondear(r.ventaja) for r in resultados]
+    }
+    
+    return pd.DataFrame(data)
+
+COLORES_ALTERNATIVAS = ("#6a5acd", "#e07a5f")
+
+# Función para graficar la cascada ingreso → costo variable → margen → costos fijos → resultado  
+def grafico_cascada(alt, costos_fijos, etiqueta_fijos, color):
+    fig = go.Figure(go.Waterfall(
+        x=["Ingreso", "Costo Variable", "Margen de Contribución", etiqueta_fijos, "Resultado"],
+        measure=["absolute", "relative", "total", "relative", "total"],
+        y=[alt.ingreso, -alt.costo_variable, None, -costos_fijos, None],
+        connector=dict(line=dict(color="#b0b0b0")),
+        increasing=dict(marker=dict(color=color)),
+        decreasing=dict(marker=dict(color="#b0b0b0")),
+        totals=dict(marker=dict(color=color))
+    ))
+    fig.update_layout(title=alt.nombre, showlegend=False, height=380, margin=dict(t=50, b=20))
+    return fig
+
+# Función para comparar los conceptos de ambas alternativas en barras agrupadas  
+def grafico_comparacion(datos_basicos, fijos, resultados, etiqueta_fijos):
+    conceptos = ["Ingreso", "Costo Variable", "Margen de Contribución", etiqueta_fijos, "Resultado"]
+    fig = go.Figure()
+    for alt, total_fijos, resultado, color in zip((datos_basicos.alt1, datos_basicos.alt2), fijos, resultados, COLORES_ALTERNATIVAS):
+        fig.add_trace(go.Bar(
+            x=conceptos,
+            y=[alt.ingreso, alt.costo_variable, alt.margen, total_fijos, resultado],
+            name=alt.nombre,
+            marker_color=color
+        ))
+    fig.update_layout(barmode="group", title="Comparación de alternativas", height=380, margin=dict(t=50, b=20))
+    return fig
+
+# Función para mostrar las cascadas de ambas alternativas y su comparación  
+def mostrar_graficos_modelo(datos_basicos, fijos, resultados, etiqueta_fijos, clave):
+    with PERFIL.etapa("Render"):
+        col1, col2 = st.columns(2)
+        for columna, alt, total_fijos, color in zip((col1, col2), (datos_basicos.alt1, datos_basicos.alt2), fijos, COLORES_ALTERNATIVAS):
+            with columna:
+                st.plotly_chart(grafico_cascada(alt, total_fijos, etiqueta_fijos, color), use_container_width=True, key=f"cascada_{clave}_{color}")
+        st.plotly_chart(grafico_comparacion(datos_basicos, fijos, resultados, etiqueta_fijos), use_container_width=True, key=f"comparacion_{clave}")
+
+# Función para comparar el resultado de cada alternativa con su costo de oportunidad  
+def mostrar_grafico_oportunidad(datos_basicos, resultado1, resultado2):
+    nombres = [datos_basicos.alt1.nombre, datos_basicos.alt2.nombre]
+    fig = go.Figure()
+    fig.add_trace(go.Bar(x=nombres, y=[resultado1, resultado2], name="Resultado", marker_color=COLORES_ALTERNATIVAS[0]))
+    # El costo de oportunidad de cada alternativa es el resultado de la otra
+    fig.add_trace(go.Bar(x=nombres, y=[resultado2, resultado1], name="Costo de oportunidad", marker_color=COLORES_ALTERNATIVAS[1]))
+    fig.update_layout(barmode="group", title="Resultado y costo de oportunidad", height=380, margin=dict(t=50, b=20))
+    with PERFIL.etapa("Render"):
+        st.plotly_chart(fig, use_container_width=True, key="grafico_oportunidad")
+
+# Función para graficar una distribución a partir de su histograma ya agrupado  
+def grafico_distribucion(histogramas, titulo, percentiles=None):
+    fig = go.Figure()
+    for (nombre, histograma), color in zip(histogramas.items(), COLORES_ALTERNATIVAS):
+        fig.add_trace(go.Bar(
+            x=histograma.centros,
+            y=histograma.proporciones,
+            width=histograma.anchos,
+            name=nombre,
+            marker_color=color,
+            opacity=0.75 if len(histogramas) > 1 else 1.0
+        ))
+    for p, valor in (percentiles or {}).items():
+        fig.add_vline(x=valor, line_dash="dot", line_color="#555555", annotation_text=f"P{p}", annotation_position="top")
+    fig.update_layout(
+        barmode="overlay",
+        title=titulo,
+        yaxis_title="Proporción",
+        yaxis_tickformat=".1%",
+        height=380,
+        margin=dict(t=60, b=20),
+        showlegend=len(histogramas) > 1
+    )
+    return fig
+
+# Función para convertir un valor puntual en una distribución con la variación indicada  
+def distribucion_para(valor, tipo, variacion):
+    if tipo == "Fija" or variacion == 0:
+        return valor
+    delta = abs(valor) * variacion / 100
+    if tipo == "Normal":
+        return Normal(valor, delta, minimo=0)
+    if tipo == "Triangular":
+        return Triangular(valor - delta, valor, valor + delta)
+    return Uniforme(valor - delta, valor + delta)
+
+# Función para configurar y ejecutar la simulación Monte Carlo  
+def simular_modelos(datos_basicos, datos_costos):
+    st.markdown("---")
+    st.write("### Simulación Monte Carlo")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        tipo_alternativas = st.selectbox("Distribución de unidades, precios y costos variables", ["Normal", "Triangular", "Uniforme", "Fija"], key="sim_tipo_alternativas")
+        variacion_alternativas = st.slider("Variación % de unidades, precios y costos variables", 0, 100, 10, 5, key="sim_variacion_alternativas")
+    with col2:
+        tipo_costos = st.selectbox("Distribución de costos fijos", ["Normal", "Triangular", "Uniforme", "Fija"], key="sim_tipo_costos")
+        variacion_costos = st.slider("Variación % de costos fijos", 0, 100, 10, 5, key="sim_variacion_costos")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        n_muestras = st.number_input("Número de muestras", min_value=1000, max_value=10_000_000, value=100_000, step=10_000, key="sim_muestras")
+    with col2:
+        semilla = st.number_input("Semilla", min_value=0, value=42, step=1, key="sim_semilla")
+    
+    if not st.button("Ejecutar simulación", key="btn_simular"):
+        return None
+    
+    alternativas = []
+    for alt in (datos_basicos.alt1, datos_basicos.alt2):
+        alternativas.append(AlternativaIncierta(
+            alt.nombre,
+            distribucion_para(alt.unidades, tipo_alternativas, variacion_alternativas),
+            distribucion_para(alt.precio, tipo_alternativas, variacion_alternativas),
+            distribucion_para(alt.costo_var_unit, tipo_alternativas, variacion_alternativas)
+        ))
+    # Un costo compartido o con reducción se muestrea una sola vez para ambas alternativas
+    costos = [
+        CostoFijoIncierto.desde_costo_fijo(c, lambda valor: distribucion_para(valor, tipo_costos, variacion_costos))
+        for c in datos_costos["costos_fijos"]
+    ]
+    
+    resultado = simular(alternativas[0], alternativas[1], costos, n_muestras=int(n_muestras), semilla=int(semilla))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.write(f"**Probabilidad de que gane {resultado.nombre_alt1}:** {resultado.prob_gana1:.1%}")
+        st.write(f"**Costo de oportunidad esperado ({resultado.nombre_alt1}):** ${resultado.costo_oportunidad_esperado1:,.0f}")
+        st.write(f"**Pérdida esperada al elegir {resultado.nombre_alt1}:** ${resultado.perdida_esperada1:,.0f}")
+    with col2:
+        st.write(f"**Probabilidad de que gane {resultado.nombre_alt2}:** {resultado.prob_gana2:.1%}")
+        st.write(f"**Costo de oportunidad esperado ({resultado.nombre_alt2}):** ${resultado.costo_oportunidad_esperado2:,.0f}")
+        st.write(f"**Pérdida esperada al elegir {resultado.nombre_alt2}:** ${resultado.perdida_esperada2:,.0f}")
+    
+    data = {"Percentil": [f"P{p}" for p in resultado.percentiles["ventaja"]]}
+    etiquetas = {
+        "resultado1": f"Resultado {resultado.nombre_alt1}",
+        "resultado2": f"Resultado {resultado.nombre_alt2}",
+        "ventaja": f"Ventaja de {resultado.nombre_alt1}",
+        "ventaja_relevante": f"Ventaja relevante de {resultado.nombre_alt1}"
+    }
+    for clave, etiqueta in etiquetas.items():
+        data[etiqueta] = [int(v) for v in resultado.percentiles[clave].values()]
+    st.dataframe(pd.DataFrame(data), use_container_width=True)
+    
+    # Los gráficos usan los histogramas ya agrupados de la submuestra, no las muestras
+    percentiles_ventaja = {p: v for p, v in resultado.percentiles["ventaja"].items() if p in (5, 50, 95)}
+    st.plotly_chart(
+        grafico_distribucion({etiquetas["ventaja"]: resultado.histogramas["ventaja"]}, f"Distribución de la ventaja de {resultado.nombre_alt1}", percentiles_ventaja),
+        use_container_width=True
+    )
+    st.plotly_chart(
+        grafico_distribucion(
+            {resultado.nombre_alt1: resultado.histogramas["resultado1"], resultado.nombre_alt2: resultado.histogramas["resultado2"]},
+            "Distribución del resultado de cada alternativa"
+        ),
+        use_container_width=True
+    )
+    
+    return resultado
+
+# Función para mostrar el gráfico tornado y los puntos de equilibrio  
+def analizar_sensibilidad(datos_basicos, datos_costos):
+    st.markdown("---")
+    st.write("### Análisis de sensibilidad")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        modelo = st.radio("Modelo", ["Costo Total", "Costos Relevantes"], key="sens_modelo")
+    with col2:
+        rango = st.slider("Variación de cada entrada (±%)", 5, 100, 50, 5, key="sens_rango")
+    modelo = "total" if modelo == "Costo Total" else "relevante"
+    
+    alt1, alt2 = datos_basicos.alt1, datos_basicos.alt2
+    barras = tornado(alt1, alt2, datos_costos["costos_fijos"], rango=rango / 100, modelo=modelo)
+    barras = [b for b in barras if b.amplitud > 0][:20]
+    
+    if barras:
+        ventaja_base = (barras[0].ventaja_baja + barras[0].ventaja_alta) / 2
+        etiquetas = [b.etiqueta for b in reversed(barras)]
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            y=etiquetas,
+            x=[b.ventaja_baja - ventaja_base for b in reversed(barras)],
+            base=ventaja_base,
+            orientation="h",
+            name=f"-{rango}%",
+            marker_color="#e07a5f"
+        ))
+        fig.add_trace(go.Bar(
+            y=etiquetas,
+            x=[b.ventaja_alta - ventaja_base for b in reversed(barras)],
+            base=ventaja_base,
+            orientation="h",
+            name=f"+{rango}%",
+            marker_color="#6a5acd"
+        ))
+        fig.add_vline(x=0, line_dash="dash", line_color="#b0b0b0")
+        fig.update_layout(
+            barmode="overlay",
+            title=f"Ventaja de {alt1.nombre} sobre {alt2.nombre}",
+            xaxis_title="Ventaja",
+            height=max(300, 30 * len(barras))
+        )
+        st.plotly_chart(fig, use_container_width=True)
+    else:
+        st.info("Ingrese unidades, precios o costos para ver la sensibilidad")
+    
+    st.write("### Puntos de equilibrio")
+    puntos = puntos_de_equilibrio(alt1, alt2, datos_costos["costos_fijos"], modelo=modelo)
+    data = {
+        "Variable": [p.etiqueta for p in puntos],
+        "Valor actual": [round(p.valor_base, 2) for p in puntos],
+        "Valor de equilibrio": [round(p.valor_equilibrio, 2) if p.valor_equilibrio is not None else None for p in puntos],
+        "Cambio %": [round(p.cambio_relativo * 100, 1) if p.cambio_relativo is not None else None for p in puntos]
+    }
+    st.dataframe(pd.DataFrame(data), use_container_width=True)
+
+# Resultados de la evaluación por lotes que se resumen para graficar
+MEDIDAS_LOTES = ("ventaja", "ventaja_relevante", "resultado1", "resultado2")
+
+# Función para evaluar por bloques un archivo de escenarios y guardar solo los resúmenes  
+def evaluar_archivo_lotes():
+    archivo = st.session_state.archivo_lotes
+    st.session_state.pop("resumen_lotes", None)
+    if archivo is None:
+        return
+    # Los escenarios sin totales propios usan los del catálogo de costos fijos de la sesión
+    totales_base = getattr(st.session_state.get("costos_fijos"), "totales", None)
+    acumuladores = {medida: AcumuladorDistribucion() for medida in MEDIDAS_LOTES}
+    inicio = time.perf_counter()
+    fila = 0
+    try:
+        for bloque in leer_bloques(archivo):
+            resultados = evaluar_bloque(bloque, fila, totales_base, ("total", "relevante"))
+            for medida, acumulador in acumuladores.items():
+                acumulador.agregar(resultados[medida].to_numpy())
+            fila += len(bloque)
+    except (ErrorEsquema, ValueError, ImportError) as error:
+        st.session_state.mensaje_importacion = ("error", f"No se pudo evaluar el archivo: {error}")
+        return
+    if not fila:
+        st.session_state.mensaje_importacion = ("error", "El archivo no contiene escenarios")
+        return
+    st.session_state.resumen_lotes = {
+        "archivo": archivo.name,
+        "segundos": time.perf_counter() - inicio,
+        "resumenes": {medida: acumulador.resumen() for medida, acumulador in acumuladores.items()}
+    }
+
+# Función para evaluar un archivo de escenarios y mostrar la distribución de sus resultados  
+def evaluar_escenarios_por_lotes():
+    st.write("Cada fila del archivo es un escenario con las columnas `unidades1`, `precio1`, `costo_var_unit1`, `unidades2`, `precio2` y `costo_var_unit2`, y en forma opcional `total_costos_fijos1/2` y `total_costos_relevantes1/2`.")
+    st.file_uploader(
+        "Archivo de escenarios",
+        type=["csv", "xlsx", "parquet", "arrow"],
+        key="archivo_lotes",
+        on_change=evaluar_archivo_lotes
+    )
+    mostrar_mensaje_importacion()
+    if "resumen_lotes" not in st.session_state:
+        return None
+    
+    resumen_lotes = st.session_state.resumen_lotes
+    resumenes = resumen_lotes["resumenes"]
+    ventaja = resumenes["ventaja"]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("Escenarios", f"{ventaja.n:,}")
+    col2.metric("Gana la alternativa 1", f"{ventaja.proporcion_positivos:.1%}")
+    col3.metric("Gana la alternativa 1 (relevantes)", f"{resumenes['ventaja_relevante'].proporcion_positivos:.1%}")
+    col4.metric("Ventaja media", f"${ventaja.media:,.0f}")
+    st.caption(f"{resumen_lotes['archivo']}: evaluado en {resumen_lotes['segundos']:.2f} s.")
+    
+    modelo = st.radio("Modelo", ["Costo Total", "Costos Relevantes"], key="lotes_modelo", horizontal=True)
+    medida = "ventaja" if modelo == "Costo Total" else "ventaja_relevante"
+    resumen = resumenes[medida]
+    st.plotly_chart(
+        grafico_distribucion(
+            {"Ventaja": resumen.histograma},
+            f"Distribución de la ventaja de la alternativa 1 ({modelo.lower()})",
+            {p: v for p, v in resumen.percentiles.items() if p in (5, 50, 95)}
+        ),
+        use_container_width=True
+    )
+    st.plotly_chart(
+        grafico_distribucion(
+            {"Alternativa 1": resumenes["resultado1"].histograma, "Alternativa 2": resumenes["resultado2"].histograma},
+            "Distribución del resultado de cada alternativa (costo total)"
+        ),
+        use_container_width=True
+    )
+    
+    etiquetas = {
+        "ventaja": "Ventaja",
+        "ventaja_relevante": "Ventaja relevante",
+        "resultado1": "Resultado alternativa 1",
+        "resultado2": "Resultado alternativa 2"
+    }
+    data = {"Estadístico": ["Mínimo"] + [f"P{p}" for p in ventaja.percentiles] + ["Máximo", "Media"]}
+    for clave, etiqueta in etiquetas.items():
+        r = resumenes[clave]
+        data[etiqueta] = [redondear(v) for v in [r.minimo, *r.percentiles.values(), r.maximo, r.media]]
+    mostrar_tabla(pd.DataFrame(data), "Cuantiles de la evaluación por lotes", use_container_width=True, hide_index=True)
+    if not ventaja.exacto:
+        st.caption(f"Histogramas y percentiles calculados sobre una muestra aleatoria uniforme de {ventaja.n_muestra:,} escenarios; la cantidad, la media, el mínimo, el máximo y las proporciones son exactos.")
+    return resumen_lotes
+
+# Función para evaluar los modelos sobre una grilla de dos variables (memoizada)  
+@memoizar(cache_modelos)
+def calcular_grilla(alt1, alt2, catalogo, variable_x, rango_x, puntos_x, variable_y, rango_y, puntos_y, modelo):
+    variables = {v.etiqueta: v for v in variables_grilla(alt1, alt2, catalogo)}
+    eje_x = Eje.lineal(variables[variable_x], *rango_x, puntos_x)
+    eje_y = Eje.lineal(variables[variable_y], *rango_y, puntos_y)
+    return evaluar_grilla(alt1, alt2, catalogo, eje_x, eje_y, modelo, procesos=1)
+
+# Función para elegir la variable y el rango de un eje de la grilla  
+def ingresar_eje(titulo, variables, indice, clave):
+    st.write(f"**{titulo}**")
+    etiquetas = [v.etiqueta for v in variables]
+    etiqueta = st.selectbox("Variable", etiquetas, index=indice, key=f"grilla_variable_{clave}")
+    base = next(v.valor_base for v in variables if v.etiqueta == etiqueta)
+    if etiqueta.startswith("% de reducción"):
+        minimo, maximo = 0.0, 100.0
+    elif base:
+        minimo, maximo = base * 0.5, base * 1.5
+    else:
+        minimo, maximo = 0.0, 100.0
+    # La clave incluye la variable para que el rango se reinicie al cambiarla
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        minimo = st.number_input("Desde", value=round(float(minimo), 2), key=f"grilla_min_{clave}_{etiqueta}")
+    with col2:
+        maximo = st.number_input("Hasta", value=round(float(maximo), 2), key=f"grilla_max_{clave}_{etiqueta}")
+    with col3:
+        puntos = st.number_input("Puntos", min_value=2, max_value=MAXIMO_PUNTOS, value=200, step=50, key=f"grilla_puntos_{clave}")
+    return etiqueta, (minimo, maximo), int(puntos)
+
+# Índices equiespaciados para mostrar a lo sumo `maximo` puntos de un eje  
+def submuestra(n, maximo=250):
+    return np.unique(np.linspace(0, n - 1, min(n, maximo)).round().astype(int))
+
+# Función para explorar resultado y ventaja sobre una grilla de dos variables  
+def explorar_grilla(datos_basicos, datos_costos):
+    st.markdown("---")
+    st.write("### Explorador de escenarios en grilla")
+    
+    alt1, alt2 = datos_basicos.alt1, datos_basicos.alt2
+    variables = variables_grilla(alt1, alt2, datos_costos["costos_fijos"])
+    etiquetas = [v.etiqueta for v in variables]
+    col1, col2 = st.columns(2)
+    with col1:
+        variable_x, rango_x, puntos_x = ingresar_eje("Eje horizontal", variables, etiquetas.index(f"Precio ({alt1.nombre})"), "x")
+    with col2:
+        variable_y, rango_y, puntos_y = ingresar_eje("Eje vertical", variables, etiquetas.index(f"Unidades ({alt2.nombre})"), "y")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        modelo = st.radio("Modelo", ["Costo Total", "Costos Relevantes"], key="grilla_modelo", horizontal=True)
+    with col2:
+        medida = st.radio("Mostrar", ["Ventaja", f"Resultado {alt1.nombre}", f"Resultado {alt2.nombre}"], key="grilla_medida", horizontal=True)
+    modelo = "total" if modelo == "Costo Total" else "relevante"
+    
+    try:
+        with PERFIL.etapa("Cálculo de modelos"):
+            grilla = calcular_grilla(alt1, alt2, datos_costos["costos_fijos"], variable_x, rango_x, puntos_x, variable_y, rango_y, puntos_y, modelo)
+    except ValueError as error:
+        st.error(str(error))
+        return None
+    
+    valores = {"Ventaja": grilla.ventaja, f"Resultado {alt1.nombre}": grilla.resultado1, f"Resultado {alt2.nombre}": grilla.resultado2}[medida]
+    # El navegador recibe a lo sumo 250 × 250 celdas; el equilibrio se traza con todos los puntos de x
+    filas, columnas = submuestra(puntos_y), submuestra(puntos_x)
+    x, y = grilla.eje_x.valores, grilla.eje_y.valores
+    limite = float(np.abs(valores).max()) or 1.0
+    fig = go.Figure()
+    fig.add_trace(go.Heatmap(
+        x=x[columnas],
+        y=y[filas],
+        z=valores[np.ix_(filas, columnas)],
+        colorscale="RdBu",
+        zmid=0 if medida == "Ventaja" else None,
+        zmin=-limite if medida == "Ventaja" else None,
+        zmax=limite if medida == "Ventaja" else None,
+        colorbar=dict(title=medida)
+    ))
+    fig.add_trace(go.Scatter(
+        x=x,
+        y=grilla.equilibrio,
+        mode="lines",
+        line=dict(color="black", width=2, dash="dash"),
+        name="Equilibrio (ventaja = 0)"
+    ))
+    fig.update_layout(
+        title=f"{medida} según {variable_x} y {variable_y}",
+        xaxis_title=variable_x,
+        yaxis_title=variable_y,
+        height=550,
+        legend=dict(orientation="h", y=-0.2)
+    )
+    st.plotly_chart(fig, use_container_width=True)
+    
+    gana1 = float(grilla.gana_alternativa1.mean())
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Puntos evaluados", f"{grilla.ventaja.size:,}")
+    col2.metric(f"Gana {alt1.nombre}", f"{gana1:.1%}")
+    col3.metric(f"Gana {alt2.nombre}", f"{1 - gana1:.1%}")
+    if grilla.bloques > 1:
+        st.caption(f"La grilla se evaluó en {grilla.bloques} bloques.")
+    if np.isnan(grilla.equilibrio).all():
+        st.info("La ventaja no cambia de signo dentro del rango elegido")
+    return grilla
+
+# Función para proyectar ambas alternativas en varios períodos (memoizada)  
+@memoizar(cache_modelos)
+def calcular_proyeccion(alt1, alt2, catalogo, periodos, crecimiento1, crecimiento2, tasa_descuento, inversion):
+    return proyectar(alt1, alt2, catalogo, periodos, crecimiento1, crecimiento2, tasa_descuento, inversion=inversion)
+
+# Función para ingresar las tasas de crecimiento anuales de una alternativa  
+def ingresar_crecimiento(nombre, sufijo, periodos_por_anio):
+    st.write(f"**{nombre}**")
+    unidades = st.number_input("Crecimiento anual de unidades (%)", value=0.0, step=0.5, key=f"proy_unidades{sufijo}")
+    precio = st.number_input("Crecimiento anual del precio (%)", value=0.0, step=0.5, key=f"proy_precio{sufijo}")
+    costo_var_unit = st.number_input("Crecimiento anual del costo variable unitario (%)", value=0.0, step=0.5, key=f"proy_cvu{sufijo}")
+    costos_fijos = st.number_input("Escalamiento anual de costos fijos (%)", value=0.0, step=0.5, key=f"proy_fijos{sufijo}")
+    inversion = st.number_input("Inversión inicial", min_value=0, value=0, step=1, key=f"proy_inversion{sufijo}")
+    crecimiento = Crecimiento(
+        *(float(tasa_periodica(tasa / 100, periodos_por_anio)) for tasa in (unidades, precio, costo_var_unit, costos_fijos))
+    )
+    return crecimiento, inversion
+
+# Función para mostrar la proyección multiperíodo con VAN y período de cruce  
+def proyectar_modelos(datos_basicos, datos_costos):
+    st.markdown("---")
+    st.write("### Proyección multiperíodo")
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        anios = st.slider("Horizonte (años)", 1, 10, 5, key="proy_anios")
+    with col2:
+        periodicidad = st.radio("Períodos", ["Anuales", "Mensuales"], key="proy_periodicidad", horizontal=True)
+    with col3:
+        tasa_anual = st.number_input("Tasa de descuento anual (%)", min_value=0.0, value=10.0, step=0.5, key="proy_tasa")
+    periodos_por_anio = 12 if periodicidad == "Mensuales" else 1
+    periodos = anios * periodos_por_anio
+    st.caption("Las unidades, los precios y los costos ingresados se interpretan como valores del primer período; las tasas anuales se convierten a tasas equivalentes por período.")
+    
+    nombre_alt1, nombre_alt2 = datos_basicos.alt1.nombre, datos_basicos.alt2.nombre
+    col1, col2 = st.columns(2)
+    with col1:
+        crecimiento1, inversion1 = ingresar_crecimiento(nombre_alt1, "1", periodos_por_anio)
+    with col2:
+        crecimiento2, inversion2 = ingresar_crecimiento(nombre_alt2, "2", periodos_por_anio)
+    
+    proyeccion = calcular_proyeccion(
+        datos_basicos.alt1,
+        datos_basicos.alt2,
+        datos_costos["costos_fijos"],
+        periodos,
+        crecimiento1,
+        crecimiento2,
+        float(tasa_periodica(tasa_anual / 100, periodos_por_anio)),
+        (inversion1, inversion2)
+    )
+    resultado = proyeccion.resultado
+    van1, van2 = resultado.van[0]
+    
+    col1, col2, col3 = st.columns(3)
+    col1.metric(f"VAN {nombre_alt1}", f"${van1:,.0f}")
+    col2.metric(f"VAN {nombre_alt2}", f"${van2:,.0f}")
+    col3.metric("VAN costos relevantes (dif.)", f"${resultado.ventaja_van_relevante[0]:,.0f}")
+    mejor, otra = (nombre_alt1, nombre_alt2) if resultado.gana_alternativa1[0] else (nombre_alt2, nombre_alt1)
+    unidad = "mes" if periodos_por_anio == 12 else "año"
+    cruce = int(resultado.cruce[0])
+    if cruce:
+        st.success(f"**{mejor}** supera en resultado acumulado descontado a {otra} desde el {unidad} {cruce} y lo mantiene hasta el final del horizonte")
+    else:
+        st.info(f"**{mejor}** tiene el mejor resultado acumulado descontado en todo el horizonte (no hay período de cruce)")
+    
+    etiquetas = list(range(1, periodos + 1))
+    fig = go.Figure()
+    for i, (nombre, color) in enumerate(zip(proyeccion.nombres, ["#6a5acd", "#e07a5f"])):
+        fig.add_trace(go.Scatter(x=etiquetas, y=resultado.acumulado[0, i], mode="lines", name=nombre, line_color=color))
+    if cruce:
+        fig.add_vline(x=cruce, line_dash="dash", line_color="#b0b0b0")
+    fig.update_layout(title="Resultado acumulado descontado", xaxis_title=unidad.capitalize(), yaxis_title="Acumulado")
+    st.plotly_chart(fig, use_container_width=True)
+    
+    data = {"Período": etiquetas}
+    for i, nombre in enumerate(proyeccion.nombres):
+        data[f"Ingreso ({nombre})"] = resultado.ingreso[0, i].round(0)
+        data[f"Costo variable ({nombre})"] = resultado.costo_variable[0, i].round(0)
+        data[f"Costos fijos ({nombre})"] = resultado.costos_fijos[0, i].round(0)
+        data[f"Resultado ({nombre})"] = resultado.flujo[0, i].round(0)
+        data[f"Acumulado descontado ({nombre})"] = resultado.acumulado[0, i].round(0)
+    tabla = pd.DataFrame(data)
+    mostrar_tabla(tabla, "Proyección", use_container_width=True, hide_index=True)
+    ofrecer_descarga(tabla, "proyeccion", key="descargar_proyeccion")
+    
+    # Detalle por partida; con catálogos grandes se muestran los costos de mayor peso
+    with st.expander("Matriz período × partida"):
+        indice = st.radio("Alternativa", [0, 1], format_func=lambda i: proyeccion.nombres[i], key="proy_matriz_alt", horizontal=True)
+        matriz = proyeccion.matriz[indice]
+        maximo_partidas = 20
+        if matriz.shape[1] > maximo_partidas + 2:
+            pesos = np.abs(matriz[:, 2:]).sum(axis=0)
+            principales = np.sort(np.argsort(pesos)[::-1][:maximo_partidas]) + 2
+            resto = np.setdiff1d(np.arange(2, matriz.shape[1]), principales)
+            columnas = [0, 1] + principales.tolist()
+            detalle = pd.DataFrame(matriz[:, columnas].round(0) + 0.0, columns=[proyeccion.partidas[j] for j in columnas])
+            detalle["Otros costos fijos"] = matriz[:, resto].sum(axis=1).round(0)
+        else:
+            detalle = pd.DataFrame(matriz.round(0) + 0.0, columns=proyeccion.partidas)
+        detalle.insert(0, "Período", etiquetas)
+        mostrar_tabla(detalle, "Matriz período × partida", use_container_width=True, hide_index=True)
+
+PRODUCTOS_EJEMPLO = pd.DataFrame({
+    "nombre": ["Producto A", "Producto B", "Producto C"],
+    "unidades": [1000, 500, 200],
+    "precio": [50, 80, 120],
+    "costo_var_unit": [30, 45, 70],
+    "horas_maquina": [200, 300, 100]
+})
+
+CENTROS_EJEMPLO = pd.DataFrame({
+    "nombre": ["Alquiler de planta", "Mantenimiento", "Publicidad"],
+    "valor": [12000, 6000, 4000],
+    "inductor": ["partes_iguales", "horas_maquina", "ingreso"],
+    "relevante": [False, True, True],
+    "destinos": ["", "", "Producto A, Producto B"]
+})
+
+# Función para editar una tabla que se reconstruye, conservando lo editado, cuando cambia su firma  
+def editar_tabla(clave, inicial, columnas, firma, **opciones):
+    if st.session_state.get(f"{clave}_firma") != firma:
+        origen = st.session_state.get(f"{clave}_editada", inicial)
+        st.session_state[f"{clave}_base"] = origen.reindex(columns=columnas, fill_value=0)
+        st.session_state[f"{clave}_firma"] = firma
+    editada = st.data_editor(
+        st.session_state[f"{clave}_base"],
+        key=f"{clave}_editor_{'_'.join(firma)}",
+        num_rows="dynamic",
+        use_container_width=True,
+        hide_index=True,
+        **opciones
+    )
+    st.session_state[f"{clave}_editada"] = editada
+    return editada
+
+# Función para asignar los centros y evaluar los modelos de todas las alternativas (memoizada)  
+@memoizar(cache_modelos)
+def calcular_asignacion(alternativas, centros, inductores):
+    resultado = asignar(alternativas, centros, inductores)
+    return resultado, evaluar_alternativas(alternativas, totales=resultado.totales_por_alternativa())
+
+# Función para leer las alternativas de destino de un centro; sin destinos se reparte entre todas  
+def leer_destinos(texto):
+    if not isinstance(texto, str):
+        return None
+    destinos = [d.strip() for d in texto.split(",") if d.strip()]
+    return destinos or None
+
+# Función para repartir costos fijos compartidos entre varias alternativas con inductores  
+def asignar_costos_compartidos():
+    st.write("### Alternativas")
+    texto = st.text_input("Inductores propios (separados por comas)", "horas_maquina", key="inductores_propios")
+    propios = list(dict.fromkeys(
+        nombre.strip() for nombre in texto.split(",") if nombre.strip() and nombre.strip() not in INDUCTORES_BASICOS
+    ))
+    columnas_productos = ["nombre", "unidades", "precio", "costo_var_unit"] + propios
+    productos = editar_tabla(
+        "asig_productos",
+        PRODUCTOS_EJEMPLO,
+        columnas_productos,
+        tuple(propios),
+        column_config={
+            "nombre": st.column_config.TextColumn("Alternativa", required=True),
+            "unidades": st.column_config.NumberColumn("Unidades", min_value=0),
+            "precio": st.column_config.NumberColumn("Precio", min_value=0),
+            "costo_var_unit": st.column_config.NumberColumn("Costo variable unitario", min_value=0),
+            **{nombre: st.column_config.NumberColumn(nombre, min_value=0) for nombre in propios}
+        }
+    )
+    
+    st.write("### Centros de costo compartidos")
+    st.caption("Cada centro se reparte en proporción a su inductor entre todas las alternativas o solo entre las indicadas (separadas por comas).")
+    centros = editar_tabla(
+        "asig_centros",
+        CENTROS_EJEMPLO,
+        list(CENTROS_EJEMPLO.columns),
+        tuple(propios),
+        column_config={
+            "nombre": st.column_config.TextColumn("Centro de costo", required=True),
+            "valor": st.column_config.NumberColumn("Valor", min_value=0, step=1000),
+            "inductor": st.column_config.SelectboxColumn("Inductor", options=list(INDUCTORES_BASICOS) + propios, required=True),
+            "relevante": st.column_config.CheckboxColumn("¿Es relevante?"),
+            "destinos": st.column_config.TextColumn("Alternativas (vacío = todas)")
+        }
+    )
+    
+    productos = productos[productos["nombre"].fillna("").astype(str).str.strip() != ""]
+    centros = centros[centros["nombre"].fillna("").astype(str).str.strip() != ""]
+    if len(productos) < 2:
+        st.warning("Ingrese al menos dos alternativas")
+        return
+    
+    numeros = productos[columnas_productos[1:]].apply(pd.to_numeric, errors="coerce").fillna(0)
+    alternativas = [
+        Alternativa(str(nombre).strip(), *(fila.item() for fila in valores))
+        for nombre, valores in zip(productos["nombre"], numeros[["unidades", "precio", "costo_var_unit"]].to_numpy())
+    ]
+    inductores = {nombre: numeros[nombre].tolist() for nombre in propios}
+    valores_centros = pd.to_numeric(centros["valor"], errors="coerce").fillna(0)
+    lista_centros = [
+        CentroCosto(str(nombre).strip(), valor, inductor or "partes_iguales", bool(relevante), leer_destinos(destinos))
+        for nombre, valor, inductor, relevante, destinos in zip(
+            centros["nombre"], valores_centros.tolist(), centros["inductor"], centros["relevante"].fillna(False), centros["destinos"]
+        )
+    ]
+    
+    try:
+        with PERFIL.etapa("Cálculo de modelos"):
+            asignacion, resultados = calcular_asignacion(alternativas, lista_centros, inductores)
+    except ValueError as error:
+        st.error(str(error))
+        return
+    
+    st.markdown("---")
+    st.write("### Costos asignados y resultados")
+    total_centros = sum(c.valor for c in lista_centros)
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Total de centros de costo", f"${total_centros:,.2f}")
+    col2.metric("Asignado", f"${float(asignacion.total_costos_fijos.sum()):,.2f}")
+    col3.metric("Sin asignar", f"${asignacion.sin_asignar:,.2f}")
+    if asignacion.sin_asignar:
+        st.warning("Algunos centros no se asignaron porque su inductor suma cero entre sus alternativas")
+    
+    tabla = pd.DataFrame({
+        "Alternativa": asignacion.nombres,
+        "Margen de Contribución": montos(np.array([r.margen for r in resultados], dtype=np.float64)),
+        "Costos Fijos Asignados": montos(asignacion.total_costos_fijos),
+        "Costos Relevantes Asignados": montos(asignacion.total_costos_relevantes),
+        "Resultado": montos(np.array([r.resultado for r in resultados], dtype=np.float64)),
+        "Resultado Relevante": montos(np.array([r.resultado_relevante for r in resultados], dtype=np.float64)),
+        "Costo de Oportunidad": montos(np.array([r.costo_oportunidad for r in resultados], dtype=np.float64)),
+        "Posición": [r.posicion for r in resultados]
+    })
+    mostrar_tabla(tabla, "Asignación de costos compartidos", use_container_width=True, hide_index=True)
+    ofrecer_descarga(tabla, "asignacion_costos", key="descargar_asignacion")
+    mejor = min(resultados, key=lambda r: r.posicion)
+    st.success(f"La mejor alternativa con los costos asignados es **{mejor.nombre}** con un resultado de ${mejor.resultado:,}")
+
+# Productos iniciales de la mezcla: las dos alternativas del formulario si tienen precio  
+def productos_iniciales_mezcla():
+    estado = st.session_state
+    if estado.get("precio1") or estado.get("precio2"):
+        return pd.DataFrame({
+            "nombre": [estado.get("nombre_alt1", "Alternativa 1"), estado.get("nombre_alt2", "Alternativa 2")],
+            "precio": [estado.get("precio1", 0), estado.get("precio2", 0)],
+            "costo_var_unit": [estado.get("cvu1", 0), estado.get("cvu2", 0)],
+            "minimo": [0, 0],
+            "maximo": [None, None],
+            "costo_fijo_evitable": [0, 0]
+        })
+    return pd.DataFrame({
+        "nombre": ["Producto A", "Producto B", "Producto C"],
+        "precio": [50, 80, 120],
+        "costo_var_unit": [30, 45, 70],
+        "minimo": [0, 0, 0],
+        "maximo": [1000, None, 150],
+        "costo_fijo_evitable": [0, 0, 0]
+    })
+
+RECURSOS_EJEMPLO = pd.DataFrame({
+    "recurso": ["Horas máquina", "Horas de mano de obra", "Presupuesto"],
+    "capacidad": [2400, 3000, 60000]
+})
+
+# Función para resolver la mezcla óptima (memoizada)  
+@memoizar(cache_modelos)
+def calcular_mezcla(nombres, precio, costo_var_unit, recursos, consumos, minimos, maximos, evitables, costos_fijos, entero):
+    return optimizar_mezcla(nombres, precio, costo_var_unit, recursos, consumos, minimos, maximos, evitables, costos_fijos, entero)
+
+# Función para buscar la mezcla de productos que maximiza la contribución con recursos limitados  
+def optimizar_mezcla_productos():
+    st.write("### Productos")
+    productos = editar_tabla(
+        "mezcla_productos",
+        productos_iniciales_mezcla(),
+        ["nombre", "precio", "costo_var_unit", "minimo", "maximo", "costo_fijo_evitable"],
+        (),
+        column_config={
+            "nombre": st.column_config.TextColumn("Producto", required=True),
+            "precio": st.column_config.NumberColumn("Precio", min_value=0),
+            "costo_var_unit": st.column_config.NumberColumn("Costo variable unitario", min_value=0),
+            "minimo": st.column_config.NumberColumn("Mínimo", min_value=0),
+            "maximo": st.column_config.NumberColumn("Máximo (vacío = sin límite)", min_value=0),
+            "costo_fijo_evitable": st.column_config.NumberColumn("Costo fijo evitable", min_value=0)
+        }
+    )
+    productos = productos[productos["nombre"].fillna("").astype(str).str.strip() != ""]
+    nombres = [str(n).strip() for n in productos["nombre"]]
+    if not nombres:
+        st.warning("Ingrese al menos un producto")
+        return
+    
+    st.write("### Recursos limitados")
+    st.caption("Indique la capacidad de cada recurso y cuánto consume cada producto por unidad.")
+    consumo_inicial = RECURSOS_EJEMPLO.copy()
+    for i, nombre in enumerate(nombres):
+        # Ejemplo: horas máquina y de mano de obra crecientes y presupuesto igual al costo variable
+        consumo_inicial[nombre] = [1 + i % 3, 2 + i % 2, productos["costo_var_unit"].iloc[i]]
+    recursos = editar_tabla(
+        "mezcla_recursos",
+        consumo_inicial,
+        ["recurso", "capacidad"] + nombres,
+        tuple(nombres),
+        column_config={
+            "recurso": st.column_config.TextColumn("Recurso", required=True),
+            "capacidad": st.column_config.NumberColumn("Capacidad", min_value=0)
+        }
+    )
+    recursos = recursos[recursos["recurso"].fillna("").astype(str).str.strip() != ""]
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        costos_fijos = st.number_input("Costos fijos comunes", min_value=0, value=0, step=1000, key="mezcla_costos_fijos")
+    with col2:
+        entero = st.checkbox("Cantidades enteras", key="mezcla_entero", disabled=not scipy_disponible())
+    if not scipy_disponible():
+        st.caption("Sin scipy se resuelve el programa lineal con el símplex incluido; las cantidades enteras y los costos fijos evitables requieren scipy.")
+    
+    def numeros(df, columna):
+        return pd.to_numeric(df[columna], errors="coerce").fillna(0).to_numpy(dtype=np.float64)
+    
+    try:
+        with PERFIL.etapa("Cálculo de modelos"):
+            mezcla = calcular_mezcla(
+                nombres,
+                numeros(productos, "precio"),
+                numeros(productos, "costo_var_unit"),
+                [Recurso(str(r).strip(), c) for r, c in zip(recursos["recurso"], numeros(recursos, "capacidad"))],
+                np.column_stack([numeros(recursos, nombre) for nombre in nombres]) if len(recursos) else np.zeros((0, len(nombres))),
+                numeros(productos, "minimo"),
+                pd.to_numeric(productos["maximo"], errors="coerce").to_numpy(dtype=np.float64),
+                numeros(productos, "costo_fijo_evitable"),
+                costos_fijos,
+                entero
+            )
+    except (ValueError, ImportError) as error:
+        st.error(str(error))
+        return
+    
+    st.markdown("---")
+    st.write("### Mezcla óptima")
+    col1, col2, col3 = st.columns(3)
+    col1.metric("Contribución total", f"${mezcla.contribucion:,.2f}")
+    col2.metric("Costos fijos", f"${mezcla.costos_fijos:,.2f}")
+    col3.metric("Resultado", f"${mezcla.resultado:,.2f}")
+    st.caption(f"Resuelto con {'HiGHS (scipy)' if mezcla.motor == 'highs' else 'el símplex incluido'}.")
+    
+    tabla_mezcla = pd.DataFrame({
+        "Producto": mezcla.nombres,
+        "Cantidad óptima": mezcla.cantidades.round(2),
+        "Margen unitario": mezcla.margen_unitario.round(2),
+        "Contribución": (mezcla.margen_unitario * mezcla.cantidades).round(2),
+        "Costo de oportunidad unitario": mezcla.costo_oportunidad_unitario.round(2),
+        "Costo reducido": mezcla.costo_reducido.round(2)
+    })
+    mostrar_tabla(tabla_mezcla, "Mezcla óptima", use_container_width=True, hide_index=True)
+    ofrecer_descarga(tabla_mezcla, "mezcla_optima", key="descargar_mezcla")
+    
+    st.write("### Recursos y precios sombra")
+    tabla_recursos = pd.DataFrame({
+        "Recurso": mezcla.recursos,
+        "Capacidad": (mezcla.uso + mezcla.holgura).round(2),
+        "Usado": mezcla.uso.round(2),
+        "Holgura": mezcla.holgura.round(2),
+        "Precio sombra": mezcla.precios_sombra.round(4),
+        "Restricción activa": mezcla.activas
+    })
+    mostrar_tabla(tabla_recursos, "Recursos y precios sombra", use_container_width=True, hide_index=True)
+    for recurso, precio in zip(mezcla.recursos, mezcla.precios_sombra):
+        if precio > 0:
+            st.info(f"**{recurso}** limita la mezcla: cada unidad adicional aumentaría la contribución en ${precio:,.2f}; es el costo de oportunidad de usar una unidad de este recurso.")
+
+# Costos fijos que se ofrecen para editar en una rama; el resto se encuentra buscando
+MAXIMO_OPCIONES_COSTO = 200
+
+# Función para tomar los datos básicos y los costos fijos actuales como base de las ramas  
+def reiniciar_ramas(datos_basicos, catalogo):
+    st.session_state.arbol_escenarios = ArbolEscenarios(datos_basicos, catalogo)
+    st.session_state.huella_base_ramas = huella(datos_basicos, catalogo)
+    st.session_state.mensaje_ramas = ("success", "La base de las ramas se tomó de los datos actuales")
+
+# Función para crear una rama a partir de la rama de origen elegida  
+def crear_rama():
+    arbol = st.session_state.arbol_escenarios
+    try:
+        rama = arbol.ramificar(st.session_state.nombre_rama, st.session_state.origen_rama)
+    except ValueError as error:
+        st.session_state.mensaje_ramas = ("error", str(error))
+        return
+    st.session_state.nombre_rama = ""
+    st.session_state.rama_elegida = rama.nombre
+    st.session_state.mensaje_ramas = ("success", f"Rama '{rama.nombre}' creada desde '{rama.padre}'")
+
+# Función para eliminar una rama y las que derivan de ella  
+def eliminar_rama(nombre):
+    eliminadas = st.session_state.arbol_escenarios.eliminar(nombre)
+    st.session_state.pop("rama_elegida", None)
+    st.session_state.mensaje_ramas = ("success", f"Ramas eliminadas: {', '.join(eliminadas)}")
+
+# Función para aplicar a una rama los datos básicos de su formulario  
+def aplicar_datos_rama(nombre):
+    for alternativa in (1, 2):
+        st.session_state.arbol_escenarios.editar_datos(
+            nombre,
+            alternativa,
+            unidades=st.session_state[f"rama_{nombre}_unidades{alternativa}"],
+            precio=st.session_state[f"rama_{nombre}_precio{alternativa}"],
+            costo_var_unit=st.session_state[f"rama_{nombre}_cvu{alternativa}"]
+        )
+
+# Función para aplicar a una rama solo los campos modificados de un costo fijo, con
+# las mismas reglas que el editor de costos fijos  
+def aplicar_costo_rama(nombre, i):
+    catalogo = st.session_state.arbol_escenarios[nombre].costos_fijos
+    actual = catalogo.fila(i)
+    clave = f"rama_{nombre}_costo{i}"
+    cambios = {
+        campo: st.session_state[f"{clave}_{campo}"]
+        for campo in ("valor1", "valor2", "reduccion", "relevante")
+        if st.session_state[f"{clave}_{campo}"] != actual[campo]
+    }
+    if catalogo.editar(i, cambios):
+        st.session_state.mensaje_ramas = ("success", f"Costo fijo '{actual['nombre']}' modificado en la rama '{nombre}'")
+
+# Función para eliminar un costo fijo de una rama  
+def eliminar_costo_rama(nombre, i):
+    catalogo = st.session_state.arbol_escenarios[nombre].costos_fijos
+    costo = catalogo.fila(i)["nombre"]
+    catalogo.eliminar(i)
+    st.session_state.mensaje_ramas = ("success", f"Costo fijo '{costo}' eliminado de la rama '{nombre}'")
+
+# Función para editar los datos básicos y los costos fijos de una rama  
+def editar_rama(arbol, nombre):
+    rama = arbol[nombre]
+    alternativas = (rama.datos_basicos.alt1, rama.datos_basicos.alt2)
+    with st.form(f"form_datos_rama_{nombre}"):
+        columnas = st.columns(2)
+        for numero, (columna, alt) in enumerate(zip(columnas, alternativas), 1):
+            with columna:
+                st.write(f"**{alt.nombre}**")
+                st.number_input(f"Unidades ({alt.nombre})", min_value=0.0, value=float(alt.unidades), step=1.0, key=f"rama_{nombre}_unidades{numero}")
+                st.number_input(f"Precio por unidad ({alt.nombre})", min_value=0.0, value=float(alt.precio), step=1.0, key=f"rama_{nombre}_precio{numero}")
+                st.number_input(f"Costo variable unitario ({alt.nombre})", min_value=0.0, value=float(alt.costo_var_unit), step=1.0, key=f"rama_{nombre}_cvu{numero}")
+        st.form_submit_button("Aplicar datos básicos", on_click=aplicar_datos_rama, args=(nombre,))
+    
+    catalogo = rama.costos_fijos
+    texto = st.text_input("Buscar costo fijo de la rama", key="rama_buscar_costo")
+    ids = catalogo.filtrar(texto)[:MAXIMO_OPCIONES_COSTO]
+    if not len(ids):
+        st.caption("No hay costos fijos que coincidan con la búsqueda")
+    else:
+        i = st.selectbox(
+            "Costo fijo",
+            ids.tolist(),
+            format_func=lambda i: catalogo.fila(i)["nombre"],
+            key=f"rama_{nombre}_costo_elegido"
+        )
+        fila = catalogo.fila(i)
+        clave = f"rama_{nombre}_costo{i}"
+        with st.form(f"form_{clave}"):
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.number_input(f"Valor para {alternativas[0].nombre}", min_value=0.0, value=float(fila["valor1"]), step=1000.0, key=f"{clave}_valor1")
+            with col2:
+                st.number_input(f"Valor para {alternativas[1].nombre}", min_value=0.0, value=float(fila["valor2"]), step=1000.0, key=f"{clave}_valor2")
+            with col3:
+                st.slider("% de reducción", 0.0, 100.0, float(fila["reduccion"]), step=1.0, key=f"{clave}_reduccion")
+            with col4:
+                st.checkbox("¿Es relevante?", value=fila["relevante"], key=f"{clave}_relevante")
+            col1, col2 = st.columns(2)
+            with col1:
+                st.form_submit_button("Aplicar cambios al costo", on_click=aplicar_costo_rama, args=(nombre, i))
+            with col2:
+                st.form_submit_button("Eliminar costo de la rama", on_click=eliminar_costo_rama, args=(nombre, i))
+    
+    mostrar_diferencias_ramas(arbol.diferencias(nombre))
+    st.button(f"Eliminar la rama '{nombre}' y sus derivadas", key="btn_eliminar_rama", on_click=eliminar_rama, args=(nombre,))
+
+# Función para mostrar los datos básicos y los costos fijos que cambian entre dos ramas  
+def mostrar_diferencias_ramas(diferencias):
+    if not diferencias:
+        st.caption(f"'{diferencias.rama}' no tiene cambios respecto de '{diferencias.otra}'")
+        return
+    st.write(f"**Cambios de '{diferencias.rama}' respecto de '{diferencias.otra}'**")
+    for campo, (antes, despues) in diferencias.datos.items():
+        st.write(f"- {campo}: {antes:,} → {despues:,}")
+    if diferencias.costos:
+        filas = []
+        for costo in diferencias.costos:
+            antes, despues = costo.antes or {}, costo.despues or {}
+            filas.append({
+                "Costo fijo": costo.nombre,
+                "Cambio": "Agregado" if not antes else "Eliminado" if not despues else "Editado",
+                f"Valor 1 ({diferencias.otra})": antes.get("valor1"),
+                f"Valor 1 ({diferencias.rama})": despues.get("valor1"),
+                f"Valor 2 ({diferencias.otra})": antes.get("valor2"),
+                f"Valor 2 ({diferencias.rama})": despues.get("valor2"),
+                f"% reducción ({diferencias.otra})": antes.get("reduccion"),
+                f"% reducción ({diferencias.rama})": despues.get("reduccion")
+            })
+        mostrar_tabla(pd.DataFrame(filas), "Diferencias de costos fijos entre ramas", use_container_width=True, hide_index=True)
+
+# Función para armar la tabla con los tres modelos de cada rama y su diferencia con la de referencia  
+def tabla_comparacion_ramas(arbol, nombres, referencia):
+    resultados = {nombre: arbol.evaluar(nombre) for nombre in nombres}
+    base = arbol[arbol.nombre_base].datos_basicos
+    alt1, alt2 = base.alt1.nombre, base.alt2.nombre
+    filas = []
+    for nombre, r in resultados.items():
+        filas.append({
+            "Rama": nombre,
+            "Origen": arbol[nombre].padre or "-",
+            "Cambios": arbol[nombre].cambios,
+            f"Costo total: {alt1}": r.total.resultado1,
+            f"Costo total: {alt2}": r.total.resultado2,
+            "Costo total: ventaja": r.total.ventaja,
+            f"Costos relevantes: {alt1}": r.relevante.resultado1,
+            f"Costos relevantes: {alt2}": r.relevante.resultado2,
+            "Costos relevantes: ventaja": r.relevante.ventaja,
+            f"Costo de oportunidad: {alt1}": r.oportunidad.costo_oportunidad_alt1,
+            f"Costo de oportunidad: {alt2}": r.oportunidad.costo_oportunidad_alt2,
+            "Mejor alternativa": r.oportunidad.mejor_alternativa
+        })
+    df = pd.DataFrame(filas)
+    # Diferencia de la ventaja de cada modelo respecto de la rama de referencia
+    fila_referencia = df.loc[df["Rama"] == referencia].iloc[0]
+    for modelo in ("Costo total", "Costos relevantes"):
+        df[f"{modelo}: Δ ventaja vs {referencia}"] = df[f"{modelo}: ventaja"] - fila_referencia[f"{modelo}: ventaja"]
+    return df
+
+# Función para comparar dos ramas lado a lado, con la diferencia de cada resultado  
+def comparar_dos_ramas(arbol, nombre1, nombre2):
+    resultados = (arbol.evaluar(nombre1), arbol.evaluar(nombre2))
+    base = arbol[arbol.nombre_base].datos_basicos
+    columnas = st.columns(2)
+    for columna, nombre, r, otro in zip(columnas, (nombre1, nombre2), resultados, resultados[::-1]):
+        with columna:
+            st.write(f"**{nombre}**")
+            medidas = (
+                (f"Costo total: {base.alt1.nombre}", r.total.resultado1, otro.total.resultado1),
+                (f"Costo total: {base.alt2.nombre}", r.total.resultado2, otro.total.resultado2),
+                ("Costos relevantes: ventaja", r.relevante.ventaja, otro.relevante.ventaja),
+                ("Costo de oportunidad: ventaja", r.oportunidad.ventaja, otro.oportunidad.ventaja)
+            )
+            for etiqueta, valor, valor_otro in medidas:
+                st.metric(etiqueta, f"${valor:,.2f}", f"{valor - valor_otro:,.2f}" if valor != valor_otro else None)
+            st.write(f"Mejor alternativa: **{r.oportunidad.mejor_alternativa}**")
+    mostrar_diferencias_ramas(arbol.diferencias(nombre2, nombre1))
+
+# Función para derivar ramas what-if de un escenario base y compararlas  
+def ramificar_escenarios(datos_basicos, datos_costos):
+    st.markdown("---")
+    st.write("### Ramas de escenarios")
+    catalogo = datos_costos["costos_fijos"]
+    # Sin ramas la base sigue a los datos actuales; con ramas se avisa si cambiaron
+    actual = huella(datos_basicos, catalogo)
+    if "arbol_escenarios" not in st.session_state or (
+        len(st.session_state.arbol_escenarios) == 1 and st.session_state.huella_base_ramas != actual
+    ):
+        st.session_state.arbol_escenarios = ArbolEscenarios(datos_basicos, catalogo)
+        st.session_state.huella_base_ramas = actual
+    arbol = st.session_state.arbol_escenarios
+    
+    st.caption(
+        "Cada rama parte de una copia de su origen y guarda solo los costos que cambia. "
+        "La base es una copia de los datos ingresados arriba al crear la primera rama."
+    )
+    if st.session_state.huella_base_ramas != actual:
+        st.warning("Los datos ingresados cambiaron después de crear las ramas; la base conserva los anteriores")
+    st.button("Tomar los datos actuales como base (descarta las ramas)", key="btn_reiniciar_ramas", on_click=reiniciar_ramas, args=(datos_basicos, catalogo))
+    
+    col1, col2, col3 = st.columns([2, 2, 1])
+    with col1:
+        st.text_input("Nombre de la nueva rama", key="nombre_rama")
+    with col2:
+        st.selectbox("Origen", arbol.nombres(), key="origen_rama")
+    with col3:
+        st.write("")
+        st.button("Crear rama", key="btn_crear_rama", on_click=crear_rama)
+    
+    if "mensaje_ramas" in st.session_state:
+        tipo, mensaje = st.session_state.pop("mensaje_ramas")
+        if tipo == "success":
+            st.success(mensaje)
+        else:
+            st.error(mensaje)
+    
+    ramas = [n for n in arbol.nombres() if n != arbol.nombre_base]
+    if ramas:
+        st.write("#### Editar rama")
+        nombre = st.selectbox("Rama", ramas, key="rama_elegida")
+        editar_rama(arbol, nombre)
+    
+    st.write("#### Comparación de ramas")
+    referencia = st.selectbox("Diferencia respecto de", arbol.nombres(), key="rama_referencia")
+    with PERFIL.etapa("Cálculo de modelos"):
+        df = tabla_comparacion_ramas(arbol, arbol.nombres(), referencia)
+    mostrar_tabla(df, "Comparación de ramas", use_container_width=True, hide_index=True)
+    ofrecer_descarga(df, "comparacion_ramas", key="descargar_ramas")
+    
+    fig = go.Figure()
+    for modelo, color in zip(("Costo total", "Costos relevantes"), COLORES_ALTERNATIVAS):
+        fig.add_trace(go.Bar(x=df["Rama"], y=df[f"{modelo}: ventaja"], name=modelo, marker_color=color))
+    fig.update_layout(
+        barmode="group",
+        title=f"Ventaja de {arbol[arbol.nombre_base].datos_basicos.alt1.nombre} por rama",
+        height=380,
+        margin=dict(t=50, b=20)
+    )
+    with PERFIL.etapa("Render"):
+        st.plotly_chart(fig, use_container_width=True, key="grafico_ramas")
+    
+    if len(arbol) > 1:
+        st.write("#### Diferencias entre dos ramas")
+        col1, col2 = st.columns(2)
+        with col1:
+            nombre1 = st.selectbox("Rama", arbol.nombres(), key="rama_diferencia1")
+        with col2:
+            nombre2 = st.selectbox("Comparada con", arbol.nombres(), index=len(arbol) - 1, key="rama_diferencia2")
+        comparar_dos_ramas(arbol, nombre1, nombre2)
+    return arbol
+
+# Función para registrar (una vez por ejecución) el tiempo transcurrido hasta un hito  
+def marcar_tiempo(hito):
+    st.session_state.tiempos_ejecucion.setdefault(hito, (time.perf_counter() - PERFIL.inicio) * 1000)
+
+# Función para mostrar los tiempos de la ejecución actual en la barra lateral  
+def mostrar_panel_depuracion(secciones_calculadas):
+    marcar_tiempo("Ejecución completa")
+    with st.sidebar.expander("Depuración"):
+        for hito, milisegundos in st.session_state.tiempos_ejecucion.items():
+            st.write(f"**{hito}:** {milisegundos:,.0f} ms")
+        st.write(f"**Secciones calculadas:** {', '.join(secciones_calculadas) or 'ninguna'}")
+
+# Cantidad de widgets creados en esta ejecución. Usa una API interna de
+# Streamlit; si no está disponible el conteo se omite.
+def contar_widgets():
+    try:
+        from streamlit.runtime.scriptrunner import get_script_run_ctx
+        return len(get_script_run_ctx().shared.widget_ids_this_run.snapshot())
+    except Exception:
+        return None
+
+# Función para registrar la ejecución en el historial y mostrar el perfil por etapa  
+def mostrar_panel_perfil(pagina):
+    if "historial_perfiles" not in st.session_state:
+        st.session_state.historial_perfiles = HistorialPerfiles()
+    historial = st.session_state.historial_perfiles
+    ejecucion = PERFIL.finalizar(pagina, contar_widgets())
+    historial.agregar(ejecucion)
+    
+    with st.sidebar.expander("Perfil de ejecución", expanded=True):
+        widgets = f"{ejecucion.widgets:,}" if ejecucion.widgets is not None else "n/d"
+        st.write(f"**Total:** {ejecucion.total_ms:,.0f} ms · **Widgets:** {widgets}")
+        etapas = dict(ejecucion.etapas, **{"Otros": ejecucion.otros_ms})
+        st.dataframe(
+            pd.DataFrame({"Etapa": list(etapas), "ms": [round(ms, 1) for ms in etapas.values()]}),
+            use_container_width=True,
+            hide_index=True
+        )
+        if ejecucion.tablas:
+            st.dataframe(
+                pd.DataFrame({
+                    "Tabla": [t.nombre for t in ejecucion.tablas],
+                    "Filas": [t.filas for t in ejecucion.tablas],
+                    "Columnas": [t.columnas for t in ejecucion.tablas],
+                    "KB": [round(t.bytes / 1024, 1) for t in ejecucion.tablas]
+                }),
+                use_container_width=True,
+                hide_index=True
+            )
+        if len(historial) > 1:
+            st.line_chart(pd.DataFrame(historial.filas()).set_index("ejecucion").drop(columns="pagina"))
+        st.download_button(
+            "Exportar historial (JSON)",
+            data=historial.a_json(),
+            file_name="perfil_ejecuciones.json",
+            mime="application/json",
+            key="descargar_perfil",
+            on_click="ignore"
+        )
+
+# Función para mostrar los contadores de la caché de modelos  
+def mostrar_estadisticas_cache():
+    estadisticas = cache_modelos.estadisticas()
+    with st.sidebar.expander("Caché de modelos"):
+        st.write(f"**Aciertos:** {estadisticas.aciertos:,}")
+        st.write(f"**Fallos:** {estadisticas.fallos:,}")
+        st.write(f"**Tasa de aciertos:** {estadisticas.tasa_aciertos:.1%}")
+        st.write(f"**Entradas:** {estadisticas.entradas:,} ({estadisticas.bytes / 1024:,.0f} KB)")
+        st.write(f"**Desalojos:** {estadisticas.desalojos:,}")
+
+# Datos básicos que se guardan con cada escenario y el campo del formulario de cada uno
+CAMPOS_ESCENARIO = {
+    "nombre_alt1": "nombre_alt1",
+    "nombre_alt2": "nombre_alt2",
+    "unidades1": "unidades1",
+    "unidades2": "unidades2",
+    "precio1": "precio1",
+    "precio2": "precio2",
+    "costo_var_unit1": "cvu1",
+    "costo_var_unit2": "cvu2"
+}
+
+# Catálogo de costos fijos de solo lectura compartido por las sesiones (ruta en CALCULADORA_CATALOGO).
+# La fecha de modificación forma parte de la clave para recargarlo si el archivo cambia.
+def obtener_catalogo_compartido(ruta):
+    return cargar_catalogo_compartido(ruta, os.path.getmtime(ruta))
+
+@st.cache_resource
+def cargar_catalogo_compartido(ruta, modificado):
+    return leer_costos_fijos(ruta).congelar()
+
+# Almacén de escenarios compartido por las sesiones (ruta configurable con CALCULADORA_ESCENARIOS)
+@st.cache_resource
+def obtener_almacen():
+    return AlmacenEscenarios(os.environ.get("CALCULADORA_ESCENARIOS", "escenarios.sqlite3"))
+
+# Función para guardar los datos, costos fijos y resultados actuales como escenario  
+def guardar_escenario(datos_basicos):
+    nombre = st.session_state.nombre_escenario.strip()
+    if not nombre:
+        st.session_state.mensaje_importacion = ("error", "Ingrese un nombre para el escenario")
+        return
+    catalogo = st.session_state.costos_fijos
+    resultados = evaluar(datos_basicos.alt1, datos_basicos.alt2, catalogo)
+    datos = datos_basicos.a_dict()
+    datos = {clave: datos[clave] for clave in CAMPOS_ESCENARIO}
+    version = obtener_almacen().guardar(nombre, datos, catalogo, resultados, resultados.oportunidad.mejor_alternativa)
+    st.session_state.mensaje_importacion = ("success", f"Escenario '{nombre}' guardado (versión {version})")
+
+# Función para cargar un escenario guardado en el formulario y el catálogo  
+def abrir_escenario():
+    nombre = st.session_state.escenario_elegido
+    if nombre is None:
+        return
+    try:
+        escenario = obtener_almacen().abrir(nombre, st.session_state.get("version_elegida"))
+    except KeyError as error:
+        st.session_state.mensaje_importacion = ("error", str(error))
+        return
+    for clave, campo in CAMPOS_ESCENARIO.items():
+        if clave in escenario.datos_basicos:
+            st.session_state[campo] = escenario.datos_basicos[clave]
+    st.session_state.costos_fijos = escenario.costos_fijos
+    st.session_state.nombre_escenario = escenario.nombre
+    st.session_state.mensaje_importacion = (
+        "success",
+        f"Escenario '{escenario.nombre}' (versión {escenario.version}) abierto con {len(escenario.costos_fijos):,} costos fijos"
+    )
+
+# Función para guardar y abrir escenarios desde la barra lateral  
+def gestionar_escenarios(datos_basicos):
+    almacen = obtener_almacen()
+    with st.sidebar.expander("Escenarios guardados"):
+        st.text_input("Nombre del escenario", key="nombre_escenario")
+        st.button("Guardar escenario", key="btn_guardar_escenario", on_click=guardar_escenario, args=(datos_basicos,))
+        
+        st.markdown("---")
+        busqueda = st.text_input("Buscar escenario", key="buscar_escenario")
+        escenarios = almacen.listar(busqueda)
+        if not escenarios:
+            st.caption("No hay escenarios guardados")
+            return
+        resumenes = {e.nombre: e for e in escenarios}
+        nombre = st.selectbox(
+            "Escenario",
+            list(resumenes),
+            format_func=lambda n: f"{n} · {resumenes[n].ganadora or '-'} · {resumenes[n].actualizado[:10]}",
+            key="escenario_elegido"
+        )
+        versiones = [v.version for v in almacen.historial(nombre)]
+        st.selectbox(
+            "Versión",
+            versiones,
+            format_func=lambda v: f"{v} (actual)" if v == versiones[0] else str(v),
+            key="version_elegida"
+        )
+        st.button("Abrir escenario", key="btn_abrir_escenario", on_click=abrir_escenario)
+
+# Función para volver a la carátula  
+def boton_volver():
+    if st.button("Volver al Menú Principal"):
+        st.switch_page("paginas/caratula.py")
+
+# Función para mostrar las opciones de la barra lateral comunes a las páginas; los
+# escenarios guardados solo se ofrecen en las páginas con datos básicos  
+def mostrar_barra_lateral(datos_basicos=None):
+    st.sidebar.selectbox("Formato de exportación", list(FORMATOS_EXPORTACION), key="formato_exportacion")
+    if datos_basicos is not None:
+        gestionar_escenarios(datos_basicos)
+    mostrar_estadisticas_cache()
@@ -0,0 +1,42 @@
+"""Motor de cálculo de la Calculadora de Modelos de Costos, sin dependencias de UI.
+
+Los nombres de `modelos` se importan al usarse por primera vez, de modo que
+importar un submódulo liviano (por ejemplo `motor_costos.perfil`) no carga
+NumPy.
+"""
+
+import importlib
+
+__all__ = [
+    "Alternativa",
+    "CostoFijo",
+    "CostoFijoMultiple",
+    "DatosBasicos",
+    "ResultadoAlternativa",
+    "ResultadoModelo",
+    "ResultadoOportunidad",
+    "ResultadosModelos",
+    "TotalesCostosFijos",
+    "costos_de_oportunidad",
+    "evaluar",
+    "evaluar_alternativas",
+    "modelo_costo_oportunidad",
+    "modelo_costo_total",
+    "modelo_costos_relevantes",
+    "normalizar_costos_fijos",
+    "ranking",
+    "totalizar_costos_fijos",
+    "valor_con_reduccion",
+]
+
+
+def __getattr__(nombre):
+    if nombre in __all__:
+        valor = getattr(importlib.import_module(".modelos", __name__), nombre)
+        globals()[nombre] = valor
+        return valor
+    raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,373 @@
+"""Almacén persistente de escenarios en SQLite.
+
+Un escenario guarda los datos básicos de las alternativas, su catálogo de
+costos fijos y los resultados calculados, bajo un nombre. La tabla de
+escenarios tiene índices por nombre, fecha de actualización y alternativa
+ganadora.
+
+Cada vez que se guarda un escenario existente se crea una versión nueva. De
+los costos fijos solo se registra la diferencia con la versión anterior
+(altas, bajas y modificaciones, guardadas como el estado previo de cada
+fila), de modo que editar un costo en un catálogo de 10.000 no copia los
+otros 9.999. La versión actual se lee con una sola consulta; una versión
+anterior se reconstruye deshaciendo las diferencias posteriores.
+"""
+
+import json
+import sqlite3
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from .catalogo import CatalogoCostosFijos
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS escenarios (
+    id INTEGER PRIMARY KEY,
+    nombre TEXT NOT NULL UNIQUE,
+    creado TEXT NOT NULL,
+    actualizado TEXT NOT NULL,
+    version INTEGER NOT NULL,
+    ganadora TEXT,
+    datos_basicos TEXT NOT NULL,
+    resultados TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_escenarios_actualizado ON escenarios (actualizado);
+CREATE INDEX IF NOT EXISTS idx_escenarios_ganadora ON escenarios (ganadora);
+
+CREATE TABLE IF NOT EXISTS costos_fijos (
+    escenario_id INTEGER NOT NULL REFERENCES escenarios (id) ON DELETE CASCADE,
+    costo_id INTEGER NOT NULL,
+    nombre TEXT NOT NULL,
+    valor1 REAL NOT NULL,
+    valor2 REAL NOT NULL,
+    reduccion REAL NOT NULL,
+    relevante INTEGER NOT NULL,
+    PRIMARY KEY (escenario_id, costo_id)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS versiones (
+    escenario_id INTEGER NOT NULL REFERENCES escenarios (id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    fecha TEXT NOT NULL,
+    ganadora TEXT,
+    datos_basicos TEXT NOT NULL,
+    resultados TEXT,
+    altas INTEGER NOT NULL,
+    bajas INTEGER NOT NULL,
+    modificaciones INTEGER NOT NULL,
+    PRIMARY KEY (escenario_id, version)
+) WITHOUT ROWID;
+
+-- Estado de cada costo antes del cambio introducido en `version`
+CREATE TABLE IF NOT EXISTS cambios_costos (
+    escenario_id INTEGER NOT NULL REFERENCES escenarios (id) ON DELETE CASCADE,
+    version INTEGER NOT NULL,
+    costo_id INTEGER NOT NULL,
+    operacion TEXT NOT NULL CHECK (operacion IN ('alta', 'baja', 'modificacion')),
+    nombre TEXT,
+    valor1 REAL,
+    valor2 REAL,
+    reduccion REAL,
+    relevante INTEGER,
+    PRIMARY KEY (escenario_id, version, costo_id)
+) WITHOUT ROWID;
+"""
+
+_COLUMNAS_COSTOS = ("nombre", "valor1", "valor2", "reduccion", "relevante")
+
+
+@dataclass
+class Escenario:
+    nombre: str
+    version: int
+    actualizado: str
+    datos_basicos: dict
+    costos_fijos: CatalogoCostosFijos
+    resultados: Optional[dict] = None
+    ganadora: Optional[str] = None
+
+
+@dataclass
+class ResumenEscenario:
+    nombre: str
+    version: int
+    creado: str
+    actualizado: str
+    ganadora: Optional[str]
+    cantidad_costos: int
+
+
+@dataclass
+class Version:
+    version: int
+    fecha: str
+    ganadora: Optional[str]
+    altas: int
+    bajas: int
+    modificaciones: int
+
+
+def _a_json(valor):
+    if valor is None:
+        return None
+    if is_dataclass(valor) and not isinstance(valor, type):
+        valor = asdict(valor)
+    return json.dumps(valor, ensure_ascii=False, default=_json_por_defecto)
+
+
+def _json_por_defecto(valor):
+    if hasattr(valor, "tolist"):
+        return valor.tolist()
+    if is_dataclass(valor) and not isinstance(valor, type):
+        return asdict(valor)
+    raise TypeError(f"No se puede guardar un valor de tipo {type(valor).__name__}")
+
+
+def _desde_json(texto):
+    return None if texto is None else json.loads(texto)
+
+
+def _ahora():
+    return datetime.now().isoformat(timespec="seconds")
+
+
+# Filas (costo_id, nombre, valor1, valor2, reduccion, relevante) de un catálogo
+def _filas_catalogo(catalogo):
+    columnas = catalogo.columnas()
+    return list(zip(
+        columnas["id"].tolist(),
+        columnas["nombre"],
+        columnas["valor1"].tolist(),
+        columnas["valor2"].tolist(),
+        columnas["reduccion"].tolist(),
+        columnas["relevante"].astype(int).tolist(),
+    ))
+
+
+def _catalogo_desde_filas(filas):
+    if not filas:
+        return CatalogoCostosFijos()
+    ids, nombres, valor1, valor2, reduccion, relevante = zip(*filas)
+    return CatalogoCostosFijos.desde_columnas(
+        nombres,
+        np.array(valor1, dtype=np.float64),
+        np.array(valor2, dtype=np.float64),
+        np.array(reduccion, dtype=np.float64),
+        np.array(relevante, dtype=bool),
+        ids=ids,
+    )
+
+
+class AlmacenEscenarios:
+    def __init__(self, ruta="escenarios.sqlite3"):
+        self.ruta = ruta
+        with self._conectar() as conexion:
+            conexion.executescript(_ESQUEMA)
+
+    # Una conexión por operación: la aplicación atiende cada ejecución en un hilo distinto
+    def _conectar(self):
+        conexion = sqlite3.connect(self.ruta, timeout=30)
+        conexion.execute("PRAGMA foreign_keys = ON")
+        conexion.execute("PRAGMA journal_mode = WAL")
+        return _Conexion(conexion)
+
+    # Guarda el escenario y devuelve su número de versión. Si nada cambió
+    # respecto de la versión actual no se crea una versión nueva.
+    def guardar(self, nombre, datos_basicos, costos_fijos, resultados=None, ganadora=None) -> int:
+        if not hasattr(costos_fijos, "columnas"):
+            costos_fijos = CatalogoCostosFijos.desde_dicts(costos_fijos)
+        datos_json = _a_json(datos_basicos)
+        resultados_json = _a_json(resultados)
+        nuevas = {fila[0]: fila[1:] for fila in _filas_catalogo(costos_fijos)}
+        fecha = _ahora()
+
+        with self._conectar() as conexion:
+            actual = conexion.execute(
+                "SELECT id, version, datos_basicos, resultados, ganadora FROM escenarios WHERE nombre = ?", (nombre,)
+            ).fetchone()
+            if actual is None:
+                cursor = conexion.execute(
+                    "INSERT INTO escenarios (nombre, creado, actualizado, version, ganadora, datos_basicos, resultados)"
+                    " VALUES (?, ?, ?, 1, ?, ?, ?)",
+                    (nombre, fecha, fecha, ganadora, datos_json, resultados_json),
+                )
+                escenario_id = cursor.lastrowid
+                conexion.executemany(
+                    "INSERT INTO costos_fijos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    ((escenario_id, costo_id, *valores) for costo_id, valores in nuevas.items()),
+                )
+                self._registrar_version(conexion, escenario_id, 1, fecha, ganadora, datos_json, resultados_json, len(nuevas), 0, 0)
+                return 1
+
+            escenario_id, version, datos_anteriores, resultados_anteriores, ganadora_anterior = actual
+            anteriores = {
+                fila[0]: fila[1:]
+                for fila in conexion.execute(
+                    "SELECT costo_id, nombre, valor1, valor2, reduccion, relevante FROM costos_fijos WHERE escenario_id = ?",
+                    (escenario_id,),
+                )
+            }
+            altas = [i for i in nuevas if i not in anteriores]
+            bajas = [i for i in anteriores if i not in nuevas]
+            modificadas = [i for i in nuevas if i in anteriores and nuevas[i] != anteriores[i]]
+            sin_cambios = (
+                not (altas or bajas or modificadas)
+                and datos_json == datos_anteriores
+                and resultados_json == resultados_anteriores
+                and ganadora == ganadora_anterior
+            )
+            if sin_cambios:
+                return version
+
+            version += 1
+            conexion.executemany(
+                "INSERT INTO cambios_costos VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(escenario_id, version, i, "alta", None, None, None, None, None) for i in altas]
+                + [(escenario_id, version, i, "baja", *anteriores[i]) for i in bajas]
+                + [(escenario_id, version, i, "modificacion", *anteriores[i]) for i in modificadas],
+            )
+            conexion.executemany(
+                "DELETE FROM costos_fijos WHERE escenario_id = ? AND costo_id = ?",
+                [(escenario_id, i) for i in bajas],
+            )
+            conexion.executemany(
+                "INSERT OR REPLACE INTO costos_fijos VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(escenario_id, i, *nuevas[i]) for i in altas + modificadas],
+            )
+            conexion.execute(
+                "UPDATE escenarios SET actualizado = ?, version = ?, ganadora = ?, datos_basicos = ?, resultados = ?"
+                " WHERE id = ?",
+                (fecha, version, ganadora, datos_json, resultados_json, escenario_id),
+            )
+            self._registrar_version(
+                conexion, escenario_id, version, fecha, ganadora, datos_json, resultados_json,
+                len(altas), len(bajas), len(modificadas),
+            )
+            return version
+
+    def _registrar_version(self, conexion, escenario_id, version, fecha, ganadora, datos_json, resultados_json,
+                           altas, bajas, modificaciones):
+        conexion.execute(
+            "INSERT INTO versiones VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (escenario_id, version, fecha, ganadora, datos_json, resultados_json, altas, bajas, modificaciones),
+        )
+
+    # Abre la versión actual (o la indicada) de un escenario con una lectura en bloque de sus costos
+    def abrir(self, nombre, version=None) -> Escenario:
+        with self._conectar() as conexion:
+            fila = conexion.execute(
+                "SELECT id, version, actualizado, ganadora, datos_basicos, resultados FROM escenarios WHERE nombre = ?",
+                (nombre,),
+            ).fetchone()
+            if fila is None:
+                raise KeyError(f"No existe el escenario '{nombre}'")
+            escenario_id, version_actual, actualizado, ganadora, datos_json, resultados_json = fila
+            filas = conexion.execute(
+                "SELECT costo_id, nombre, valor1, valor2, reduccion, relevante FROM costos_fijos"
+                " WHERE escenario_id = ? ORDER BY costo_id",
+                (escenario_id,),
+            ).fetchall()
+
+            if version is not None and version != version_actual:
+                historica = conexion.execute(
+                    "SELECT fecha, ganadora, datos_basicos, resultados FROM versiones WHERE escenario_id = ? AND version = ?",
+                    (escenario_id, version),
+                ).fetchone()
+                if historica is None:
+                    raise KeyError(f"El escenario '{nombre}' no tiene la versión {version}")
+                actualizado, ganadora, datos_json, resultados_json = historica
+                filas = self._deshacer(conexion, escenario_id, version, filas)
+            else:
+                version = version_actual
+
+        return Escenario(
+            nombre=nombre,
+            version=version,
+            actualizado=actualizado,
+            datos_basicos=_desde_json(datos_json),
+            costos_fijos=_catalogo_desde_filas(filas),
+            resultados=_desde_json(resultados_json),
+            ganadora=ganadora,
+        )
+
+    # Reconstruye los costos de `version` deshaciendo, de la más nueva a la más
+    # vieja, las diferencias de las versiones posteriores
+    def _deshacer(self, conexion, escenario_id, version, filas):
+        costos = {fila[0]: fila[1:] for fila in filas}
+        cambios = conexion.execute(
+            "SELECT costo_id, operacion, nombre, valor1, valor2, reduccion, relevante FROM cambios_costos"
+            " WHERE escenario_id = ? AND version > ? ORDER BY version DESC",
+            (escenario_id, version),
+        )
+        for costo_id, operacion, *valores in cambios:
+            if operacion == "alta":
+                costos.pop(costo_id, None)
+            else:
+                costos[costo_id] = tuple(valores)
+        return [(costo_id, *costos[costo_id]) for costo_id in sorted(costos)]
+
+    # Escenarios guardados, del más reciente al más antiguo, filtrados por nombre,
+    # alternativa ganadora y rango de fechas (ISO, por ejemplo "2024-05-01")
+    def listar(self, texto=None, ganadora=None, desde=None, hasta=None, limite=100) -> List[ResumenEscenario]:
+        condiciones, parametros = [], []
+        if texto:
+            condiciones.append("e.nombre LIKE ? ESCAPE '\\'")
+            escapado = texto.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            parametros.append(f"%{escapado}%")
+        if ganadora is not None:
+            condiciones.append("e.ganadora = ?")
+            parametros.append(ganadora)
+        if desde is not None:
+            condiciones.append("e.actualizado >= ?")
+            parametros.append(desde)
+        if hasta is not None:
+            condiciones.append("e.actualizado < ?")
+            parametros.append(hasta)
+        donde = f"WHERE {' AND '.join(condiciones)}" if condiciones else ""
+        consulta = (
+            "SELECT e.nombre, e.version, e.creado, e.actualizado, e.ganadora,"
+            " (SELECT COUNT(*) FROM costos_fijos c WHERE c.escenario_id = e.id)"
+            f" FROM escenarios e {donde} ORDER BY e.actualizado DESC, e.id DESC LIMIT ?"
+        )
+        with self._conectar() as conexion:
+            filas = conexion.execute(consulta, (*parametros, limite)).fetchall()
+        return [ResumenEscenario(*fila) for fila in filas]
+
+    def historial(self, nombre) -> List[Version]:
+        with self._conectar() as conexion:
+            filas = conexion.execute(
+                "SELECT v.version, v.fecha, v.ganadora, v.altas, v.bajas, v.modificaciones"
+                " FROM versiones v JOIN escenarios e ON e.id = v.escenario_id"
+                " WHERE e.nombre = ? ORDER BY v.version DESC",
+                (nombre,),
+            ).fetchall()
+        if not filas:
+            raise KeyError(f"No existe el escenario '{nombre}'")
+        return [Version(*fila) for fila in filas]
+
+    def eliminar(self, nombre):
+        with self._conectar() as conexion:
+            cursor = conexion.execute("DELETE FROM escenarios WHERE nombre = ?", (nombre,))
+        if cursor.rowcount == 0:
+            raise KeyError(f"No existe el escenario '{nombre}'")
+
+
+class _Conexion:
+    # Confirma la transacción al salir sin errores y cierra siempre la conexión
+    def __init__(self, conexion):
+        self.conexion = conexion
+
+    def __enter__(self):
+        return self.conexion
+
+    def __exit__(self, tipo, *exc):
+        try:
+            if tipo is None:
+                self.conexion.commit()
+            else:
+                self.conexion.rollback()
+        finally:
+            self.conexion.close()
@@ -0,0 +1,378 @@
+"""Importación y exportación de costos fijos, alternativas y tablas de resultados.
+
+Formatos admitidos: CSV, Excel (requiere ``openpyxl``), Parquet y Arrow IPC
+(Feather). CSV y Parquet se leen por bloques, de modo que un catálogo grande
+no se carga completo como texto en memoria. Cada bloque se valida contra la
+forma de los costos fijos de la aplicación (`nombre`, `valor1`, `valor2`,
+`reduccion`, `relevante`). Los archivos de escenarios de la ejecución por
+lotes se validan con `validar_escenarios`, se evalúan con `evaluar_bloque` y
+sus resultados se escriben por bloques con `EscritorResultados`.
+"""
+
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from .catalogo import CatalogoCostosFijos
+from .dinero import a_centavos_arreglo, desde_centavos_arreglo
+from .lote import evaluar_lote_totales
+from .modelos import Alternativa
+
+COLUMNAS_COSTOS_FIJOS = ("nombre", "valor1", "valor2", "reduccion", "relevante")
+COLUMNAS_ALTERNATIVAS = ("nombre", "unidades", "precio", "costo_var_unit")
+
+_EXTENSIONES = {
+    ".csv": "csv",
+    ".txt": "csv",
+    ".xlsx": "excel",
+    ".xls": "excel",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+    ".arrow": "arrow",
+    ".feather": "arrow",
+    ".ipc": "arrow",
+}
+FORMATOS = ("csv", "excel", "parquet", "arrow")
+
+_VERDADEROS = {"true", "1", "si", "sí", "s", "yes", "y", "x", "verdadero"}
+_FALSOS = {"false", "0", "no", "n", "", "nan", "none", "falso"}
+
+
+class ErrorEsquema(ValueError):
+    pass
+
+
+def detectar_formato(ruta, formato=None):
+    if formato:
+        if formato not in FORMATOS:
+            raise ValueError(f"Formato desconocido '{formato}'; use uno de {', '.join(FORMATOS)}")
+        return formato
+    nombre = getattr(ruta, "name", ruta)
+    if not isinstance(nombre, str):
+        raise ValueError("No se puede deducir el formato; indíquelo con el parámetro 'formato'")
+    extension = os.path.splitext(nombre)[1].lower()
+    if extension not in _EXTENSIONES:
+        raise ValueError(f"Extensión no admitida '{extension}'")
+    return _EXTENSIONES[extension]
+
+
+# Lee un archivo tabular en bloques de DataFrame
+def leer_bloques(ruta, formato=None, tamano_bloque=100_000):
+    formato = detectar_formato(ruta, formato)
+    if formato == "csv":
+        yield from pd.read_csv(ruta, chunksize=tamano_bloque, skipinitialspace=True)
+    elif formato == "parquet":
+        import pyarrow.parquet as pq
+
+        for lote in pq.ParquetFile(ruta).iter_batches(batch_size=tamano_bloque):
+            yield lote.to_pandas()
+    elif formato == "arrow":
+        import pyarrow as pa
+
+        fuente = pa.memory_map(ruta) if isinstance(ruta, str) else ruta
+        try:
+            lector = pa.ipc.open_file(fuente)
+            for i in range(lector.num_record_batches):
+                yield lector.get_batch(i).to_pandas()
+        except pa.ArrowInvalid:
+            if hasattr(fuente, "seek"):
+                fuente.seek(0)
+            for lote in pa.ipc.open_stream(fuente):
+                yield lote.to_pandas()
+    else:
+        # Excel no admite lectura por bloques
+        yield pd.read_excel(ruta)
+
+
+def _columna_numerica(bloque, columna, fila_inicial):
+    valores = pd.to_numeric(bloque[columna], errors="coerce")
+    invalidos = valores.isna() & bloque[columna].notna()
+    if invalidos.any():
+        fila = fila_inicial + int(np.flatnonzero(invalidos.to_numpy())[0]) + 1
+        raise ErrorEsquema(f"Valor no numérico en la columna '{columna}', fila {fila}: {bloque[columna][invalidos].iloc[0]!r}")
+    if (valores < 0).any():
+        fila = fila_inicial + int(np.flatnonzero((valores < 0).to_numpy())[0]) + 1
+        raise ErrorEsquema(f"Valor negativo en la columna '{columna}', fila {fila}")
+    return valores
+
+
+def _columna_booleana(serie, fila_inicial):
+    if serie.dtype == bool:
+        return serie.to_numpy()
+    # Las celdas vacías cuentan como falso, también en columnas numéricas (1, 0, NaN)
+    if pd.api.types.is_numeric_dtype(serie):
+        return (serie.fillna(0) != 0).to_numpy()
+    texto = serie.fillna("").astype(str).str.strip().str.lower()
+    desconocidos = ~texto.isin(_VERDADEROS | _FALSOS)
+    if desconocidos.any():
+        fila = fila_inicial + int(np.flatnonzero(desconocidos.to_numpy())[0]) + 1
+        raise ErrorEsquema(f"Valor no válido en la columna 'relevante', fila {fila}: {serie[desconocidos].iloc[0]!r}")
+    return texto.isin(_VERDADEROS).to_numpy()
+
+
+def _normalizar_columnas(bloque):
+    bloque = bloque.rename(columns=lambda c: str(c).strip().lower())
+    return bloque.rename(columns={"reducción": "reduccion", "costo_var_unitario": "costo_var_unit"})
+
+
+# Valida un bloque de costos fijos y devuelve sus columnas normalizadas
+def validar_costos_fijos(bloque, fila_inicial=0):
+    bloque = _normalizar_columnas(bloque)
+    faltantes = [c for c in ("nombre", "valor1") if c not in bloque.columns]
+    if faltantes:
+        raise ErrorEsquema(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+
+    nombres = bloque["nombre"]
+    vacios = nombres.isna() | (nombres.astype(str).str.strip() == "")
+    if vacios.any():
+        fila = fila_inicial + int(np.flatnonzero(vacios.to_numpy())[0]) + 1
+        raise ErrorEsquema(f"Costo fijo sin nombre en la fila {fila}")
+
+    valor1 = _columna_numerica(bloque, "valor1", fila_inicial).fillna(0)
+    if "reduccion" in bloque.columns:
+        reduccion = _columna_numerica(bloque, "reduccion", fila_inicial).fillna(0)
+        if (reduccion > 100).any():
+            fila = fila_inicial + int(np.flatnonzero((reduccion > 100).to_numpy())[0]) + 1
+            raise ErrorEsquema(f"La reducción debe estar entre 0 y 100 (fila {fila})")
+    else:
+        reduccion = pd.Series(0.0, index=bloque.index)
+
+    # Sin valor 2 se aplica la reducción sobre el valor 1, como en la aplicación
+    derivado = desde_centavos_arreglo(a_centavos_arreglo(valor1.to_numpy(dtype=np.float64) * (100 - reduccion.to_numpy(dtype=np.float64)) / 100))
+    derivado = pd.Series(derivado, index=bloque.index)
+    if "valor2" in bloque.columns:
+        valor2 = _columna_numerica(bloque, "valor2", fila_inicial)
+        valor2 = valor2.where(valor2.notna(), derivado)
+    else:
+        valor2 = derivado
+
+    if "relevante" in bloque.columns:
+        relevante = _columna_booleana(bloque["relevante"], fila_inicial)
+    else:
+        relevante = (valor1 != valor2).to_numpy()
+
+    return {
+        "nombre": nombres.astype(str).str.strip().tolist(),
+        "valor1": valor1.to_numpy(dtype=np.float64),
+        "valor2": valor2.to_numpy(dtype=np.float64),
+        "reduccion": reduccion.to_numpy(dtype=np.float64),
+        "relevante": np.asarray(relevante, dtype=bool),
+    }
+
+
+# Carga un catálogo de costos fijos leyendo y validando el archivo por bloques
+def leer_costos_fijos(ruta, formato=None, tamano_bloque=100_000) -> CatalogoCostosFijos:
+    partes = {c: [] for c in COLUMNAS_COSTOS_FIJOS}
+    fila = 0
+    for bloque in leer_bloques(ruta, formato, tamano_bloque):
+        columnas = validar_costos_fijos(bloque, fila)
+        for nombre, valores in columnas.items():
+            partes[nombre].append(valores)
+        fila += len(bloque)
+
+    def unir(columna):
+        return np.concatenate(partes[columna]) if partes[columna] else np.zeros(0)
+
+    nombres = [nombre for parte in partes["nombre"] for nombre in parte]
+    return CatalogoCostosFijos.desde_columnas(
+        nombres, unir("valor1"), unir("valor2"), unir("reduccion"), unir("relevante").astype(bool)
+    )
+
+
+def leer_alternativas(ruta, formato=None):
+    alternativas = []
+    fila = 0
+    for bloque in leer_bloques(ruta, formato):
+        bloque = _normalizar_columnas(bloque)
+        faltantes = [c for c in COLUMNAS_ALTERNATIVAS if c not in bloque.columns]
+        if faltantes:
+            raise ErrorEsquema(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+        valores = {c: _columna_numerica(bloque, c, fila).fillna(0) for c in COLUMNAS_ALTERNATIVAS[1:]}
+        for j, nombre in enumerate(bloque["nombre"].astype(str)):
+            alternativas.append(Alternativa(
+                nombre.strip(),
+                valores["unidades"].iloc[j].item(),
+                valores["precio"].iloc[j].item(),
+                valores["costo_var_unit"].iloc[j].item(),
+            ))
+        fila += len(bloque)
+    return alternativas
+
+
+# DataFrame con los costos fijos del catálogo
+def tabla_costos_fijos(catalogo) -> pd.DataFrame:
+    columnas = catalogo.columnas()
+    return pd.DataFrame({c: columnas[c] for c in COLUMNAS_COSTOS_FIJOS})
+
+
+# Las tablas de la aplicación mezclan números y celdas vacías (""); para
+# Parquet/Arrow se convierten en columnas numéricas con valores nulos
+def _preparar_para_arrow(df):
+    df = df.copy()
+    for columna in df.columns:
+        if df[columna].dtype == object:
+            valores = df[columna].replace("", None)
+            numeros = pd.to_numeric(valores, errors="coerce")
+            if numeros.notna().sum() == valores.notna().sum():
+                df[columna] = numeros
+            else:
+                df[columna] = df[columna].astype(str)
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+# Escribe un DataFrame en `destino` (ruta o buffer); sin destino devuelve los bytes
+def exportar_tabla(df, destino=None, formato=None):
+    formato = detectar_formato(destino, formato)
+    salida = io.BytesIO() if destino is None else destino
+    if formato == "csv":
+        if isinstance(salida, str):
+            df.to_csv(salida, index=False)
+        else:
+            salida.write(df.to_csv(index=False).encode("utf-8"))
+    elif formato == "excel":
+        df.to_excel(salida, index=False)
+    elif formato == "parquet":
+        _preparar_para_arrow(df).to_parquet(salida, index=False)
+    else:
+        import pyarrow as pa
+
+        tabla = pa.Table.from_pandas(_preparar_para_arrow(df), preserve_index=False)
+        sumidero = pa.OSFile(salida, "wb") if isinstance(salida, str) else salida
+        with pa.ipc.new_file(sumidero, tabla.schema) as escritor:
+            escritor.write_table(tabla)
+        if isinstance(salida, str):
+            sumidero.close()
+    if destino is None:
+        return salida.getvalue()
+    return None
+
+
+# Columnas de un archivo de escenarios por lotes; solo las de unidades, precio y
+# costo variable son obligatorias
+COLUMNAS_ESCENARIOS = (
+    "unidades1", "precio1", "costo_var_unit1",
+    "unidades2", "precio2", "costo_var_unit2",
+    "total_costos_fijos1", "total_costos_fijos2",
+    "total_costos_relevantes1", "total_costos_relevantes2",
+)
+
+
+# Valida un bloque de escenarios y devuelve arreglos (N, 2) listos para `evaluar_lote_totales`.
+# Los totales que falten se toman de `totales_base` (por ejemplo, de un catálogo común).
+def validar_escenarios(bloque, fila_inicial=0, totales_base=None):
+    bloque = _normalizar_columnas(bloque)
+    faltantes = [c for c in COLUMNAS_ESCENARIOS[:6] if c not in bloque.columns]
+    if faltantes:
+        raise ErrorEsquema(f"Faltan columnas obligatorias: {', '.join(faltantes)}")
+
+    n = len(bloque)
+    base = {
+        "total_costos_fijos1": getattr(totales_base, "total_costos_fijos1", 0),
+        "total_costos_fijos2": getattr(totales_base, "total_costos_fijos2", 0),
+        "total_costos_relevantes1": getattr(totales_base, "total_costos_relevantes1", 0),
+        "total_costos_relevantes2": getattr(totales_base, "total_costos_relevantes2", 0),
+    }
+    valores = {}
+    for columna in COLUMNAS_ESCENARIOS:
+        if columna in bloque.columns:
+            serie = _columna_numerica(bloque, columna, fila_inicial)
+            valores[columna] = serie.fillna(base.get(columna, 0)).to_numpy(dtype=np.float64)
+        else:
+            valores[columna] = np.full(n, float(base[columna]))
+
+    def par(prefijo):
+        return np.column_stack([valores[f"{prefijo}1"], valores[f"{prefijo}2"]])
+
+    if "escenario" in bloque.columns:
+        escenarios = bloque["escenario"].astype(str).to_numpy()
+    else:
+        escenarios = np.arange(fila_inicial + 1, fila_inicial + n + 1)
+    return {
+        "escenario": escenarios,
+        "unidades": par("unidades"),
+        "precio": par("precio"),
+        "costo_var_unit": par("costo_var_unit"),
+        "total_costos_fijos": par("total_costos_fijos"),
+        "total_costos_relevantes": par("total_costos_relevantes"),
+    }
+
+
+# Modelos que puede calcular la evaluación de un bloque de escenarios
+MODELOS = ("total", "relevante", "oportunidad")
+
+
+# Evalúa un bloque de escenarios y devuelve la tabla de resultados de los modelos pedidos
+def evaluar_bloque(bloque, fila_inicial=0, totales_base=None, modelos=MODELOS) -> pd.DataFrame:
+    escenarios = validar_escenarios(bloque, fila_inicial, totales_base)
+    lote = evaluar_lote_totales(
+        escenarios["unidades"],
+        escenarios["precio"],
+        escenarios["costo_var_unit"],
+        escenarios["total_costos_fijos"],
+        escenarios["total_costos_relevantes"],
+    )
+    columnas = {"escenario": escenarios["escenario"]}
+    columnas["margen1"], columnas["margen2"] = lote.margen[:, 0], lote.margen[:, 1]
+    if "total" in modelos:
+        columnas["total_costos_fijos1"] = lote.total_costos_fijos[:, 0]
+        columnas["total_costos_fijos2"] = lote.total_costos_fijos[:, 1]
+        columnas["resultado1"], columnas["resultado2"] = lote.resultado[:, 0], lote.resultado[:, 1]
+        columnas["ventaja"] = lote.ventaja
+        columnas["ganadora"] = np.where(lote.ventaja > 0, 1, 2)
+    if "relevante" in modelos:
+        columnas["total_costos_relevantes1"] = lote.total_costos_relevantes[:, 0]
+        columnas["total_costos_relevantes2"] = lote.total_costos_relevantes[:, 1]
+        columnas["resultado_relevante1"] = lote.resultado_relevante[:, 0]
+        columnas["resultado_relevante2"] = lote.resultado_relevante[:, 1]
+        columnas["ventaja_relevante"] = lote.ventaja_relevante
+        columnas["ganadora_relevante"] = np.where(lote.ventaja_relevante > 0, 1, 2)
+    if "oportunidad" in modelos:
+        columnas["costo_oportunidad1"] = lote.costo_oportunidad[:, 0]
+        columnas["costo_oportunidad2"] = lote.costo_oportunidad[:, 1]
+    return pd.DataFrame(columnas)
+
+
+# Escribe resultados por bloques sin mantener el archivo completo en memoria.
+# `destino` puede ser una ruta o un archivo binario abierto (con `formato`).
+class EscritorResultados:
+    def __init__(self, destino, formato=None):
+        self.destino = destino
+        self.formato = detectar_formato(destino, formato)
+        if self.formato == "excel":
+            raise ValueError("Excel no admite escritura por bloques; use csv, parquet o arrow")
+        self._escritor = None
+        self._esquema = None
+        self.filas = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def escribir(self, df):
+        import pyarrow as pa
+
+        tabla = pa.Table.from_pandas(_preparar_para_arrow(df), preserve_index=False)
+        if self._escritor is None:
+            self._esquema = tabla.schema
+            if self.formato == "csv":
+                import pyarrow.csv as pa_csv
+
+                self._escritor = pa_csv.CSVWriter(self.destino, self._esquema)
+            elif self.formato == "parquet":
+                import pyarrow.parquet as pq
+
+                self._escritor = pq.ParquetWriter(self.destino, self._esquema)
+            else:
+                self._escritor = pa.ipc.new_file(self.destino, self._esquema)
+        self._escritor.write_table(tabla.cast(self._esquema))
+        self.filas += len(df)
+
+    def cerrar(self):
+        if self._escritor is not None:
+            self._escritor.close()
+            self._escritor = None
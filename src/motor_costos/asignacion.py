@@ -0,0 +1,192 @@
+"""Asignación de costos fijos compartidos entre alternativas mediante inductores.
+
+Cada centro de costo (un costo fijo compartido) se reparte entre las
+alternativas en proporción a un inductor: unidades, ingreso, costo variable,
+partes iguales o cualquier cantidad propia de cada alternativa (horas
+máquina, metros cuadrados, pesos a medida), como en el costeo basado en
+actividades. Un centro puede limitarse a algunas alternativas.
+
+La asignación es el producto de los valores de los centros (K,) por una
+matriz dispersa de proporciones (K, N). No se construye la matriz completa:
+los centros que se reparten entre todas las alternativas solo dependen de su
+inductor, por lo que se agrupan por inductor y se multiplican por la matriz
+de proporciones inductor × alternativa (M, N); los centros limitados a
+algunas alternativas se recorren como tripletas (centro, alternativa, peso)
+con `np.bincount`. Todo en una sola pasada vectorizada, sin SciPy.
+
+Los totales asignados alimentan los modelos de costo total y de costos
+relevantes (`ResultadoAsignacion.totales` y `evaluar_alternativas(...,
+totales=...)`).
+"""
+
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .dinero import a_centavos_arreglo, desde_centavos, desde_centavos_arreglo
+from .modelos import Alternativa, TotalesCostosFijos
+
+# Inductores que se calculan a partir de los datos de cada alternativa
+INDUCTORES_BASICOS = ("unidades", "ingreso", "costo_variable", "partes_iguales")
+
+
+# Un costo fijo compartido y la forma de repartirlo
+@dataclass(slots=True)
+class CentroCosto:
+    nombre: str
+    valor: float
+    inductor: str = "unidades"
+    relevante: bool = False
+    # Nombres de las alternativas que reciben el costo; None = todas
+    destinos: Optional[Sequence[str]] = None
+
+
+@dataclass
+class ResultadoAsignacion:
+    nombres: List[str]
+    # Costos asignados a cada alternativa, (N,), redondeados al centavo
+    total_costos_fijos: np.ndarray
+    total_costos_relevantes: np.ndarray
+    # Valor de los centros cuyo inductor suma cero entre sus destinos
+    sin_asignar: float
+    sin_asignar_relevante: float
+
+    def __len__(self):
+        return len(self.nombres)
+
+    # Totales para comparar la alternativa `i` con la `j` en los modelos de dos alternativas
+    def totales(self, i=0, j=1) -> TotalesCostosFijos:
+        return TotalesCostosFijos(
+            total_costos_fijos1=_importe(self.total_costos_fijos[i]),
+            total_costos_fijos2=_importe(self.total_costos_fijos[j]),
+            total_costos_relevantes1=_importe(self.total_costos_relevantes[i]),
+            total_costos_relevantes2=_importe(self.total_costos_relevantes[j]),
+        )
+
+    # (totales, relevantes) por alternativa, en el formato de `evaluar_alternativas`
+    def totales_por_alternativa(self):
+        return (
+            [_importe(v) for v in self.total_costos_fijos],
+            [_importe(v) for v in self.total_costos_relevantes],
+        )
+
+
+def _importe(valor):
+    return desde_centavos(a_centavos_arreglo(valor).item())
+
+
+# Matriz de cantidades alternativa × inductor (N, M) con los inductores básicos
+# seguidos de los propios (`inductores`: nombre -> cantidad por alternativa)
+def matriz_de_inductores(alternativas: Sequence[Alternativa], inductores: Optional[Dict[str, Sequence[float]]] = None):
+    n = len(alternativas)
+    inductores = inductores or {}
+    columnas = {
+        "unidades": [a.unidades for a in alternativas],
+        "ingreso": [a.ingreso for a in alternativas],
+        "costo_variable": [a.costo_variable for a in alternativas],
+        "partes_iguales": np.ones(n),
+    }
+    for nombre, cantidades in inductores.items():
+        if nombre in columnas:
+            raise ValueError(f"El inductor '{nombre}' ya existe")
+        if len(cantidades) != n:
+            raise ValueError(f"El inductor '{nombre}' tiene {len(cantidades)} cantidades para {n} alternativas")
+        columnas[nombre] = cantidades
+    cantidades = np.column_stack([np.asarray(c, dtype=np.float64) for c in columnas.values()]) if n else np.zeros((0, len(columnas)))
+    if (cantidades < 0).any():
+        raise ValueError("Las cantidades de los inductores no pueden ser negativas")
+    return list(columnas), cantidades
+
+
+# Reparte K centros entre N alternativas. `inductor` (K,) indica la columna de
+# `cantidades` (N, M) de cada centro. Los centros que aparecen en `filas` solo
+# se reparten entre las alternativas `columnas` de sus tripletas; el resto se
+# reparte entre todas. Devuelve los costos asignados, los relevantes asignados
+# (N,) y lo que quedó sin asignar de cada uno.
+def asignar_columnas(valores, relevante, inductor, cantidades, filas=None, columnas=None):
+    valores = np.asarray(valores, dtype=np.float64)
+    relevante = np.asarray(relevante, dtype=bool)
+    inductor = np.asarray(inductor, dtype=np.int64)
+    cantidades = np.asarray(cantidades, dtype=np.float64)
+    k = len(valores)
+    n, m = cantidades.shape
+    if len(relevante) != k or len(inductor) != k:
+        raise ValueError("valores, relevante e inductor deben tener el mismo largo")
+    if k and (inductor.min() < 0 or inductor.max() >= m):
+        raise ValueError("Hay centros con un inductor fuera de la matriz de cantidades")
+
+    # Una columna por cada vector a repartir: todos los costos y solo los relevantes
+    repartir = np.column_stack([valores, np.where(relevante, valores, 0.0)])
+    asignado = np.zeros((n, 2))
+    sin_asignar = np.zeros(2)
+
+    restringido = np.zeros(k, dtype=bool)
+    if filas is not None:
+        filas = np.asarray(filas, dtype=np.int64)
+        columnas = np.asarray(columnas, dtype=np.int64)
+        restringido[filas] = True
+
+    # Centros repartidos entre todas: se agrupan por inductor, (M, 2)
+    libres = ~restringido
+    por_inductor = np.column_stack([
+        np.bincount(inductor[libres], weights=repartir[libres, c], minlength=m) for c in range(2)
+    ])
+    base = cantidades.sum(axis=0)
+    proporcion = np.divide(cantidades, base, out=np.zeros_like(cantidades), where=base > 0)
+    asignado += proporcion @ por_inductor
+    sin_asignar += por_inductor[base <= 0].sum(axis=0)
+
+    # Centros limitados a algunas alternativas: tripletas (centro, alternativa, peso)
+    if restringido.any():
+        pesos = cantidades[columnas, inductor[filas]]
+        suma = np.bincount(filas, weights=pesos, minlength=k)
+        parte = np.divide(pesos, suma[filas], out=np.zeros_like(pesos), where=suma[filas] > 0)
+        for c in range(2):
+            asignado[:, c] += np.bincount(columnas, weights=repartir[filas, c] * parte, minlength=n)
+        sin_asignar += repartir[restringido & (suma <= 0)].sum(axis=0)
+
+    asignado = desde_centavos_arreglo(a_centavos_arreglo(asignado))
+    return asignado[:, 0], asignado[:, 1], sin_asignar[0].item(), sin_asignar[1].item()
+
+
+# Asigna los centros de costo entre las alternativas
+def asignar(
+    alternativas: Sequence[Alternativa],
+    centros: Sequence[CentroCosto],
+    inductores: Optional[Dict[str, Sequence[float]]] = None,
+) -> ResultadoAsignacion:
+    nombres = [a.nombre for a in alternativas]
+    nombres_inductores, cantidades = matriz_de_inductores(alternativas, inductores)
+    indice_inductor = {nombre: i for i, nombre in enumerate(nombres_inductores)}
+    indice_alternativa = {nombre: i for i, nombre in enumerate(nombres)}
+
+    inductor = np.empty(len(centros), dtype=np.int64)
+    filas, columnas = [], []
+    for k, centro in enumerate(centros):
+        if centro.inductor not in indice_inductor:
+            raise ValueError(f"El centro '{centro.nombre}' usa un inductor desconocido: '{centro.inductor}'")
+        inductor[k] = indice_inductor[centro.inductor]
+        if centro.destinos is not None:
+            desconocidas = [d for d in centro.destinos if d not in indice_alternativa]
+            if desconocidas:
+                raise ValueError(f"El centro '{centro.nombre}' se asigna a alternativas inexistentes: {', '.join(desconocidas)}")
+            for destino in centro.destinos:
+                filas.append(k)
+                columnas.append(indice_alternativa[destino])
+
+    total, relevantes, sin_asignar, sin_asignar_relevante = asignar_columnas(
+        [c.valor for c in centros],
+        [c.relevante for c in centros],
+        inductor,
+        cantidades,
+        filas if filas else None,
+        columnas if filas else None,
+    )
+    return ResultadoAsignacion(
+        nombres=nombres,
+        total_costos_fijos=total,
+        total_costos_relevantes=relevantes,
+        sin_asignar=sin_asignar,
+        sin_asignar_relevante=sin_asignar_relevante,
+    )
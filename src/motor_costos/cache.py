@@ -0,0 +1,164 @@
+"""Memoización de resultados por huella de las entradas.
+
+`huella` produce un hash estable de las entradas normalizadas (dataclasses,
+diccionarios, listas y números), de modo que dos llamadas con los mismos
+datos comparten la misma clave aunque lleguen como objetos distintos.
+`CacheLRU` guarda los resultados con desalojo LRU acotado por cantidad de
+entradas y por tamaño aproximado, y lleva contadores de aciertos y fallos.
+"""
+
+import hashlib
+import json
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, fields, is_dataclass
+from functools import wraps
+from typing import Optional
+
+from .modelos import evaluar, normalizar_costos_fijos
+
+
+def _normalizar(valor):
+    if hasattr(valor, "__huella__"):
+        # Objetos que identifican su propio estado, como el catálogo de costos fijos
+        return _normalizar(valor.__huella__())
+    if is_dataclass(valor) and not isinstance(valor, type):
+        return [type(valor).__name__, {f.name: _normalizar(getattr(valor, f.name)) for f in fields(valor)}]
+    if isinstance(valor, dict):
+        return {str(k): _normalizar(v) for k, v in valor.items()}
+    if isinstance(valor, (list, tuple)):
+        return [_normalizar(v) for v in valor]
+    if hasattr(valor, "tolist"):
+        # Escalares y arreglos de NumPy
+        return _normalizar(valor.tolist())
+    if isinstance(valor, bool) or valor is None or isinstance(valor, str):
+        return valor
+    if isinstance(valor, (int, float)):
+        # 5 y 5.0 producen la misma huella
+        return int(valor) if float(valor).is_integer() else float(valor)
+    return repr(valor)
+
+
+# Hash estable de las entradas normalizadas
+def huella(*partes) -> str:
+    texto = json.dumps(_normalizar(list(partes)), sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.blake2b(texto.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _tamano_aproximado(valor):
+    if hasattr(valor, "memory_usage"):
+        # DataFrame de pandas
+        return int(valor.memory_usage(deep=True).sum())
+    if hasattr(valor, "nbytes"):
+        return int(valor.nbytes)
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(_tamano_aproximado(v) for v in valor)
+    return sys.getsizeof(valor)
+
+
+@dataclass
+class EstadisticasCache:
+    aciertos: int
+    fallos: int
+    desalojos: int
+    entradas: int
+    bytes: int
+
+    @property
+    def tasa_aciertos(self):
+        total = self.aciertos + self.fallos
+        return self.aciertos / total if total else 0.0
+
+
+class CacheLRU:
+    def __init__(self, max_entradas=256, max_bytes: Optional[int] = 256 * 1024 * 1024):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self._datos = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.aciertos = 0
+        self.fallos = 0
+        self.desalojos = 0
+
+    def __len__(self):
+        return len(self._datos)
+
+    def __contains__(self, clave):
+        return clave in self._datos
+
+    def obtener(self, clave, defecto=None):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave][0]
+            self.fallos += 1
+            return defecto
+
+    def guardar(self, clave, valor):
+        tamano = _tamano_aproximado(valor)
+        with self._lock:
+            if clave in self._datos:
+                self._bytes -= self._datos.pop(clave)[1]
+            self._datos[clave] = (valor, tamano)
+            self._bytes += tamano
+            self._desalojar()
+
+    def _desalojar(self):
+        # Se conserva siempre la última entrada aunque supere el límite de bytes
+        while len(self._datos) > 1 and (
+            len(self._datos) > self.max_entradas
+            or (self.max_bytes is not None and self._bytes > self.max_bytes)
+        ):
+            _, (_, tamano) = self._datos.popitem(last=False)
+            self._bytes -= tamano
+            self.desalojos += 1
+
+    def obtener_o_calcular(self, clave, funcion):
+        with self._lock:
+            if clave in self._datos:
+                self._datos.move_to_end(clave)
+                self.aciertos += 1
+                return self._datos[clave][0]
+            self.fallos += 1
+        valor = funcion()
+        self.guardar(clave, valor)
+        return valor
+
+    def limpiar(self):
+        with self._lock:
+            self._datos.clear()
+            self._bytes = 0
+
+    def estadisticas(self) -> EstadisticasCache:
+        with self._lock:
+            return EstadisticasCache(self.aciertos, self.fallos, self.desalojos, len(self._datos), self._bytes)
+
+
+# Decorador que memoiza una función en `cache` usando la huella de sus argumentos
+def memoizar(cache: CacheLRU):
+    def decorador(funcion):
+        @wraps(funcion)
+        def envoltura(*args, **kwargs):
+            clave = huella(funcion.__module__, funcion.__qualname__, args, kwargs)
+            return cache.obtener_o_calcular(clave, lambda: funcion(*args, **kwargs))
+
+        envoltura.cache = cache
+        return envoltura
+
+    return decorador
+
+
+# Cache compartida por el proceso para los resultados de los modelos. Los
+# valores guardados se comparten entre llamadas y no deben modificarse.
+cache_modelos = CacheLRU()
+
+
+# `evaluar` con memoización; los costos fijos se normalizan antes de calcular la
+# huella para que una lista de diccionarios y una de CostoFijo compartan clave
+def evaluar_memoizado(alt1, alt2, costos_fijos):
+    costos_fijos = normalizar_costos_fijos(costos_fijos)
+    clave = huella("evaluar", alt1, alt2, costos_fijos)
+    return cache_modelos.obtener_o_calcular(clave, lambda: evaluar(alt1, alt2, costos_fijos))
@@ -0,0 +1,568 @@
+"""Catálogo columnar de costos fijos con totales incrementales.
+
+Reemplaza la lista de diccionarios `costos_fijos`: cada campo se guarda en
+una columna (arreglos de NumPy para los valores y una lista para los
+nombres) y los totales de costos fijos y de costos relevantes se actualizan
+en O(1) al agregar, editar, eliminar o cambiar la relevancia de un costo.
+
+Los valores se guardan en centavos (enteros de 64 bits), por lo que los
+totales son exactos; `fila`, `columnas` y `totales` los devuelven como
+importes (`motor_costos.dinero`).
+
+Cada costo tiene un identificador estable (su posición en las columnas). Al
+eliminar un costo solo se marca como inactivo, por lo que los
+identificadores del resto no cambian; `compactar` recupera el espacio.
+
+`CatalogoConDelta` permite que varias sesiones compartan un catálogo base
+congelado (de solo lectura) y guarden solo sus propios cambios: costos
+editados, eliminados y agregados. Los totales son los de la base más los del
+delta, que se mantienen en O(1) igual que en el catálogo base. `ramificar`
+deriva de una vista otra que arranca con sus mismos cambios, como las ramas
+de escenarios de `motor_costos.ramas`.
+"""
+
+import itertools
+
+import numpy as np
+
+from .dinero import a_centavos, a_centavos_arreglo, desde_centavos, desde_centavos_arreglo
+from .modelos import TotalesCostosFijos, valor_con_reduccion
+
+_CAMPOS = ("nombre", "valor1", "valor2", "reduccion", "relevante")
+_contador_catalogos = itertools.count(1)
+
+
+# Los porcentajes enteros se devuelven como int, igual que los ingresa la aplicación
+def _numero(valor):
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+class CatalogoCostosFijos:
+    def __init__(self, capacidad=16):
+        capacidad = max(int(capacidad), 1)
+        self._nombres = []
+        # Centavos
+        self._valor1 = np.zeros(capacidad, dtype=np.int64)
+        self._valor2 = np.zeros(capacidad, dtype=np.int64)
+        self._reduccion = np.zeros(capacidad)
+        self._relevante = np.zeros(capacidad, dtype=bool)
+        self._activo = np.zeros(capacidad, dtype=bool)
+        self._n = 0
+        self._activos = 0
+        self._total1 = 0
+        self._total2 = 0
+        self._relevante1 = 0
+        self._relevante2 = 0
+        # Cambia con cada modificación; junto con el identificador del catálogo
+        # forma la huella usada por la caché
+        self._id = next(_contador_catalogos)
+        self.version = 0
+        self._columnas = None
+        self._nombres_minusculas = None
+        self.solo_lectura = False
+
+    @classmethod
+    def desde_dicts(cls, costos_fijos):
+        costos_fijos = list(costos_fijos)
+        catalogo = cls(capacidad=len(costos_fijos) or 16)
+        for costo in costos_fijos:
+            catalogo.agregar(
+                costo["nombre"],
+                costo["valor1"],
+                costo["valor2"],
+                costo.get("reduccion", 0),
+                costo.get("relevante", False),
+            )
+        return catalogo
+
+    # Con `ids` cada costo conserva su identificador (por ejemplo, al reabrir un
+    # escenario guardado); las posiciones intermedias quedan como eliminadas
+    @classmethod
+    def desde_columnas(cls, nombres, valor1, valor2, reduccion=None, relevante=None, ids=None):
+        n = len(nombres)
+        if ids is None:
+            posiciones = slice(0, n)
+            largo = n
+        else:
+            posiciones = np.asarray(ids, dtype=np.int64)
+            largo = int(posiciones.max()) + 1 if n else 0
+        catalogo = cls(capacidad=largo or 16)
+        catalogo._nombres = [""] * largo
+        for i, nombre in zip(range(n) if ids is None else posiciones.tolist(), nombres):
+            catalogo._nombres[i] = str(nombre)
+        catalogo._valor1[posiciones] = a_centavos_arreglo(valor1)
+        catalogo._valor2[posiciones] = a_centavos_arreglo(valor2)
+        if reduccion is not None:
+            catalogo._reduccion[posiciones] = reduccion
+        if relevante is not None:
+            catalogo._relevante[posiciones] = relevante
+        catalogo._activo[posiciones] = True
+        catalogo._n = largo
+        catalogo._activos = n
+        catalogo._recalcular_totales()
+        return catalogo
+
+    def __huella__(self):
+        return ["CatalogoCostosFijos", self._id, self.version]
+
+    def __len__(self):
+        return self._activos
+
+    def __bool__(self):
+        return self._activos > 0
+
+    def __iter__(self):
+        for i in self.ids():
+            yield self.fila(i)
+
+    def _crecer(self):
+        capacidad = len(self._valor1) * 2
+        for nombre in ("_valor1", "_valor2", "_reduccion", "_relevante", "_activo"):
+            actual = getattr(self, nombre)
+            nuevo = np.zeros(capacidad, dtype=actual.dtype)
+            nuevo[: self._n] = actual[: self._n]
+            setattr(self, nombre, nuevo)
+
+    # Copia modificable con los mismos identificadores, versión aparte
+    def copiar(self):
+        copia = CatalogoCostosFijos(capacidad=len(self._valor1))
+        copia._nombres = list(self._nombres)
+        for nombre in ("_valor1", "_valor2", "_reduccion", "_relevante", "_activo"):
+            getattr(copia, nombre)[:] = getattr(self, nombre)
+        copia._n = self._n
+        copia._activos = self._activos
+        copia._total1, copia._total2 = self._total1, self._total2
+        copia._relevante1, copia._relevante2 = self._relevante1, self._relevante2
+        return copia
+
+    # Impide modificar el catálogo, por ejemplo cuando lo comparten varias sesiones
+    def congelar(self):
+        self.solo_lectura = True
+        for nombre in ("_valor1", "_valor2", "_reduccion", "_relevante", "_activo"):
+            getattr(self, nombre).flags.writeable = False
+        return self
+
+    def _verificar_escritura(self):
+        if self.solo_lectura:
+            raise ValueError("El catálogo de costos fijos es de solo lectura")
+
+    def _modificado(self):
+        self.version += 1
+        self._columnas = None
+        self._nombres_minusculas = None
+
+    def _sumar(self, i, signo):
+        valor1 = int(self._valor1[i])
+        valor2 = int(self._valor2[i])
+        self._total1 += signo * valor1
+        self._total2 += signo * valor2
+        if self._relevante[i]:
+            self._relevante1 += signo * valor1
+            self._relevante2 += signo * valor2
+
+    def _recalcular_totales(self):
+        activos = self._activo[: self._n]
+        relevantes = activos & self._relevante[: self._n]
+        self._total1 = self._valor1[: self._n][activos].sum().item()
+        self._total2 = self._valor2[: self._n][activos].sum().item()
+        self._relevante1 = self._valor1[: self._n][relevantes].sum().item()
+        self._relevante2 = self._valor2[: self._n][relevantes].sum().item()
+
+    def _validar(self, i):
+        if not (0 <= i < self._n) or not self._activo[i]:
+            raise KeyError(f"No existe el costo fijo {i}")
+
+    # Agrega un costo fijo y devuelve su identificador
+    def agregar(self, nombre, valor1=0, valor2=0, reduccion=0, relevante=False):
+        self._verificar_escritura()
+        if self._n == len(self._valor1):
+            self._crecer()
+        i = self._n
+        self._nombres.append(nombre)
+        self._valor1[i] = a_centavos(valor1)
+        self._valor2[i] = a_centavos(valor2)
+        self._reduccion[i] = reduccion
+        self._relevante[i] = bool(relevante)
+        self._activo[i] = True
+        self._n += 1
+        self._activos += 1
+        self._sumar(i, 1)
+        self._modificado()
+        return i
+
+    # Deja sin usar los identificadores anteriores a `n`: el próximo costo
+    # agregado recibe al menos `n`
+    def reservar(self, n):
+        self._verificar_escritura()
+        if n <= self._n:
+            return
+        while n > len(self._valor1):
+            self._crecer()
+        self._nombres.extend([""] * (n - self._n))
+        self._n = n
+        self._modificado()
+
+    # Actualiza los campos indicados; devuelve True si algo cambió
+    def actualizar(self, i, **cambios):
+        self._verificar_escritura()
+        self._validar(i)
+        desconocidos = set(cambios) - set(_CAMPOS)
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+        actual = self.fila(i)
+        cambios = {k: v for k, v in cambios.items() if actual[k] != v}
+        if not cambios:
+            return False
+
+        self._sumar(i, -1)
+        if "nombre" in cambios:
+            self._nombres[i] = cambios["nombre"]
+        if "valor1" in cambios:
+            self._valor1[i] = a_centavos(cambios["valor1"])
+        if "valor2" in cambios:
+            self._valor2[i] = a_centavos(cambios["valor2"])
+        if "reduccion" in cambios:
+            self._reduccion[i] = cambios["reduccion"]
+        if "relevante" in cambios:
+            self._relevante[i] = bool(cambios["relevante"])
+        self._sumar(i, 1)
+        self._modificado()
+        return True
+
+    # Aplica la edición de algunas celdas con las reglas de la aplicación: con
+    # reducción % el valor 2 se deriva del valor 1, editar el valor 2 anula la
+    # reducción y, si no se indica, la relevancia sigue a la diferencia de valores
+    def editar(self, i, cambios):
+        self._validar(i)
+        cambios = {k: v for k, v in cambios.items() if v is not None}
+        nuevo = self.fila(i)
+        nuevo.update(cambios)
+        if "valor2" in cambios and "reduccion" not in cambios:
+            nuevo["reduccion"] = 0
+        elif nuevo["reduccion"] > 0 and ("valor1" in cambios or "reduccion" in cambios):
+            nuevo["valor2"] = valor_con_reduccion(nuevo["valor1"], nuevo["reduccion"])
+        if "relevante" not in cambios and {"valor1", "valor2", "reduccion"} & set(cambios):
+            nuevo["relevante"] = nuevo["valor1"] != nuevo["valor2"]
+        return self.actualizar(i, **nuevo)
+
+    def marcar_relevante(self, i, relevante=True):
+        return self.actualizar(i, relevante=relevante)
+
+    def eliminar(self, i):
+        self._verificar_escritura()
+        self._validar(i)
+        self._sumar(i, -1)
+        self._activo[i] = False
+        self._activos -= 1
+        self._modificado()
+
+    def limpiar(self):
+        self._verificar_escritura()
+        self.__init__(capacidad=16)
+
+    # Reubica los costos activos al principio de las columnas. Los identificadores
+    # cambian; se devuelve un diccionario {identificador anterior: nuevo}.
+    def compactar(self):
+        self._verificar_escritura()
+        ids = self.ids()
+        mapa = {int(anterior): nuevo for nuevo, anterior in enumerate(ids)}
+        n = len(ids)
+        self._nombres = [self._nombres[i] for i in ids]
+        for nombre in ("_valor1", "_valor2", "_reduccion", "_relevante"):
+            columna = getattr(self, nombre)
+            columna[:n] = columna[ids]
+        self._activo[:] = False
+        self._activo[:n] = True
+        self._n = n
+        self._modificado()
+        return mapa
+
+    def ids(self):
+        return np.flatnonzero(self._activo[: self._n])
+
+    # Identificadores de los costos cuyo nombre contiene `texto` y, si se indica,
+    # con la relevancia pedida
+    def filtrar(self, texto="", relevante=None):
+        mascara = self._activo[: self._n].copy()
+        if relevante is not None:
+            mascara &= self._relevante[: self._n] == bool(relevante)
+        texto = texto.strip().lower()
+        if texto:
+            if self._nombres_minusculas is None:
+                self._nombres_minusculas = np.array([n.lower() for n in self._nombres], dtype=str)
+            mascara &= np.char.find(self._nombres_minusculas, texto) >= 0
+        return np.flatnonzero(mascara)
+
+    def fila(self, i):
+        return {
+            "nombre": self._nombres[i],
+            "valor1": desde_centavos(self._valor1[i]),
+            "valor2": desde_centavos(self._valor2[i]),
+            "reduccion": _numero(self._reduccion[i]),
+            "relevante": bool(self._relevante[i]),
+        }
+
+    def a_dicts(self):
+        return list(self)
+
+    # Columnas de los costos activos, reutilizadas mientras el catálogo no cambie
+    def columnas(self):
+        if self._columnas is None:
+            ids = self.ids()
+            self._columnas = {
+                "id": ids,
+                "nombre": [self._nombres[i] for i in ids],
+                "valor1": desde_centavos_arreglo(self._valor1[ids]),
+                "valor2": desde_centavos_arreglo(self._valor2[ids]),
+                "reduccion": self._reduccion[ids],
+                "relevante": self._relevante[ids],
+            }
+        return self._columnas
+
+    @property
+    def totales(self) -> TotalesCostosFijos:
+        return TotalesCostosFijos(
+            total_costos_fijos1=desde_centavos(self._total1),
+            total_costos_fijos2=desde_centavos(self._total2),
+            total_costos_relevantes1=desde_centavos(self._relevante1),
+            total_costos_relevantes2=desde_centavos(self._relevante2),
+        )
+
+
+# Fila en centavos para calcular el delta de los totales
+def _centavos(fila):
+    return a_centavos(fila["valor1"]), a_centavos(fila["valor2"]), fila["relevante"]
+
+
+# Vista de una sesión sobre un catálogo base compartido. La base no se
+# modifica: los costos editados se guardan en `_editados` ({id: fila}), los
+# eliminados en `_eliminados` y los agregados en un catálogo propio cuyos
+# identificadores siguen a los de la base.
+class CatalogoConDelta:
+    def __init__(self, base: CatalogoCostosFijos):
+        if not base.solo_lectura:
+            raise ValueError("El catálogo base debe estar congelado (`congelar()`)")
+        self.base = base
+        self._desplazamiento = base._n
+        self._editados = {}
+        self._eliminados = set()
+        self._agregados = CatalogoCostosFijos()
+        # Próximo identificador para un costo agregado, compartido con las vistas
+        # ramificadas de esta: un identificador nunca se reutiliza para otro costo
+        self._siguiente = [self._desplazamiento]
+        # Diferencia de los totales respecto de la base, en centavos
+        self._delta = [0, 0, 0, 0]
+        self._id = next(_contador_catalogos)
+        self.version = 0
+        self._columnas = None
+
+    # Sin cambios la huella es la de la base, de modo que las sesiones que no
+    # editaron el catálogo comparten las entradas de la caché
+    def __huella__(self):
+        if not self.cantidad_cambios():
+            return self.base.__huella__()
+        return ["CatalogoConDelta", self._id, self.version, *self.base.__huella__()[1:]]
+
+    def __len__(self):
+        return len(self.base) - len(self._eliminados) + len(self._agregados)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    def __iter__(self):
+        for i in self.ids():
+            yield self.fila(i)
+
+    # Costos editados, eliminados y agregados respecto de la base
+    def cantidad_cambios(self):
+        return len(self._editados) + len(self._eliminados) + len(self._agregados)
+
+    def _es_base(self, i):
+        return i < self._desplazamiento
+
+    def _validar(self, i):
+        if self._es_base(i):
+            self.base._validar(i)
+            if i in self._eliminados:
+                raise KeyError(f"No existe el costo fijo {i}")
+        else:
+            self._agregados._validar(i - self._desplazamiento)
+
+    def _sumar(self, fila, signo):
+        valor1, valor2, relevante = _centavos(fila)
+        self._delta[0] += signo * valor1
+        self._delta[1] += signo * valor2
+        if relevante:
+            self._delta[2] += signo * valor1
+            self._delta[3] += signo * valor2
+
+    def _modificado(self):
+        self.version += 1
+        self._columnas = None
+
+    def agregar(self, nombre, valor1=0, valor2=0, reduccion=0, relevante=False):
+        self._agregados.reservar(self._siguiente[0] - self._desplazamiento)
+        i = self._agregados.agregar(nombre, valor1, valor2, reduccion, relevante) + self._desplazamiento
+        self._siguiente[0] = i + 1
+        self._modificado()
+        return i
+
+    def actualizar(self, i, **cambios):
+        self._validar(i)
+        if not self._es_base(i):
+            cambio = self._agregados.actualizar(i - self._desplazamiento, **cambios)
+            if cambio:
+                self._modificado()
+            return cambio
+        desconocidos = set(cambios) - set(_CAMPOS)
+        if desconocidos:
+            raise ValueError(f"Campos desconocidos: {', '.join(sorted(desconocidos))}")
+        actual = self.fila(i)
+        nueva = {**actual, **cambios}
+        if nueva == actual:
+            return False
+        # Los montos se guardan redondeados al centavo, igual que en la base
+        nueva["valor1"] = desde_centavos(a_centavos(nueva["valor1"]))
+        nueva["valor2"] = desde_centavos(a_centavos(nueva["valor2"]))
+        nueva["reduccion"] = _numero(nueva["reduccion"])
+        nueva["relevante"] = bool(nueva["relevante"])
+        self._sumar(actual, -1)
+        self._sumar(nueva, 1)
+        # Si la fila vuelve a ser igual a la de la base deja de ser un cambio
+        if nueva == self.base.fila(i):
+            self._editados.pop(i, None)
+        else:
+            self._editados[i] = nueva
+        self._modificado()
+        return True
+
+    # Mismas reglas de edición que el catálogo base
+    editar = CatalogoCostosFijos.editar
+
+    def marcar_relevante(self, i, relevante=True):
+        return self.actualizar(i, relevante=relevante)
+
+    def eliminar(self, i):
+        self._validar(i)
+        if not self._es_base(i):
+            self._agregados.eliminar(i - self._desplazamiento)
+        else:
+            self._sumar(self.fila(i), -1)
+            self._editados.pop(i, None)
+            self._eliminados.add(i)
+        self._modificado()
+
+    def limpiar(self):
+        base = self.base.totales
+        self._editados = {}
+        self._eliminados = set(self.base.ids().tolist())
+        self._agregados = CatalogoCostosFijos()
+        self._delta = [
+            -a_centavos(base.total_costos_fijos1),
+            -a_centavos(base.total_costos_fijos2),
+            -a_centavos(base.total_costos_relevantes1),
+            -a_centavos(base.total_costos_relevantes2),
+        ]
+        self._modificado()
+
+    # Nueva vista sobre la misma base con una copia de los cambios de esta, que
+    # desde ahí evolucionan por separado. Solo se copia el delta; las filas
+    # editadas se comparten porque `actualizar` las reemplaza sin modificarlas.
+    # Los costos que agregue cada una reciben identificadores distintos, de
+    # modo que `ramas.diferencias` no confunde dos costos agregados por separado
+    def ramificar(self):
+        rama = CatalogoConDelta(self.base)
+        rama._editados = dict(self._editados)
+        rama._eliminados = set(self._eliminados)
+        rama._agregados = self._agregados.copiar()
+        rama._siguiente = self._siguiente
+        rama._delta = list(self._delta)
+        return rama
+
+    # Identificadores de los costos que difieren de la base
+    def ids_cambiados(self):
+        agregados = self._agregados.ids() + self._desplazamiento
+        return set(self._editados) | self._eliminados | set(agregados.tolist())
+
+    def contiene(self, i):
+        try:
+            self._validar(i)
+        except KeyError:
+            return False
+        return True
+
+    # Vuelve a la base sin cambios
+    def descartar_cambios(self):
+        self._editados = {}
+        self._eliminados = set()
+        self._agregados = CatalogoCostosFijos()
+        self._delta = [0, 0, 0, 0]
+        self._modificado()
+
+    def _ids_base(self, ids):
+        if not self._eliminados:
+            return ids
+        return ids[~np.isin(ids, np.fromiter(self._eliminados, dtype=np.int64, count=len(self._eliminados)))]
+
+    def ids(self):
+        return np.concatenate([self._ids_base(self.base.ids()), self._agregados.ids() + self._desplazamiento])
+
+    def filtrar(self, texto="", relevante=None):
+        ids = self._ids_base(self.base.filtrar(texto, relevante))
+        if self._editados:
+            # Los costos editados se vuelven a evaluar con sus valores propios
+            editados = np.fromiter(self._editados, dtype=np.int64, count=len(self._editados))
+            ids = ids[~np.isin(ids, editados)]
+            texto = texto.strip().lower()
+            coinciden = [
+                i for i, fila in self._editados.items()
+                if texto in fila["nombre"].lower() and (relevante is None or fila["relevante"] == bool(relevante))
+            ]
+            ids = np.sort(np.concatenate([ids, np.array(coinciden, dtype=np.int64)]))
+        return np.concatenate([ids, self._agregados.filtrar(texto, relevante) + self._desplazamiento])
+
+    def fila(self, i):
+        if not self._es_base(i):
+            return self._agregados.fila(i - self._desplazamiento)
+        if i in self._editados:
+            return dict(self._editados[i])
+        return self.base.fila(i)
+
+    def a_dicts(self):
+        return list(self)
+
+    # Columnas de la base sin los costos eliminados, con los editados
+    # reemplazados y seguidas de los agregados
+    def columnas(self):
+        if self._columnas is None:
+            base = self.base.columnas()
+            conservar = ~np.isin(base["id"], np.fromiter(self._eliminados, dtype=np.int64, count=len(self._eliminados)))
+            columnas = {clave: valores[conservar] for clave, valores in base.items() if clave != "nombre"}
+            nombres = [n for n, conservado in zip(base["nombre"], conservar) if conservado] if self._eliminados else list(base["nombre"])
+            if self._editados:
+                for clave in ("valor1", "valor2", "reduccion", "relevante"):
+                    columnas[clave] = columnas[clave].copy()
+                posiciones = np.searchsorted(columnas["id"], list(self._editados))
+                for posicion, fila in zip(posiciones.tolist(), self._editados.values()):
+                    nombres[posicion] = fila["nombre"]
+                    for clave in ("valor1", "valor2", "reduccion", "relevante"):
+                        columnas[clave][posicion] = fila[clave]
+            agregados = self._agregados.columnas()
+            self._columnas = {
+                "id": np.concatenate([columnas["id"], agregados["id"] + self._desplazamiento]),
+                "nombre": nombres + agregados["nombre"],
+                **{clave: np.concatenate([columnas[clave], agregados[clave]]) for clave in ("valor1", "valor2", "reduccion", "relevante")},
+            }
+        return self._columnas
+
+    @property
+    def totales(self) -> TotalesCostosFijos:
+        base = self.base
+        agregados = self._agregados
+        return TotalesCostosFijos(
+            total_costos_fijos1=desde_centavos(base._total1 + self._delta[0] + agregados._total1),
+            total_costos_fijos2=desde_centavos(base._total2 + self._delta[1] + agregados._total2),
+            total_costos_relevantes1=desde_centavos(base._relevante1 + self._delta[2] + agregados._relevante1),
+            total_costos_relevantes2=desde_centavos(base._relevante2 + self._delta[3] + agregados._relevante2),
+        )
@@ -0,0 +1,147 @@
+"""Ejecución por lotes de los modelos de costo desde la línea de comandos.
+
+Lee un archivo de escenarios (una fila por par de alternativas) y evalúa los
+modelos de costo total, costos relevantes y costo de oportunidad. El archivo
+se procesa por bloques que se reparten en un pool de procesos y los
+resultados se escriben a medida que terminan, en el mismo orden de entrada,
+sin cargar el archivo completo en memoria.
+
+Uso:
+
+    python -m motor_costos escenarios.csv -o resultados.parquet --procesos 4
+
+Códigos de salida (pensados para cron, Airflow y similares): 0 éxito, 1
+error inesperado, 2 uso incorrecto, 3 error en los datos de entrada, 4 error
+al escribir la salida y 130 interrupción por el usuario.
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from . import archivos
+from .archivos import MODELOS, evaluar_bloque
+
+SALIDA_OK = 0
+SALIDA_ERROR = 1
+SALIDA_USO = 2
+SALIDA_DATOS = 3
+SALIDA_ESCRITURA = 4
+SALIDA_INTERRUMPIDO = 130
+
+# Evalúa los bloques en orden; con `procesos` > 1 mantiene a lo sumo dos bloques
+# por proceso en vuelo para acotar la memoria
+def evaluar_bloques(bloques, procesos=1, totales_base=None, modelos=MODELOS):
+    fila = 0
+    if procesos <= 1:
+        for bloque in bloques:
+            yield evaluar_bloque(bloque, fila, totales_base, modelos)
+            fila += len(bloque)
+        return
+
+    with ProcessPoolExecutor(max_workers=procesos) as pool:
+        pendientes = deque()
+        try:
+            for bloque in bloques:
+                pendientes.append(pool.submit(evaluar_bloque, bloque, fila, totales_base, modelos))
+                fila += len(bloque)
+                if len(pendientes) >= 2 * procesos:
+                    yield pendientes.popleft().result()
+            while pendientes:
+                yield pendientes.popleft().result()
+        finally:
+            for futuro in pendientes:
+                futuro.cancel()
+
+
+def _modelos(texto):
+    modelos = tuple(m.strip().lower() for m in texto.split(",") if m.strip())
+    desconocidos = [m for m in modelos if m not in MODELOS]
+    if desconocidos or not modelos:
+        raise argparse.ArgumentTypeError(f"Modelos válidos: {', '.join(MODELOS)}")
+    return modelos
+
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="python -m motor_costos",
+        description="Evalúa por lotes los modelos de costo total, costos relevantes y costo de oportunidad.",
+    )
+    parser.add_argument("escenarios", help="Archivo de escenarios (CSV, Excel, Parquet o Arrow)")
+    parser.add_argument("-o", "--salida", help="Archivo de resultados (CSV, Parquet o Arrow); por defecto CSV por la salida estándar")
+    parser.add_argument("--formato-entrada", choices=archivos.FORMATOS, help="Formato del archivo de escenarios si no se deduce de la extensión")
+    parser.add_argument("--formato-salida", choices=("csv", "parquet", "arrow"), help="Formato de los resultados si no se deduce de la extensión")
+    parser.add_argument("--costos-fijos", help="Catálogo de costos fijos común; sus totales se usan cuando un escenario no trae los suyos")
+    parser.add_argument("--modelos", type=_modelos, default=MODELOS, help="Modelos a calcular, separados por comas (por defecto: total,relevante,oportunidad)")
+    parser.add_argument("--procesos", type=int, default=1, help="Cantidad de procesos; 0 usa todos los núcleos (por defecto: 1)")
+    parser.add_argument("--tamano-bloque", type=int, default=100_000, help="Escenarios por bloque (por defecto: 100000)")
+    parser.add_argument("-q", "--silencioso", action="store_true", help="No mostrar el progreso por la salida de errores")
+    return parser
+
+
+def _informar(mensaje, silencioso):
+    if not silencioso:
+        print(mensaje, file=sys.stderr, flush=True)
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if args.procesos < 0 or args.tamano_bloque <= 0:
+        parser.error("--procesos no puede ser negativo y --tamano-bloque debe ser positivo")
+    if args.salida:
+        try:
+            formato_salida = archivos.detectar_formato(args.salida, args.formato_salida)
+        except ValueError as error:
+            parser.error(str(error))
+        if formato_salida == "excel":
+            parser.error("Excel no admite escritura por bloques; use csv, parquet o arrow")
+    procesos = args.procesos or os.cpu_count() or 1
+
+    inicio = time.perf_counter()
+    escenarios = 0
+    try:
+        totales_base = None
+        if args.costos_fijos:
+            totales_base = archivos.leer_costos_fijos(args.costos_fijos).totales
+
+        bloques = archivos.leer_bloques(args.escenarios, args.formato_entrada, args.tamano_bloque)
+        resultados = evaluar_bloques(bloques, procesos, totales_base, args.modelos)
+        if args.salida:
+            escritor = archivos.EscritorResultados(args.salida, args.formato_salida)
+        else:
+            escritor = archivos.EscritorResultados(sys.stdout.buffer, args.formato_salida or "csv")
+        try:
+            for tabla in resultados:
+                try:
+                    escritor.escribir(tabla)
+                except OSError as error:
+                    _informar(f"Error al escribir los resultados: {error}", False)
+                    return SALIDA_ESCRITURA
+                escenarios += len(tabla)
+                transcurrido = time.perf_counter() - inicio
+                _informar(f"{escenarios:,} escenarios ({escenarios / transcurrido:,.0f} escenarios/s)", args.silencioso)
+        finally:
+            escritor.cerrar()
+    except KeyboardInterrupt:
+        _informar(f"Interrumpido tras {escenarios:,} escenarios", False)
+        return SALIDA_INTERRUMPIDO
+    except (archivos.ErrorEsquema, FileNotFoundError, pd.errors.ParserError, ValueError) as error:
+        _informar(f"Error en los datos de entrada: {error}", False)
+        return SALIDA_DATOS
+    except Exception as error:  # noqa: BLE001 - cualquier otro fallo se informa con código 1
+        _informar(f"Error inesperado: {type(error).__name__}: {error}", False)
+        return SALIDA_ERROR
+
+    transcurrido = time.perf_counter() - inicio
+    _informar(
+        f"Listo: {escenarios:,} escenarios en {transcurrido:.2f} s "
+        f"({escenarios / transcurrido if transcurrido else 0:,.0f} escenarios/s, {procesos} proceso(s))",
+        args.silencioso,
+    )
+    return SALIDA_OK
@@ -0,0 +1,87 @@
+"""Importes exactos al centavo.
+
+Los importes se guardan como enteros en centavos, de modo que sumar y restar
+costos no acumula errores de punto flotante. Al convertir se redondea al
+centavo más cercano (las mitades se alejan del cero) y se devuelve un `int`
+cuando el importe no tiene centavos, igual que los valores que ingresa la
+aplicación.
+"""
+
+from decimal import ROUND_HALF_UP, Decimal
+from numbers import Integral
+
+import numpy as np
+
+CENTAVOS_POR_UNIDAD = 100
+_CENTAVO = Decimal(1)
+
+
+def _decimal(valor):
+    return Decimal(str(valor))
+
+
+# `type(...) is int` evita la comprobación más lenta contra `Integral` en el caso habitual
+def _entero(valor):
+    return type(valor) is int or isinstance(valor, Integral)
+
+
+def a_centavos(valor) -> int:
+    tipo = type(valor)
+    if tipo is int or (tipo is float and valor.is_integer()):
+        return int(valor) * CENTAVOS_POR_UNIDAD
+    if isinstance(valor, Integral) or (isinstance(valor, float) and valor.is_integer()):
+        return int(valor) * CENTAVOS_POR_UNIDAD
+    return int((_decimal(valor) * CENTAVOS_POR_UNIDAD).quantize(_CENTAVO, rounding=ROUND_HALF_UP))
+
+
+def desde_centavos(centavos):
+    centavos = int(centavos)
+    if centavos % CENTAVOS_POR_UNIDAD == 0:
+        return centavos // CENTAVOS_POR_UNIDAD
+    return centavos / CENTAVOS_POR_UNIDAD
+
+
+# Importe redondeado al centavo
+def redondear(valor):
+    return desde_centavos(a_centavos(valor))
+
+
+# Importe de `cantidad` unidades a `precio` cada una, exacto al centavo
+def multiplicar(cantidad, precio):
+    if _entero(cantidad) and _entero(precio):
+        return int(cantidad) * int(precio)
+    return redondear(_decimal(cantidad) * _decimal(precio))
+
+
+def restar(a, b):
+    if _entero(a) and _entero(b):
+        return int(a) - int(b)
+    return desde_centavos(a_centavos(a) - a_centavos(b))
+
+
+# Valor para la alternativa 2 a partir de una reducción porcentual del valor 1
+def aplicar_reduccion(valor, reduccion):
+    return redondear(_decimal(valor) * (100 - _decimal(reduccion)) / 100)
+
+
+# Versión vectorizada de `a_centavos`. El margen sobre la mitad evita que un
+# importe como 0.285 (28.499999... centavos en binario) se redondee hacia abajo.
+def a_centavos_arreglo(valores) -> np.ndarray:
+    valores = np.asarray(valores)
+    if valores.dtype.kind in "biu":
+        return valores.astype(np.int64) * CENTAVOS_POR_UNIDAD
+    centavos = valores.astype(np.float64) * CENTAVOS_POR_UNIDAD
+    centavos += np.copysign(0.5 + 1e-7, centavos)
+    return np.trunc(centavos).astype(np.int64)
+
+
+def desde_centavos_arreglo(centavos) -> np.ndarray:
+    return np.asarray(centavos, dtype=np.int64) / CENTAVOS_POR_UNIDAD
+
+
+# Importes de un arreglo como lista de `int` (o `float` al centavo si alguno tiene centavos)
+def montos(valores):
+    centavos = a_centavos_arreglo(valores)
+    if not (centavos % CENTAVOS_POR_UNIDAD).any():
+        return (centavos // CENTAVOS_POR_UNIDAD).tolist()
+    return desde_centavos_arreglo(centavos).tolist()
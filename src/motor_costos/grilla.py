@@ -0,0 +1,191 @@
+"""Exploración de los modelos sobre una grilla de dos variables.
+
+Evalúa el resultado de cada alternativa y la ventaja de los modelos de costo
+total o de costos relevantes sobre todas las combinaciones de dos variables
+(por ejemplo precio de la alternativa 1 × unidades de la alternativa 2, o %
+de reducción de un costo fijo × nivel de costos fijos), con grillas de hasta
+1000 × 1000 puntos.
+
+Cada variable es una dirección en las columnas de entrada del análisis de
+sensibilidad, de modo que la grilla se evalúa por difusión de NumPy a partir
+de un vector de eje (Py, 1) y otro (1, Px), sin armar una fila por escenario.
+Las grillas que superan `memoria_maxima` se dividen en bloques de filas, que
+pueden repartirse en un pool de procesos (`procesos`).
+
+La ventaja es afín en cada variable tomada por separado, por lo que la curva
+de equilibrio (ventaja = 0) se obtiene en forma cerrada para cada columna de
+la grilla.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .modelos import Alternativa, normalizar_costos_fijos
+from .sensibilidad import _COLUMNAS, _INDICE, Variable, _base, variables_sensibilidad
+
+MAXIMO_PUNTOS = 1000
+# Bytes por punto de la grilla durante la evaluación (entradas y temporales)
+_BYTES_POR_PUNTO = 12 * 8
+
+
+# Valores que toma una variable a lo largo de un eje
+@dataclass
+class Eje:
+    variable: Variable
+    valores: np.ndarray
+
+    @classmethod
+    def lineal(cls, variable, minimo, maximo, puntos):
+        if not 2 <= puntos <= MAXIMO_PUNTOS:
+            raise ValueError(f"Cada eje debe tener entre 2 y {MAXIMO_PUNTOS} puntos")
+        if maximo <= minimo:
+            raise ValueError(f"El máximo de '{variable.etiqueta}' debe ser mayor que el mínimo")
+        return cls(variable, np.linspace(minimo, maximo, puntos))
+
+
+@dataclass
+class ResultadoGrilla:
+    eje_x: Eje
+    eje_y: Eje
+    modelo: str
+    # Resultados y ventaja de la alternativa 1 sobre la 2, forma (Py, Px)
+    resultado1: np.ndarray
+    resultado2: np.ndarray
+    ventaja: np.ndarray
+    # Valor de y en que la ventaja es cero para cada x, (Px,); NaN si no cae en el eje y
+    equilibrio: np.ndarray
+    bloques: int = 1
+
+    @property
+    def gana_alternativa1(self):
+        # En caso de empate gana la alternativa 2, igual que en el modelo escalar
+        return self.ventaja > 0
+
+
+# Variables que pueden usarse como ejes: las del análisis de sensibilidad, el
+# total de costos fijos de cada alternativa y el % de reducción de cada costo
+# fijo de la alternativa 2 respecto de la 1
+def variables_grilla(alt1: Alternativa, alt2: Alternativa, costos_fijos) -> List[Variable]:
+    costos_fijos = normalizar_costos_fijos(costos_fijos)
+    variables = variables_sensibilidad(alt1, alt2, costos_fijos)
+    base = _base(alt1, alt2, costos_fijos)
+    for sufijo, alt in (("1", alt1), ("2", alt2)):
+        total = base[_INDICE[f"total{sufijo}"]]
+        direccion = np.zeros(len(_COLUMNAS))
+        direccion[_INDICE[f"total{sufijo}"]] = 1.0
+        # Al cambiar el nivel se mantiene la proporción de costos relevantes
+        direccion[_INDICE[f"relevante{sufijo}"]] = base[_INDICE[f"relevante{sufijo}"]] / total if total else 0.0
+        variables.append(Variable(f"Total de costos fijos ({alt.nombre})", total, direccion, 0.0))
+    for costo in costos_fijos:
+        if costo.valor1 == 0:
+            continue
+        # valor2 = valor1 * (1 - r / 100): cada punto de reducción resta valor1 / 100
+        direccion = np.zeros(len(_COLUMNAS))
+        direccion[_INDICE["total2"]] = -costo.valor1 / 100
+        if costo.relevante:
+            direccion[_INDICE["relevante2"]] = -costo.valor1 / 100
+        variables.append(Variable(
+            f"% de reducción de {costo.nombre} ({alt2.nombre})",
+            (1 - costo.valor2 / costo.valor1) * 100,
+            direccion,
+            0.0,
+        ))
+    return variables
+
+
+# Resultados de las dos alternativas para un bloque de filas de la grilla
+def _evaluar_bloque(base, direccion_x, delta_x, direccion_y, delta_y, modelo):
+    delta_x = delta_x[np.newaxis, :]
+    delta_y = delta_y[:, np.newaxis]
+
+    def columna(nombre):
+        i = _INDICE[nombre]
+        valor = base[i]
+        if direccion_x[i]:
+            valor = valor + direccion_x[i] * delta_x
+        if direccion_y[i]:
+            valor = valor + direccion_y[i] * delta_y
+        return valor
+
+    fijos = "total" if modelo == "total" else "relevante"
+    forma = (len(delta_y), delta_x.shape[1])
+    resultados = []
+    for sufijo in ("1", "2"):
+        margen = columna(f"unidades{sufijo}") * (columna(f"precio{sufijo}") - columna(f"costo_var_unit{sufijo}"))
+        resultados.append(np.broadcast_to(margen - columna(f"{fijos}{sufijo}"), forma))
+    return resultados
+
+
+def _evaluar_bloque_args(args):
+    return _evaluar_bloque(*args)
+
+
+# Valor de y con ventaja cero en cada columna, a partir de la primera y la
+# última fila (la ventaja es afín en y)
+def _equilibrio(valores_y, primera, ultima):
+    y0, y1 = valores_y[0], valores_y[-1]
+    pendiente = (ultima - primera) / (y1 - y0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        equilibrio = y0 - primera / pendiente
+    fuera = (pendiente == 0) | (equilibrio < min(y0, y1)) | (equilibrio > max(y0, y1))
+    return np.where(fuera, np.nan, equilibrio)
+
+
+# Evalúa el modelo "total" o "relevante" sobre la grilla eje_y × eje_x. Las
+# grillas que ocupan más de `memoria_maxima` bytes se evalúan por bloques de
+# filas; con `procesos` > 1 los bloques se reparten en un pool de procesos (por
+# defecto se evalúan en el mismo proceso, como desde la aplicación web).
+def evaluar_grilla(
+    alt1: Alternativa,
+    alt2: Alternativa,
+    costos_fijos,
+    eje_x: Eje,
+    eje_y: Eje,
+    modelo="total",
+    procesos: Optional[int] = None,
+    memoria_maxima=64 * 1024 ** 2,
+) -> ResultadoGrilla:
+    if modelo not in ("total", "relevante"):
+        raise ValueError("El modelo debe ser 'total' o 'relevante'")
+    if eje_x.variable.etiqueta == eje_y.variable.etiqueta:
+        raise ValueError("Los dos ejes deben usar variables distintas")
+    costos_fijos = normalizar_costos_fijos(costos_fijos)
+    base = _base(alt1, alt2, costos_fijos)
+    valores_x = np.asarray(eje_x.valores, dtype=np.float64)
+    valores_y = np.asarray(eje_y.valores, dtype=np.float64)
+    delta_x = valores_x - eje_x.variable.valor_base
+    delta_y = valores_y - eje_y.variable.valor_base
+
+    filas_por_bloque = max(1, memoria_maxima // (_BYTES_POR_PUNTO * len(valores_x)))
+    n_bloques = math.ceil(len(valores_y) / filas_por_bloque)
+    tareas = [
+        (base, eje_x.variable.direccion, delta_x, eje_y.variable.direccion, delta_y[inicio:inicio + filas_por_bloque], modelo)
+        for inicio in range(0, len(valores_y), filas_por_bloque)
+    ]
+
+    if procesos and procesos > 1 and n_bloques > 1:
+        with ProcessPoolExecutor(max_workers=min(procesos, n_bloques)) as pool:
+            partes = list(pool.map(_evaluar_bloque_args, tareas))
+    else:
+        partes = [_evaluar_bloque_args(tarea) for tarea in tareas]
+
+    if n_bloques == 1:
+        resultado1, resultado2 = (np.ascontiguousarray(r) for r in partes[0])
+    else:
+        resultado1 = np.concatenate([p[0] for p in partes])
+        resultado2 = np.concatenate([p[1] for p in partes])
+    ventaja = resultado1 - resultado2
+    return ResultadoGrilla(
+        eje_x=eje_x,
+        eje_y=eje_y,
+        modelo=modelo,
+        resultado1=resultado1,
+        resultado2=resultado2,
+        ventaja=ventaja,
+        equilibrio=_equilibrio(valores_y, ventaja[0], ventaja[-1]),
+        bloques=n_bloques,
+    )
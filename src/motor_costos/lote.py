@@ -0,0 +1,203 @@
+"""Evaluación vectorizada de los tres modelos sobre muchos escenarios a la vez.
+
+Cada escenario compara dos alternativas. Las entradas son arreglos columnares
+de NumPy con forma ``(N, 2)`` (columna 0 = alternativa 1, columna 1 =
+alternativa 2) y los costos fijos una matriz ``(N, 2, K)`` o ``(2, K)`` que se
+difunde a todos los escenarios.
+
+``evaluar_lote_alternativas`` generaliza lo mismo a ``A`` alternativas por
+escenario, con entradas ``(N, A)`` y costos fijos ``(N, A, K)``.
+"""
+
+from dataclasses import dataclass, fields
+
+import numpy as np
+
+
+@dataclass
+class ResultadoLote:
+    ingreso: np.ndarray
+    costo_variable: np.ndarray
+    margen: np.ndarray
+    total_costos_fijos: np.ndarray
+    total_costos_relevantes: np.ndarray
+    resultado: np.ndarray
+    resultado_relevante: np.ndarray
+    ventaja: np.ndarray
+    ventaja_relevante: np.ndarray
+    costo_oportunidad: np.ndarray
+
+    def __len__(self):
+        return len(self.ventaja)
+
+    @property
+    def gana_alternativa1(self):
+        # En caso de empate gana la alternativa 2, igual que en el modelo escalar
+        return self.ventaja > 0
+
+    # Columnas planas (una por alternativa) para construir tablas o exportar
+    def columnas(self):
+        salida = {}
+        for campo in fields(self):
+            valor = getattr(self, campo.name)
+            if valor.ndim == 2:
+                salida[f"{campo.name}1"] = valor[:, 0]
+                salida[f"{campo.name}2"] = valor[:, 1]
+            else:
+                salida[campo.name] = valor
+        return salida
+
+
+@dataclass
+class ResultadoLoteAlternativas:
+    ingreso: np.ndarray
+    margen: np.ndarray
+    resultado: np.ndarray
+    resultado_relevante: np.ndarray
+    costo_oportunidad: np.ndarray
+    ventaja: np.ndarray
+    ganadora: np.ndarray
+
+    def __len__(self):
+        return len(self.ganadora)
+
+
+def _columnas_alternativas(valor, nombre, alternativas=2):
+    arreglo = np.asarray(valor, dtype=np.float64)
+    if arreglo.ndim == 1:
+        arreglo = arreglo.reshape(1, -1)
+    if arreglo.ndim != 2 or (alternativas is not None and arreglo.shape[1] != alternativas):
+        forma = f"(N, {alternativas})" if alternativas is not None else "(N, A)"
+        raise ValueError(f"'{nombre}' debe tener forma {forma}; se recibió {arreglo.shape}")
+    return arreglo
+
+
+# Totales por alternativa con forma (N, A), o (1, A) si los costos fijos se
+# difunden a todos los escenarios
+def _totales_costos_fijos(costos_fijos, relevante, alternativas=2):
+    if costos_fijos is None:
+        ceros = np.zeros((1, alternativas))
+        return ceros, ceros
+    costos = np.asarray(costos_fijos, dtype=np.float64)
+    if costos.ndim == 2:
+        costos = costos[np.newaxis]
+    if costos.ndim != 3 or costos.shape[1] != alternativas:
+        raise ValueError(
+            f"'costos_fijos' debe tener forma (N, {alternativas}, K) o ({alternativas}, K); se recibió {costos.shape}"
+        )
+
+    total = costos.sum(axis=2)
+    if relevante is None:
+        total_relevante = np.zeros_like(total)
+    else:
+        mascara = np.asarray(relevante, dtype=np.float64)
+        if mascara.shape[-1] != costos.shape[2]:
+            raise ValueError("'relevante' debe tener un valor por costo fijo")
+        if mascara.ndim == 1:
+            total_relevante = costos @ mascara
+        else:
+            # Máscara por escenario (N, K)
+            total_relevante = np.einsum("nak,nk->na", costos, mascara)
+    return total, total_relevante
+
+
+# Cantidad de escenarios: las entradas con una sola fila se difunden a las demás
+def _cantidad_escenarios(**arreglos):
+    try:
+        return np.broadcast_shapes(*((len(a),) for a in arreglos.values()))[0]
+    except ValueError:
+        filas = ", ".join(f"'{nombre}' {len(a)}" for nombre, a in arreglos.items())
+        raise ValueError(f"Las entradas deben tener la misma cantidad de escenarios o una sola fila; filas: {filas}") from None
+
+
+# Costo de oportunidad por fila con un barrido de los dos mejores (O(A) por escenario).
+# En caso de empate gana la última alternativa, como en el modelo escalar.
+def costos_de_oportunidad_lote(resultado):
+    resultado = np.asarray(resultado, dtype=np.float64)
+    filas = np.arange(len(resultado))
+    alternativas = resultado.shape[1]
+    mejor = alternativas - 1 - np.argmax(resultado[:, ::-1], axis=1)
+    valor_mejor = resultado[filas, mejor]
+    resto = resultado.copy()
+    resto[filas, mejor] = -np.inf
+    segundo = resto.max(axis=1)
+    costo_oportunidad = np.broadcast_to(valor_mejor[:, np.newaxis], resultado.shape).copy()
+    costo_oportunidad[filas, mejor] = segundo
+    return costo_oportunidad, mejor
+
+
+# Evalúa costo total, costos relevantes y costo de oportunidad en una sola pasada
+def evaluar_lote(unidades, precio, costo_var_unit, costos_fijos=None, relevante=None) -> ResultadoLote:
+    unidades = _columnas_alternativas(unidades, "unidades")
+    precio = _columnas_alternativas(precio, "precio")
+    costo_var_unit = _columnas_alternativas(costo_var_unit, "costo_var_unit")
+    total_costos_fijos, total_costos_relevantes = _totales_costos_fijos(costos_fijos, relevante)
+    n = _cantidad_escenarios(
+        unidades=unidades, precio=precio, costo_var_unit=costo_var_unit,
+        costos_fijos=total_costos_fijos, relevante=total_costos_relevantes,
+    )
+
+    ingreso = np.broadcast_to(unidades * precio, (n, 2))
+    costo_variable = np.broadcast_to(unidades * costo_var_unit, (n, 2))
+    margen = ingreso - costo_variable
+    total_costos_fijos = np.broadcast_to(total_costos_fijos, (n, 2))
+    total_costos_relevantes = np.broadcast_to(total_costos_relevantes, (n, 2))
+    resultado = margen - total_costos_fijos
+    resultado_relevante = margen - total_costos_relevantes
+
+    return ResultadoLote(
+        ingreso=ingreso,
+        costo_variable=costo_variable,
+        margen=margen,
+        total_costos_fijos=total_costos_fijos,
+        total_costos_relevantes=total_costos_relevantes,
+        resultado=resultado,
+        resultado_relevante=resultado_relevante,
+        ventaja=resultado[:, 0] - resultado[:, 1],
+        ventaja_relevante=resultado_relevante[:, 0] - resultado_relevante[:, 1],
+        # El costo de oportunidad de cada alternativa es el resultado de la otra
+        costo_oportunidad=resultado[:, ::-1],
+    )
+
+
+# Igual que `evaluar_lote`, pero con los costos fijos ya totalizados: arreglos
+# (N, 2) con el total de costos fijos y el total de costos relevantes
+def evaluar_lote_totales(unidades, precio, costo_var_unit, total_costos_fijos, total_costos_relevantes) -> ResultadoLote:
+    total = _columnas_alternativas(total_costos_fijos, "total_costos_fijos")
+    relevantes = _columnas_alternativas(total_costos_relevantes, "total_costos_relevantes")
+    total, relevantes = np.broadcast_arrays(total, relevantes)
+    # Dos "costos" por alternativa: la parte no relevante y la relevante
+    costos = np.stack([total - relevantes, relevantes], axis=2)
+    return evaluar_lote(unidades, precio, costo_var_unit, costos, (False, True))
+
+
+# Evalúa N escenarios de A alternativas cada uno
+def evaluar_lote_alternativas(unidades, precio, costo_var_unit, costos_fijos=None, relevante=None) -> ResultadoLoteAlternativas:
+    unidades = _columnas_alternativas(unidades, "unidades", None)
+    alternativas = unidades.shape[1]
+    if alternativas < 2:
+        raise ValueError("Se necesitan al menos dos alternativas para calcular el costo de oportunidad")
+    precio = _columnas_alternativas(precio, "precio", alternativas)
+    costo_var_unit = _columnas_alternativas(costo_var_unit, "costo_var_unit", alternativas)
+    total_costos_fijos, total_costos_relevantes = _totales_costos_fijos(costos_fijos, relevante, alternativas)
+    n = _cantidad_escenarios(
+        unidades=unidades, precio=precio, costo_var_unit=costo_var_unit,
+        costos_fijos=total_costos_fijos, relevante=total_costos_relevantes,
+    )
+
+    ingreso = np.broadcast_to(unidades * precio, (n, alternativas))
+    margen = ingreso - unidades * costo_var_unit
+    total_costos_fijos = np.broadcast_to(total_costos_fijos, (n, alternativas))
+    total_costos_relevantes = np.broadcast_to(total_costos_relevantes, (n, alternativas))
+    resultado = margen - total_costos_fijos
+    costo_oportunidad, ganadora = costos_de_oportunidad_lote(resultado)
+
+    return ResultadoLoteAlternativas(
+        ingreso=ingreso,
+        margen=margen,
+        resultado=resultado,
+        resultado_relevante=margen - total_costos_relevantes,
+        costo_oportunidad=costo_oportunidad,
+        ventaja=resultado - costo_oportunidad,
+        ganadora=ganadora,
+    )
@@ -0,0 +1,320 @@
+"""Modelos de costo total, costos relevantes y costo de oportunidad.
+
+Este módulo no depende de Streamlit, pandas ni plotly: recibe datos simples
+y devuelve resultados numéricos, de modo que puede usarse desde la
+aplicación web, desde procesos por lotes o desde otros servicios.
+
+Los registros son dataclasses con ``__slots__`` y los importes se calculan al
+centavo (`motor_costos.dinero`), por lo que el resultado de los modelos no
+depende del orden en que se suman los costos.
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import List, Optional, Sequence
+
+from .dinero import a_centavos, aplicar_reduccion, desde_centavos, multiplicar, redondear, restar
+
+
+# Datos básicos de una alternativa (unidades, precio y costo variable unitario)
+@dataclass(slots=True)
+class Alternativa:
+    nombre: str
+    unidades: float = 0
+    precio: float = 0
+    costo_var_unit: float = 0
+
+    @property
+    def ingreso(self):
+        return multiplicar(self.unidades, self.precio)
+
+    @property
+    def costo_variable(self):
+        return multiplicar(self.unidades, self.costo_var_unit)
+
+    @property
+    def margen(self):
+        return restar(self.ingreso, self.costo_variable)
+
+
+# Datos básicos de las dos alternativas que se comparan. Reemplaza al
+# diccionario que devolvía la aplicación; `a_dict` y `desde_dict` convierten
+# sin pérdida entre ambas formas.
+@dataclass(slots=True)
+class DatosBasicos:
+    alt1: Alternativa
+    alt2: Alternativa
+
+    @classmethod
+    def desde_dict(cls, datos):
+        return cls(
+            alt1=Alternativa(datos["nombre_alt1"], datos["unidades1"], datos["precio1"], datos["costo_var_unit1"]),
+            alt2=Alternativa(datos["nombre_alt2"], datos["unidades2"], datos["precio2"], datos["costo_var_unit2"]),
+        )
+
+    def a_dict(self):
+        datos = {}
+        for sufijo, alt in (("1", self.alt1), ("2", self.alt2)):
+            datos[f"nombre_alt{sufijo}"] = alt.nombre
+            datos[f"unidades{sufijo}"] = alt.unidades
+            datos[f"precio{sufijo}"] = alt.precio
+            datos[f"costo_var_unit{sufijo}"] = alt.costo_var_unit
+            datos[f"ingreso{sufijo}"] = alt.ingreso
+            datos[f"costo_variable{sufijo}"] = alt.costo_variable
+            datos[f"margen{sufijo}"] = alt.margen
+        datos["alt1"] = self.alt1
+        datos["alt2"] = self.alt2
+        return datos
+
+
+# Un costo fijo con su valor para cada alternativa
+@dataclass(slots=True)
+class CostoFijo:
+    nombre: str
+    valor1: float = 0
+    valor2: float = 0
+    reduccion: float = 0
+    relevante: bool = False
+
+    @classmethod
+    def desde_dict(cls, costo):
+        return cls(
+            nombre=costo["nombre"],
+            valor1=costo["valor1"],
+            valor2=costo["valor2"],
+            reduccion=costo.get("reduccion", 0),
+            relevante=bool(costo.get("relevante", False)),
+        )
+
+    def a_dict(self):
+        return {
+            "nombre": self.nombre,
+            "valor1": self.valor1,
+            "valor2": self.valor2,
+            "reduccion": self.reduccion,
+            "relevante": self.relevante,
+        }
+
+
+# Un costo fijo con un valor por cada una de N alternativas
+@dataclass(slots=True)
+class CostoFijoMultiple:
+    nombre: str
+    valores: List[float]
+    relevante: bool = False
+
+    @classmethod
+    def desde_costo_fijo(cls, costo):
+        costo = _como_costo_fijo(costo)
+        return cls(costo.nombre, [costo.valor1, costo.valor2], costo.relevante)
+
+
+# Totales de costos fijos y de costos fijos relevantes por alternativa
+@dataclass(slots=True)
+class TotalesCostosFijos:
+    total_costos_fijos1: float = 0
+    total_costos_fijos2: float = 0
+    total_costos_relevantes1: float = 0
+    total_costos_relevantes2: float = 0
+
+
+# Resultado de un modelo: resultado de cada alternativa y ventaja de la 1 sobre la 2
+@dataclass(slots=True)
+class ResultadoModelo:
+    resultado1: float
+    resultado2: float
+
+    @property
+    def ventaja(self):
+        return restar(self.resultado1, self.resultado2)
+
+    @property
+    def gana_alternativa1(self):
+        # En caso de empate se mantiene el criterio de la aplicación: gana la 2
+        return self.ventaja > 0
+
+
+@dataclass(slots=True)
+class ResultadoOportunidad:
+    costo_oportunidad_alt1: float
+    costo_oportunidad_alt2: float
+    ventaja: float
+    mejor_alternativa: str
+
+
+@dataclass(slots=True)
+class ResultadosModelos:
+    total: ResultadoModelo
+    relevante: ResultadoModelo
+    oportunidad: ResultadoOportunidad
+    totales: TotalesCostosFijos = field(default_factory=TotalesCostosFijos)
+
+
+# Valor para la alternativa 2 a partir de una reducción porcentual del valor 1,
+# redondeado al centavo
+def valor_con_reduccion(valor1, reduccion):
+    return aplicar_reduccion(valor1, reduccion)
+
+
+def _como_costo_fijo(costo):
+    return costo if isinstance(costo, CostoFijo) else CostoFijo.desde_dict(costo)
+
+
+def _sumar(valores):
+    return redondear(math.fsum(valores))
+
+
+def normalizar_costos_fijos(costos_fijos) -> List[CostoFijo]:
+    return [_como_costo_fijo(c) for c in costos_fijos]
+
+
+# Función para totalizar costos fijos en una sola pasada
+def totalizar_costos_fijos(costos_fijos) -> TotalesCostosFijos:
+    if hasattr(costos_fijos, "totales"):
+        # El catálogo columnar ya mantiene los totales actualizados
+        return costos_fijos.totales
+    valores1, valores2, relevantes1, relevantes2 = [], [], [], []
+    for costo in costos_fijos:
+        costo = _como_costo_fijo(costo)
+        valores1.append(costo.valor1)
+        valores2.append(costo.valor2)
+        if costo.relevante:
+            relevantes1.append(costo.valor1)
+            relevantes2.append(costo.valor2)
+    # `fsum` suma sin error de redondeo intermedio; el total se lleva al centavo
+    return TotalesCostosFijos(
+        total_costos_fijos1=_sumar(valores1),
+        total_costos_fijos2=_sumar(valores2),
+        total_costos_relevantes1=_sumar(relevantes1),
+        total_costos_relevantes2=_sumar(relevantes2),
+    )
+
+
+# Función para calcular modelo de costo total
+def modelo_costo_total(alt1: Alternativa, alt2: Alternativa, totales: TotalesCostosFijos) -> ResultadoModelo:
+    return ResultadoModelo(
+        resultado1=restar(alt1.margen, totales.total_costos_fijos1),
+        resultado2=restar(alt2.margen, totales.total_costos_fijos2),
+    )
+
+
+# Función para calcular modelo de costos relevantes
+def modelo_costos_relevantes(alt1: Alternativa, alt2: Alternativa, totales: TotalesCostosFijos) -> ResultadoModelo:
+    return ResultadoModelo(
+        resultado1=restar(alt1.margen, totales.total_costos_relevantes1),
+        resultado2=restar(alt2.margen, totales.total_costos_relevantes2),
+    )
+
+
+# Función para calcular modelo de costo de oportunidad
+def modelo_costo_oportunidad(alt1: Alternativa, alt2: Alternativa, total: ResultadoModelo) -> ResultadoOportunidad:
+    # El costo de oportunidad es el resultado de la alternativa no elegida
+    return ResultadoOportunidad(
+        costo_oportunidad_alt1=total.resultado2,
+        costo_oportunidad_alt2=total.resultado1,
+        ventaja=total.ventaja,
+        mejor_alternativa=alt1.nombre if total.gana_alternativa1 else alt2.nombre,
+    )
+
+
+# Evalúa los tres modelos a partir de dos alternativas y una lista de costos fijos
+def evaluar(alt1: Alternativa, alt2: Alternativa, costos_fijos, totales: Optional[TotalesCostosFijos] = None) -> ResultadosModelos:
+    if totales is None:
+        totales = totalizar_costos_fijos(costos_fijos)
+    total = modelo_costo_total(alt1, alt2, totales)
+    relevante = modelo_costos_relevantes(alt1, alt2, totales)
+    oportunidad = modelo_costo_oportunidad(alt1, alt2, total)
+    return ResultadosModelos(total=total, relevante=relevante, oportunidad=oportunidad, totales=totales)
+
+
+# Resultado de una alternativa dentro de una comparación de N alternativas
+@dataclass(slots=True)
+class ResultadoAlternativa:
+    nombre: str
+    margen: float
+    total_costos_fijos: float
+    total_costos_relevantes: float
+    resultado: float
+    resultado_relevante: float
+    costo_oportunidad: float
+    ventaja: float
+    posicion: int = 0
+
+
+# Índice del mejor valor y valor del segundo mejor en una sola pasada.
+# En caso de empate gana la última alternativa, igual que el criterio de
+# dos alternativas (ventaja > 0 para elegir la primera).
+def mejores_dos(valores):
+    mejor = None
+    segundo = float("-inf")
+    for i, valor in enumerate(valores):
+        if mejor is None or valor >= valores[mejor]:
+            if mejor is not None:
+                segundo = valores[mejor]
+            mejor = i
+        elif valor > segundo:
+            segundo = valor
+    return mejor, segundo
+
+
+# El costo de oportunidad de cada alternativa es el mejor resultado al que se renuncia
+def costos_de_oportunidad(resultados: Sequence[float]) -> List[float]:
+    if len(resultados) < 2:
+        raise ValueError("Se necesitan al menos dos alternativas para calcular el costo de oportunidad")
+    mejor, segundo = mejores_dos(resultados)
+    return [segundo if i == mejor else resultados[mejor] for i in range(len(resultados))]
+
+
+def _totales_por_alternativa(costos_fijos, n):
+    totales = [0] * n
+    relevantes = [0] * n
+    for costo in costos_fijos:
+        if not isinstance(costo, CostoFijoMultiple):
+            costo = CostoFijoMultiple.desde_costo_fijo(costo)
+        if len(costo.valores) != n:
+            raise ValueError(f"El costo fijo '{costo.nombre}' tiene {len(costo.valores)} valores para {n} alternativas")
+        for i, valor in enumerate(costo.valores):
+            valor = a_centavos(valor)
+            totales[i] += valor
+            if costo.relevante:
+                relevantes[i] += valor
+    return [desde_centavos(t) for t in totales], [desde_centavos(r) for r in relevantes]
+
+
+# Evalúa los tres modelos para N alternativas y devuelve los resultados en orden
+# de entrada; `ranking` los ordena de mejor a peor resultado. Con `totales`
+# (costos fijos, costos relevantes) por alternativa, por ejemplo de una
+# asignación de costos compartidos, no se recorren los costos fijos. Sin
+# costos fijos ni totales se evalúa solo el margen de cada alternativa.
+def evaluar_alternativas(alternativas: Sequence[Alternativa], costos_fijos=None, totales=None) -> List[ResultadoAlternativa]:
+    n = len(alternativas)
+    if totales is None:
+        totales, relevantes = _totales_por_alternativa(costos_fijos or (), n)
+    else:
+        totales, relevantes = totales
+        if len(totales) != n or len(relevantes) != n:
+            raise ValueError(f"Se recibieron totales para {len(totales)} alternativas y hay {n}")
+    resultados = [restar(alt.margen, total) for alt, total in zip(alternativas, totales)]
+    oportunidad = costos_de_oportunidad(resultados)
+
+    salida = [
+        ResultadoAlternativa(
+            nombre=alt.nombre,
+            margen=alt.margen,
+            total_costos_fijos=totales[i],
+            total_costos_relevantes=relevantes[i],
+            resultado=resultados[i],
+            resultado_relevante=restar(alt.margen, relevantes[i]),
+            costo_oportunidad=oportunidad[i],
+            ventaja=restar(resultados[i], oportunidad[i]),
+        )
+        for i, alt in enumerate(alternativas)
+    ]
+    for posicion, fila in enumerate(ranking(salida), start=1):
+        fila.posicion = posicion
+    return salida
+
+
+def ranking(resultados: Sequence[ResultadoAlternativa]) -> List[ResultadoAlternativa]:
+    # Orden estable de mayor a menor resultado; en empate queda primero la última
+    return sorted(reversed(resultados), key=lambda r: r.resultado, reverse=True)
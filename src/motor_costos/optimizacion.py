@@ -0,0 +1,259 @@
+"""Mezcla óptima de productos con recursos limitados.
+
+Plantea un programa lineal que maximiza la contribución total (margen
+unitario = precio - costo variable unitario, por cantidad) sujeta a la
+capacidad de cada recurso (horas máquina, mano de obra, presupuesto...), a
+mínimos y máximos por producto y, opcionalmente, a cantidades enteras y a
+costos fijos evitables que solo se pagan si el producto se produce.
+
+Con SciPy instalado se resuelve con HiGHS (`scipy.optimize.linprog` y
+`scipy.optimize.milp`). Sin SciPy el programa lineal se resuelve con un
+símplex propio sobre NumPy; las cantidades enteras y los costos fijos
+evitables requieren SciPy.
+
+Además de la mezcla óptima se informan los precios sombra de cada recurso
+(cuánto aumentaría la contribución con una unidad más de capacidad), el
+costo de oportunidad por unidad de cada producto (los recursos que consume
+valorados a sus precios sombra) y su costo reducido.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+_TOLERANCIA = 1e-9
+
+
+@dataclass(slots=True)
+class Recurso:
+    nombre: str
+    capacidad: float
+
+
+@dataclass
+class ResultadoMezcla:
+    nombres: List[str]
+    recursos: List[str]
+    # Cantidad óptima de cada producto, (N,)
+    cantidades: np.ndarray
+    margen_unitario: np.ndarray
+    contribucion: float
+    costos_fijos: float
+    # Uso de cada recurso y su holgura, (R,)
+    uso: np.ndarray
+    holgura: np.ndarray
+    # Aumento de la contribución por unidad adicional de cada recurso, (R,)
+    precios_sombra: np.ndarray
+    # Recursos consumidos por unidad de cada producto, valorados a precio sombra, (N,)
+    costo_oportunidad_unitario: np.ndarray
+    # Margen unitario menos costo de oportunidad unitario, (N,)
+    costo_reducido: np.ndarray
+    motor: str
+    entero: bool = False
+
+    @property
+    def resultado(self):
+        return self.contribucion - self.costos_fijos
+
+    # Recursos agotados por la mezcla óptima
+    @property
+    def activas(self):
+        return self.holgura <= 1e-6 * np.maximum(1.0, np.abs(self.uso))
+
+
+def scipy_disponible():
+    try:
+        import scipy.optimize  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+# Símplex primal de tablero para max c·x con A x <= b, x >= 0 y b >= 0 (el origen
+# es factible). Usa la regla de Dantzig y pasa a la de Bland en los pasos
+# degenerados para no ciclar. Devuelve x y los valores duales de las filas.
+def _simplex(c, A, b, max_iteraciones=50_000):
+    m, n = A.shape
+    tablero = np.zeros((m + 1, n + m + 1))
+    tablero[:m, :n] = A
+    tablero[:m, n:n + m] = np.eye(m)
+    tablero[:m, -1] = b
+    tablero[-1, :n] = -c
+    base = np.arange(n, n + m)
+    bland = False
+
+    for _ in range(max_iteraciones):
+        objetivo = tablero[-1, :-1]
+        candidatos = np.flatnonzero(objetivo < -_TOLERANCIA)
+        if not len(candidatos):
+            break
+        entrante = candidatos[0] if bland else candidatos[np.argmin(objetivo[candidatos])]
+        columna = tablero[:m, entrante]
+        positivos = columna > _TOLERANCIA
+        if not positivos.any():
+            raise ValueError("El problema no está acotado: algún producto con margen positivo no consume recursos limitados ni tiene máximo")
+        razones = np.full(m, np.inf)
+        razones[positivos] = tablero[:m, -1][positivos] / columna[positivos]
+        minima = razones.min()
+        empatadas = np.flatnonzero(razones <= minima + _TOLERANCIA)
+        saliente = empatadas[np.argmin(base[empatadas])]
+        bland = minima <= _TOLERANCIA
+
+        tablero[saliente] /= tablero[saliente, entrante]
+        factores = tablero[:, entrante].copy()
+        factores[saliente] = 0.0
+        tablero -= np.outer(factores, tablero[saliente])
+        base[saliente] = entrante
+    else:
+        raise ValueError("El símplex no convergió")
+
+    x = np.zeros(n + m)
+    x[base] = tablero[:m, -1]
+    return x[:n], tablero[-1, n:n + m].copy()
+
+
+# Límites superiores finitos; sin máximo, el que permiten los recursos
+def _maximos_finitos(consumos, capacidades, minimos, maximos):
+    maximos = maximos.copy()
+    for i in np.flatnonzero(~np.isfinite(maximos)):
+        usa = consumos[:, i] > _TOLERANCIA
+        if not usa.any():
+            raise ValueError("Con costos fijos evitables cada producto necesita un máximo o consumir algún recurso")
+        maximos[i] = max(minimos[i], (capacidades[usa] / consumos[usa, i]).min())
+    return maximos
+
+
+def _resolver_highs(margenes, consumos, capacidades, minimos, maximos, evitables, entero):
+    from scipy.optimize import Bounds, LinearConstraint, linprog, milp
+
+    n = len(margenes)
+    if entero or evitables.any():
+        # Variables: cantidades (N) y, con costos evitables, una binaria por producto (N)
+        con_binarias = bool(evitables.any())
+        if con_binarias:
+            tope = _maximos_finitos(consumos, capacidades, minimos, maximos)
+            r = len(capacidades)
+            objetivo = -np.concatenate([margenes, -evitables])
+            filas = np.vstack([
+                np.hstack([consumos, np.zeros((r, n))]),
+                # x_i - tope_i * z_i <= 0: sin producir no se paga el costo evitable
+                np.hstack([np.eye(n), -np.diag(tope)]),
+            ])
+            superiores = np.concatenate([capacidades, np.zeros(n)])
+            limites = Bounds(np.concatenate([minimos, (minimos > 0).astype(float)]), np.concatenate([maximos, np.ones(n)]))
+            integralidad = np.concatenate([np.full(n, int(entero)), np.ones(n)])
+        else:
+            objetivo = -margenes
+            filas = consumos
+            superiores = capacidades
+            limites = Bounds(minimos, maximos)
+            integralidad = np.ones(n)
+        solucion = milp(objetivo, constraints=LinearConstraint(filas, -np.inf, superiores), integrality=integralidad, bounds=limites)
+        if solucion.status != 0:
+            raise ValueError(f"No se encontró una mezcla factible: {solucion.message}")
+        cantidades = solucion.x[:n]
+        producidos = solucion.x[n:] > 0.5 if con_binarias else np.ones(n, dtype=bool)
+        # Precios sombra de la relajación lineal con la decisión de producir fija
+        relajado = linprog(
+            -margenes,
+            A_ub=consumos if len(capacidades) else None,
+            b_ub=capacidades if len(capacidades) else None,
+            bounds=list(zip(np.where(producidos, minimos, 0.0), np.where(producidos, maximos, 0.0))),
+            method="highs",
+        )
+        duales = -relajado.ineqlin.marginals if relajado.status == 0 and len(capacidades) else np.zeros(len(capacidades))
+        return cantidades, duales
+
+    if not len(capacidades):
+        consumos = capacidades = None
+    solucion = linprog(-margenes, A_ub=consumos, b_ub=capacidades, bounds=list(zip(minimos, maximos)), method="highs")
+    if solucion.status == 2:
+        raise ValueError("No hay una mezcla factible: los mínimos exceden la capacidad de algún recurso")
+    if solucion.status == 3:
+        raise ValueError("El problema no está acotado: algún producto con margen positivo no consume recursos limitados ni tiene máximo")
+    if solucion.status != 0:
+        raise ValueError(f"No se encontró la mezcla óptima: {solucion.message}")
+    return solucion.x, -solucion.ineqlin.marginals if capacidades is not None else np.zeros(0)
+
+
+def _resolver_simplex(margenes, consumos, capacidades, minimos, maximos):
+    # Cambio de variable x = mínimo + y para que el origen sea factible
+    restante = capacidades - consumos @ minimos
+    if (restante < -_TOLERANCIA).any():
+        raise ValueError("No hay una mezcla factible: los mínimos exceden la capacidad de algún recurso")
+    acotados = np.flatnonzero(np.isfinite(maximos))
+    r = len(capacidades)
+    filas = np.vstack([consumos, np.eye(len(margenes))[acotados]])
+    lados = np.concatenate([np.maximum(restante, 0.0), maximos[acotados] - minimos[acotados]])
+    y, duales = _simplex(margenes, filas, lados)
+    return minimos + y, duales[:r]
+
+
+# Mezcla óptima de N productos con R recursos. `consumos` (R, N) es el uso de
+# cada recurso por unidad de cada producto; `minimos` y `maximos` (N,) acotan
+# las cantidades (None o inf = sin máximo); `costos_fijos_evitables` (N,) solo
+# se pagan si el producto se produce; `costos_fijos` es el costo fijo común.
+# `motor` puede ser "highs" o "simplex"; por defecto HiGHS si SciPy está instalado.
+def optimizar_mezcla(
+    nombres: Sequence[str],
+    precio,
+    costo_var_unit,
+    recursos: Sequence[Recurso],
+    consumos,
+    minimos=None,
+    maximos=None,
+    costos_fijos_evitables=None,
+    costos_fijos=0.0,
+    entero=False,
+    motor: Optional[str] = None,
+) -> ResultadoMezcla:
+    n = len(nombres)
+    margenes = np.asarray(precio, dtype=np.float64) - np.asarray(costo_var_unit, dtype=np.float64)
+    consumos = np.asarray(consumos, dtype=np.float64).reshape(len(recursos), n)
+    capacidades = np.array([r.capacidad for r in recursos], dtype=np.float64)
+    minimos = np.zeros(n) if minimos is None else np.asarray(minimos, dtype=np.float64)
+    maximos = np.full(n, np.inf) if maximos is None else np.array(
+        [np.inf if m is None else m for m in maximos], dtype=np.float64
+    )
+    maximos = np.where(np.isnan(maximos), np.inf, maximos)
+    evitables = np.zeros(n) if costos_fijos_evitables is None else np.asarray(costos_fijos_evitables, dtype=np.float64)
+
+    if len(margenes) != n or len(minimos) != n or len(maximos) != n or len(evitables) != n:
+        raise ValueError("Cada producto necesita precio, costo variable unitario, mínimo, máximo y costo evitable")
+    if (consumos < 0).any() or (capacidades < 0).any():
+        raise ValueError("Los consumos y las capacidades no pueden ser negativos")
+    if (minimos < 0).any() or (maximos < minimos).any():
+        raise ValueError("Los mínimos deben ser no negativos y no mayores que los máximos")
+
+    if motor is None:
+        motor = "highs" if scipy_disponible() else "simplex"
+    if motor == "highs":
+        cantidades, precios_sombra = _resolver_highs(margenes, consumos, capacidades, minimos, maximos, evitables, entero)
+    elif motor == "simplex":
+        if entero or evitables.any():
+            raise ImportError("Las cantidades enteras y los costos fijos evitables requieren scipy (pip install scipy)")
+        cantidades, precios_sombra = _resolver_simplex(margenes, consumos, capacidades, minimos, maximos)
+    else:
+        raise ValueError(f"Motor desconocido: {motor}")
+
+    cantidades = np.where(np.abs(cantidades) < 1e-9, 0.0, cantidades)
+    precios_sombra = np.where(np.abs(precios_sombra) < 1e-9, 0.0, precios_sombra)
+    uso = consumos @ cantidades
+    oportunidad = consumos.T @ precios_sombra
+    producidos = cantidades > 1e-9
+    return ResultadoMezcla(
+        nombres=list(nombres),
+        recursos=[r.nombre for r in recursos],
+        cantidades=cantidades,
+        margen_unitario=margenes,
+        contribucion=float(margenes @ cantidades),
+        costos_fijos=float(costos_fijos) + float(evitables[producidos].sum()),
+        uso=uso,
+        holgura=np.maximum(capacidades - uso, 0.0),
+        precios_sombra=precios_sombra,
+        costo_oportunidad_unitario=oportunidad,
+        costo_reducido=margenes - oportunidad,
+        motor=motor,
+        entero=bool(entero),
+    )
@@ -0,0 +1,129 @@
+"""Instrumentación opcional del tiempo de cada etapa de una ejecución.
+
+`Perfilador` mide el tiempo de reloj de etapas con nombre (entrada de datos,
+costos fijos, totales, cálculo de modelos, construcción de tablas y render),
+la cantidad de widgets y el tamaño de las tablas mostradas. Desactivado, sus
+métodos no miden nada, por lo que la instrumentación puede quedar en el
+código sin costo. `HistorialPerfiles` guarda las últimas ejecuciones y las
+exporta como JSON para graficar regresiones.
+"""
+
+import json
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from functools import wraps
+from typing import Dict, List, Optional
+
+
+@dataclass
+class Tabla:
+    nombre: str
+    filas: int
+    columnas: int
+    bytes: int
+
+
+@dataclass
+class EjecucionPerfilada:
+    fecha: str
+    pagina: str
+    total_ms: float
+    # Milisegundos acumulados por etapa, en el orden en que aparecieron. El
+    # tiempo de una etapa no incluye el de las etapas anidadas en ella.
+    etapas: Dict[str, float] = field(default_factory=dict)
+    # Tiempo fuera de toda etapa (importaciones, estilos, navegación)
+    otros_ms: float = 0.0
+    widgets: Optional[int] = None
+    tablas: List[Tabla] = field(default_factory=list)
+
+
+class Perfilador:
+    def __init__(self, activo=True, inicio=None):
+        self.activo = activo
+        self.inicio = time.perf_counter() if inicio is None else inicio
+        self.etapas = {}
+        self.tablas = []
+        # Tiempo de las etapas anidadas dentro de cada etapa abierta
+        self._anidadas = []
+
+    # Suma al total de la etapa el tiempo del bloque; una etapa puede repetirse
+    def etapa(self, nombre):
+        if not self.activo:
+            return nullcontext()
+        return self._medir(nombre)
+
+    @contextmanager
+    def _medir(self, nombre):
+        inicio = time.perf_counter()
+        self._anidadas.append(0.0)
+        try:
+            yield
+        finally:
+            transcurrido = time.perf_counter() - inicio
+            propio = transcurrido - self._anidadas.pop()
+            self.etapas[nombre] = self.etapas.get(nombre, 0.0) + propio * 1000
+            if self._anidadas:
+                self._anidadas[-1] += transcurrido
+
+    # Decorador que mide cada llamada a la función como la etapa `nombre`. Si
+    # el perfilador está activo se decide en cada llamada, de modo que otro
+    # objeto con `etapa` (por ejemplo un intermediario hacia el perfilador de
+    # cada ejecución) puede reutilizar este método.
+    def medir(self, nombre):
+        def decorador(funcion):
+            @wraps(funcion)
+            def envoltura(*args, **kwargs):
+                with self.etapa(nombre):
+                    return funcion(*args, **kwargs)
+
+            return envoltura
+
+        return decorador
+
+    def registrar_tabla(self, nombre, df):
+        if self.activo:
+            filas, columnas = df.shape
+            self.tablas.append(Tabla(nombre, int(filas), int(columnas), int(df.memory_usage(deep=True).sum())))
+
+    def finalizar(self, pagina, widgets=None) -> EjecucionPerfilada:
+        total_ms = (time.perf_counter() - self.inicio) * 1000
+        return EjecucionPerfilada(
+            fecha=datetime.now().isoformat(timespec="seconds"),
+            pagina=pagina,
+            total_ms=total_ms,
+            etapas=dict(self.etapas),
+            otros_ms=max(total_ms - sum(self.etapas.values()), 0.0),
+            widgets=widgets,
+            tablas=list(self.tablas),
+        )
+
+
+# Últimas `maximo` ejecuciones perfiladas de una sesión
+class HistorialPerfiles:
+    def __init__(self, maximo=50):
+        self.ejecuciones = deque(maxlen=maximo)
+
+    def __len__(self):
+        return len(self.ejecuciones)
+
+    def agregar(self, ejecucion: EjecucionPerfilada):
+        self.ejecuciones.append(ejecucion)
+
+    def ultima(self) -> Optional[EjecucionPerfilada]:
+        return self.ejecuciones[-1] if self.ejecuciones else None
+
+    # Una fila por ejecución con el total y una columna por etapa (ms)
+    def filas(self):
+        filas = []
+        for numero, ejecucion in enumerate(self.ejecuciones, 1):
+            fila = {"ejecucion": numero, "pagina": ejecucion.pagina, "total_ms": round(ejecucion.total_ms, 1)}
+            fila.update({etapa: round(ms, 1) for etapa, ms in ejecucion.etapas.items()})
+            fila["otros_ms"] = round(ejecucion.otros_ms, 1)
+            filas.append(fila)
+        return filas
+
+    def a_json(self):
+        return json.dumps([asdict(e) for e in self.ejecuciones], ensure_ascii=False, indent=2)
@@ -0,0 +1,250 @@
+"""Proyección multiperíodo de los modelos de costo con descuento (VAN).
+
+Cada alternativa se expande en una matriz período × partida: ingreso, costo
+variable y cada costo fijo, con tasas de crecimiento por período para las
+unidades, el precio y el costo variable unitario, y una tasa de escalamiento
+para cada costo fijo. El flujo de cada período es el resultado del modelo de
+costo total (o de costos relevantes) en ese período; su valor actual neto
+descuenta los flujos al final de cada período y resta la inversión inicial.
+
+`proyectar_lote` trabaja sobre ``S`` escenarios y ``T`` períodos a la vez con
+arreglos ``(S, 2, T)``; los costos fijos ``(2, K)`` o ``(S, 2, K)`` se
+llevan a totales por período con un producto matricial contra los factores
+de escalamiento ``(K, T)``, sin recorrer los costos uno por uno.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .lote import _cantidad_escenarios, _columnas_alternativas
+from .modelos import Alternativa, normalizar_costos_fijos
+
+
+@dataclass
+class Crecimiento:
+    # Tasas por período (0.03 = 3 %)
+    unidades: float = 0.0
+    precio: float = 0.0
+    costo_var_unit: float = 0.0
+    # Escalamiento de los costos fijos que no tengan una tasa propia
+    costos_fijos: float = 0.0
+
+
+@dataclass
+class ResultadoProyeccionLote:
+    # Flujos por período, forma (S, 2, T)
+    ingreso: np.ndarray
+    costo_variable: np.ndarray
+    costos_fijos: np.ndarray
+    costos_relevantes: np.ndarray
+    flujo: np.ndarray
+    flujo_relevante: np.ndarray
+    # Resultado acumulado descontado, incluida la inversión inicial, (S, 2, T)
+    acumulado: np.ndarray
+    # Valor actual neto de cada alternativa, (S, 2)
+    van: np.ndarray
+    van_relevante: np.ndarray
+    # Diferencias alternativa 1 - alternativa 2, (S,)
+    ventaja_van: np.ndarray
+    ventaja_van_relevante: np.ndarray
+    # Primer período (1..T) desde el cual la alternativa que va adelante en el
+    # acumulado ya no cambia; 0 si no hay cruce. (S,)
+    cruce: np.ndarray
+
+    def __len__(self):
+        return len(self.van)
+
+    @property
+    def gana_alternativa1(self):
+        # En caso de empate gana la alternativa 2, igual que en el modelo escalar
+        return self.ventaja_van > 0
+
+
+@dataclass
+class Proyeccion:
+    nombres: List[str]
+    # Partidas de la matriz: ingreso, costo variable y cada costo fijo
+    partidas: List[str]
+    # Matriz período × partida de cada alternativa, forma (2, T, P). Los costos van con signo negativo.
+    matriz: np.ndarray
+    resultado: ResultadoProyeccionLote
+
+    @property
+    def periodos(self):
+        return self.matriz.shape[1]
+
+
+# Tasa por período equivalente a una tasa anual (por ejemplo, 12 períodos por año)
+def tasa_periodica(tasa_anual, periodos_por_anio=1):
+    return (1 + np.asarray(tasa_anual, dtype=np.float64)) ** (1 / periodos_por_anio) - 1
+
+
+# Factores (1 + tasa)^t para t = 0..T-1, con la tasa difundida sobre las dimensiones previas
+def _factores(tasa, periodos):
+    return (1 + np.asarray(tasa, dtype=np.float64))[..., np.newaxis] ** np.arange(periodos)
+
+
+# Primer período desde el cual el signo de la ventaja acumulada ya no cambia.
+# `inicial` es la ventaja en t = 0 (la diferencia de inversiones, con signo
+# negativo): un cambio de signo entre t = 0 y el período 1 también es un
+# cruce. Si las inversiones son iguales, en t = 0 no va adelante ninguna.
+def _periodo_de_cruce(diferencia, inicial):
+    signo = diferencia > 0
+    signo_inicial = np.where(inicial != 0, inicial > 0, signo[:, 0])
+    signo = np.column_stack([signo_inicial, signo])
+    cambios = signo[:, 1:] != signo[:, :-1]
+    # Último cambio de signo; el cambio entre t y t+1 se ve en el período t+1
+    ultimo = cambios.shape[1] - 1 - np.argmax(cambios[:, ::-1], axis=1)
+    return np.where(cambios.any(axis=1), ultimo + 1, 0)
+
+
+# Proyecta S escenarios a T períodos. `unidades`, `precio` y `costo_var_unit` son
+# (S, 2); las tasas de crecimiento son escalares o arreglos difundibles a (S, 2);
+# `escalamiento` es un escalar, una tasa por costo fijo (K,) o por alternativa y
+# costo (2, K); `tasa_descuento` es un escalar o (S,); `inversion` es el
+# desembolso inicial (S, 2) en t = 0.
+def proyectar_lote(
+    unidades,
+    precio,
+    costo_var_unit,
+    periodos,
+    costos_fijos=None,
+    relevante=None,
+    crecimiento_unidades=0.0,
+    crecimiento_precio=0.0,
+    crecimiento_costo_var_unit=0.0,
+    escalamiento=0.0,
+    tasa_descuento=0.0,
+    inversion=0.0,
+) -> ResultadoProyeccionLote:
+    if periodos < 1:
+        raise ValueError("La proyección necesita al menos un período")
+    unidades = _columnas_alternativas(unidades, "unidades")
+    precio = _columnas_alternativas(precio, "precio")
+    costo_var_unit = _columnas_alternativas(costo_var_unit, "costo_var_unit")
+    if costos_fijos is not None:
+        costos = np.asarray(costos_fijos, dtype=np.float64)
+        if costos.ndim == 2:
+            costos = costos[np.newaxis]
+    inversion = np.asarray(inversion, dtype=np.float64)
+    inversion = np.broadcast_to(inversion, (len(inversion) if inversion.ndim == 2 else 1, 2))
+    tasa = np.asarray(tasa_descuento, dtype=np.float64).reshape(-1, 1, 1)
+    s = _cantidad_escenarios(
+        unidades=unidades, precio=precio, costo_var_unit=costo_var_unit, inversion=inversion, tasa_descuento=tasa,
+        **({} if costos_fijos is None else {"costos_fijos": costos}),
+    )
+    forma = (s, 2, periodos)
+
+    factor_unidades = _factores(crecimiento_unidades, periodos)
+    cantidad = unidades[..., np.newaxis] * factor_unidades
+    ingreso = np.broadcast_to(cantidad * precio[..., np.newaxis] * _factores(crecimiento_precio, periodos), forma)
+    costo_variable = np.broadcast_to(
+        cantidad * costo_var_unit[..., np.newaxis] * _factores(crecimiento_costo_var_unit, periodos), forma
+    )
+
+    if costos_fijos is None:
+        fijos = relevantes = np.zeros(forma)
+    else:
+        k = costos.shape[-1]
+        escala = _factores(np.broadcast_to(np.asarray(escalamiento, dtype=np.float64), (2, k)), periodos)
+        fijos = np.broadcast_to(np.einsum("sak,akt->sat", costos, escala), forma)
+        if relevante is None:
+            relevantes = np.zeros(forma)
+        else:
+            mascara = np.asarray(relevante, dtype=bool)
+            relevantes = np.broadcast_to(np.einsum("sak,akt->sat", costos[..., mascara], escala[:, mascara]), forma)
+
+    margen = ingreso - costo_variable
+    flujo = margen - fijos
+    flujo_relevante = margen - relevantes
+
+    descuento = (1 + tasa) ** -np.arange(1, periodos + 1)
+    inversion = np.broadcast_to(inversion, (s, 2))
+    descontado = flujo * descuento
+    acumulado = np.cumsum(descontado, axis=2) - inversion[..., np.newaxis]
+    van = acumulado[:, :, -1]
+    van_relevante = (flujo_relevante * descuento).sum(axis=2) - inversion
+
+    return ResultadoProyeccionLote(
+        ingreso=ingreso,
+        costo_variable=costo_variable,
+        costos_fijos=fijos,
+        costos_relevantes=relevantes,
+        flujo=flujo,
+        flujo_relevante=flujo_relevante,
+        acumulado=acumulado,
+        van=van,
+        van_relevante=van_relevante,
+        ventaja_van=van[:, 0] - van[:, 1],
+        ventaja_van_relevante=van_relevante[:, 0] - van_relevante[:, 1],
+        cruce=_periodo_de_cruce(acumulado[:, 0] - acumulado[:, 1], inversion[:, 1] - inversion[:, 0]),
+    )
+
+
+# Proyección de un escenario con la matriz período × partida de cada alternativa.
+# `escalamiento` puede asignar a algunos costos fijos (por nombre) una tasa propia.
+def proyectar(
+    alt1: Alternativa,
+    alt2: Alternativa,
+    costos_fijos,
+    periodos,
+    crecimiento1: Optional[Crecimiento] = None,
+    crecimiento2: Optional[Crecimiento] = None,
+    tasa_descuento=0.0,
+    escalamiento: Optional[dict] = None,
+    inversion=(0.0, 0.0),
+) -> Proyeccion:
+    crecimiento1 = crecimiento1 or Crecimiento()
+    crecimiento2 = crecimiento2 or Crecimiento()
+    if hasattr(costos_fijos, "columnas"):
+        # Catálogo columnar: se usan sus columnas sin convertir fila por fila
+        columnas = costos_fijos.columnas()
+        nombres_costos = columnas["nombre"]
+        valores = np.stack([columnas["valor1"], columnas["valor2"]])
+        relevante = columnas["relevante"]
+    else:
+        costos = normalizar_costos_fijos(costos_fijos)
+        nombres_costos = [c.nombre for c in costos]
+        valores = np.array([[c.valor1 for c in costos], [c.valor2 for c in costos]], dtype=np.float64).reshape(2, -1)
+        relevante = np.array([c.relevante for c in costos], dtype=bool)
+
+    escalamiento = escalamiento or {}
+    # Tasas por alternativa y por costo: (2, K)
+    tasas = np.array([
+        [escalamiento.get(nombre, crecimiento.costos_fijos) for nombre in nombres_costos]
+        for crecimiento in (crecimiento1, crecimiento2)
+    ], dtype=np.float64).reshape(2, -1)
+
+    def par(campo):
+        return np.array([[getattr(crecimiento1, campo), getattr(crecimiento2, campo)]])
+
+    resultado = proyectar_lote(
+        [[alt1.unidades, alt2.unidades]],
+        [[alt1.precio, alt2.precio]],
+        [[alt1.costo_var_unit, alt2.costo_var_unit]],
+        periodos,
+        costos_fijos=valores,
+        relevante=relevante,
+        crecimiento_unidades=par("unidades"),
+        crecimiento_precio=par("precio"),
+        crecimiento_costo_var_unit=par("costo_var_unit"),
+        escalamiento=tasas,
+        tasa_descuento=tasa_descuento,
+        inversion=[inversion],
+    )
+
+    # Costos fijos por período de cada alternativa, (2, T, K)
+    costos_periodo = valores[:, np.newaxis, :] * np.swapaxes(_factores(tasas, periodos), 1, 2)
+    matriz = np.concatenate([
+        resultado.ingreso[0][..., np.newaxis],
+        -resultado.costo_variable[0][..., np.newaxis],
+        -costos_periodo,
+    ], axis=2)
+    return Proyeccion(
+        nombres=[alt1.nombre, alt2.nombre],
+        partidas=["Ingreso", "Costo variable"] + list(nombres_costos),
+        matriz=matriz,
+        resultado=resultado,
+    )
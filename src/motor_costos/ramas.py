@@ -0,0 +1,159 @@
+"""Ramas de escenarios what-if que comparten los costos fijos con su padre.
+
+Un `ArbolEscenarios` parte de un escenario base (datos básicos y catálogo de
+costos fijos) y deriva ramas de la base o de otras ramas, por ejemplo "20 %
+de reducción del arriendo" y, de esa, "con 10 % más de unidades". El
+catálogo de la base se congela una sola vez y cada rama es una vista
+`CatalogoConDelta` sobre él: al ramificar solo se copia el delta del padre
+(costos editados, eliminados y agregados), por lo que cientos de ramas sobre
+un catálogo de 10.000 costos ocupan lo que ocupan sus cambios.
+
+Los totales de cada rama son los de la base más su delta, mantenidos en O(1)
+al editar un costo, y los tres modelos se evalúan a partir de esos totales
+sin recorrer el catálogo. `diferencias` compara dos ramas revisando solo los
+costos que alguna de las dos cambió respecto de la base.
+"""
+
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Tuple
+
+from .catalogo import CatalogoConDelta, CatalogoCostosFijos
+from .modelos import DatosBasicos, ResultadosModelos, evaluar
+
+NOMBRE_BASE = "Base"
+# Datos básicos que puede cambiar una rama y su nombre para mostrar
+_CAMPOS_DATOS = {"unidades": "Unidades", "precio": "Precio", "costo_var_unit": "Costo variable unitario"}
+
+
+@dataclass
+class Rama:
+    nombre: str
+    padre: Optional[str]
+    datos_basicos: DatosBasicos
+    costos_fijos: CatalogoConDelta
+
+    # Costos editados, eliminados y agregados respecto de la base del árbol
+    @property
+    def cambios(self):
+        return self.costos_fijos.cantidad_cambios()
+
+
+@dataclass
+class DiferenciaCosto:
+    id: int
+    nombre: str
+    # Fila del costo en cada rama; None si no existe en ella
+    antes: Optional[dict]
+    despues: Optional[dict]
+
+
+@dataclass
+class DiferenciasRamas:
+    rama: str
+    otra: str
+    # "Campo (alternativa)" de los datos básicos: (valor en `otra`, valor en `rama`)
+    datos: Dict[str, Tuple] = field(default_factory=dict)
+    costos: List[DiferenciaCosto] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.datos or self.costos)
+
+
+# Vista sobre un catálogo congelado. Un catálogo modificable se copia una vez;
+# una vista existente se ramifica para compartir su base.
+def _vista(costos_fijos):
+    if isinstance(costos_fijos, CatalogoConDelta):
+        return costos_fijos.ramificar()
+    if isinstance(costos_fijos, CatalogoCostosFijos):
+        return CatalogoConDelta(costos_fijos.copiar().congelar())
+    return CatalogoConDelta(CatalogoCostosFijos.desde_dicts(costos_fijos).congelar())
+
+
+class ArbolEscenarios:
+    def __init__(self, datos_basicos: DatosBasicos, costos_fijos, nombre_base=NOMBRE_BASE):
+        self.nombre_base = nombre_base
+        self._ramas = {nombre_base: Rama(nombre_base, None, datos_basicos, _vista(costos_fijos))}
+
+    def __len__(self):
+        return len(self._ramas)
+
+    def __iter__(self):
+        return iter(self._ramas.values())
+
+    def __contains__(self, nombre):
+        return nombre in self._ramas
+
+    def __getitem__(self, nombre) -> Rama:
+        try:
+            return self._ramas[nombre]
+        except KeyError:
+            raise KeyError(f"No existe la rama '{nombre}'") from None
+
+    def nombres(self):
+        return list(self._ramas)
+
+    # Nueva rama con los datos básicos y los costos fijos actuales de `padre`
+    # (por defecto, la base)
+    def ramificar(self, nombre, padre=None) -> Rama:
+        nombre = nombre.strip()
+        if not nombre:
+            raise ValueError("Ingrese un nombre para la rama")
+        if nombre in self._ramas:
+            raise ValueError(f"Ya existe la rama '{nombre}'")
+        origen = self[padre or self.nombre_base]
+        rama = Rama(nombre, origen.nombre, replace(origen.datos_basicos), origen.costos_fijos.ramificar())
+        self._ramas[nombre] = rama
+        return rama
+
+    def hijas(self, nombre):
+        return [r.nombre for r in self._ramas.values() if r.padre == nombre]
+
+    # Elimina una rama y las que derivan de ella; devuelve los nombres eliminados
+    def eliminar(self, nombre):
+        if nombre == self.nombre_base:
+            raise ValueError("La base no puede eliminarse")
+        if nombre not in self._ramas:
+            raise KeyError(f"No existe la rama '{nombre}'")
+        eliminadas = [nombre]
+        for eliminada in eliminadas:
+            eliminadas.extend(self.hijas(eliminada))
+        for eliminada in eliminadas:
+            del self._ramas[eliminada]
+        return eliminadas
+
+    # Cambia los datos básicos de una rama: `alternativa` 1 o 2 y campos de
+    # `Alternativa` (unidades, precio, costo_var_unit)
+    def editar_datos(self, nombre, alternativa, **cambios):
+        rama = self[nombre]
+        datos = rama.datos_basicos
+        if alternativa == 1:
+            rama.datos_basicos = DatosBasicos(replace(datos.alt1, **cambios), datos.alt2)
+        elif alternativa == 2:
+            rama.datos_basicos = DatosBasicos(datos.alt1, replace(datos.alt2, **cambios))
+        else:
+            raise ValueError("La alternativa debe ser 1 o 2")
+
+    # Los tres modelos a partir de los totales de la rama (base más delta)
+    def evaluar(self, nombre) -> ResultadosModelos:
+        rama = self[nombre]
+        catalogo = rama.costos_fijos
+        return evaluar(rama.datos_basicos.alt1, rama.datos_basicos.alt2, catalogo, catalogo.totales)
+
+    # Cambios de `nombre` respecto de `otra` (por defecto, su padre). Solo se
+    # revisan los costos que alguna de las dos ramas cambió respecto de la base.
+    def diferencias(self, nombre, otra=None) -> DiferenciasRamas:
+        rama = self[nombre]
+        otra = self[otra or rama.padre or nombre]
+        diferencias = DiferenciasRamas(rama=rama.nombre, otra=otra.nombre)
+        for alt_otra, alt_rama in zip((otra.datos_basicos.alt1, otra.datos_basicos.alt2), (rama.datos_basicos.alt1, rama.datos_basicos.alt2)):
+            for campo, etiqueta in _CAMPOS_DATOS.items():
+                antes, despues = getattr(alt_otra, campo), getattr(alt_rama, campo)
+                if antes != despues:
+                    diferencias.datos[f"{etiqueta} ({alt_rama.nombre})"] = (antes, despues)
+        catalogo_rama, catalogo_otra = rama.costos_fijos, otra.costos_fijos
+        for i in sorted(catalogo_rama.ids_cambiados() | catalogo_otra.ids_cambiados()):
+            antes = catalogo_otra.fila(i) if catalogo_otra.contiene(i) else None
+            despues = catalogo_rama.fila(i) if catalogo_rama.contiene(i) else None
+            if antes != despues:
+                diferencias.costos.append(DiferenciaCosto(i, (despues or antes)["nombre"], antes, despues))
+        return diferencias
@@ -0,0 +1,137 @@
+"""Resúmenes de distribuciones para graficar millones de resultados.
+
+Los gráficos de distribución (de una simulación o de una evaluación por
+lotes) se arman con histogramas por intervalos y resúmenes de cuantiles que
+se calculan acá, de modo que el navegador recibe unas decenas de barras y no
+las filas de resultados.
+
+`AcumuladorDistribucion` procesa los resultados por bloques con memoria
+acotada: lleva en forma exacta la cantidad, la suma, el mínimo, el máximo y
+los valores positivos, y conserva una muestra aleatoria uniforme de tamaño
+fijo (se queda con las filas de menor clave aleatoria) de la que se
+obtienen el histograma y los cuantiles. Con menos filas que el tamaño de la
+muestra el resumen es exacto.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Sequence
+
+import numpy as np
+
+PERCENTILES = (1, 5, 25, 50, 75, 95, 99)
+INTERVALOS = 50
+
+
+# Histograma por intervalos: `conteos` (B,) entre `bordes` (B + 1,)
+@dataclass
+class Histograma:
+    bordes: np.ndarray
+    conteos: np.ndarray
+
+    @property
+    def n(self):
+        return int(self.conteos.sum())
+
+    @property
+    def centros(self):
+        return (self.bordes[:-1] + self.bordes[1:]) / 2
+
+    @property
+    def anchos(self):
+        return np.diff(self.bordes)
+
+    # Proporción de valores en cada intervalo
+    @property
+    def proporciones(self):
+        n = self.n
+        return self.conteos / n if n else np.zeros(len(self.conteos))
+
+
+@dataclass
+class ResumenDistribucion:
+    n: int
+    media: float
+    minimo: float
+    maximo: float
+    # Proporción de valores mayores que cero (por ejemplo, ventaja de la alternativa 1)
+    proporcion_positivos: float
+    percentiles: Dict[int, float]
+    histograma: Histograma
+    # Cantidad de valores de los que salen el histograma y los percentiles
+    n_muestra: int = 0
+
+    @property
+    def exacto(self):
+        return self.n_muestra == self.n
+
+
+def histograma(valores, intervalos=INTERVALOS, rango=None) -> Histograma:
+    valores = np.asarray(valores, dtype=np.float64)
+    if rango is None:
+        rango = (float(valores.min()), float(valores.max())) if len(valores) else (0.0, 1.0)
+    if rango[0] == rango[1]:
+        rango = (rango[0] - 0.5, rango[1] + 0.5)
+    conteos, bordes = np.histogram(valores, bins=intervalos, range=rango)
+    return Histograma(bordes, conteos)
+
+
+def cuantiles(valores, percentiles: Sequence[int] = PERCENTILES) -> Dict[int, float]:
+    if not len(valores):
+        return {p: float("nan") for p in percentiles}
+    return {p: float(v) for p, v in zip(percentiles, np.percentile(valores, percentiles))}
+
+
+def resumir(valores, intervalos=INTERVALOS, percentiles: Sequence[int] = PERCENTILES) -> ResumenDistribucion:
+    acumulador = AcumuladorDistribucion(tamano_muestra=max(len(valores), 1))
+    acumulador.agregar(valores)
+    return acumulador.resumen(intervalos, percentiles)
+
+
+# Resumen de una distribución que llega por bloques
+@dataclass
+class AcumuladorDistribucion:
+    tamano_muestra: int = 200_000
+    semilla: Optional[int] = 0
+    n: int = 0
+    suma: float = 0.0
+    positivos: int = 0
+    minimo: float = float("inf")
+    maximo: float = float("-inf")
+    _muestra: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    _claves: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    _rng: Optional[np.random.Generator] = None
+
+    def agregar(self, valores):
+        valores = np.asarray(valores, dtype=np.float64).ravel()
+        if not len(valores):
+            return
+        self.n += len(valores)
+        self.suma += float(valores.sum())
+        self.positivos += int(np.count_nonzero(valores > 0))
+        self.minimo = min(self.minimo, float(valores.min()))
+        self.maximo = max(self.maximo, float(valores.max()))
+
+        if self._rng is None:
+            self._rng = np.random.default_rng(self.semilla)
+        muestra = np.concatenate([self._muestra, valores])
+        claves = np.concatenate([self._claves, self._rng.random(len(valores))])
+        if len(muestra) > self.tamano_muestra:
+            # Las filas con las menores claves aleatorias forman una muestra uniforme
+            quedan = np.argpartition(claves, self.tamano_muestra)[:self.tamano_muestra]
+            muestra, claves = muestra[quedan], claves[quedan]
+        self._muestra, self._claves = muestra, claves
+
+    def resumen(self, intervalos=INTERVALOS, percentiles: Sequence[int] = PERCENTILES) -> ResumenDistribucion:
+        if not self.n:
+            raise ValueError("No hay valores para resumir")
+        return ResumenDistribucion(
+            n=self.n,
+            media=self.suma / self.n,
+            minimo=self.minimo,
+            maximo=self.maximo,
+            proporcion_positivos=self.positivos / self.n,
+            percentiles=cuantiles(self._muestra, percentiles),
+            # Los bordes usan el mínimo y el máximo exactos aunque la muestra no los incluya
+            histograma=histograma(self._muestra, intervalos, (self.minimo, self.maximo)),
+            n_muestra=len(self._muestra),
+        )
@@ -0,0 +1,206 @@
+"""Análisis de sensibilidad (tornado) y puntos de equilibrio de la ventaja.
+
+Cada entrada del modelo (unidades, precio y costo variable unitario de cada
+alternativa, y los valores de cada costo fijo) se considera una variable. El
+barrido evalúa todas las variables sobre su rango en una sola llamada
+vectorizada a `evaluar_lote_totales`.
+
+La ventaja es lineal en cada variable tomada por separado, de modo que el
+valor que la lleva a cero se obtiene en forma cerrada a partir de la
+pendiente, sin búsqueda en grilla.
+"""
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from .lote import evaluar_lote_totales
+from .modelos import Alternativa, normalizar_costos_fijos
+
+# Orden de las columnas de entrada en el barrido
+_COLUMNAS = ("unidades1", "unidades2", "precio1", "precio2", "costo_var_unit1", "costo_var_unit2",
+             "total1", "total2", "relevante1", "relevante2")
+_INDICE = {nombre: i for i, nombre in enumerate(_COLUMNAS)}
+
+
+@dataclass
+class Variable:
+    etiqueta: str
+    valor_base: float
+    # Cambio de cada columna de entrada por unidad de cambio de la variable
+    direccion: np.ndarray
+    # Derivada de la ventaja respecto de la variable
+    pendiente: float
+
+
+@dataclass
+class Barrido:
+    variables: List[Variable]
+    ventaja_base: float
+    # Valores de cada variable y ventaja resultante, forma (V, P)
+    valores: np.ndarray
+    ventajas: np.ndarray
+
+
+@dataclass
+class BarraTornado:
+    etiqueta: str
+    valor_base: float
+    valor_bajo: float
+    valor_alto: float
+    ventaja_baja: float
+    ventaja_alta: float
+    cambia_ganador: bool
+
+    @property
+    def amplitud(self):
+        return abs(self.ventaja_alta - self.ventaja_baja)
+
+
+@dataclass
+class PuntoEquilibrio:
+    etiqueta: str
+    valor_base: float
+    # None si la ventaja no depende de la variable
+    valor_equilibrio: Optional[float]
+
+    @property
+    def cambio_relativo(self):
+        if self.valor_equilibrio is None or self.valor_base == 0:
+            return None
+        return (self.valor_equilibrio - self.valor_base) / abs(self.valor_base)
+
+
+def _base(alt1, alt2, costos_fijos):
+    base = np.zeros(len(_COLUMNAS))
+    base[_INDICE["unidades1"]], base[_INDICE["unidades2"]] = alt1.unidades, alt2.unidades
+    base[_INDICE["precio1"]], base[_INDICE["precio2"]] = alt1.precio, alt2.precio
+    base[_INDICE["costo_var_unit1"]], base[_INDICE["costo_var_unit2"]] = alt1.costo_var_unit, alt2.costo_var_unit
+    for costo in costos_fijos:
+        base[_INDICE["total1"]] += costo.valor1
+        base[_INDICE["total2"]] += costo.valor2
+        if costo.relevante:
+            base[_INDICE["relevante1"]] += costo.valor1
+            base[_INDICE["relevante2"]] += costo.valor2
+    return base
+
+
+def _direccion(*columnas):
+    direccion = np.zeros(len(_COLUMNAS))
+    for columna in columnas:
+        direccion[_INDICE[columna]] = 1.0
+    return direccion
+
+
+# Lista de variables del modelo con la pendiente de la ventaja respecto de cada una
+def variables_sensibilidad(alt1: Alternativa, alt2: Alternativa, costos_fijos, modelo="total") -> List[Variable]:
+    if modelo not in ("total", "relevante"):
+        raise ValueError("El modelo debe ser 'total' o 'relevante'")
+    costos_fijos = normalizar_costos_fijos(costos_fijos)
+    variables = []
+    for sufijo, alt, signo in (("1", alt1, 1), ("2", alt2, -1)):
+        contribucion = alt.precio - alt.costo_var_unit
+        variables.extend([
+            Variable(f"Unidades ({alt.nombre})", alt.unidades, _direccion(f"unidades{sufijo}"), signo * contribucion),
+            Variable(f"Precio ({alt.nombre})", alt.precio, _direccion(f"precio{sufijo}"), signo * alt.unidades),
+            Variable(f"Costo variable unitario ({alt.nombre})", alt.costo_var_unit,
+                     _direccion(f"costo_var_unit{sufijo}"), -signo * alt.unidades),
+        ])
+    for costo in costos_fijos:
+        cuenta = modelo == "total" or costo.relevante
+        for sufijo, valor, signo, nombre_alt in (("1", costo.valor1, 1, alt1.nombre), ("2", costo.valor2, -1, alt2.nombre)):
+            columnas = [f"total{sufijo}"] + ([f"relevante{sufijo}"] if costo.relevante else [])
+            variables.append(Variable(
+                f"{costo.nombre} ({nombre_alt})", valor, _direccion(*columnas), -signo if cuenta else 0.0
+            ))
+    return variables
+
+
+def _ventaja_base(base, modelo):
+    margen1 = base[_INDICE["unidades1"]] * (base[_INDICE["precio1"]] - base[_INDICE["costo_var_unit1"]])
+    margen2 = base[_INDICE["unidades2"]] * (base[_INDICE["precio2"]] - base[_INDICE["costo_var_unit2"]])
+    fijos = ("total1", "total2") if modelo == "total" else ("relevante1", "relevante2")
+    return (margen1 - base[_INDICE[fijos[0]]]) - (margen2 - base[_INDICE[fijos[1]]])
+
+
+# Barre cada variable entre (1 - rango) y (1 + rango) veces su valor base.
+# Todas las variables y puntos se evalúan en un único lote vectorizado.
+def barrido(alt1: Alternativa, alt2: Alternativa, costos_fijos, rango=0.5, puntos=21, modelo="total") -> Barrido:
+    costos_fijos = normalizar_costos_fijos(costos_fijos)
+    variables = variables_sensibilidad(alt1, alt2, costos_fijos, modelo)
+    base = _base(alt1, alt2, costos_fijos)
+
+    factores = np.linspace(-rango, rango, puntos)
+    valores_base = np.array([v.valor_base for v in variables])
+    direcciones = np.stack([v.direccion for v in variables])
+    valores = valores_base[:, np.newaxis] * (1 + factores)
+    # Los valores de entrada no pueden ser negativos
+    np.maximum(valores, 0, out=valores)
+    delta = valores - valores_base[:, np.newaxis]
+    entradas = base + delta[:, :, np.newaxis] * direcciones[:, np.newaxis, :]
+    entradas = entradas.reshape(-1, len(_COLUMNAS))
+
+    def columnas(a, b):
+        return entradas[:, [_INDICE[a], _INDICE[b]]]
+
+    lote = evaluar_lote_totales(
+        columnas("unidades1", "unidades2"),
+        columnas("precio1", "precio2"),
+        columnas("costo_var_unit1", "costo_var_unit2"),
+        columnas("total1", "total2"),
+        columnas("relevante1", "relevante2"),
+    )
+    ventajas = lote.ventaja if modelo == "total" else lote.ventaja_relevante
+    return Barrido(
+        variables=variables,
+        ventaja_base=float(_ventaja_base(base, modelo)),
+        valores=valores,
+        ventajas=ventajas.reshape(len(variables), puntos),
+    )
+
+
+# Barras del gráfico tornado ordenadas de mayor a menor impacto sobre la ventaja
+def tornado(alt1: Alternativa, alt2: Alternativa, costos_fijos, rango=0.5, puntos=21, modelo="total") -> List[BarraTornado]:
+    resultado = barrido(alt1, alt2, costos_fijos, rango, puntos, modelo)
+    gana1 = resultado.ventaja_base > 0
+    barras = []
+    for variable, valores, ventajas in zip(resultado.variables, resultado.valores, resultado.ventajas):
+        barras.append(BarraTornado(
+            etiqueta=variable.etiqueta,
+            valor_base=variable.valor_base,
+            valor_bajo=float(valores[0]),
+            valor_alto=float(valores[-1]),
+            ventaja_baja=float(ventajas[0]),
+            ventaja_alta=float(ventajas[-1]),
+            cambia_ganador=bool(np.any((ventajas > 0) != gana1)),
+        ))
+    barras.sort(key=lambda b: b.amplitud, reverse=True)
+    return barras
+
+
+# Valor de cada variable (y % de reducción de cada costo fijo) en que la ventaja es cero
+def puntos_de_equilibrio(alt1: Alternativa, alt2: Alternativa, costos_fijos, modelo="total") -> List[PuntoEquilibrio]:
+    costos_fijos = normalizar_costos_fijos(costos_fijos)
+    ventaja = _ventaja_base(_base(alt1, alt2, costos_fijos), modelo)
+    puntos = []
+    for variable in variables_sensibilidad(alt1, alt2, costos_fijos, modelo):
+        equilibrio = None
+        if variable.pendiente != 0:
+            equilibrio = variable.valor_base - ventaja / variable.pendiente
+        puntos.append(PuntoEquilibrio(variable.etiqueta, variable.valor_base, equilibrio))
+
+    # Reducción porcentual del costo de la alternativa 2 respecto del valor 1:
+    # valor2 = valor1 * (1 - r / 100), por lo que d(ventaja)/dr = -valor1 / 100
+    for costo in costos_fijos:
+        cuenta = modelo == "total" or costo.relevante
+        if not cuenta or costo.valor1 == 0:
+            continue
+        reduccion_actual = (1 - costo.valor2 / costo.valor1) * 100
+        pendiente = -costo.valor1 / 100
+        puntos.append(PuntoEquilibrio(
+            f"% de reducción de {costo.nombre} ({alt2.nombre})",
+            reduccion_actual,
+            reduccion_actual - ventaja / pendiente,
+        ))
+    return puntos
@@ -0,0 +1,358 @@
+"""Servicio HTTP local para evaluar los modelos de costo.
+
+Expone los modelos de costo total, costos relevantes y costo de oportunidad
+a otros sistemas (precios, compras) sin pasar por la interfaz de Streamlit.
+`POST /evaluar` acepta un escenario o un lote (`{"escenarios": [...]}`) con
+la misma forma de datos que usa la aplicación: dos alternativas y la lista
+de costos fijos.
+
+Las solicitudes concurrentes se agrupan en micro-lotes: durante unos
+milisegundos se acumulan escenarios de distintas solicitudes y se evalúan
+juntos con una sola llamada vectorizada a `evaluar_lote_totales`. Los lotes
+grandes se dividen en bloques. Todo el cálculo corre en un pool de trabajo
+acotado, fuera del bucle de eventos, y cuando la cola de pendientes se llena
+el servicio responde 503 en lugar de acumular memoria.
+
+Uso:
+
+    python -m motor_costos.servicio --puerto 8765 --procesos 4
+
+Requiere ``starlette`` y ``uvicorn``.
+"""
+
+import argparse
+import asyncio
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+
+import numpy as np
+
+from .lote import evaluar_lote_totales
+from .modelos import Alternativa, CostoFijo, totalizar_costos_fijos
+
+MODELOS = ("total", "relevante", "oportunidad")
+
+# Columnas de la matriz de entrada de cada escenario
+_ENTRADAS = ("unidades1", "unidades2", "precio1", "precio2", "costo_var_unit1", "costo_var_unit2",
+             "total1", "total2", "relevante1", "relevante2")
+# Columnas de la matriz de salida
+_SALIDAS = ("resultado1", "resultado2", "ventaja", "resultado_relevante1", "resultado_relevante2",
+            "ventaja_relevante", "costo_oportunidad1", "costo_oportunidad2")
+
+
+class ErrorSolicitud(ValueError):
+    pass
+
+
+class ServicioSaturado(RuntimeError):
+    pass
+
+
+# Evalúa una matriz (N, 10) de entradas y devuelve una matriz (N, 8) de resultados.
+# Se ejecuta en el pool de trabajo; arreglos planos para que el envío entre procesos sea barato.
+def evaluar_matriz(entradas: np.ndarray) -> np.ndarray:
+    lote = evaluar_lote_totales(entradas[:, 0:2], entradas[:, 2:4], entradas[:, 4:6], entradas[:, 6:8], entradas[:, 8:10])
+    return np.column_stack([
+        lote.resultado,
+        lote.ventaja,
+        lote.resultado_relevante,
+        lote.ventaja_relevante,
+        lote.costo_oportunidad,
+    ])
+
+
+def _alternativa(datos, clave):
+    if not isinstance(datos, dict):
+        raise ErrorSolicitud(f"Falta '{clave}'")
+    try:
+        alternativa = Alternativa(
+            nombre=str(datos.get("nombre", clave)),
+            unidades=float(datos.get("unidades", 0)),
+            precio=float(datos.get("precio", 0)),
+            costo_var_unit=float(datos.get("costo_var_unit", 0)),
+        )
+    except (TypeError, ValueError):
+        raise ErrorSolicitud(f"Valores no numéricos en '{clave}'") from None
+    _validar_valores((alternativa.unidades, alternativa.precio, alternativa.costo_var_unit), f"'{clave}'")
+    return alternativa
+
+
+# NaN e infinito pasan `float()` y las comparaciones con cero, así que se rechazan aparte
+def _validar_valores(valores, donde):
+    if not all(math.isfinite(v) for v in valores):
+        raise ErrorSolicitud(f"Valores no finitos en {donde}")
+    if min(valores) < 0:
+        raise ErrorSolicitud(f"Valores negativos en {donde}")
+
+
+def _costo_fijo(costo):
+    try:
+        costo = CostoFijo.desde_dict(costo)
+        costo.valor1 = float(costo.valor1)
+        costo.valor2 = float(costo.valor2)
+    except (KeyError, TypeError, AttributeError, ValueError):
+        raise ErrorSolicitud("Cada costo fijo necesita 'nombre', 'valor1' y 'valor2' numéricos") from None
+    _validar_valores((costo.valor1, costo.valor2), f"el costo fijo '{costo.nombre}'")
+    return costo
+
+
+# Convierte un escenario JSON en su fila de entradas y los nombres de las alternativas
+def escenario_a_fila(escenario):
+    if not isinstance(escenario, dict):
+        raise ErrorSolicitud("Cada escenario debe ser un objeto JSON")
+    alt1 = _alternativa(escenario.get("alternativa1"), "alternativa1")
+    alt2 = _alternativa(escenario.get("alternativa2"), "alternativa2")
+    costos_fijos = escenario.get("costos_fijos") or []
+    if not isinstance(costos_fijos, list):
+        raise ErrorSolicitud("'costos_fijos' debe ser una lista")
+    costos_fijos = [_costo_fijo(c) for c in costos_fijos]
+    try:
+        totales = totalizar_costos_fijos(costos_fijos)
+    except (ValueError, ArithmeticError):
+        # Importes que no se pueden llevar al centavo
+        raise ErrorSolicitud("Importes de costos fijos fuera de rango") from None
+    fila = (
+        alt1.unidades, alt2.unidades, alt1.precio, alt2.precio, alt1.costo_var_unit, alt2.costo_var_unit,
+        totales.total_costos_fijos1, totales.total_costos_fijos2,
+        totales.total_costos_relevantes1, totales.total_costos_relevantes2,
+    )
+    return fila, (alt1.nombre, alt2.nombre)
+
+
+# Valida el cuerpo de `POST /evaluar`: devuelve los modelos pedidos, si es un
+# lote, y las filas de entradas y nombres de cada escenario
+def leer_solicitud(cuerpo):
+    if not isinstance(cuerpo, dict):
+        raise ErrorSolicitud("El cuerpo debe ser un objeto JSON")
+    modelos = cuerpo.get("modelos") or list(MODELOS)
+    if not isinstance(modelos, list) or any(m not in MODELOS for m in modelos):
+        raise ErrorSolicitud(f"Modelos válidos: {', '.join(MODELOS)}")
+    es_lote = "escenarios" in cuerpo
+    escenarios = cuerpo["escenarios"] if es_lote else [cuerpo]
+    if not isinstance(escenarios, list) or not escenarios:
+        raise ErrorSolicitud("'escenarios' debe ser una lista no vacía")
+    filas, nombres = zip(*(escenario_a_fila(e) for e in escenarios))
+    return modelos, es_lote, filas, nombres
+
+
+def _numero(valor):
+    valor = float(valor)
+    return int(valor) if valor.is_integer() else valor
+
+
+# Respuesta JSON de un escenario a partir de su fila de resultados
+def fila_a_respuesta(salida, nombres, modelos=MODELOS):
+    valores = dict(zip(_SALIDAS, (_numero(v) for v in salida)))
+    nombre1, nombre2 = nombres
+    respuesta = {}
+    if "total" in modelos:
+        respuesta["total"] = {
+            "resultado1": valores["resultado1"],
+            "resultado2": valores["resultado2"],
+            "ventaja": valores["ventaja"],
+            "ganadora": nombre1 if valores["ventaja"] > 0 else nombre2,
+        }
+    if "relevante" in modelos:
+        respuesta["relevante"] = {
+            "resultado1": valores["resultado_relevante1"],
+            "resultado2": valores["resultado_relevante2"],
+            "ventaja": valores["ventaja_relevante"],
+            "ganadora": nombre1 if valores["ventaja_relevante"] > 0 else nombre2,
+        }
+    if "oportunidad" in modelos:
+        respuesta["oportunidad"] = {
+            "costo_oportunidad1": valores["costo_oportunidad1"],
+            "costo_oportunidad2": valores["costo_oportunidad2"],
+            "mejor": nombre1 if valores["ventaja"] > 0 else nombre2,
+        }
+    return respuesta
+
+
+@dataclass
+class EstadisticasServicio:
+    solicitudes: int = 0
+    escenarios: int = 0
+    lotes: int = 0
+    rechazadas: int = 0
+
+    @property
+    def escenarios_por_lote(self):
+        return self.escenarios / self.lotes if self.lotes else 0.0
+
+
+class Microlotes:
+    # `espera` (segundos) es lo máximo que un escenario aguarda a que se le sumen
+    # otros; `max_lote` corta el micro-lote antes si se junta ese tamaño.
+    def __init__(self, ejecutor, trabajadores=1, espera=0.002, max_lote=50_000, max_pendientes=1_000_000):
+        self.ejecutor = ejecutor
+        self.espera = espera
+        self.max_lote = max_lote
+        self.max_pendientes = max_pendientes
+        self.estadisticas = EstadisticasServicio()
+        # A lo sumo dos lotes por trabajador en vuelo
+        self._cupos = asyncio.Semaphore(2 * max(trabajadores, 1))
+        self._cola = asyncio.Queue()
+        self._pendientes = 0
+        self._tarea = None
+        self._lotes_en_curso = set()
+
+    def iniciar(self):
+        self._tarea = asyncio.create_task(self._agrupar())
+
+    async def detener(self):
+        if self._tarea is not None:
+            self._tarea.cancel()
+            await asyncio.gather(self._tarea, return_exceptions=True)
+            self._tarea = None
+        await asyncio.gather(*self._lotes_en_curso, return_exceptions=True)
+
+    async def _ejecutar(self, entradas):
+        async with self._cupos:
+            self.estadisticas.lotes += 1
+            return await asyncio.get_running_loop().run_in_executor(self.ejecutor, evaluar_matriz, entradas)
+
+    # Evalúa una matriz (N, 10); los bloques chicos se agrupan con otras solicitudes
+    async def evaluar(self, entradas: np.ndarray) -> np.ndarray:
+        n = len(entradas)
+        if self._pendientes + n > self.max_pendientes:
+            self.estadisticas.rechazadas += 1
+            raise ServicioSaturado("Demasiados escenarios pendientes")
+        self.estadisticas.escenarios += n
+        if n >= self.max_lote:
+            bloques = [entradas[i:i + self.max_lote] for i in range(0, n, self.max_lote)]
+            self._pendientes += n
+            try:
+                resultados = await asyncio.gather(*(self._ejecutar(b) for b in bloques))
+            finally:
+                self._pendientes -= n
+            return np.concatenate(resultados)
+
+        futuro = asyncio.get_running_loop().create_future()
+        self._pendientes += n
+        self._cola.put_nowait((entradas, futuro))
+        return await futuro
+
+    async def _agrupar(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            grupo = [await self._cola.get()]
+            tamano = len(grupo[0][0])
+            limite = loop.time() + self.espera
+            while tamano < self.max_lote:
+                restante = limite - loop.time()
+                if restante <= 0:
+                    break
+                try:
+                    elemento = await asyncio.wait_for(self._cola.get(), restante)
+                except asyncio.TimeoutError:
+                    break
+                grupo.append(elemento)
+                tamano += len(elemento[0])
+            tarea = asyncio.create_task(self._resolver(grupo, tamano))
+            self._lotes_en_curso.add(tarea)
+            tarea.add_done_callback(self._lotes_en_curso.discard)
+
+    async def _resolver(self, grupo, tamano):
+        try:
+            salida = await self._ejecutar(np.concatenate([entradas for entradas, _ in grupo]))
+        except Exception as error:  # noqa: BLE001 - el error se entrega a cada solicitud del grupo
+            for _, futuro in grupo:
+                if not futuro.done():
+                    futuro.set_exception(error)
+        else:
+            inicio = 0
+            for entradas, futuro in grupo:
+                if not futuro.done():
+                    futuro.set_result(salida[inicio:inicio + len(entradas)])
+                inicio += len(entradas)
+        finally:
+            self._pendientes -= tamano
+
+
+# Crea la aplicación ASGI. `procesos` > 1 usa un pool de procesos; si no, un hilo de trabajo.
+def crear_app(procesos=1, espera_ms=2.0, max_lote=50_000, max_pendientes=1_000_000):
+    from starlette.applications import Starlette
+    from starlette.responses import JSONResponse
+    from starlette.routing import Route
+
+    estado = {}
+
+    @asynccontextmanager
+    async def ciclo_de_vida(app):
+        if procesos > 1:
+            ejecutor = ProcessPoolExecutor(max_workers=procesos)
+        else:
+            ejecutor = ThreadPoolExecutor(max_workers=1)
+        microlotes = Microlotes(ejecutor, procesos, espera_ms / 1000, max_lote, max_pendientes)
+        microlotes.iniciar()
+        estado["microlotes"] = microlotes
+        try:
+            yield
+        finally:
+            await microlotes.detener()
+            ejecutor.shutdown(cancel_futures=True)
+
+    async def evaluar(request):
+        microlotes = estado["microlotes"]
+        microlotes.estadisticas.solicitudes += 1
+        try:
+            cuerpo = await request.json()
+        except ValueError:
+            return JSONResponse({"error": "El cuerpo no es JSON válido"}, status_code=400)
+        try:
+            modelos, es_lote, filas, nombres = leer_solicitud(cuerpo)
+        except ErrorSolicitud as error:
+            return JSONResponse({"error": str(error)}, status_code=400)
+
+        try:
+            salida = await microlotes.evaluar(np.array(filas, dtype=np.float64))
+        except ServicioSaturado as error:
+            return JSONResponse({"error": str(error)}, status_code=503, headers={"Retry-After": "1"})
+        resultados = [fila_a_respuesta(s, n, modelos) for s, n in zip(salida, nombres)]
+        return JSONResponse({"resultados": resultados} if es_lote else resultados[0])
+
+    async def salud(request):
+        return JSONResponse({"estado": "ok"})
+
+    async def estadisticas(request):
+        datos = estado["microlotes"].estadisticas
+        return JSONResponse({
+            "solicitudes": datos.solicitudes,
+            "escenarios": datos.escenarios,
+            "lotes": datos.lotes,
+            "escenarios_por_lote": round(datos.escenarios_por_lote, 2),
+            "rechazadas": datos.rechazadas,
+        })
+
+    return Starlette(
+        routes=[
+            Route("/evaluar", evaluar, methods=["POST"]),
+            Route("/salud", salud, methods=["GET"]),
+            Route("/estadisticas", estadisticas, methods=["GET"]),
+        ],
+        lifespan=ciclo_de_vida,
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m motor_costos.servicio", description="Servicio HTTP de los modelos de costo.")
+    parser.add_argument("--host", default="127.0.0.1", help="Dirección de escucha (por defecto: 127.0.0.1)")
+    parser.add_argument("--puerto", type=int, default=8765, help="Puerto (por defecto: 8765)")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos de cálculo; 0 usa todos los núcleos (por defecto: 1)")
+    parser.add_argument("--espera-ms", type=float, default=2.0, help="Espera máxima para armar un micro-lote (por defecto: 2 ms)")
+    parser.add_argument("--max-lote", type=int, default=50_000, help="Escenarios máximos por micro-lote (por defecto: 50000)")
+    args = parser.parse_args(argv)
+
+    import uvicorn
+
+    procesos = args.procesos or os.cpu_count() or 1
+    app = crear_app(procesos, args.espera_ms, args.max_lote)
+    print(f"Servicio en http://{args.host}:{args.puerto} ({procesos} proceso(s))", flush=True)
+    uvicorn.run(app, host=args.host, port=args.puerto, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
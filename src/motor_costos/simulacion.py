@@ -0,0 +1,280 @@
+"""Simulación Monte Carlo de los modelos de costo con entradas inciertas.
+
+Cada entrada (unidades, precio, costo variable unitario y valores de costos
+fijos) puede ser un número o una distribución. Las muestras se generan en
+bloques vectorizados con memoria acotada: de cada bloque solo se conservan
+contadores, sumas y una submuestra de tamaño fijo para estimar percentiles.
+Cada bloque usa su propio generador derivado de la semilla, por lo que el
+resultado es reproducible con o sin procesos en paralelo.
+"""
+
+import math
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .lote import evaluar_lote_totales
+from .modelos import CostoFijo
+from .resumen import Histograma, histograma
+
+
+@dataclass
+class Normal:
+    media: float
+    desviacion: float
+    minimo: Optional[float] = None
+
+    def muestrear(self, rng, n):
+        muestras = rng.normal(self.media, self.desviacion, n)
+        if self.minimo is not None:
+            np.maximum(muestras, self.minimo, out=muestras)
+        return muestras
+
+
+@dataclass
+class Triangular:
+    minimo: float
+    moda: float
+    maximo: float
+
+    def muestrear(self, rng, n):
+        if self.minimo == self.maximo:
+            return np.full(n, float(self.moda))
+        return rng.triangular(self.minimo, self.moda, self.maximo, n)
+
+
+@dataclass
+class Uniforme:
+    minimo: float
+    maximo: float
+
+    def muestrear(self, rng, n):
+        return rng.uniform(self.minimo, self.maximo, n)
+
+
+# Distribución empírica: se remuestrea con reemplazo a partir de valores observados
+@dataclass
+class Empirica:
+    valores: Sequence[float]
+
+    def muestrear(self, rng, n):
+        return rng.choice(np.asarray(self.valores, dtype=np.float64), n, replace=True)
+
+
+Entrada = Union[float, int, Normal, Triangular, Uniforme, Empirica]
+
+
+def _muestrear(entrada, rng, n):
+    if hasattr(entrada, "muestrear"):
+        return entrada.muestrear(rng, n)
+    return np.full(n, float(entrada))
+
+
+@dataclass
+class AlternativaIncierta:
+    nombre: str
+    unidades: Entrada = 0
+    precio: Entrada = 0
+    costo_var_unit: Entrada = 0
+
+
+# Si `valor2` es None se calcula como `valor1` con la reducción porcentual indicada
+@dataclass
+class CostoFijoIncierto:
+    nombre: str
+    valor1: Entrada = 0
+    valor2: Optional[Entrada] = None
+    reduccion: float = 0
+    relevante: bool = False
+
+    # Costo incierto a partir de un costo fijo puntual; `distribucion` convierte
+    # cada valor en una entrada. Un costo con el mismo valor para ambas
+    # alternativas o con reducción porcentual usa una sola muestra de `valor1`
+    # (la alternativa 2 se deriva de ella); solo un valor distinto se muestrea
+    # por separado.
+    @classmethod
+    def desde_costo_fijo(cls, costo, distribucion=lambda valor: valor):
+        if not isinstance(costo, CostoFijo):
+            costo = CostoFijo.desde_dict(costo)
+        valor2 = None
+        if not costo.reduccion and costo.valor2 != costo.valor1:
+            valor2 = distribucion(costo.valor2)
+        return cls(costo.nombre, distribucion(costo.valor1), valor2, costo.reduccion, costo.relevante)
+
+
+PERCENTILES = (5, 25, 50, 75, 95)
+
+
+@dataclass
+class ResultadoSimulacion:
+    nombre_alt1: str
+    nombre_alt2: str
+    n_muestras: int
+    semilla: Optional[int]
+    prob_gana1: float
+    prob_gana2: float
+    prob_gana1_relevante: float
+    prob_gana2_relevante: float
+    media_resultado1: float
+    media_resultado2: float
+    media_ventaja: float
+    desviacion_ventaja: float
+    costo_oportunidad_esperado1: float
+    costo_oportunidad_esperado2: float
+    # Pérdida esperada: lo que se deja de ganar en promedio al elegir cada alternativa
+    perdida_esperada1: float
+    perdida_esperada2: float
+    percentiles: Dict[str, Dict[int, float]] = field(default_factory=dict)
+    # Histogramas de la submuestra, para graficar sin enviar las muestras
+    histogramas: Dict[str, Histograma] = field(default_factory=dict)
+
+
+# Acumuladores de un bloque; se combinan sumando campo a campo
+@dataclass
+class _Acumulado:
+    n: int = 0
+    victorias1: int = 0
+    victorias1_relevante: int = 0
+    suma_resultado1: float = 0.0
+    suma_resultado2: float = 0.0
+    suma_ventaja: float = 0.0
+    suma_ventaja2: float = 0.0
+    suma_perdida1: float = 0.0
+    suma_perdida2: float = 0.0
+    submuestras: Dict[str, List[np.ndarray]] = field(default_factory=dict)
+
+    def combinar(self, otro):
+        self.n += otro.n
+        self.victorias1 += otro.victorias1
+        self.victorias1_relevante += otro.victorias1_relevante
+        self.suma_resultado1 += otro.suma_resultado1
+        self.suma_resultado2 += otro.suma_resultado2
+        self.suma_ventaja += otro.suma_ventaja
+        self.suma_ventaja2 += otro.suma_ventaja2
+        self.suma_perdida1 += otro.suma_perdida1
+        self.suma_perdida2 += otro.suma_perdida2
+        for nombre, partes in otro.submuestras.items():
+            self.submuestras.setdefault(nombre, []).extend(partes)
+
+
+def _simular_bloque(alt1, alt2, costos_fijos, n, semilla, n_submuestra):
+    rng = np.random.default_rng(semilla)
+    alternativas = (alt1, alt2)
+    unidades = np.column_stack([_muestrear(a.unidades, rng, n) for a in alternativas])
+    precio = np.column_stack([_muestrear(a.precio, rng, n) for a in alternativas])
+    costo_var_unit = np.column_stack([_muestrear(a.costo_var_unit, rng, n) for a in alternativas])
+
+    # Los costos fijos se acumulan en totales para que la memoria no crezca
+    # con el tamaño del catálogo
+    total = np.zeros((n, 2))
+    total_relevante = np.zeros((n, 2))
+    for costo in costos_fijos:
+        valor1 = _muestrear(costo.valor1, rng, n)
+        if costo.valor2 is None:
+            valor2 = valor1 * (1 - costo.reduccion / 100)
+        else:
+            valor2 = _muestrear(costo.valor2, rng, n)
+        total[:, 0] += valor1
+        total[:, 1] += valor2
+        if costo.relevante:
+            total_relevante[:, 0] += valor1
+            total_relevante[:, 1] += valor2
+
+    lote = evaluar_lote_totales(unidades, precio, costo_var_unit, total, total_relevante)
+    ventaja = lote.ventaja
+    # Las muestras son independientes, así que las primeras filas ya son una submuestra aleatoria
+    return _Acumulado(
+        n=n,
+        victorias1=int(np.count_nonzero(ventaja > 0)),
+        victorias1_relevante=int(np.count_nonzero(lote.ventaja_relevante > 0)),
+        suma_resultado1=float(lote.resultado[:, 0].sum()),
+        suma_resultado2=float(lote.resultado[:, 1].sum()),
+        suma_ventaja=float(ventaja.sum()),
+        suma_ventaja2=float(np.dot(ventaja, ventaja)),
+        suma_perdida1=float(np.maximum(-ventaja, 0).sum()),
+        suma_perdida2=float(np.maximum(ventaja, 0).sum()),
+        submuestras={
+            "resultado1": [lote.resultado[:n_submuestra, 0].copy()],
+            "resultado2": [lote.resultado[:n_submuestra, 1].copy()],
+            "ventaja": [ventaja[:n_submuestra].copy()],
+            "ventaja_relevante": [lote.ventaja_relevante[:n_submuestra].copy()],
+        },
+    )
+
+
+def _simular_bloque_args(args):
+    return _simular_bloque(*args)
+
+
+# Ejecuta la simulación; `procesos` > 1 reparte los bloques en un pool de procesos
+def simular(
+    alt1: AlternativaIncierta,
+    alt2: AlternativaIncierta,
+    costos_fijos: Sequence[CostoFijoIncierto] = (),
+    n_muestras: int = 100_000,
+    tamano_bloque: int = 250_000,
+    semilla: Optional[int] = None,
+    procesos: Optional[int] = None,
+    tamano_submuestra: int = 200_000,
+    percentiles: Sequence[int] = PERCENTILES,
+) -> ResultadoSimulacion:
+    if n_muestras <= 0:
+        raise ValueError("El número de muestras debe ser positivo")
+    if tamano_bloque <= 0:
+        raise ValueError("El tamaño de bloque debe ser positivo")
+    costos_fijos = list(costos_fijos)
+    n_bloques = math.ceil(n_muestras / tamano_bloque)
+    semillas = np.random.SeedSequence(semilla).spawn(n_bloques)
+    fraccion = min(1.0, tamano_submuestra / n_muestras)
+
+    tareas = []
+    for i, semilla_bloque in enumerate(semillas):
+        n = min(tamano_bloque, n_muestras - i * tamano_bloque)
+        tareas.append((alt1, alt2, costos_fijos, n, semilla_bloque, math.ceil(n * fraccion)))
+
+    acumulado = _Acumulado()
+    if procesos and procesos > 1 and n_bloques > 1:
+        with ProcessPoolExecutor(max_workers=procesos) as pool:
+            for parcial in pool.map(_simular_bloque_args, tareas):
+                acumulado.combinar(parcial)
+    else:
+        for tarea in tareas:
+            acumulado.combinar(_simular_bloque_args(tarea))
+
+    n = acumulado.n
+    media_ventaja = acumulado.suma_ventaja / n
+    varianza = max(acumulado.suma_ventaja2 / n - media_ventaja ** 2, 0.0)
+    media_resultado1 = acumulado.suma_resultado1 / n
+    media_resultado2 = acumulado.suma_resultado2 / n
+
+    resumen_percentiles = {}
+    histogramas = {}
+    for nombre, partes in acumulado.submuestras.items():
+        submuestra = np.concatenate(partes)
+        valores = np.percentile(submuestra, percentiles)
+        resumen_percentiles[nombre] = {p: float(v) for p, v in zip(percentiles, valores)}
+        histogramas[nombre] = histograma(submuestra)
+
+    return ResultadoSimulacion(
+        nombre_alt1=alt1.nombre,
+        nombre_alt2=alt2.nombre,
+        n_muestras=n,
+        semilla=semilla,
+        prob_gana1=acumulado.victorias1 / n,
+        prob_gana2=1 - acumulado.victorias1 / n,
+        prob_gana1_relevante=acumulado.victorias1_relevante / n,
+        prob_gana2_relevante=1 - acumulado.victorias1_relevante / n,
+        media_resultado1=media_resultado1,
+        media_resultado2=media_resultado2,
+        media_ventaja=media_ventaja,
+        desviacion_ventaja=math.sqrt(varianza),
+        # El costo de oportunidad de elegir una alternativa es el resultado de la otra
+        costo_oportunidad_esperado1=media_resultado2,
+        costo_oportunidad_esperado2=media_resultado1,
+        perdida_esperada1=acumulado.suma_perdida1 / n,
+        perdida_esperada2=acumulado.suma_perdida2 / n,
+        percentiles=resumen_percentiles,
+        histogramas=histogramas,
+    )
@@ -0,0 +1,9 @@
+import streamlit as st
+
+from interfaz import asignar_costos_compartidos, boton_volver, mostrar_barra_lateral
+
+st.title("Asignación de Costos Compartidos")
+asignar_costos_compartidos()
+
+boton_volver()
+mostrar_barra_lateral()
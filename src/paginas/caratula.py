@@ -0,0 +1,79 @@
+import streamlit as st
+
+st.markdown('<div class="info-section">', unsafe_allow_html=True)
+st.title("Calculadora de Modelos de Costos")
+st.markdown('<p class="info-text">Esta calculadora permite analizar decisiones entre dos alternativas mediante tres modelos de costos:</p>', unsafe_allow_html=True)
+
+st.markdown("""
+- **Modelo de Costo Total:** Incluye todos los costos e ingresos de cada alternativa.
+- **Modelo de Costos Relevantes:** Se enfoca solo en los costos e ingresos que varían entre alternativas.
+- **Modelo de Costo de Oportunidad:** Calcula lo que se renuncia al elegir una alternativa.
+""")
+st.markdown('</div>', unsafe_allow_html=True)
+
+st.markdown('<div class="creator-section">', unsafe_allow_html=True)
+st.markdown('<div class="creator-name">Vanessa Bogado</div>', unsafe_allow_html=True)
+st.markdown('<div class="creator-details">Módulo de Gestión de Costos<br>Carrera Informática Empresarial<br>Universidad Paraguayo Alemana</div>', unsafe_allow_html=True)
+st.markdown('</div>', unsafe_allow_html=True)
+
+st.markdown('<div class="button-container">', unsafe_allow_html=True)
+col1, col2 = st.columns(2)
+col3, col4 = st.columns(2)
+
+with col1:
+    if st.button("Modelo de Costo Total", key="btn_costo_total", use_container_width=True):
+        st.switch_page("paginas/costo_total.py")
+
+with col2:
+    if st.button("Modelo de Costos Relevantes", key="btn_costos_relevantes", use_container_width=True):
+        st.switch_page("paginas/costos_relevantes.py")
+
+with col3:
+    if st.button("Modelo de Costo de Oportunidad", key="btn_costo_oportunidad", use_container_width=True):
+        st.switch_page("paginas/costo_oportunidad.py")
+
+with col4:
+    if st.button("Modelo Combinado (3 en 1)", key="btn_modelo_combinado", use_container_width=True):
+        st.switch_page("paginas/combinado.py")
+
+col5, col6 = st.columns(2)
+
+with col5:
+    if st.button("Simulación Monte Carlo", key="btn_simulacion", use_container_width=True):
+        st.switch_page("paginas/simulacion.py")
+
+with col6:
+    if st.button("Sensibilidad y Punto de Equilibrio", key="btn_sensibilidad", use_container_width=True):
+        st.switch_page("paginas/sensibilidad.py")
+
+col7, col8 = st.columns(2)
+
+with col7:
+    if st.button("Proyección Multiperíodo (VAN)", key="btn_proyeccion", use_container_width=True):
+        st.switch_page("paginas/proyeccion.py")
+
+with col8:
+    if st.button("Asignación de Costos Compartidos", key="btn_asignacion", use_container_width=True):
+        st.switch_page("paginas/asignacion.py")
+
+col9, col10 = st.columns(2)
+
+with col9:
+    if st.button("Mezcla Óptima de Productos", key="btn_optimizacion", use_container_width=True):
+        st.switch_page("paginas/optimizacion.py")
+
+with col10:
+    if st.button("Explorador de Escenarios en Grilla", key="btn_grilla", use_container_width=True):
+        st.switch_page("paginas/grilla.py")
+
+col11, col12 = st.columns(2)
+
+with col11:
+    if st.button("Evaluación de Escenarios por Lotes", key="btn_lotes", use_container_width=True):
+        st.switch_page("paginas/lotes.py")
+
+with col12:
+    if st.button("Ramas de Escenarios (What-If)", key="btn_ramas", use_container_width=True):
+        st.switch_page("paginas/ramas.py")
+
+st.markdown('</div>', unsafe_allow_html=True)
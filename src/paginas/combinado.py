@@ -0,0 +1,74 @@
+import streamlit as st
+
+from interfaz import (
+    boton_volver,
+    calcular_costo_oportunidad,
+    calcular_costo_total,
+    calcular_costos_relevantes,
+    calcular_ranking,
+    ingresar_costos_fijos,
+    ingresar_datos_basicos,
+    marcar_tiempo,
+    mostrar_barra_lateral,
+    mostrar_grafico_oportunidad,
+    mostrar_graficos_modelo,
+    mostrar_panel_depuracion,
+    mostrar_tabla,
+    ofrecer_descarga,
+)
+
+st.title("Modelo Combinado")
+datos_basicos = ingresar_datos_basicos()
+datos_costos = ingresar_costos_fijos(datos_basicos)
+marcar_tiempo("Datos de entrada")
+secciones_calculadas = []
+
+if datos_basicos and datos_costos:
+    # Solo se calcula la pestaña abierta; el costo total se calcula una vez
+    # por ejecución y alimenta también al costo de oportunidad
+    costo_total = {}
+    
+    def obtener_costo_total():
+        if not costo_total:
+            costo_total["valor"] = calcular_costo_total(datos_basicos, datos_costos)
+        return costo_total["valor"]
+    
+    pestana_total, pestana_relevantes, pestana_oportunidad = st.tabs(
+        ["Modelo de Costo Total", "Modelo de Costos Relevantes", "Modelo de Costo de Oportunidad"],
+        key="pestana_combinado",
+        on_change="rerun"
+    )
+    
+    with pestana_total:
+        if pestana_total.open:
+            resultado_costo_total, resultado1, resultado2, ventaja_total = obtener_costo_total()
+            mostrar_tabla(resultado_costo_total, "Modelo de Costo Total")
+            marcar_tiempo("Primer resultado")
+            ofrecer_descarga(resultado_costo_total, "modelo_costo_total", key="descargar_costo_total")
+            mostrar_graficos_modelo(datos_basicos, (datos_costos["total_costos_fijos1"], datos_costos["total_costos_fijos2"]), (resultado1, resultado2), "Costos Fijos", "total")
+            secciones_calculadas.append("Costo Total")
+    
+    with pestana_relevantes:
+        if pestana_relevantes.open:
+            resultado_costos_relevantes, resultado_relevante1, resultado_relevante2, ventaja_relevante = calcular_costos_relevantes(datos_basicos, datos_costos)
+            mostrar_tabla(resultado_costos_relevantes, "Modelo de Costos Relevantes")
+            marcar_tiempo("Primer resultado")
+            ofrecer_descarga(resultado_costos_relevantes, "modelo_costos_relevantes", key="descargar_costos_relevantes")
+            mostrar_graficos_modelo(datos_basicos, (datos_costos["total_costos_relevantes1"], datos_costos["total_costos_relevantes2"]), (resultado_relevante1, resultado_relevante2), "Costos Relevantes", "relevantes")
+            secciones_calculadas.append("Costos Relevantes")
+    
+    with pestana_oportunidad:
+        if pestana_oportunidad.open:
+            resultado_costo_total, resultado1, resultado2, _ = obtener_costo_total()
+            resultado_costo_oportunidad = calcular_costo_oportunidad(datos_basicos, resultado1, resultado2)
+            mostrar_tabla(resultado_costo_oportunidad, "Modelo de Costo de Oportunidad")
+            marcar_tiempo("Primer resultado")
+            ofrecer_descarga(resultado_costo_oportunidad, "modelo_costo_oportunidad", key="descargar_costo_oportunidad")
+            mostrar_grafico_oportunidad(datos_basicos, resultado1, resultado2)
+            st.write("#### Ranking de alternativas")
+            mostrar_tabla(calcular_ranking(datos_basicos, datos_costos), "Ranking de alternativas")
+            secciones_calculadas.append("Costo de Oportunidad")
+
+boton_volver()
+mostrar_panel_depuracion(secciones_calculadas)
+mostrar_barra_lateral(datos_basicos)
@@ -0,0 +1,28 @@
+import streamlit as st
+
+from interfaz import (
+    boton_volver,
+    calcular_costo_oportunidad,
+    calcular_costo_total,
+    calcular_ranking,
+    ingresar_costos_fijos,
+    ingresar_datos_basicos,
+    mostrar_barra_lateral,
+    mostrar_grafico_oportunidad,
+    mostrar_tabla,
+    ofrecer_descarga,
+)
+
+datos_basicos = ingresar_datos_basicos()
+datos_costos = ingresar_costos_fijos(datos_basicos)
+if datos_basicos and datos_costos:
+    resultado_costo_total, resultado1, resultado2, _ = calcular_costo_total(datos_basicos, datos_costos)
+    resultado_costo_oportunidad = calcular_costo_oportunidad(datos_basicos, resultado1, resultado2)
+    mostrar_tabla(resultado_costo_oportunidad, "Modelo de Costo de Oportunidad")
+    ofrecer_descarga(resultado_costo_oportunidad, "modelo_costo_oportunidad", key="descargar_costo_oportunidad")
+    mostrar_grafico_oportunidad(datos_basicos, resultado1, resultado2)
+    st.write("#### Ranking de alternativas")
+    mostrar_tabla(calcular_ranking(datos_basicos, datos_costos), "Ranking de alternativas")
+
+boton_volver()
+mostrar_barra_lateral(datos_basicos)
@@ -0,0 +1,21 @@
+from interfaz import (
+    boton_volver,
+    calcular_costo_total,
+    ingresar_costos_fijos,
+    ingresar_datos_basicos,
+    mostrar_barra_lateral,
+    mostrar_graficos_modelo,
+    mostrar_tabla,
+    ofrecer_descarga,
+)
+
+datos_basicos = ingresar_datos_basicos()
+datos_costos = ingresar_costos_fijos(datos_basicos)
+if datos_basicos and datos_costos:
+    resultado_costo_total, resultado1, resultado2, ventaja = calcular_costo_total(datos_basicos, datos_costos)
+    mostrar_tabla(resultado_costo_total, "Modelo de Costo Total")
+    ofrecer_descarga(resultado_costo_total, "modelo_costo_total", key="descargar_costo_total")
+    mostrar_graficos_modelo(datos_basicos, (datos_costos["total_costos_fijos1"], datos_costos["total_costos_fijos2"]), (resultado1, resultado2), "Costos Fijos", "total")
+
+boton_volver()
+mostrar_barra_lateral(datos_basicos)
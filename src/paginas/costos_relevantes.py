@@ -0,0 +1,21 @@
+from interfaz import (
+    boton_volver,
+    calcular_costos_relevantes,
+    ingresar_costos_fijos,
+    ingresar_datos_basicos,
+    mostrar_barra_lateral,
+    mostrar_graficos_modelo,
+    mostrar_tabla,
+    ofrecer_descarga,
+)
+
+datos_basicos = ingresar_datos_basicos()
+datos_costos = ingresar_costos_fijos(datos_basicos)
+if datos_basicos and datos_costos:
+    resultado_costos_relevantes, resultado1, resultado2, ventaja = calcular_costos_relevantes(datos_basicos, datos_costos)
+    mostrar_tabla(resultado_costos_relevantes, "Modelo de Costos Relevantes")
+    ofrecer_descarga(resultado_costos_relevantes, "modelo_costos_relevantes", key="descargar_costos_relevantes")
+    mostrar_graficos_modelo(datos_basicos, (datos_costos["total_costos_relevantes1"], datos_costos["total_costos_relevantes2"]), (resultado1, resultado2), "Costos Relevantes", "relevantes")
+
+boton_volver()
+mostrar_barra_lateral(datos_basicos)
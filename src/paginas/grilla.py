@@ -0,0 +1,19 @@
+import streamlit as st
+
+from interfaz import (
+    boton_volver,
+    explorar_grilla,
+    ingresar_costos_fijos,
+    ingresar_datos_basicos,
+    mostrar_barra_lateral,
+)
+
+st.title("Explorador de Escenarios en Grilla")
+datos_basicos = ingresar_datos_basicos()
+datos_costos = ingresar_costos_fijos(datos_basicos)
+
+if datos_basicos and datos_costos:
+    explorar_grilla(datos_basicos, datos_costos)
+
+boton_volver()
+mostrar_barra_lateral(datos_basicos)
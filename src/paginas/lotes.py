@@ -0,0 +1,9 @@
+import streamlit as st
+
+from interfaz import boton_volver, evaluar_escenarios_por_lotes, mostrar_barra_lateral
+
+st.title("Evaluación de Escenarios por Lotes")
+evaluar_escenarios_por_lotes()
+
+boton_volver()
+mostrar_barra_lateral()
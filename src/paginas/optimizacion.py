@@ -0,0 +1,9 @@
+import streamlit as st
+
+from interfaz import boton_volver, mostrar_barra_lateral, optimizar_mezcla_productos
+
+st.title("Mezcla Óptima de Productos")
+optimizar_mezcla_productos()
+
+boton_volver()
+mostrar_barra_lateral()
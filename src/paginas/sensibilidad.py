@@ -0,0 +1,19 @@
+import streamlit as st
+
+from interfaz import (
+    analizar_sensibilidad,
+    boton_volver,
+    ingresar_costos_fijos,
+    ingresar_datos_basicos,
+    mostrar_barra_lateral,
+)
+
+st.title("Sensibilidad y Punto de Equilibrio")
+datos_basicos = ingresar_datos_basicos()
+datos_costos = ingresar_costos_fijos(datos_basicos)
+
+if datos_basicos and datos_costos:
+    analizar_sensibilidad(datos_basicos, datos_costos)
+
+boton_volver()
+mostrar_barra_lateral(datos_basicos)
@@ -0,0 +1,11 @@
+"""Configuración de pytest: las pruebas importan `motor_costos` desde `src/`.
+
+Uso, desde ``src/``:
+
+    python -m pytest -q
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
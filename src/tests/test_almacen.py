@@ -0,0 +1,84 @@
+"""Almacén de escenarios: versiones y reconstrucción de versiones anteriores."""
+
+import pytest
+
+from motor_costos.almacen import AlmacenEscenarios
+from motor_costos.catalogo import CatalogoCostosFijos
+
+
+@pytest.fixture
+def almacen(tmp_path):
+    return AlmacenEscenarios(str(tmp_path / "escenarios.sqlite3"))
+
+
+def _datos(unidades1):
+    return {"nombre_alt1": "A", "unidades1": unidades1, "nombre_alt2": "B", "unidades2": 10}
+
+
+def _catalogo(n=20):
+    catalogo = CatalogoCostosFijos()
+    for i in range(n):
+        catalogo.agregar(f"Costo {i}", 1000 + i, 900 + i, relevante=i % 3 == 0)
+    return catalogo
+
+
+def test_deshacer_reconstruye_cada_version(almacen):
+    catalogo = _catalogo()
+    instantaneas = {}
+    instantaneas[almacen.guardar("Planta", _datos(1), catalogo, ganadora="A")] = (catalogo.a_dicts(), _datos(1))
+
+    catalogo.actualizar(3, valor1=5000)
+    catalogo.eliminar(7)
+    catalogo.agregar("Nuevo", 10, 20, relevante=True)
+    instantaneas[almacen.guardar("Planta", _datos(2), catalogo, ganadora="B")] = (catalogo.a_dicts(), _datos(2))
+
+    catalogo.actualizar(3, valor1=6000, relevante=False)
+    catalogo.eliminar(20)
+    catalogo.eliminar(0)
+    instantaneas[almacen.guardar("Planta", _datos(3), catalogo)] = (catalogo.a_dicts(), _datos(3))
+
+    assert sorted(instantaneas) == [1, 2, 3]
+    for version, (costos, datos) in instantaneas.items():
+        escenario = almacen.abrir("Planta", version)
+        assert escenario.version == version
+        assert escenario.costos_fijos.a_dicts() == costos
+        assert escenario.datos_basicos == datos
+        assert escenario.costos_fijos.totales == CatalogoCostosFijos.desde_dicts(costos).totales
+    assert almacen.abrir("Planta").version == 3
+
+
+def test_historial_cuenta_solo_las_diferencias(almacen):
+    catalogo = _catalogo(100)
+    almacen.guardar("Planta", _datos(1), catalogo)
+    catalogo.actualizar(5, valor2=1)
+    catalogo.eliminar(6)
+    catalogo.agregar("Nuevo", 1, 1)
+    almacen.guardar("Planta", _datos(1), catalogo)
+    ultima, primera = almacen.historial("Planta")
+    assert (ultima.version, ultima.altas, ultima.bajas, ultima.modificaciones) == (2, 1, 1, 1)
+    assert (primera.version, primera.altas) == (1, 100)
+
+
+def test_guardar_sin_cambios_no_crea_version(almacen):
+    catalogo = _catalogo()
+    assert almacen.guardar("Planta", _datos(1), catalogo) == 1
+    assert almacen.guardar("Planta", _datos(1), catalogo) == 1
+    assert len(almacen.historial("Planta")) == 1
+
+
+def test_escenarios_inexistentes(almacen):
+    almacen.guardar("Planta", _datos(1), [])
+    with pytest.raises(KeyError):
+        almacen.abrir("Otra")
+    with pytest.raises(KeyError):
+        almacen.abrir("Planta", 5)
+    almacen.eliminar("Planta")
+    with pytest.raises(KeyError):
+        almacen.historial("Planta")
+
+
+def test_listar_filtra_por_nombre_y_ganadora(almacen):
+    almacen.guardar("Planta_norte", _datos(1), [], ganadora="A")
+    almacen.guardar("Planta sur", _datos(1), [], ganadora="B")
+    assert [e.nombre for e in almacen.listar("_")] == ["Planta_norte"]
+    assert [e.nombre for e in almacen.listar(ganadora="B")] == ["Planta sur"]
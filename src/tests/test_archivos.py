@@ -0,0 +1,158 @@
+"""Validación de esquema y lectura por bloques de archivos de costos y escenarios."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from motor_costos import totalizar_costos_fijos
+from motor_costos.archivos import (
+    _FALSOS,
+    _VERDADEROS,
+    EscritorResultados,
+    ErrorEsquema,
+    detectar_formato,
+    exportar_tabla,
+    leer_alternativas,
+    leer_bloques,
+    leer_costos_fijos,
+    tabla_costos_fijos,
+    validar_costos_fijos,
+    validar_escenarios,
+)
+from motor_costos.catalogo import CatalogoCostosFijos
+from motor_costos.modelos import TotalesCostosFijos
+
+
+def _catalogo(n=25):
+    catalogo = CatalogoCostosFijos()
+    for i in range(n):
+        catalogo.agregar(f"Costo {i}", 1000 + i + 0.25, 900 + i, 12.5 if i % 4 == 0 else 0, relevante=i % 3 == 0)
+    return catalogo
+
+
+@pytest.mark.parametrize("columnas, faltantes", [
+    ({"valor1": [1]}, "nombre"),
+    ({"nombre": ["x"]}, "valor1"),
+    ({"otra": [1]}, "nombre, valor1"),
+])
+def test_costos_fijos_columnas_faltantes(columnas, faltantes):
+    with pytest.raises(ErrorEsquema, match=f"Faltan columnas obligatorias: {faltantes}$"):
+        validar_costos_fijos(pd.DataFrame(columnas))
+
+
+@pytest.mark.parametrize("columnas, mensaje", [
+    ({"nombre": ["a", "b", ""], "valor1": [1, 2, 3]}, "sin nombre en la fila 13"),
+    ({"nombre": ["a", "b", "c"], "valor1": [1, "mucho", 3]}, "no numérico en la columna 'valor1', fila 12: 'mucho'"),
+    ({"nombre": ["a", "b", "c"], "valor1": [1, 2, -3]}, "negativo en la columna 'valor1', fila 13"),
+    ({"nombre": ["a", "b", "c"], "valor1": [1, 2, 3], "reduccion": [0, 150, 0]}, r"entre 0 y 100 \(fila 12\)"),
+    ({"nombre": ["a", "b", "c"], "valor1": [1, 2, 3], "relevante": ["si", "quizás", "no"]}, "'relevante', fila 12: 'quizás'"),
+])
+def test_costos_fijos_errores_con_numero_de_fila(columnas, mensaje):
+    with pytest.raises(ErrorEsquema, match=mensaje):
+        validar_costos_fijos(pd.DataFrame(columnas), fila_inicial=10)
+
+
+@pytest.mark.parametrize("valor", sorted(_VERDADEROS))
+def test_booleanos_verdaderos(valor):
+    columnas = validar_costos_fijos(pd.DataFrame({"nombre": ["a"], "valor1": [1], "relevante": [f" {valor.upper()} "]}))
+    assert columnas["relevante"].tolist() == [True]
+
+
+@pytest.mark.parametrize("valor", sorted(_FALSOS))
+def test_booleanos_falsos(valor):
+    columnas = validar_costos_fijos(pd.DataFrame({"nombre": ["a"], "valor1": [1], "relevante": [valor]}, dtype=object))
+    assert columnas["relevante"].tolist() == [False]
+
+
+def test_booleanos_numericos_y_nulos():
+    columnas = validar_costos_fijos(pd.DataFrame({"nombre": ["a", "b", "c"], "valor1": [1, 1, 1], "relevante": [1, 0, None]}))
+    assert columnas["relevante"].tolist() == [True, False, False]
+
+
+def test_valor2_derivado_de_la_reduccion_y_relevancia_por_defecto():
+    bloque = pd.DataFrame({
+        "Nombre ": ["Arriendo", "Luz", "Gas"],
+        "VALOR1": [1000, 333.33, 500],
+        "Reducción": [20, 50, None],
+        "valor2": [None, None, 400],
+    })
+    columnas = validar_costos_fijos(bloque)
+    assert columnas["nombre"] == ["Arriendo", "Luz", "Gas"]
+    # 333.33 * 0.5 = 166.665 se redondea al centavo alejándose del cero
+    assert columnas["valor2"].tolist() == [800, 166.67, 400]
+    assert columnas["reduccion"].tolist() == [20, 50, 0]
+    assert columnas["relevante"].tolist() == [True, True, True]
+    sin_cambios = validar_costos_fijos(pd.DataFrame({"nombre": ["a"], "valor1": [5]}))
+    assert sin_cambios["valor2"].tolist() == [5] and sin_cambios["relevante"].tolist() == [False]
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet", "arrow"])
+def test_ida_y_vuelta_por_bloques(tmp_path, extension):
+    catalogo = _catalogo()
+    ruta = str(tmp_path / f"costos.{extension}")
+    exportar_tabla(tabla_costos_fijos(catalogo), ruta)
+    if extension != "arrow":
+        assert [len(b) for b in leer_bloques(ruta, tamano_bloque=10)] == [10, 10, 5]
+    leido = leer_costos_fijos(ruta, tamano_bloque=10)
+    assert leido.a_dicts() == catalogo.a_dicts()
+    assert leido.totales == totalizar_costos_fijos(catalogo.a_dicts())
+
+
+def test_error_en_un_bloque_posterior_informa_la_fila_del_archivo(tmp_path):
+    tabla = tabla_costos_fijos(_catalogo()).astype({"valor1": object})
+    tabla.loc[22, "valor1"] = "abc"
+    ruta = str(tmp_path / "costos.csv")
+    exportar_tabla(tabla, ruta)
+    with pytest.raises(ErrorEsquema, match="fila 23"):
+        leer_costos_fijos(ruta, tamano_bloque=10)
+
+
+def test_archivo_vacio_da_catalogo_vacio(tmp_path):
+    ruta = str(tmp_path / "costos.parquet")
+    exportar_tabla(tabla_costos_fijos(CatalogoCostosFijos()), ruta)
+    assert len(leer_costos_fijos(ruta)) == 0
+
+
+def test_leer_alternativas(tmp_path):
+    ruta = tmp_path / "alternativas.csv"
+    ruta.write_text("nombre,unidades,precio,costo_var_unitario\nA,10,100,40\nB, 8,120,\n", encoding="utf-8")
+    alternativas = leer_alternativas(str(ruta))
+    assert [(a.nombre, a.unidades, a.precio, a.costo_var_unit) for a in alternativas] == [("A", 10, 100, 40), ("B", 8, 120, 0)]
+
+
+def test_validar_escenarios():
+    bloque = pd.DataFrame({
+        "unidades1": [10, 20], "precio1": [5, 5], "costo_var_unit1": [1, 1],
+        "unidades2": [10, 20], "precio2": [6, 6], "costo_var_unit2": [2, 2],
+        "total_costos_fijos1": [100, None],
+    })
+    totales = TotalesCostosFijos(50, 60, 5, 6)
+    columnas = validar_escenarios(bloque, fila_inicial=100, totales_base=totales)
+    assert columnas["escenario"].tolist() == [101, 102]
+    assert columnas["unidades"].tolist() == [[10, 10], [20, 20]]
+    assert columnas["total_costos_fijos"].tolist() == [[100, 60], [50, 60]]
+    assert columnas["total_costos_relevantes"].tolist() == [[5, 6], [5, 6]]
+    with pytest.raises(ErrorEsquema, match="Faltan columnas obligatorias: precio2, costo_var_unit2"):
+        validar_escenarios(bloque.drop(columns=["precio2", "costo_var_unit2"]))
+    with pytest.raises(ErrorEsquema, match="'precio1', fila 102"):
+        validar_escenarios(bloque.assign(precio1=[5, -5]), fila_inicial=100)
+
+
+@pytest.mark.parametrize("extension", ["csv", "parquet", "arrow"])
+def test_escritor_de_resultados_por_bloques(tmp_path, extension):
+    ruta = str(tmp_path / f"resultados.{extension}")
+    bloques = [pd.DataFrame({"escenario": np.arange(i, i + 4), "ventaja": np.arange(i, i + 4) * 1.5}) for i in (0, 4, 8)]
+    with EscritorResultados(ruta) as escritor:
+        for bloque in bloques:
+            escritor.escribir(bloque)
+    assert escritor.filas == 12
+    leido = pd.concat(list(leer_bloques(ruta)), ignore_index=True)
+    pd.testing.assert_frame_equal(leido, pd.concat(bloques, ignore_index=True), check_dtype=False)
+
+
+def test_formatos():
+    assert detectar_formato("x.FEATHER") == "arrow"
+    with pytest.raises(ValueError):
+        detectar_formato("x.json")
+    with pytest.raises(ValueError):
+        EscritorResultados("x.xlsx")
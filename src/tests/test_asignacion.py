@@ -0,0 +1,179 @@
+"""Asignación de centros de costo frente a un reparto centro por centro."""
+
+import random
+
+import numpy as np
+import pytest
+
+from motor_costos import Alternativa, evaluar_alternativas
+from motor_costos.asignacion import CentroCosto, asignar, asignar_columnas, matriz_de_inductores
+
+INDUCTORES = ("unidades", "ingreso", "costo_variable", "partes_iguales", "horas", "metros")
+
+
+def _alternativas():
+    return [
+        Alternativa("A", unidades=100, precio=10, costo_var_unit=4),
+        Alternativa("B", unidades=300, precio=6, costo_var_unit=2),
+        Alternativa("C", unidades=0, precio=8, costo_var_unit=5),
+    ]
+
+
+# Reparto de referencia: cada centro por separado, valor × peso / suma de los
+# pesos de sus destinos; si la suma es cero el centro queda sin asignar
+def _referencia(alternativas, centros, inductores):
+    nombres = [a.nombre for a in alternativas]
+    nombres_inductores, cantidades = matriz_de_inductores(alternativas, inductores)
+    total = [0.0] * len(nombres)
+    relevantes = [0.0] * len(nombres)
+    sin_asignar = sin_asignar_relevante = 0.0
+    for centro in centros:
+        columna = nombres_inductores.index(centro.inductor)
+        destinos = centro.destinos if centro.destinos is not None else nombres
+        pesos = {d: cantidades[nombres.index(d), columna] for d in destinos}
+        suma = sum(pesos.values())
+        if suma <= 0:
+            sin_asignar += centro.valor
+            sin_asignar_relevante += centro.valor if centro.relevante else 0.0
+            continue
+        for destino, peso in pesos.items():
+            i = nombres.index(destino)
+            total[i] += centro.valor * peso / suma
+            if centro.relevante:
+                relevantes[i] += centro.valor * peso / suma
+    return total, relevantes, sin_asignar, sin_asignar_relevante
+
+
+# Un conjunto de centros al azar: inductores propios con ceros, centros
+# limitados a algunas alternativas y alternativas sin unidades
+def _pool_al_azar(rng):
+    n = rng.randint(1, 6)
+    alternativas = [
+        Alternativa(
+            f"Alt {i}",
+            unidades=rng.choice([0, rng.randint(1, 500)]),
+            precio=round(rng.uniform(1, 50), 2),
+            costo_var_unit=round(rng.uniform(0, 20), 2),
+        )
+        for i in range(n)
+    ]
+    inductores = {
+        "horas": [rng.choice([0, round(rng.uniform(0, 80), 1)]) for _ in range(n)],
+        "metros": [rng.randint(0, 3) for _ in range(n)],
+    }
+    nombres = [a.nombre for a in alternativas]
+    centros = []
+    for k in range(rng.randint(0, 12)):
+        destinos = None
+        if rng.random() < 0.4:
+            destinos = rng.sample(nombres, rng.randint(1, n))
+        centros.append(
+            CentroCosto(
+                f"Centro {k}",
+                round(rng.uniform(0, 20000), 2),
+                rng.choice(INDUCTORES),
+                rng.random() < 0.5,
+                destinos,
+            )
+        )
+    return alternativas, centros, inductores
+
+
+@pytest.mark.parametrize("semilla", range(50))
+def test_coincide_con_el_reparto_centro_por_centro(semilla):
+    alternativas, centros, inductores = _pool_al_azar(random.Random(semilla))
+    resultado = asignar(alternativas, centros, inductores)
+    total, relevantes, sin_asignar, sin_asignar_relevante = _referencia(alternativas, centros, inductores)
+
+    assert resultado.nombres == [a.nombre for a in alternativas]
+    assert resultado.total_costos_fijos.tolist() == pytest.approx(total, abs=0.01)
+    assert resultado.total_costos_relevantes.tolist() == pytest.approx(relevantes, abs=0.01)
+    assert resultado.sin_asignar == pytest.approx(sin_asignar, abs=0.01)
+    assert resultado.sin_asignar_relevante == pytest.approx(sin_asignar_relevante, abs=0.01)
+
+    # Lo asignado más lo que quedó sin asignar es el total de los centros,
+    # salvo el redondeo al centavo de cada alternativa
+    tolerancia = 0.005 * len(alternativas) + 1e-9
+    assert resultado.total_costos_fijos.sum() + resultado.sin_asignar == pytest.approx(
+        sum(c.valor for c in centros), abs=tolerancia
+    )
+    assert resultado.total_costos_relevantes.sum() + resultado.sin_asignar_relevante == pytest.approx(
+        sum(c.valor for c in centros if c.relevante), abs=tolerancia
+    )
+
+
+def test_inductor_que_suma_cero_queda_sin_asignar():
+    centros = [
+        CentroCosto("Planta", 1000, "horas", relevante=True),
+        # Entre todas suma 12, pero C no tiene unidades
+        CentroCosto("Empaque", 500, "unidades", destinos=["C"]),
+        CentroCosto("Oficina", 300, "partes_iguales"),
+    ]
+    resultado = asignar(_alternativas(), centros, {"horas": [0, 0, 0]})
+
+    assert resultado.sin_asignar == 1500
+    assert resultado.sin_asignar_relevante == 1000
+    assert resultado.total_costos_fijos.tolist() == [100, 100, 100]
+    assert resultado.total_costos_relevantes.tolist() == [0, 0, 0]
+
+
+def test_destinos_reciben_solo_su_parte():
+    centros = [
+        # Unidades entre A y B: 100 y 300
+        CentroCosto("Depósito", 1000, "unidades", relevante=True, destinos=["A", "B"]),
+        # Solo B, sea cual sea el inductor
+        CentroCosto("Licencia", 250, "ingreso", destinos=["B"]),
+        # Partes iguales entre A y C
+        CentroCosto("Supervisión", 99.99, "partes_iguales", destinos=["C", "A"]),
+        # Sin restricción: unidades entre las tres (100, 300, 0)
+        CentroCosto("Planta", 800, "unidades"),
+    ]
+    resultado = asignar(_alternativas(), centros)
+
+    assert resultado.total_costos_fijos.tolist() == pytest.approx([250 + 50 + 200, 750 + 250 + 600, 50], abs=0.01)
+    assert resultado.total_costos_relevantes.tolist() == [250, 750, 0]
+    assert resultado.sin_asignar == 0
+
+
+def test_totales_alimentan_los_modelos():
+    alternativas = _alternativas()
+    centros = [CentroCosto("Planta", 800, "unidades", relevante=True), CentroCosto("Oficina", 300, "partes_iguales")]
+    resultado = asignar(alternativas, centros)
+
+    totales = resultado.totales(0, 1)
+    assert (totales.total_costos_fijos1, totales.total_costos_fijos2) == (300, 700)
+    assert (totales.total_costos_relevantes1, totales.total_costos_relevantes2) == (200, 600)
+
+    evaluados = evaluar_alternativas(alternativas, totales=resultado.totales_por_alternativa())
+    # Márgenes: A 600, B 1200, C 0
+    assert [r.resultado for r in evaluados] == [300, 500, -100]
+    assert [r.resultado_relevante for r in evaluados] == [400, 600, 0]
+
+
+def test_asignar_columnas_sin_centros():
+    asignado, relevantes, sin_asignar, sin_asignar_relevante = asignar_columnas([], [], [], np.ones((2, 3)))
+    assert asignado.tolist() == [0, 0]
+    assert relevantes.tolist() == [0, 0]
+    assert (sin_asignar, sin_asignar_relevante) == (0, 0)
+
+
+@pytest.mark.parametrize(
+    "centros, inductores, mensaje",
+    [
+        ([CentroCosto("Planta", 100, "horas")], None, "inductor desconocido"),
+        ([CentroCosto("Planta", 100, destinos=["Z"])], None, "inexistentes: Z"),
+        ([], {"unidades": [1, 1, 1]}, "ya existe"),
+        ([], {"horas": [1, 1]}, "2 cantidades para 3"),
+        ([], {"horas": [1, -1, 1]}, "negativas"),
+    ],
+)
+def test_validaciones(centros, inductores, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        asignar(_alternativas(), centros, inductores)
+
+
+def test_asignar_columnas_valida_el_inductor():
+    with pytest.raises(ValueError, match="fuera de la matriz"):
+        asignar_columnas([100], [False], [3], np.ones((2, 3)))
+    with pytest.raises(ValueError, match="mismo largo"):
+        asignar_columnas([100, 200], [False], [0, 0], np.ones((2, 3)))
@@ -0,0 +1,143 @@
+"""Catálogo columnar y vistas con delta frente a un recuento completo."""
+
+import random
+
+import numpy as np
+import pytest
+
+from motor_costos import totalizar_costos_fijos
+from motor_costos.catalogo import CatalogoConDelta, CatalogoCostosFijos
+from motor_costos.modelos import DatosBasicos
+from motor_costos.ramas import ArbolEscenarios
+
+
+def _base(n=200, semilla=0):
+    generador = random.Random(semilla)
+    catalogo = CatalogoCostosFijos()
+    for i in range(n):
+        valor1 = round(generador.uniform(0, 10_000), 2)
+        catalogo.agregar(f"Costo {i}", valor1, round(valor1 * generador.uniform(0.5, 1.5), 2), relevante=generador.random() < 0.4)
+    return catalogo
+
+
+# Aplica la misma secuencia aleatoria de cambios a la vista y a una copia modificable
+def _editar_al_azar(vista, copia, semilla, pasos=300):
+    generador = random.Random(semilla)
+    for paso in range(pasos):
+        ids = vista.ids().tolist()
+        operacion = generador.random()
+        if operacion < 0.15 or not ids:
+            nuevo = (f"Nuevo {paso}", round(generador.uniform(0, 500), 2), round(generador.uniform(0, 500), 2), 0, generador.random() < 0.5)
+            assert vista.agregar(*nuevo) == copia.agregar(*nuevo)
+        elif operacion < 0.3:
+            i = generador.choice(ids)
+            vista.eliminar(i)
+            copia.eliminar(i)
+        elif operacion < 0.45:
+            i = generador.choice(ids)
+            relevante = generador.random() < 0.5
+            vista.marcar_relevante(i, relevante)
+            copia.marcar_relevante(i, relevante)
+        elif operacion < 0.55:
+            # Volver a los valores de la base
+            i = generador.choice([i for i in ids if vista._es_base(i)] or ids)
+            fila = vista.base.fila(i) if vista._es_base(i) else vista.fila(i)
+            cambios = {k: fila[k] for k in ("valor1", "valor2", "relevante")}
+            vista.actualizar(i, **cambios)
+            copia.actualizar(i, **cambios)
+        else:
+            i = generador.choice(ids)
+            cambios = {"valor1": round(generador.uniform(0, 10_000), 2)}
+            if generador.random() < 0.5:
+                cambios["reduccion"] = generador.choice([0, 5, 12.5, 30])
+            vista.actualizar(i, **cambios)
+            copia.actualizar(i, **cambios)
+
+
+def _assert_igual_a_recuento(vista, copia):
+    filas = copia.a_dicts()
+    assert vista.a_dicts() == filas
+    assert vista.totales == totalizar_costos_fijos(filas)
+    assert vista.totales == copia.totales
+    assert len(vista) == len(copia)
+    for clave, valores in copia.columnas().items():
+        assert list(vista.columnas()[clave]) == list(valores), clave
+    for texto, relevante in (("", True), ("nuevo", None), ("1", False)):
+        np.testing.assert_array_equal(vista.filtrar(texto, relevante), copia.filtrar(texto, relevante))
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_delta_coincide_con_recuento_completo(semilla):
+    base = _base(semilla=semilla).congelar()
+    totales_base = base.totales
+    vista = CatalogoConDelta(base)
+    copia = base.copiar()
+    _editar_al_azar(vista, copia, semilla)
+    _assert_igual_a_recuento(vista, copia)
+    # La base compartida no cambia
+    assert base.totales == totales_base == totalizar_costos_fijos(base.a_dicts())
+
+
+def test_volver_a_la_base_deja_de_ser_un_cambio():
+    vista = CatalogoConDelta(_base(10).congelar())
+    original = vista.fila(3)
+    vista.actualizar(3, valor1=1)
+    assert vista.cantidad_cambios() == 1
+    vista.actualizar(3, valor1=original["valor1"], valor2=original["valor2"], relevante=original["relevante"])
+    assert vista.cantidad_cambios() == 0
+    assert vista.totales == vista.base.totales
+
+
+def test_limpiar_y_descartar_cambios():
+    base = _base(50).congelar()
+    vista = CatalogoConDelta(base)
+    vista.agregar("Nuevo", 100, 50)
+    vista.limpiar()
+    assert len(vista) == 0 and vista.totales == totalizar_costos_fijos([])
+    vista.descartar_cambios()
+    assert vista.a_dicts() == base.a_dicts() and vista.totales == base.totales
+
+
+def test_base_modificable_no_se_comparte():
+    with pytest.raises(ValueError):
+        CatalogoConDelta(_base(3))
+    with pytest.raises(ValueError, match="solo lectura"):
+        _base(3).congelar().agregar("Otro")
+
+
+def test_ramas_evolucionan_por_separado():
+    base = _base(100, semilla=9)
+    datos = DatosBasicos.desde_dict({
+        "nombre_alt1": "A", "unidades1": 1000, "precio1": 100, "costo_var_unit1": 60,
+        "nombre_alt2": "B", "unidades2": 900, "precio2": 110, "costo_var_unit2": 65,
+    })
+    arbol = ArbolEscenarios(datos, base)
+    padre = arbol.ramificar("Padre")
+    padre.costos_fijos.actualizar(1, valor1=0, valor2=0)
+    hija = arbol.ramificar("Hija", "Padre")
+    hija.costos_fijos.eliminar(2)
+    copia_padre, copia_hija = base.copiar(), base.copiar()
+    for copia in (copia_padre, copia_hija):
+        copia.actualizar(1, valor1=0, valor2=0)
+    copia_hija.eliminar(2)
+    for nombre, copia in (("Padre", copia_padre), ("Hija", copia_hija)):
+        rama = arbol[nombre]
+        assert rama.costos_fijos.totales == totalizar_costos_fijos(copia.a_dicts())
+        assert arbol.evaluar(nombre).total.resultado1 == datos.alt1.margen - copia.totales.total_costos_fijos1
+    assert arbol["Base"].costos_fijos.totales == base.totales
+    diferencias = arbol.diferencias("Hija")
+    assert [c.id for c in diferencias.costos] == [2] and diferencias.costos[0].despues is None
+
+
+def test_vistas_ramificadas_no_repiten_identificadores():
+    vista = CatalogoConDelta(_base(10).congelar())
+    hermana = vista.ramificar()
+    primero = vista.agregar("Uno", 10, 10)
+    segundo = hermana.agregar("Dos", 20, 20)
+    assert primero == 10 and segundo == 11
+    assert not hermana.contiene(primero) and not vista.contiene(segundo)
+    assert hermana.ids().tolist()[-1] == segundo and len(hermana) == 11
+    assert hermana.totales == totalizar_costos_fijos(hermana.a_dicts())
+    # Tampoco se reutilizan después de descartar los cambios
+    vista.descartar_cambios()
+    assert vista.agregar("Tres", 30, 30) == 12
@@ -0,0 +1,104 @@
+"""Códigos de salida y resultados de la ejecución por lotes desde la línea de comandos."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from motor_costos import Alternativa, CostoFijo, evaluar
+from motor_costos.archivos import exportar_tabla, tabla_costos_fijos
+from motor_costos.catalogo import CatalogoCostosFijos
+from motor_costos.cli import SALIDA_DATOS, SALIDA_ESCRITURA, SALIDA_OK, SALIDA_USO, main
+
+
+@pytest.fixture
+def escenarios(tmp_path):
+    generador = np.random.default_rng(4)
+    n = 250
+    tabla = pd.DataFrame({
+        "escenario": [f"E{i}" for i in range(n)],
+        "unidades1": generador.integers(0, 1000, n), "precio1": generador.integers(1, 100, n),
+        "costo_var_unit1": generador.integers(0, 60, n),
+        "unidades2": generador.integers(0, 1000, n), "precio2": generador.integers(1, 100, n),
+        "costo_var_unit2": generador.integers(0, 60, n),
+        "total_costos_fijos1": generador.integers(0, 20000, n), "total_costos_fijos2": generador.integers(0, 20000, n),
+    })
+    ruta = tmp_path / "escenarios.csv"
+    tabla.to_csv(ruta, index=False)
+    return str(ruta), tabla
+
+
+def test_exito_y_resultados_coinciden_con_evaluar(tmp_path, escenarios):
+    entrada, tabla = escenarios
+    salida = str(tmp_path / "resultados.parquet")
+    assert main([entrada, "-o", salida, "--tamano-bloque", "60", "-q"]) == SALIDA_OK
+    resultados = pd.read_parquet(salida)
+    assert resultados["escenario"].tolist() == tabla["escenario"].tolist()
+    for i in (0, 100, 249):
+        fila = tabla.iloc[i]
+        esperado = evaluar(
+            Alternativa("1", int(fila.unidades1), int(fila.precio1), int(fila.costo_var_unit1)),
+            Alternativa("2", int(fila.unidades2), int(fila.precio2), int(fila.costo_var_unit2)),
+            [CostoFijo("Fijos", int(fila.total_costos_fijos1), int(fila.total_costos_fijos2))],
+        )
+        assert resultados["ventaja"][i] == esperado.total.ventaja
+        assert resultados["costo_oportunidad1"][i] == esperado.oportunidad.costo_oportunidad_alt1
+
+
+def test_procesos_conservan_el_orden(tmp_path, escenarios):
+    entrada, _ = escenarios
+    un_proceso, dos_procesos = str(tmp_path / "uno.csv"), str(tmp_path / "dos.csv")
+    assert main([entrada, "-o", un_proceso, "--tamano-bloque", "30", "--procesos", "1", "-q"]) == SALIDA_OK
+    assert main([entrada, "-o", dos_procesos, "--tamano-bloque", "30", "--procesos", "2", "-q"]) == SALIDA_OK
+    pd.testing.assert_frame_equal(pd.read_csv(un_proceso), pd.read_csv(dos_procesos))
+
+
+def test_catalogo_comun_completa_los_totales(tmp_path, escenarios):
+    entrada, tabla = escenarios
+    catalogo = CatalogoCostosFijos()
+    catalogo.agregar("Arriendo", 1000, 800, relevante=True)
+    costos = str(tmp_path / "costos.csv")
+    exportar_tabla(tabla_costos_fijos(catalogo), costos)
+    salida = str(tmp_path / "resultados.csv")
+    assert main([entrada, "-o", salida, "--costos-fijos", costos, "--modelos", "relevante", "-q"]) == SALIDA_OK
+    resultados = pd.read_csv(salida)
+    assert "ventaja" not in resultados and (resultados["total_costos_relevantes1"] == 1000).all()
+
+
+def test_entrada_inexistente(tmp_path):
+    assert main([str(tmp_path / "no_existe.csv"), "-o", str(tmp_path / "r.csv"), "-q"]) == SALIDA_DATOS
+
+
+def test_columnas_faltantes(tmp_path, escenarios, capsys):
+    _, tabla = escenarios
+    entrada = tmp_path / "incompleto.csv"
+    tabla.drop(columns=["precio2"]).to_csv(entrada, index=False)
+    assert main([str(entrada), "-o", str(tmp_path / "r.csv"), "-q"]) == SALIDA_DATOS
+    assert "precio2" in capsys.readouterr().err
+
+
+def test_valores_invalidos_en_un_bloque_posterior(tmp_path, escenarios, capsys):
+    _, tabla = escenarios
+    tabla.loc[200, "precio1"] = -1
+    entrada = tmp_path / "invalido.csv"
+    tabla.to_csv(entrada, index=False)
+    assert main([str(entrada), "-o", str(tmp_path / "r.csv"), "--tamano-bloque", "50", "-q"]) == SALIDA_DATOS
+    assert "fila 201" in capsys.readouterr().err
+
+
+def test_salida_no_escribible(tmp_path, escenarios):
+    entrada, _ = escenarios
+    assert main([entrada, "-o", str(tmp_path / "no_existe" / "r.csv"), "-q"]) == SALIDA_ESCRITURA
+
+
+@pytest.mark.parametrize("argumentos", [
+    ["--procesos", "-1"],
+    ["--tamano-bloque", "0"],
+    ["--modelos", "otro"],
+    ["-o", "resultados.xlsx"],
+    ["-o", "resultados.json"],
+])
+def test_uso_incorrecto(escenarios, argumentos):
+    entrada, _ = escenarios
+    with pytest.raises(SystemExit) as salida:
+        main([entrada, *argumentos])
+    assert salida.value.code == SALIDA_USO
@@ -0,0 +1,53 @@
+"""Grilla de dos variables frente a los modelos escalares."""
+
+import numpy as np
+import pytest
+
+from motor_costos import Alternativa, CostoFijo, evaluar
+from motor_costos import grilla
+from motor_costos.grilla import Eje, evaluar_grilla, variables_grilla
+
+ALT1 = Alternativa("A", 1000, 100, 60)
+ALT2 = Alternativa("B", 800, 120, 70)
+COSTOS = [CostoFijo("Arriendo", 5000, 4000, relevante=True), CostoFijo("Luz", 700, 700)]
+
+
+def _ejes(puntos_x=7, puntos_y=5):
+    variables = {v.etiqueta: v for v in variables_grilla(ALT1, ALT2, COSTOS)}
+    return (
+        Eje.lineal(variables["Precio (A)"], 80, 120, puntos_x),
+        Eje.lineal(variables["Unidades (B)"], 500, 1100, puntos_y),
+    )
+
+
+@pytest.mark.parametrize("modelo", ["total", "relevante"])
+def test_cada_punto_coincide_con_evaluar(modelo):
+    eje_x, eje_y = _ejes()
+    resultado = evaluar_grilla(ALT1, ALT2, COSTOS, eje_x, eje_y, modelo)
+    for j, unidades in enumerate(eje_y.valores):
+        for i, precio in enumerate(eje_x.valores):
+            escalar = getattr(evaluar(
+                Alternativa("A", 1000, precio, 60), Alternativa("B", unidades, 120, 70), COSTOS
+            ), modelo)
+            assert resultado.ventaja[j, i] == pytest.approx(escalar.ventaja, abs=0.01)
+
+
+def test_bloques_en_el_mismo_proceso_por_defecto(monkeypatch):
+    def sin_pool(*args, **kwargs):
+        raise AssertionError("evaluar_grilla no debe abrir un pool de procesos por defecto")
+
+    monkeypatch.setattr(grilla, "ProcessPoolExecutor", sin_pool)
+    eje_x, eje_y = _ejes(40, 30)
+    completa = evaluar_grilla(ALT1, ALT2, COSTOS, eje_x, eje_y)
+    por_bloques = evaluar_grilla(ALT1, ALT2, COSTOS, eje_x, eje_y, memoria_maxima=40 * 96 * 4)
+    assert completa.bloques == 1 and por_bloques.bloques == 8
+    np.testing.assert_array_equal(completa.ventaja, por_bloques.ventaja)
+
+
+def test_equilibrio_anula_la_ventaja():
+    eje_x, eje_y = _ejes()
+    resultado = evaluar_grilla(ALT1, ALT2, COSTOS, eje_x, eje_y)
+    for precio, unidades in zip(eje_x.valores, resultado.equilibrio):
+        if not np.isnan(unidades):
+            escalar = evaluar(Alternativa("A", 1000, precio, 60), Alternativa("B", unidades, 120, 70), COSTOS)
+            assert escalar.total.ventaja == pytest.approx(0, abs=0.01)
@@ -0,0 +1,110 @@
+"""Evaluación por lotes frente a los modelos escalares."""
+
+import numpy as np
+import pytest
+
+from motor_costos import Alternativa, CostoFijo, CostoFijoMultiple, evaluar, evaluar_alternativas
+from motor_costos.lote import evaluar_lote, evaluar_lote_alternativas, evaluar_lote_totales
+
+
+@pytest.fixture
+def escenarios():
+    generador = np.random.default_rng(7)
+    n, k = 50, 4
+    return {
+        "unidades": generador.integers(0, 2000, (n, 2)),
+        "precio": generador.integers(1, 200, (n, 2)),
+        "costo_var_unit": generador.integers(0, 150, (n, 2)),
+        "costos_fijos": generador.integers(0, 50000, (n, 2, k)),
+        "relevante": generador.random(k) < 0.5,
+    }
+
+
+def _escalar(escenarios, i, relevante=None):
+    unidades, precio, cvu = escenarios["unidades"][i], escenarios["precio"][i], escenarios["costo_var_unit"][i]
+    costos = escenarios["costos_fijos"]
+    costos = costos[i] if costos.ndim == 3 else costos
+    relevante = escenarios["relevante"] if relevante is None else relevante
+    return evaluar(
+        Alternativa("1", int(unidades[0]), int(precio[0]), int(cvu[0])),
+        Alternativa("2", int(unidades[1]), int(precio[1]), int(cvu[1])),
+        [CostoFijo(f"c{j}", int(costos[0, j]), int(costos[1, j]), relevante=bool(r)) for j, r in enumerate(relevante)],
+    )
+
+
+def test_lote_coincide_con_modelo_escalar(escenarios):
+    lote = evaluar_lote(**escenarios)
+    assert len(lote) == 50
+    for i in range(len(lote)):
+        escalar = _escalar(escenarios, i)
+        assert lote.resultado[i].tolist() == [escalar.total.resultado1, escalar.total.resultado2]
+        assert lote.resultado_relevante[i].tolist() == [escalar.relevante.resultado1, escalar.relevante.resultado2]
+        assert lote.ventaja[i] == escalar.total.ventaja
+        assert lote.ventaja_relevante[i] == escalar.relevante.ventaja
+        assert lote.costo_oportunidad[i].tolist() == [
+            escalar.oportunidad.costo_oportunidad_alt1,
+            escalar.oportunidad.costo_oportunidad_alt2,
+        ]
+        assert lote.gana_alternativa1[i] == escalar.total.gana_alternativa1
+
+
+def test_mascara_relevante_por_escenario(escenarios):
+    mascaras = np.random.default_rng(3).random(escenarios["costos_fijos"].shape[::2]) < 0.5
+    lote = evaluar_lote(**{**escenarios, "relevante": mascaras})
+    for i in range(len(lote)):
+        escalar = _escalar(escenarios, i, mascaras[i])
+        assert lote.resultado_relevante[i].tolist() == [escalar.relevante.resultado1, escalar.relevante.resultado2]
+
+
+def test_costos_compartidos_se_difunden(escenarios):
+    escenarios["costos_fijos"] = escenarios["costos_fijos"][0]
+    lote = evaluar_lote(**escenarios)
+    assert lote.total_costos_fijos.shape == (50, 2)
+    for i in (0, 17, 49):
+        assert lote.ventaja[i] == _escalar(escenarios, i).total.ventaja
+
+
+def test_costos_por_escenario_con_datos_de_una_fila():
+    costos = np.array([[[100, 50], [100, 50]], [[300, 0], [100, 0]], [[0, 0], [500, 500]]])
+    lote = evaluar_lote([10, 10], [100, 100], [40, 40], costos, [True, False])
+    assert len(lote) == 3
+    assert lote.ventaja.tolist() == [0, -200, 1000]
+    assert lote.ventaja_relevante.tolist() == [0, -200, 500]
+    alternativas = evaluar_lote_alternativas([10, 10, 10], [100, 100, 100], [40, 40, 40], np.ones((4, 3, 2)))
+    assert len(alternativas) == 4
+
+
+def test_cantidades_de_escenarios_incompatibles():
+    with pytest.raises(ValueError, match="cantidad de escenarios"):
+        evaluar_lote(np.ones((3, 2)), np.ones((4, 2)), np.ones((3, 2)))
+    with pytest.raises(ValueError, match="cantidad de escenarios"):
+        evaluar_lote(np.ones((3, 2)), np.ones((1, 2)), np.zeros((1, 2)), np.ones((2, 2, 5)))
+
+
+def test_lote_totales_coincide_con_lote(escenarios):
+    lote = evaluar_lote(**escenarios)
+    totales = evaluar_lote_totales(
+        escenarios["unidades"], escenarios["precio"], escenarios["costo_var_unit"],
+        lote.total_costos_fijos, lote.total_costos_relevantes,
+    )
+    np.testing.assert_array_equal(totales.resultado, lote.resultado)
+    np.testing.assert_array_equal(totales.resultado_relevante, lote.resultado_relevante)
+
+
+def test_lote_alternativas_coincide_con_evaluar_alternativas():
+    generador = np.random.default_rng(11)
+    n, a, k = 30, 4, 3
+    unidades = generador.integers(0, 1000, (n, a))
+    precio = generador.integers(1, 100, (n, a))
+    cvu = generador.integers(0, 80, (n, a))
+    costos = generador.integers(0, 20000, (n, a, k))
+    relevante = np.array([True, False, True])
+    lote = evaluar_lote_alternativas(unidades, precio, cvu, costos, relevante)
+    for i in range(n):
+        alternativas = [Alternativa(str(j), int(unidades[i, j]), int(precio[i, j]), int(cvu[i, j])) for j in range(a)]
+        costos_fijos = [CostoFijoMultiple(f"c{c}", costos[i, :, c].tolist(), bool(relevante[c])) for c in range(k)]
+        escalar = evaluar_alternativas(alternativas, costos_fijos)
+        assert lote.resultado[i].tolist() == [r.resultado for r in escalar]
+        assert lote.resultado_relevante[i].tolist() == [r.resultado_relevante for r in escalar]
+        assert lote.costo_oportunidad[i].tolist() == [r.costo_oportunidad for r in escalar]
+        assert lote.ganadora[i] == next(j for j, r in enumerate(escalar) if r.posicion == 1)
@@ -0,0 +1,214 @@
+"""Los tres modelos frente a las fórmulas originales de la aplicación."""
+
+import pytest
+
+from motor_costos import (
+    Alternativa,
+    CostoFijo,
+    CostoFijoMultiple,
+    DatosBasicos,
+    TotalesCostosFijos,
+    evaluar,
+    evaluar_alternativas,
+    ranking,
+    totalizar_costos_fijos,
+    valor_con_reduccion,
+)
+
+
+# Fórmulas de la aplicación antes de extraer el motor: márgenes por
+# alternativa, totales con sumas simples y ventaja de la 1 sobre la 2
+def _referencia(datos, costos):
+    margen1 = datos["unidades1"] * datos["precio1"] - datos["unidades1"] * datos["costo_var_unit1"]
+    margen2 = datos["unidades2"] * datos["precio2"] - datos["unidades2"] * datos["costo_var_unit2"]
+    total1 = sum(c["valor1"] for c in costos)
+    total2 = sum(c["valor2"] for c in costos)
+    relevantes1 = sum(c["valor1"] for c in costos if c["relevante"])
+    relevantes2 = sum(c["valor2"] for c in costos if c["relevante"])
+    resultado1, resultado2 = margen1 - total1, margen2 - total2
+    relevante1, relevante2 = margen1 - relevantes1, margen2 - relevantes2
+    ventaja = resultado1 - resultado2
+    return {
+        "resultado1": resultado1,
+        "resultado2": resultado2,
+        "ventaja": ventaja,
+        "relevante1": relevante1,
+        "relevante2": relevante2,
+        "ventaja_relevante": relevante1 - relevante2,
+        "oportunidad1": resultado2,
+        "oportunidad2": resultado1,
+        "mejor": datos["nombre_alt1"] if ventaja > 0 else datos["nombre_alt2"],
+    }
+
+
+# Costo como lo armaba el formulario: "Mismo valor", "Valor diferente" o "Reducción %"
+def _costo(nombre, valor1, valor2=None, reduccion=0, relevante=None):
+    if reduccion:
+        valor2 = int(valor1 * (1 - reduccion / 100))
+    elif valor2 is None:
+        valor2 = valor1
+    if relevante is None:
+        relevante = reduccion > 0 or valor1 != valor2
+    return {"nombre": nombre, "valor1": valor1, "valor2": valor2, "reduccion": reduccion, "relevante": relevante}
+
+
+def _datos(unidades1, precio1, cvu1, unidades2, precio2, cvu2):
+    return {
+        "nombre_alt1": "Comprar", "unidades1": unidades1, "precio1": precio1, "costo_var_unit1": cvu1,
+        "nombre_alt2": "Fabricar", "unidades2": unidades2, "precio2": precio2, "costo_var_unit2": cvu2,
+    }
+
+
+ESCENARIOS = {
+    "sin_costos": (_datos(1000, 100, 60, 800, 120, 70), []),
+    "mismo_valor": (
+        _datos(1000, 100, 60, 800, 120, 70),
+        [_costo("Arriendo", 5000), _costo("Electricidad", 1200)],
+    ),
+    "valor_diferente": (
+        _datos(500, 40, 25, 500, 40, 22),
+        [_costo("Arriendo", 3000, 4500), _costo("Remuneraciones", 2000)],
+    ),
+    "reducciones": (
+        _datos(1200, 90, 55, 1100, 95, 58),
+        [_costo("Arriendo", 10000, reduccion=20), _costo("Teléfono", 800, reduccion=35), _costo("Seguros", 900)],
+    ),
+    "relevancia_manual": (
+        _datos(300, 50, 20, 320, 48, 21),
+        [_costo("Arriendo", 2000, relevante=True), _costo("Electricidad", 700, 500, relevante=False)],
+    ),
+    "pierde_alt1": (
+        _datos(100, 10, 8, 100, 10, 5),
+        [_costo("Arriendo", 50, 60)],
+    ),
+}
+
+
+@pytest.mark.parametrize("nombre", ESCENARIOS)
+def test_modelos_coinciden_con_la_aplicacion(nombre):
+    datos, costos = ESCENARIOS[nombre]
+    basicos = DatosBasicos.desde_dict(datos)
+    esperado = _referencia(datos, costos)
+
+    resultados = evaluar(basicos.alt1, basicos.alt2, [CostoFijo.desde_dict(c) for c in costos])
+
+    assert resultados.total.resultado1 == esperado["resultado1"]
+    assert resultados.total.resultado2 == esperado["resultado2"]
+    assert resultados.total.ventaja == esperado["ventaja"]
+    assert resultados.relevante.resultado1 == esperado["relevante1"]
+    assert resultados.relevante.resultado2 == esperado["relevante2"]
+    assert resultados.relevante.ventaja == esperado["ventaja_relevante"]
+    assert resultados.oportunidad.costo_oportunidad_alt1 == esperado["oportunidad1"]
+    assert resultados.oportunidad.costo_oportunidad_alt2 == esperado["oportunidad2"]
+    assert resultados.oportunidad.ventaja == esperado["ventaja"]
+    assert resultados.oportunidad.mejor_alternativa == esperado["mejor"]
+
+
+def test_acepta_diccionarios_de_costos():
+    datos, costos = ESCENARIOS["reducciones"]
+    basicos = DatosBasicos.desde_dict(datos)
+    con_dicts = evaluar(basicos.alt1, basicos.alt2, costos)
+    con_costos = evaluar(basicos.alt1, basicos.alt2, [CostoFijo.desde_dict(c) for c in costos])
+    assert con_dicts == con_costos
+
+
+def test_empate_gana_alternativa2():
+    alt1 = Alternativa("A", unidades=10, precio=100, costo_var_unit=40)
+    alt2 = Alternativa("B", unidades=10, precio=100, costo_var_unit=40)
+    resultados = evaluar(alt1, alt2, [CostoFijo("Arriendo", 200, 200)])
+    assert resultados.total.ventaja == 0
+    assert not resultados.total.gana_alternativa1
+    assert resultados.oportunidad.mejor_alternativa == "B"
+
+
+def test_totales_separan_costos_relevantes():
+    costos = [_costo("Arriendo", 1000, reduccion=10), _costo("Luz", 300), _costo("Gas", 200, 150)]
+    assert totalizar_costos_fijos(costos) == TotalesCostosFijos(1500, 1350, 1200, 1050)
+
+
+def test_totales_dados_no_recorren_los_costos():
+    alt1 = Alternativa("A", unidades=10, precio=100, costo_var_unit=40)
+    alt2 = Alternativa("B", unidades=8, precio=120, costo_var_unit=50)
+    totales = TotalesCostosFijos(200, 150, 100, 50)
+    resultados = evaluar(alt1, alt2, None, totales)
+    assert (resultados.total.resultado1, resultados.total.resultado2) == (400, 410)
+    assert (resultados.relevante.resultado1, resultados.relevante.resultado2) == (500, 510)
+
+
+@pytest.mark.parametrize("valor1, reduccion, esperado", [(10000, 20, 8000), (800, 35, 520), (999, 0, 999), (1000, 100, 0)])
+def test_valor_con_reduccion(valor1, reduccion, esperado):
+    assert valor_con_reduccion(valor1, reduccion) == esperado
+
+
+def test_importes_al_centavo_no_dependen_del_orden():
+    costos = [CostoFijo("a", 0.1, 0.1), CostoFijo("b", 0.2, 0.2), CostoFijo("c", 0.3, 0.3)]
+    assert totalizar_costos_fijos(costos) == totalizar_costos_fijos(costos[::-1])
+    assert totalizar_costos_fijos(costos).total_costos_fijos1 == 0.6
+
+
+def test_datos_basicos_ida_y_vuelta():
+    datos = _datos(1000, 100.5, 60.25, 800, 120, 70)
+    basicos = DatosBasicos.desde_dict(datos)
+    vuelta = basicos.a_dict()
+    assert {k: vuelta[k] for k in datos} == datos
+    assert vuelta["margen1"] == 1000 * 100.5 - 1000 * 60.25
+    assert DatosBasicos.desde_dict(vuelta) == basicos
+
+
+def _resultados_n(resultados):
+    return [(r.nombre, r.resultado, r.costo_oportunidad, r.ventaja, r.posicion) for r in resultados]
+
+
+def test_n_alternativas_costo_de_oportunidad_y_ranking():
+    alternativas = [
+        Alternativa("A", 100, 10, 4),   # margen 600
+        Alternativa("B", 100, 12, 4),   # margen 800
+        Alternativa("C", 100, 9, 4),    # margen 500
+        Alternativa("D", 100, 11, 4),   # margen 700
+    ]
+    costos = [CostoFijoMultiple("Arriendo", [100, 150, 0, 50], relevante=True), CostoFijoMultiple("Luz", [10, 10, 10, 10])]
+    resultados = evaluar_alternativas(alternativas, costos)
+    # Resultados 490, 640, 490, 640: empatan B y D, y C y A
+    assert _resultados_n(resultados) == [
+        ("A", 490, 640, -150, 4),
+        ("B", 640, 640, 0, 2),
+        ("C", 490, 640, -150, 3),
+        ("D", 640, 640, 0, 1),
+    ]
+    assert [r.resultado_relevante for r in resultados] == [500, 650, 500, 650]
+    assert [r.nombre for r in ranking(resultados)] == ["D", "B", "C", "A"]
+
+
+def test_n_alternativas_la_mejor_renuncia_a_la_segunda():
+    alternativas = [Alternativa("A", 10, 10, 0), Alternativa("B", 10, 30, 0), Alternativa("C", 10, 20, 0)]
+    resultados = evaluar_alternativas(alternativas, [])
+    assert [r.costo_oportunidad for r in resultados] == [300, 200, 300]
+    assert [r.ventaja for r in resultados] == [-200, 100, -100]
+    assert [r.posicion for r in resultados] == [3, 1, 2]
+
+
+def test_n_alternativas_sin_costos_fijos():
+    alternativas = [Alternativa("A", 10, 10, 5), Alternativa("B", 10, 10, 5)]
+    resultados = evaluar_alternativas(alternativas)
+    assert [r.resultado for r in resultados] == [50, 50]
+    # Empate: gana la última, igual que con dos alternativas
+    assert [r.posicion for r in resultados] == [2, 1]
+
+
+def test_n_alternativas_coincide_con_dos_alternativas():
+    datos, costos = ESCENARIOS["reducciones"]
+    basicos = DatosBasicos.desde_dict(datos)
+    dos = evaluar(basicos.alt1, basicos.alt2, costos)
+    n = evaluar_alternativas([basicos.alt1, basicos.alt2], costos)
+    assert [r.resultado for r in n] == [dos.total.resultado1, dos.total.resultado2]
+    assert [r.costo_oportunidad for r in n] == [dos.oportunidad.costo_oportunidad_alt1, dos.oportunidad.costo_oportunidad_alt2]
+    assert ranking(n)[0].nombre == dos.oportunidad.mejor_alternativa
+
+
+def test_n_alternativas_validaciones():
+    with pytest.raises(ValueError, match="al menos dos"):
+        evaluar_alternativas([Alternativa("A", 1, 1, 0)])
+    with pytest.raises(ValueError, match="3 valores para 2"):
+        evaluar_alternativas([Alternativa("A"), Alternativa("B")], [CostoFijoMultiple("x", [1, 2, 3])])
+    with pytest.raises(ValueError, match="totales para 1"):
+        evaluar_alternativas([Alternativa("A"), Alternativa("B")], totales=([1], [1]))
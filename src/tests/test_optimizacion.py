@@ -0,0 +1,207 @@
+"""Mezcla óptima con el símplex propio y, si SciPy está instalado, con HiGHS."""
+
+import numpy as np
+import pytest
+
+from motor_costos.optimizacion import Recurso, _simplex, optimizar_mezcla
+
+
+# Problema de Wyndor Glass (Hillier y Lieberman): max 3 x1 + 5 x2 con
+# x1 <= 4, 2 x2 <= 12 y 3 x1 + 2 x2 <= 18. Óptimo x = (2, 6), Z = 36 y
+# precios sombra (0, 1.5, 1).
+def _wyndor(**opciones):
+    return optimizar_mezcla(
+        ["Puerta", "Ventana"],
+        [10, 12],
+        [7, 7],
+        [Recurso("Planta 1", 4), Recurso("Planta 2", 12), Recurso("Planta 3", 18)],
+        [[1, 0], [0, 2], [3, 2]],
+        **opciones,
+    )
+
+
+def test_mezcla_de_libro_con_el_simplex():
+    resultado = _wyndor(motor="simplex")
+
+    assert resultado.motor == "simplex"
+    assert resultado.cantidades.tolist() == pytest.approx([2, 6])
+    assert resultado.contribucion == pytest.approx(36)
+    assert resultado.precios_sombra.tolist() == pytest.approx([0, 1.5, 1])
+    assert resultado.uso.tolist() == pytest.approx([2, 12, 18])
+    assert resultado.holgura.tolist() == pytest.approx([2, 0, 0])
+    assert resultado.activas.tolist() == [False, True, True]
+    # Ambos productos están en la base: el costo de oportunidad iguala al margen
+    assert resultado.costo_oportunidad_unitario.tolist() == pytest.approx([3, 5])
+    assert resultado.costo_reducido.tolist() == pytest.approx([0, 0])
+
+
+def test_precios_sombra_miden_la_contribucion_de_una_unidad_mas():
+    base = _wyndor(motor="simplex")
+    for r, recurso in enumerate(base.recursos):
+        capacidades = [4, 12, 18]
+        capacidades[r] += 1
+        ampliado = optimizar_mezcla(
+            base.nombres, [10, 12], [7, 7],
+            [Recurso(nombre, c) for nombre, c in zip(base.recursos, capacidades)],
+            [[1, 0], [0, 2], [3, 2]],
+            motor="simplex",
+        )
+        assert ampliado.contribucion - base.contribucion == pytest.approx(base.precios_sombra[r]), recurso
+
+
+# Problema de Giapetto (Winston): max 3 x1 + 2 x2 con 2 x1 + x2 <= 100,
+# x1 + x2 <= 80 y una demanda máxima de 40 soldados. Óptimo (20, 60), Z = 180.
+def test_maximos_y_costos_fijos():
+    resultado = optimizar_mezcla(
+        ["Soldado", "Tren"],
+        [27, 21],
+        [24, 19],
+        [Recurso("Terminación", 100), Recurso("Carpintería", 80)],
+        [[2, 1], [1, 1]],
+        maximos=[40, None],
+        costos_fijos=50,
+        motor="simplex",
+    )
+
+    assert resultado.cantidades.tolist() == pytest.approx([20, 60])
+    assert resultado.contribucion == pytest.approx(180)
+    assert resultado.resultado == pytest.approx(130)
+    assert resultado.precios_sombra.tolist() == pytest.approx([1, 1])
+
+
+def test_minimos_desplazan_la_mezcla():
+    # Con x1 >= 3 la planta 3 deja 4.5 ventanas: Z = 9 + 22.5
+    resultado = _wyndor(minimos=[3, 0], motor="simplex")
+
+    assert resultado.cantidades.tolist() == pytest.approx([3, 4.5])
+    assert resultado.contribucion == pytest.approx(31.5)
+    assert resultado.precios_sombra.tolist() == pytest.approx([0, 0, 2.5])
+    # La puerta se produce solo por el mínimo: su costo reducido es negativo
+    assert resultado.costo_reducido.tolist() == pytest.approx([-4.5, 0])
+
+
+def test_minimos_iguales_a_los_maximos_fijan_la_cantidad():
+    resultado = _wyndor(minimos=[1, 2], maximos=[1, 2], motor="simplex")
+    assert resultado.cantidades.tolist() == pytest.approx([1, 2])
+    assert resultado.contribucion == pytest.approx(13)
+
+
+def test_sin_recursos_produce_hasta_el_maximo_si_hay_margen():
+    resultado = optimizar_mezcla(["A", "B"], [10, 5], [4, 6], [], np.zeros((0, 2)), maximos=[30, 10], motor="simplex")
+    assert resultado.cantidades.tolist() == pytest.approx([30, 0])
+    assert resultado.contribucion == pytest.approx(180)
+    assert resultado.precios_sombra.shape == (0,)
+
+
+def test_problema_infactible():
+    with pytest.raises(ValueError, match="factible"):
+        _wyndor(minimos=[5, 0], motor="simplex")
+    with pytest.raises(ValueError, match="factible"):
+        _wyndor(minimos=[3, 5], motor="simplex")
+
+
+def test_problema_no_acotado():
+    with pytest.raises(ValueError, match="no está acotado"):
+        optimizar_mezcla(
+            ["A", "B"], [10, 5], [4, 1], [Recurso("Horas", 100)], [[1, 0]], motor="simplex"
+        )
+
+
+# Tres restricciones activas en el óptimo de un problema con dos productos
+def test_vertice_degenerado():
+    resultado = optimizar_mezcla(
+        ["Puerta", "Ventana"],
+        [10, 12],
+        [7, 7],
+        [Recurso("Planta 1", 4), Recurso("Planta 2", 12), Recurso("Planta 3", 18), Recurso("Depósito", 8)],
+        [[1, 0], [0, 2], [3, 2], [1, 1]],
+        motor="simplex",
+    )
+    assert resultado.cantidades.tolist() == pytest.approx([2, 6])
+    assert resultado.contribucion == pytest.approx(36)
+    # Los precios sombra no son únicos, pero siempre valoran el óptimo
+    assert resultado.precios_sombra @ [4, 12, 18, 8] == pytest.approx(36)
+    assert (resultado.precios_sombra >= 0).all()
+    assert resultado.costo_reducido.tolist() == pytest.approx([0, 0])
+
+
+# Ejemplo de Beale: con la regla de Dantzig sola el símplex cicla
+def test_simplex_no_cicla_en_el_ejemplo_de_beale():
+    c = np.array([0.75, -150, 0.02, -6])
+    A = np.array([
+        [0.25, -60, -0.04, 9],
+        [0.5, -90, -0.02, 3],
+        [0, 0, 1, 0],
+    ])
+    b = np.array([0.0, 0.0, 1.0])
+
+    x, duales = _simplex(c, A, b)
+
+    assert x.tolist() == pytest.approx([0.04, 0, 1, 0])
+    assert c @ x == pytest.approx(0.05)
+    assert duales @ b == pytest.approx(0.05)
+
+
+def test_simplex_informa_si_no_converge():
+    with pytest.raises(ValueError, match="no convergió"):
+        _simplex(np.array([3.0, 5.0]), np.array([[1.0, 0], [0, 2], [3, 2]]), np.array([4.0, 12, 18]), max_iteraciones=1)
+
+
+@pytest.mark.parametrize(
+    "opciones, mensaje",
+    [
+        ({"minimos": [-1, 0]}, "no negativos"),
+        ({"minimos": [3, 0], "maximos": [2, None]}, "no mayores"),
+        ({"costos_fijos_evitables": [1, 2, 3]}, "costo evitable"),
+        ({"motor": "otro"}, "Motor desconocido"),
+    ],
+)
+def test_validaciones(opciones, mensaje):
+    with pytest.raises(ValueError, match=mensaje):
+        _wyndor(**opciones)
+
+
+def test_simplex_no_resuelve_enteros_ni_evitables():
+    with pytest.raises(ImportError, match="scipy"):
+        _wyndor(entero=True, motor="simplex")
+    with pytest.raises(ImportError, match="scipy"):
+        _wyndor(costos_fijos_evitables=[5, 0], motor="simplex")
+
+
+def _problema_al_azar(rng):
+    n, r = rng.integers(1, 6), rng.integers(1, 5)
+    precio = rng.uniform(5, 50, n).round(2)
+    costo = (precio * rng.uniform(0.2, 1.1, n)).round(2)
+    consumos = rng.uniform(0.1, 5, (r, n)).round(1)
+    capacidades = rng.uniform(50, 500, r).round()
+    minimos = np.where(rng.random(n) < 0.3, rng.uniform(0, 2, n).round(1), 0)
+    maximos = [float(m) if rng.random() < 0.3 else None for m in rng.uniform(5, 60, n).round()]
+    maximos = [None if m is None else max(m, mi) for m, mi in zip(maximos, minimos)]
+    recursos = [Recurso(f"R{i}", c) for i, c in enumerate(capacidades)]
+    return [f"P{i}" for i in range(n)], precio, costo, recursos, consumos, minimos, maximos
+
+
+@pytest.mark.parametrize("semilla", range(20))
+def test_highs_coincide_con_el_simplex(semilla):
+    pytest.importorskip("scipy")
+    nombres, precio, costo, recursos, consumos, minimos, maximos = _problema_al_azar(np.random.default_rng(semilla))
+
+    simplex = optimizar_mezcla(nombres, precio, costo, recursos, consumos, minimos, maximos, motor="simplex")
+    highs = optimizar_mezcla(nombres, precio, costo, recursos, consumos, minimos, maximos, motor="highs")
+
+    assert highs.motor == "highs"
+    assert highs.contribucion == pytest.approx(simplex.contribucion, rel=1e-7, abs=1e-6)
+    # Con óptimos alternativos las cantidades pueden diferir; la contribución no
+    assert highs.uso.tolist() == pytest.approx(consumos @ highs.cantidades)
+    assert (highs.holgura >= 0).all() and (simplex.holgura >= 0).all()
+
+
+def test_highs_coincide_en_la_mezcla_de_libro():
+    pytest.importorskip("scipy")
+    simplex, highs = _wyndor(motor="simplex"), _wyndor(motor="highs")
+    assert highs.cantidades.tolist() == pytest.approx(simplex.cantidades.tolist())
+    assert highs.precios_sombra.tolist() == pytest.approx(simplex.precios_sombra.tolist())
+
+    simplex, highs = _wyndor(minimos=[3, 0], motor="simplex"), _wyndor(minimos=[3, 0], motor="highs")
+    assert highs.cantidades.tolist() == pytest.approx(simplex.cantidades.tolist())
+    assert highs.precios_sombra.tolist() == pytest.approx(simplex.precios_sombra.tolist())
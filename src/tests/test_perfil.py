@@ -0,0 +1,73 @@
+"""Perfilador de etapas e historial de ejecuciones."""
+
+import json
+
+from motor_costos.perfil import HistorialPerfiles, Perfilador
+
+
+def test_etapas_anidadas_no_se_cuentan_dos_veces():
+    perfilador = Perfilador(inicio=0)
+    with perfilador.etapa("Externa"):
+        with perfilador.etapa("Interna"):
+            sum(range(10_000))
+    with perfilador.etapa("Interna"):
+        pass
+    assert list(perfilador.etapas) == ["Interna", "Externa"]
+    assert all(ms >= 0 for ms in perfilador.etapas.values())
+
+
+def test_inactivo_no_mide():
+    perfilador = Perfilador(activo=False)
+    with perfilador.etapa("Cálculo"):
+        pass
+    perfilador.registrar_tabla("Resultados", None)
+    assert perfilador.etapas == {} and perfilador.tablas == []
+
+
+def test_medir_decide_en_cada_llamada():
+    perfilador = Perfilador(activo=False)
+
+    @perfilador.medir("Cálculo")
+    def calcular(x):
+        return x * 2
+
+    assert calcular(2) == 4 and perfilador.etapas == {}
+    perfilador.activo = True
+    assert calcular(3) == 6 and "Cálculo" in perfilador.etapas
+    assert calcular.__name__ == "calcular"
+
+
+def test_medir_sirve_a_un_intermediario():
+    # Como `interfaz.PerfilEjecucion`: cada llamada usa el perfilador vigente
+    class Intermediario:
+        actual = Perfilador()
+
+        def etapa(self, nombre):
+            return self.actual.etapa(nombre)
+
+        medir = Perfilador.medir
+
+    intermediario = Intermediario()
+
+    @intermediario.medir("Render")
+    def mostrar():
+        return "ok"
+
+    primero = Intermediario.actual
+    mostrar()
+    Intermediario.actual = Perfilador()
+    mostrar()
+    mostrar()
+    assert "Render" in primero.etapas and "Render" in Intermediario.actual.etapas
+
+
+def test_historial():
+    historial = HistorialPerfiles(maximo=2)
+    for pagina in ("a", "b", "c"):
+        perfilador = Perfilador()
+        with perfilador.etapa("Totales"):
+            pass
+        historial.agregar(perfilador.finalizar(pagina, widgets=3))
+    assert len(historial) == 2 and historial.ultima().pagina == "c"
+    assert [f["pagina"] for f in historial.filas()] == ["b", "c"]
+    assert [e["widgets"] for e in json.loads(historial.a_json())] == [3, 3]
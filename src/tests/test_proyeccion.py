@@ -0,0 +1,62 @@
+"""Proyección multiperíodo: VAN, período de cruce y difusión de escenarios."""
+
+import numpy as np
+import pytest
+
+from motor_costos import Alternativa, CostoFijo, evaluar
+from motor_costos.proyeccion import Crecimiento, proyectar, proyectar_lote
+
+
+def test_un_periodo_sin_descuento_coincide_con_costo_total():
+    alt1 = Alternativa("A", 1000, 100, 60)
+    alt2 = Alternativa("B", 800, 120, 70)
+    costos = [CostoFijo("Arriendo", 5000, 4000, relevante=True), CostoFijo("Luz", 700, 700)]
+    proyeccion = proyectar(alt1, alt2, costos, 1)
+    escalar = evaluar(alt1, alt2, costos)
+    assert proyeccion.resultado.van[0].tolist() == [escalar.total.resultado1, escalar.total.resultado2]
+    assert proyeccion.resultado.van_relevante[0].tolist() == [escalar.relevante.resultado1, escalar.relevante.resultado2]
+
+
+def test_van_descuenta_al_final_de_cada_periodo():
+    resultado = proyectar_lote([[1, 1]], [[110, 0]], [[0, 0]], 2, tasa_descuento=0.1, inversion=[[100, 0]])
+    assert resultado.van[0, 0] == pytest.approx(110 / 1.1 + 110 / 1.21 - 100)
+
+
+@pytest.mark.parametrize("inversion, periodos, esperado", [
+    # Recupera la inversión en el primer período
+    (300, 5, 1),
+    (300, 1, 1),
+    # Recupera la inversión en el período 7 (500 por período)
+    (3000, 10, 7),
+    # No llega a recuperarla
+    (3000, 5, 0),
+])
+def test_periodo_de_recupero(inversion, periodos, esperado):
+    resultado = proyectar_lote([[10, 10]], [[100, 50]], [[0, 0]], periodos, inversion=[[inversion, 0]])
+    assert resultado.cruce.tolist() == [esperado]
+
+
+def test_sin_cruce_con_inversiones_iguales_y_misma_ganadora():
+    resultado = proyectar_lote([[10, 10]], [[100, 50]], [[0, 0]], 6)
+    assert resultado.cruce.tolist() == [0]
+
+
+def test_cruce_por_crecimiento():
+    # B arranca adelante y A la supera en el período 4 gracias al crecimiento
+    proyeccion = proyectar(
+        Alternativa("A", 100, 10, 0), Alternativa("B", 100, 13, 0), [], 8,
+        crecimiento1=Crecimiento(unidades=0.5),
+    )
+    diferencia = proyeccion.resultado.acumulado[0, 0] - proyeccion.resultado.acumulado[0, 1]
+    esperado = int(np.argmax(diferencia > 0)) + 1
+    assert diferencia[esperado - 2] <= 0 and (diferencia[esperado - 1:] > 0).all()
+    assert proyeccion.resultado.cruce.tolist() == [esperado]
+
+
+def test_costos_e_inversion_por_escenario_con_datos_de_una_fila():
+    costos = np.array([[[100], [0]], [[0], [100]], [[50], [50]]])
+    resultado = proyectar_lote([[10, 10]], [[10, 10]], [[0, 0]], 3, costos_fijos=costos, relevante=[True])
+    assert len(resultado) == 3
+    assert resultado.ventaja_van.tolist() == [-300, 300, 0]
+    inversion = proyectar_lote([[10, 10]], [[10, 10]], [[0, 0]], 2, inversion=[[0, 0], [10, 0]])
+    assert inversion.ventaja_van.tolist() == [0, -10]
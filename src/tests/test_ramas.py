@@ -0,0 +1,165 @@
+"""Árbol de ramas de escenarios frente a catálogos recalculados por completo."""
+
+import random
+
+import pytest
+
+from motor_costos import evaluar
+from motor_costos.catalogo import CatalogoCostosFijos
+from motor_costos.modelos import DatosBasicos
+from motor_costos.ramas import ArbolEscenarios
+
+
+def _datos():
+    return DatosBasicos.desde_dict({
+        "nombre_alt1": "A", "unidades1": 1000, "precio1": 100, "costo_var_unit1": 60,
+        "nombre_alt2": "B", "unidades2": 900, "precio2": 110, "costo_var_unit2": 65,
+    })
+
+
+def _catalogo(n=50):
+    catalogo = CatalogoCostosFijos()
+    for i in range(n):
+        catalogo.agregar(f"Costo {i}", 100 * (i + 1), 90 * (i + 1), relevante=i % 3 == 0)
+    return catalogo
+
+
+# Base -> Arriendo -> Arriendo y volumen -> Detalle; Base -> Volumen
+def _arbol():
+    arbol = ArbolEscenarios(_datos(), _catalogo())
+    arbol.ramificar("Arriendo")
+    arbol.ramificar("Arriendo y volumen", "Arriendo")
+    arbol.ramificar("Detalle", "Arriendo y volumen")
+    arbol.ramificar("Volumen")
+    return arbol
+
+
+def test_eliminar_quita_el_subarbol():
+    arbol = _arbol()
+
+    eliminadas = arbol.eliminar("Arriendo")
+
+    assert eliminadas == ["Arriendo", "Arriendo y volumen", "Detalle"]
+    assert arbol.nombres() == ["Base", "Volumen"]
+    assert arbol.hijas("Base") == ["Volumen"]
+    with pytest.raises(KeyError):
+        arbol["Detalle"]
+
+
+def test_eliminar_una_hoja_no_toca_a_su_padre():
+    arbol = _arbol()
+    assert arbol.eliminar("Detalle") == ["Detalle"]
+    assert arbol.nombres() == ["Base", "Arriendo", "Arriendo y volumen", "Volumen"]
+    assert arbol.hijas("Arriendo y volumen") == []
+
+
+def test_eliminar_la_base_o_una_rama_inexistente():
+    arbol = _arbol()
+    with pytest.raises(ValueError, match="base"):
+        arbol.eliminar("Base")
+    with pytest.raises(KeyError):
+        arbol.eliminar("Otra")
+    assert len(arbol) == 5
+
+
+def test_ramificar_valida_el_nombre():
+    arbol = _arbol()
+    with pytest.raises(ValueError, match="Ya existe"):
+        arbol.ramificar(" Volumen ")
+    with pytest.raises(ValueError, match="nombre"):
+        arbol.ramificar("  ")
+    with pytest.raises(KeyError):
+        arbol.ramificar("Nueva", "Otra")
+
+
+def test_diferencias_entre_ramas_hermanas():
+    arbol = _arbol()
+    arriendo, volumen = arbol["Arriendo"].costos_fijos, arbol["Volumen"].costos_fijos
+    # Editado en una sola de las hermanas
+    arriendo.actualizar(0, valor1=50, valor2=40)
+    # Editado en ambas con valores distintos
+    arriendo.actualizar(1, valor1=10)
+    volumen.actualizar(1, valor1=20)
+    # Editado en ambas con los mismos valores: no es una diferencia
+    arriendo.actualizar(2, relevante=True)
+    volumen.actualizar(2, relevante=True)
+    # Eliminado en una de ellas
+    arriendo.eliminar(3)
+    # Agregados en cada una
+    nuevo_arriendo = arriendo.agregar("Seguro", 300, 300)
+    nuevo_volumen = volumen.agregar("Flete", 120, 80, relevante=True)
+    arbol.editar_datos("Volumen", 2, unidades=1200)
+
+    diferencias = arbol.diferencias("Volumen", "Arriendo")
+
+    assert diferencias.rama == "Volumen" and diferencias.otra == "Arriendo"
+    assert diferencias.datos == {"Unidades (B)": (900, 1200)}
+    por_id = {c.id: c for c in diferencias.costos}
+    assert sorted(por_id) == sorted([0, 1, 3, nuevo_arriendo, nuevo_volumen])
+    # Editados
+    assert por_id[0].antes["valor1"] == 50 and por_id[0].despues["valor1"] == 100
+    assert por_id[1].antes["valor1"] == 10 and por_id[1].despues["valor1"] == 20
+    # Eliminado en "Arriendo": existe solo en "Volumen"
+    assert por_id[3].antes is None and por_id[3].despues == arbol["Base"].costos_fijos.fila(3)
+    # Agregado en "Arriendo": falta en "Volumen"
+    assert por_id[nuevo_arriendo].nombre == "Seguro" and por_id[nuevo_arriendo].despues is None
+    # Agregado en "Volumen"
+    assert por_id[nuevo_volumen].nombre == "Flete" and por_id[nuevo_volumen].antes is None
+    assert por_id[nuevo_volumen].despues["valor2"] == 80
+
+    # En sentido contrario se invierten antes y después
+    inversas = {c.id: (c.antes, c.despues) for c in arbol.diferencias("Arriendo", "Volumen").costos}
+    assert inversas == {i: (c.despues, c.antes) for i, c in por_id.items()}
+
+
+def test_sin_cambios_no_hay_diferencias():
+    arbol = _arbol()
+    assert not arbol.diferencias("Arriendo", "Volumen")
+    assert not arbol.diferencias("Detalle")
+
+
+def test_editar_datos_valida_la_alternativa():
+    arbol = _arbol()
+    with pytest.raises(ValueError, match="1 o 2"):
+        arbol.editar_datos("Volumen", 3, unidades=10)
+
+
+# Aplica cambios al azar a una rama y a una copia modificable de su catálogo
+def _editar_al_azar(rama, copia, semilla, pasos=60):
+    generador = random.Random(semilla)
+    for paso in range(pasos):
+        ids = rama.costos_fijos.ids().tolist()
+        operacion = generador.random()
+        if operacion < 0.2 or not ids:
+            nuevo = (f"Nuevo {semilla}-{paso}", round(generador.uniform(0, 900), 2), round(generador.uniform(0, 900), 2), 0, generador.random() < 0.5)
+            i = rama.costos_fijos.agregar(*nuevo)
+            # Las otras ramas ya usaron algunos identificadores
+            copia.reservar(i)
+            assert copia.agregar(*nuevo) == i
+        elif operacion < 0.35:
+            i = generador.choice(ids)
+            rama.costos_fijos.eliminar(i)
+            copia.eliminar(i)
+        else:
+            i = generador.choice(ids)
+            cambios = {"valor1": round(generador.uniform(0, 9000), 2), "relevante": generador.random() < 0.5}
+            if generador.random() < 0.5:
+                cambios["reduccion"] = generador.choice([0, 10, 25])
+            rama.costos_fijos.actualizar(i, **cambios)
+            copia.actualizar(i, **cambios)
+
+
+@pytest.mark.parametrize("semilla", range(5))
+def test_evaluar_una_rama_coincide_con_el_recuento_completo(semilla):
+    arbol = ArbolEscenarios(_datos(), _catalogo())
+    copias = {"Base": _catalogo()}
+    # Cada rama parte del estado de su padre al ramificar
+    for nombre, padre in (("Arriendo", None), ("Arriendo y volumen", "Arriendo"), ("Detalle", "Arriendo y volumen"), ("Volumen", None)):
+        rama = arbol.ramificar(nombre, padre)
+        copias[nombre] = copias[rama.padre].copiar()
+        _editar_al_azar(rama, copias[nombre], semilla * 10 + len(copias))
+    arbol.editar_datos("Detalle", 1, precio=95, unidades=1100)
+
+    for rama in arbol:
+        esperado = evaluar(rama.datos_basicos.alt1, rama.datos_basicos.alt2, copias[rama.nombre].a_dicts())
+        assert arbol.evaluar(rama.nombre) == esperado, rama.nombre
@@ -0,0 +1,84 @@
+"""Tornado y puntos de equilibrio de la ventaja."""
+
+import dataclasses
+
+import pytest
+
+from motor_costos import Alternativa, CostoFijo, evaluar
+from motor_costos.lote import evaluar_lote_totales
+from motor_costos.sensibilidad import _INDICE, _base, puntos_de_equilibrio, tornado, variables_sensibilidad
+
+ALT1 = Alternativa("A", 1000, 100, 60)
+ALT2 = Alternativa("B", 900, 110, 70)
+COSTOS = [
+    CostoFijo("Arriendo", 8000, 6000, reduccion=25, relevante=True),
+    CostoFijo("Luz", 1200, 1200),
+    CostoFijo("Seguros", 3000, 2500, relevante=True),
+]
+
+
+def _ventaja_con(variable, valor, modelo):
+    entradas = _base(ALT1, ALT2, COSTOS) + (valor - variable.valor_base) * variable.direccion
+
+    def columnas(a, b):
+        return entradas[[_INDICE[a], _INDICE[b]]]
+
+    lote = evaluar_lote_totales(
+        columnas("unidades1", "unidades2"), columnas("precio1", "precio2"),
+        columnas("costo_var_unit1", "costo_var_unit2"), columnas("total1", "total2"),
+        columnas("relevante1", "relevante2"),
+    )
+    return (lote.ventaja if modelo == "total" else lote.ventaja_relevante)[0]
+
+
+@pytest.mark.parametrize("modelo", ["total", "relevante"])
+def test_equilibrio_anula_la_ventaja(modelo):
+    variables = {v.etiqueta: v for v in variables_sensibilidad(ALT1, ALT2, COSTOS, modelo)}
+    puntos = puntos_de_equilibrio(ALT1, ALT2, COSTOS, modelo)
+    assert len(puntos) == len(variables) + sum(1 for c in COSTOS if modelo == "total" or c.relevante)
+    for punto in puntos:
+        if punto.etiqueta in variables and punto.valor_equilibrio is not None:
+            assert _ventaja_con(variables[punto.etiqueta], punto.valor_equilibrio, modelo) == pytest.approx(0, abs=1e-6)
+
+
+@pytest.mark.parametrize("modelo", ["total", "relevante"])
+def test_equilibrio_de_la_reduccion_porcentual(modelo):
+    puntos = {p.etiqueta: p for p in puntos_de_equilibrio(ALT1, ALT2, COSTOS, modelo)}
+    for i, costo in enumerate(COSTOS):
+        punto = puntos.get(f"% de reducción de {costo.nombre} (B)")
+        if not (modelo == "total" or costo.relevante):
+            assert punto is None
+            continue
+        assert punto.valor_base == pytest.approx((1 - costo.valor2 / costo.valor1) * 100)
+        costos = list(COSTOS)
+        costos[i] = dataclasses.replace(costo, valor2=costo.valor1 * (1 - punto.valor_equilibrio / 100))
+        resultado = getattr(evaluar(ALT1, ALT2, costos), modelo)
+        # El modelo escalar redondea los importes al centavo
+        assert resultado.ventaja == pytest.approx(0, abs=0.01)
+
+
+def test_pendiente_nula_no_tiene_equilibrio():
+    alt2 = Alternativa("B", 900, 70, 70)
+    puntos = {p.etiqueta: p for p in puntos_de_equilibrio(ALT1, alt2, COSTOS, "relevante")}
+    # Con contribución nula las unidades de B no mueven la ventaja
+    assert puntos["Unidades (B)"].valor_equilibrio is None
+    # Un costo no relevante no mueve la ventaja relevante
+    assert puntos["Luz (A)"].valor_equilibrio is None
+    assert puntos["Luz (A)"].cambio_relativo is None
+    assert puntos["Precio (B)"].valor_equilibrio is not None
+
+
+def test_tornado_ordena_por_amplitud_y_coincide_con_evaluar():
+    barras = tornado(ALT1, ALT2, COSTOS, rango=0.2, puntos=5)
+    amplitudes = [b.amplitud for b in barras]
+    assert amplitudes == sorted(amplitudes, reverse=True)
+    precio = next(b for b in barras if b.etiqueta == "Precio (A)")
+    assert precio.valor_bajo == pytest.approx(80) and precio.valor_alto == pytest.approx(120)
+    baja = evaluar(dataclasses.replace(ALT1, precio=80), ALT2, COSTOS).total.ventaja
+    alta = evaluar(dataclasses.replace(ALT1, precio=120), ALT2, COSTOS).total.ventaja
+    assert (precio.ventaja_baja, precio.ventaja_alta) == (pytest.approx(baja), pytest.approx(alta))
+
+
+def test_modelo_invalido():
+    with pytest.raises(ValueError):
+        variables_sensibilidad(ALT1, ALT2, COSTOS, "otro")
@@ -0,0 +1,106 @@
+"""Validación de solicitudes y cálculo del servicio HTTP."""
+
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from motor_costos import Alternativa, CostoFijo, evaluar
+from motor_costos.servicio import ErrorSolicitud, Microlotes, evaluar_matriz, fila_a_respuesta, leer_solicitud
+
+
+def _escenario(**cambios):
+    escenario = {
+        "alternativa1": {"nombre": "Comprar", "unidades": 1000, "precio": 100, "costo_var_unit": 60},
+        "alternativa2": {"nombre": "Fabricar", "unidades": 1000, "precio": 100, "costo_var_unit": 45},
+        "costos_fijos": [
+            {"nombre": "Arriendo", "valor1": 5000, "valor2": 5000},
+            {"nombre": "Maquinaria", "valor1": 0, "valor2": 12000, "relevante": True},
+        ],
+    }
+    escenario.update(cambios)
+    return escenario
+
+
+def _responder(cuerpo):
+    modelos, es_lote, filas, nombres = leer_solicitud(cuerpo)
+    salida = evaluar_matriz(np.array(filas, dtype=np.float64))
+    return [fila_a_respuesta(s, n, modelos) for s, n in zip(salida, nombres)]
+
+
+def test_respuesta_coincide_con_evaluar():
+    respuesta = _responder(_escenario())[0]
+    esperado = evaluar(
+        Alternativa("Comprar", 1000, 100, 60),
+        Alternativa("Fabricar", 1000, 100, 45),
+        [CostoFijo("Arriendo", 5000, 5000), CostoFijo("Maquinaria", 0, 12000, relevante=True)],
+    )
+    assert respuesta["total"] == {
+        "resultado1": esperado.total.resultado1,
+        "resultado2": esperado.total.resultado2,
+        "ventaja": esperado.total.ventaja,
+        "ganadora": "Fabricar",
+    }
+    assert respuesta["relevante"]["ventaja"] == esperado.relevante.ventaja
+    assert respuesta["oportunidad"]["mejor"] == esperado.oportunidad.mejor_alternativa
+
+
+def test_lote_y_modelos_pedidos():
+    modelos, es_lote, filas, nombres = leer_solicitud({"escenarios": [_escenario(), _escenario()], "modelos": ["total"]})
+    assert modelos == ["total"] and es_lote and len(filas) == 2
+    assert set(_responder({"escenarios": [_escenario()], "modelos": ["total"]})[0]) == {"total"}
+
+
+def test_nan_e_infinito_llegan_desde_json():
+    cuerpo = json.loads('{"alternativa1": {"unidades": NaN}, "alternativa2": {"precio": Infinity}}')
+    with pytest.raises(ErrorSolicitud, match="no finitos"):
+        leer_solicitud(cuerpo)
+
+
+@pytest.mark.parametrize("cuerpo, mensaje", [
+    ([], "objeto JSON"),
+    ({"escenarios": []}, "lista no vacía"),
+    ({"escenarios": 3}, "lista no vacía"),
+    ({"escenarios": [1]}, "objeto JSON"),
+    ({**_escenario(), "modelos": 5}, "Modelos válidos"),
+    ({**_escenario(), "modelos": "total"}, "Modelos válidos"),
+    ({**_escenario(), "modelos": ["total", "otro"]}, "Modelos válidos"),
+    (_escenario(alternativa1=None), "Falta 'alternativa1'"),
+    (_escenario(alternativa1={"unidades": "muchas"}), "no numéricos"),
+    (_escenario(alternativa1={"unidades": float("nan")}), "no finitos"),
+    (_escenario(alternativa2={"precio": float("inf")}), "no finitos"),
+    (_escenario(alternativa2={"costo_var_unit": -1}), "negativos"),
+    (_escenario(costos_fijos=5), "debe ser una lista"),
+    (_escenario(costos_fijos={"nombre": "Arriendo"}), "debe ser una lista"),
+    (_escenario(costos_fijos=[{"nombre": "Arriendo", "valor1": 10}]), "'valor2'"),
+    (_escenario(costos_fijos=["Arriendo"]), "'valor1'"),
+    (_escenario(costos_fijos=[{"nombre": "Arriendo", "valor1": "x", "valor2": 1}]), "numéricos"),
+    (_escenario(costos_fijos=[{"nombre": "Arriendo", "valor1": float("nan"), "valor2": 1}]), "no finitos"),
+    (_escenario(costos_fijos=[{"nombre": "Arriendo", "valor1": 1, "valor2": float("-inf")}]), "no finitos"),
+    (_escenario(costos_fijos=[{"nombre": "Arriendo", "valor1": -100, "valor2": 0}]), "negativos"),
+])
+def test_solicitudes_invalidas(cuerpo, mensaje):
+    with pytest.raises(ErrorSolicitud, match=mensaje):
+        leer_solicitud(cuerpo)
+
+
+def test_microlotes_agrupan_solicitudes_concurrentes():
+    filas = np.array([leer_solicitud(_escenario())[2][0]] * 3, dtype=np.float64)
+
+    async def correr():
+        with ThreadPoolExecutor(max_workers=1) as ejecutor:
+            microlotes = Microlotes(ejecutor, espera=0.05)
+            microlotes.iniciar()
+            try:
+                salidas = await asyncio.gather(*(microlotes.evaluar(filas[i:i + 1]) for i in range(3)))
+            finally:
+                await microlotes.detener()
+        return salidas, microlotes.estadisticas
+
+    salidas, estadisticas = asyncio.run(correr())
+    esperado = evaluar_matriz(filas)
+    for i, salida in enumerate(salidas):
+        np.testing.assert_array_equal(salida[0], esperado[i])
+    assert estadisticas.escenarios == 3 and estadisticas.lotes == 1
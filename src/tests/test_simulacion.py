@@ -0,0 +1,56 @@
+"""Simulación Monte Carlo: costos compartidos, reproducibilidad y validación."""
+
+import pytest
+
+from motor_costos import CostoFijo
+from motor_costos.simulacion import AlternativaIncierta, CostoFijoIncierto, Normal, simular
+
+
+def _normal(valor):
+    return Normal(valor, valor * 0.1, minimo=0)
+
+
+def test_costo_compartido_se_muestrea_una_vez():
+    alt1 = AlternativaIncierta("A", unidades=1000, precio=100, costo_var_unit=50)
+    alt2 = AlternativaIncierta("B", unidades=1000, precio=100, costo_var_unit=50.5)
+    costo = CostoFijoIncierto.desde_costo_fijo(CostoFijo("Arriendo", 1_000_000, 1_000_000), _normal)
+    assert costo.valor2 is None
+
+    resultado = simular(alt1, alt2, [costo], n_muestras=20_000, semilla=1)
+    assert resultado.prob_gana1 == 1.0
+    assert resultado.desviacion_ventaja == pytest.approx(0, abs=1e-6)
+    assert resultado.media_ventaja == pytest.approx(500)
+
+
+def test_reduccion_se_deriva_de_la_muestra_de_valor1():
+    costo = CostoFijoIncierto.desde_costo_fijo(
+        {"nombre": "Arriendo", "valor1": 1000, "valor2": 800, "reduccion": 20, "relevante": True}, _normal
+    )
+    assert costo.valor2 is None and costo.reduccion == 20 and costo.relevante
+    alt = AlternativaIncierta("A", unidades=10, precio=100, costo_var_unit=0)
+    resultado = simular(alt, alt, [costo], n_muestras=5_000, semilla=2)
+    # La ventaja de la 1 es siempre el 20 % del arriendo muestreado
+    assert resultado.prob_gana1 == 0.0
+    assert resultado.media_ventaja == pytest.approx(-200, rel=0.02)
+
+
+def test_valor_distinto_se_muestrea_por_separado():
+    costo = CostoFijoIncierto.desde_costo_fijo(CostoFijo("Arriendo", 1000, 1200), _normal)
+    assert costo.valor2 == _normal(1200)
+
+
+def test_misma_semilla_mismo_resultado():
+    alt1 = AlternativaIncierta("A", unidades=Normal(1000, 100), precio=100, costo_var_unit=50)
+    alt2 = AlternativaIncierta("B", unidades=Normal(900, 100), precio=110, costo_var_unit=55)
+    costos = [CostoFijoIncierto("Arriendo", Normal(10_000, 1000), Normal(9_000, 1000))]
+    primero = simular(alt1, alt2, costos, n_muestras=30_000, tamano_bloque=7_000, semilla=5)
+    segundo = simular(alt1, alt2, costos, n_muestras=30_000, tamano_bloque=7_000, semilla=5)
+    assert primero.media_ventaja == segundo.media_ventaja
+    assert primero.percentiles == segundo.percentiles
+
+
+@pytest.mark.parametrize("argumentos", [{"n_muestras": 0}, {"tamano_bloque": 0}, {"tamano_bloque": -1}])
+def test_parametros_invalidos(argumentos):
+    alt = AlternativaIncierta("A", unidades=1, precio=1)
+    with pytest.raises(ValueError):
+        simular(alt, alt, **argumentos)